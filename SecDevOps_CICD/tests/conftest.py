@@ -0,0 +1,38 @@
+import sys
+import shutil
+import pytest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts" / "security"))
+
+from terraform_model import TerraformModel  # noqa: E402
+from terraform_plan import TerraformPlanCache  # noqa: E402
+
+TERRAFORM_DIR = Path(__file__).parent.parent / "terraform"
+PLAN_VAR_FILE = "environments/dev.tfvars"
+
+
+@pytest.fixture(scope="session")
+def terraform_dir():
+    """Root of the SecDevOps_CICD Terraform configuration"""
+    return TERRAFORM_DIR
+
+
+@pytest.fixture(scope="session")
+def terraform_model(terraform_dir):
+    """Parsed root configuration and modules, loaded once per test session"""
+    return TerraformModel.load(terraform_dir)
+
+
+@pytest.fixture(scope="session")
+def terraform_plan(request, terraform_dir):
+    """init/validate/plan results, reused across sessions while the config is unchanged"""
+    if shutil.which("terraform") is None:
+        pytest.skip("terraform not found on PATH")
+    var_file = PLAN_VAR_FILE if (terraform_dir / PLAN_VAR_FILE).exists() else None
+    cache = TerraformPlanCache(
+        terraform_dir,
+        cache_dir=request.config.cache.mkdir("terraform-plan"),
+        var_file=var_file
+    )
+    return cache.get()
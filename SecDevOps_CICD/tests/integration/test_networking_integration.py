@@ -1,73 +1,40 @@
 import pytest
-import os
-import subprocess
-import json
-from pathlib import Path
 
 class TestNetworkingIntegration:
     @pytest.fixture(autouse=True)
-    def setup(self):
+    def setup(self, request, terraform_dir):
         """Setup test environment"""
-        self.terraform_dir = Path(__file__).parent.parent.parent / "terraform"
-        
+        self.request = request
+        self.terraform_dir = terraform_dir
+
+    @property
+    def plan(self):
+        """init/validate/plan results, only run once a test needs them"""
+        return self.request.getfixturevalue("terraform_plan")
+
     def test_terraform_init(self):
         """Test terraform can initialize"""
-        result = subprocess.run(
-            ["terraform", "init", "-backend=false"],
-            cwd=self.terraform_dir,
-            capture_output=True,
-            text=True
-        )
-        assert result.returncode == 0, f"Terraform init failed: {result.stderr}"
-    
+        assert self.plan.init.returncode == 0, f"Terraform init failed: {self.plan.init.stderr}"
+
     def test_terraform_validate(self):
         """Test terraform configuration is valid"""
-        # First init
-        subprocess.run(
-            ["terraform", "init", "-backend=false"],
-            cwd=self.terraform_dir,
-            capture_output=True,
-            text=True
-        )
-        
-        # Then validate
-        result = subprocess.run(
-            ["terraform", "validate"],
-            cwd=self.terraform_dir,
-            capture_output=True,
-            text=True
-        )
-        assert result.returncode == 0, f"Terraform validate failed: {result.stderr}"
-    
+        assert self.plan.validate is not None, "Terraform validate did not run (init failed)"
+        assert self.plan.validate.returncode == 0, f"Terraform validate failed: {self.plan.validate.stderr}"
+
     def test_terraform_plan(self):
         """Test terraform plan executes successfully"""
         # Check if tfvars file exists
         tfvars_file = self.terraform_dir / "environments" / "dev.tfvars"
         if not tfvars_file.exists():
             pytest.skip("dev.tfvars not found, skipping plan test")
-            
-        # Init first
-        subprocess.run(
-            ["terraform", "init", "-backend=false"],
-            cwd=self.terraform_dir,
-            capture_output=True,
-            text=True
-        )
-        
-        # Run plan
-        result = subprocess.run(
-            ["terraform", "plan", "-var-file=environments/dev.tfvars", "-no-color"],
-            cwd=self.terraform_dir,
-            capture_output=True,
-            text=True
-        )
-        
+
         # Plan should succeed even if resources would be created
-        assert result.returncode == 0, f"Terraform plan failed: {result.stderr}"
-        
-        # Check plan output contains expected resources
-        assert "azurerm_resource_group.main" in result.stdout or "will be created" in result.stdout
-        
+        assert self.plan.plan is not None, "Terraform plan did not run (init or validate failed)"
+        assert self.plan.plan.returncode == 0, f"Terraform plan failed: {self.plan.plan.stderr}"
+
+        # Check plan contains expected resources
+        assert "azurerm_resource_group" in self.plan.resource_types()
+
     @pytest.mark.skip(reason="Requires Azure credentials and actual deployment")
     def test_deployed_resource_group(self):
         """Test actual deployed resource group - requires Azure access"""
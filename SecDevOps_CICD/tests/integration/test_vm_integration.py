@@ -1,66 +1,39 @@
 import pytest
-import subprocess
-from pathlib import Path
 
 class TestJenkinsVMIntegration:
     @pytest.fixture(autouse=True)
-    def setup(self):
+    def setup(self, request, terraform_dir, terraform_model):
         """Setup test environment"""
-        self.terraform_dir = Path(__file__).parent.parent.parent / "terraform"
-        
+        self.request = request
+        self.terraform_dir = terraform_dir
+        self.model = terraform_model
+
+    @property
+    def plan(self):
+        """init/validate/plan results, only run once a test needs them"""
+        return self.request.getfixturevalue("terraform_plan")
+
     def test_terraform_validate_with_vm_module(self):
         """Test terraform validates with VM module included"""
         # Check if main.tf includes the jenkins-vm module
-        main_tf = self.terraform_dir / "main.tf"
-        if main_tf.exists():
-            content = main_tf.read_text()
-            if 'module "jenkins_vm"' in content:
-                # Run terraform init and validate
-                subprocess.run(
-                    ["terraform", "init", "-backend=false"],
-                    cwd=self.terraform_dir,
-                    capture_output=True,
-                    text=True
-                )
-                
-                result = subprocess.run(
-                    ["terraform", "validate"],
-                    cwd=self.terraform_dir,
-                    capture_output=True,
-                    text=True
-                )
-                assert result.returncode == 0, f"Terraform validate failed: {result.stderr}"
-    
+        if "jenkins_vm" in self.model.root.modules:
+            assert self.plan.validate is not None, "Terraform validate did not run (init failed)"
+            assert self.plan.validate.returncode == 0, f"Terraform validate failed: {self.plan.validate.stderr}"
+
     def test_terraform_plan_with_vm(self):
         """Test terraform plan includes VM resources"""
         tfvars_file = self.terraform_dir / "environments" / "dev.tfvars"
         if not tfvars_file.exists():
             pytest.skip("dev.tfvars not found, skipping plan test")
-        
+
         # Check if jenkins_vm module is in main.tf
-        main_tf = self.terraform_dir / "main.tf"
-        if main_tf.exists() and 'module "jenkins_vm"' in main_tf.read_text():
-            # Init first
-            subprocess.run(
-                ["terraform", "init", "-backend=false"],
-                cwd=self.terraform_dir,
-                capture_output=True,
-                text=True
-            )
-            
-            # Run plan
-            result = subprocess.run(
-                ["terraform", "plan", "-var-file=environments/dev.tfvars", "-no-color"],
-                cwd=self.terraform_dir,
-                capture_output=True,
-                text=True
-            )
-            
+        if "jenkins_vm" in self.model.root.modules:
             # Check plan includes VM resources
-            if result.returncode == 0:
-                assert "azurerm_linux_virtual_machine" in result.stdout or "jenkins" in result.stdout
-                assert "azurerm_public_ip" in result.stdout or "public_ip" in result.stdout
-    
+            if self.plan.plan is not None and self.plan.plan.returncode == 0:
+                resource_types = self.plan.resource_types()
+                assert "azurerm_linux_virtual_machine" in resource_types
+                assert "azurerm_public_ip" in resource_types
+
     @pytest.mark.skip(reason="Requires Azure credentials")
     def test_vm_connectivity(self):
         """Test VM is accessible via SSH after deployment"""
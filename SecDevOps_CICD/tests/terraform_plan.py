@@ -0,0 +1,212 @@
+"""
+Cached ``terraform init``/``validate``/``plan`` results for integration tests.
+
+Running init, validate and plan takes minutes, and every integration test
+used to repeat all three against the same ``terraform/`` directory. The
+cache key is a SHA-256 over every ``.tf``/``.tfvars`` file, the provider
+lock file, the var file in use and the Terraform version. On a miss the
+commands run once, the plan is rendered with ``terraform show -json`` and
+everything is stored as one JSON file. Later sessions with unchanged
+infrastructure load that file instead of calling terraform.
+
+Only fully successful runs are written to disk. A failed init or plan
+(flaky registry, missing credentials) is returned for the current
+session only and retried next time.
+"""
+
+import hashlib
+import json
+import os
+import subprocess
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+HASHED_SUFFIXES = ('.tf', '.tfvars')
+LOCK_FILE = '.terraform.lock.hcl'
+CACHE_VERSION = 1
+
+
+class CommandResult(NamedTuple):
+    returncode: int
+    stdout: str
+    stderr: str
+
+
+class TerraformPlanResult:
+    """Outcome of init/validate/plan plus the JSON plan, cached or fresh"""
+
+    def __init__(self, key: str, init: CommandResult, validate: Optional[CommandResult],
+                 plan: Optional[CommandResult], plan_json: Optional[Dict[str, Any]],
+                 cached: bool = False, duration_seconds: float = 0.0):
+        self.key = key
+        self.init = init
+        self.validate = validate
+        self.plan = plan
+        self.plan_json = plan_json
+        self.cached = cached
+        self.duration_seconds = duration_seconds
+
+    @property
+    def succeeded(self) -> bool:
+        if self.init.returncode != 0 or self.validate is None or self.validate.returncode != 0:
+            return False
+        # No plan is run when there is no var file
+        return self.plan is None or (self.plan.returncode == 0 and self.plan_json is not None)
+
+    def planned_resources(self) -> List[Dict[str, Any]]:
+        """Every resource in planned_values, including child modules"""
+        if not self.plan_json:
+            return []
+        resources = []
+        pending = [self.plan_json.get('planned_values', {}).get('root_module', {})]
+        while pending:
+            module = pending.pop()
+            resources.extend(module.get('resources', []))
+            pending.extend(module.get('child_modules', []))
+        return resources
+
+    def resource_addresses(self) -> List[str]:
+        return sorted(r['address'] for r in self.planned_resources())
+
+    def resource_types(self) -> set:
+        return {r['type'] for r in self.planned_resources()}
+
+    def resources_of_type(self, type: str) -> List[Dict[str, Any]]:
+        return [r for r in self.planned_resources() if r['type'] == type]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'version': CACHE_VERSION,
+            'key': self.key,
+            'init': self.init._asdict(),
+            'validate': self.validate._asdict() if self.validate else None,
+            'plan': self.plan._asdict() if self.plan else None,
+            'plan_json': self.plan_json,
+            'duration_seconds': self.duration_seconds
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'TerraformPlanResult':
+        def command(value):
+            return CommandResult(**value) if value else None
+
+        return cls(data['key'], command(data['init']), command(data['validate']),
+                   command(data['plan']), data['plan_json'], cached=True,
+                   duration_seconds=data.get('duration_seconds', 0.0))
+
+
+class TerraformPlanCache:
+    """Run init/validate/plan once per content hash and reuse the result"""
+
+    def __init__(self, terraform_dir, cache_dir, var_file: Optional[str] = None,
+                 terraform: str = 'terraform'):
+        self.terraform_dir = Path(terraform_dir)
+        self.cache_dir = Path(cache_dir).resolve()
+        self.var_file = var_file
+        self.terraform = terraform
+
+    def _run(self, *args: str) -> CommandResult:
+        result = subprocess.run(
+            [self.terraform, *args],
+            cwd=self.terraform_dir,
+            capture_output=True,
+            text=True
+        )
+        return CommandResult(result.returncode, result.stdout, result.stderr)
+
+    def terraform_version(self) -> str:
+        return self._run('version', '-json').stdout.strip()
+
+    def content_key(self) -> str:
+        """SHA-256 over the configuration, lock file, var file and terraform version"""
+        digest = hashlib.sha256()
+        digest.update(f'v{CACHE_VERSION}\0{self.var_file}\0{self.terraform_version()}\0'.encode())
+
+        files = []
+        for root, dirs, names in os.walk(self.terraform_dir):
+            dirs[:] = sorted(d for d in dirs if d != '.terraform')
+            files.extend(Path(root) / name for name in names
+                         if name.endswith(HASHED_SUFFIXES) or name == LOCK_FILE)
+        for path in sorted(files):
+            digest.update(str(path.relative_to(self.terraform_dir)).encode() + b'\0')
+            digest.update(path.read_bytes() + b'\0')
+        return digest.hexdigest()
+
+    def cache_file(self, key: str) -> Path:
+        return self.cache_dir / f'plan-{key[:32]}.json'
+
+    @contextmanager
+    def _lock(self):
+        """Serialise concurrent sessions (e.g. pytest-xdist workers) on a miss"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        if fcntl is None:
+            yield
+            return
+        with open(self.cache_dir / '.lock', 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def load(self, key: str) -> Optional[TerraformPlanResult]:
+        path = self.cache_file(key)
+        try:
+            data = json.loads(path.read_text())
+        except (OSError, ValueError):
+            return None
+        if data.get('version') != CACHE_VERSION or data.get('key') != key:
+            return None
+        return TerraformPlanResult.from_dict(data)
+
+    def store(self, result: TerraformPlanResult):
+        path = self.cache_file(result.key)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(result.to_dict(), f)
+        os.replace(tmp_path, path)
+
+    def execute(self, key: str) -> TerraformPlanResult:
+        """Run init, validate and plan, rendering the plan as JSON"""
+        start = time.perf_counter()
+        init = self._run('init', '-backend=false', '-input=false', '-no-color')
+        validate = plan = plan_json = None
+        if init.returncode == 0:
+            validate = self._run('validate', '-no-color')
+        if validate and validate.returncode == 0 and self.var_file:
+            plan_file = self.cache_dir / f'plan-{key[:32]}.tfplan'
+            plan = self._run('plan', f'-var-file={self.var_file}', '-input=false',
+                             '-no-color', f'-out={plan_file}')
+            if plan.returncode == 0:
+                shown = self._run('show', '-json', str(plan_file))
+                if shown.returncode == 0:
+                    plan_json = json.loads(shown.stdout)
+                else:
+                    plan = CommandResult(shown.returncode, plan.stdout, shown.stderr)
+            plan_file.unlink(missing_ok=True)
+        return TerraformPlanResult(key, init, validate, plan, plan_json,
+                                   duration_seconds=round(time.perf_counter() - start, 2))
+
+    def get(self) -> TerraformPlanResult:
+        """Cached result for the current configuration, running terraform on a miss"""
+        key = self.content_key()
+        result = self.load(key)
+        if result:
+            return result
+        with self._lock():
+            # Another session may have filled the cache while we waited
+            result = self.load(key)
+            if result:
+                return result
+            result = self.execute(key)
+            if result.succeeded:
+                self.store(result)
+        return result
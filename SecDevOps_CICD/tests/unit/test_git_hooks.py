@@ -10,6 +10,11 @@ import stat
 from pathlib import Path
 import tempfile
 import shutil
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'scripts' / 'git-hooks'))
+
+import hook_engine  # noqa: E402
 
 
 class TestGitHooks(unittest.TestCase):
@@ -297,5 +302,126 @@ class TestGitHooks(unittest.TestCase):
                 )
 
 
+class TestHookEngine(unittest.TestCase):
+    """Test the single-pass, cached staged-content scanner used by pre-commit."""
+
+    SECRETS = ['AWS_SECRET', 'api_key', 'password=', 'bearer']
+    DEBUG = ['print(', 'TODO']
+
+    def setUp(self):
+        """Create a throwaway git repository."""
+        self.repo = tempfile.mkdtemp()
+        self.git('init', '-q')
+        self.cache_path = os.path.join(self.repo, '.git', 'hook-cache', 'staged-scan.json')
+        self.matcher = hook_engine.PatternMatcher(self.SECRETS, self.DEBUG)
+
+    def tearDown(self):
+        shutil.rmtree(self.repo, ignore_errors=True)
+
+    def git(self, *args):
+        subprocess.run(['git', *args], cwd=self.repo, check=True, capture_output=True)
+
+    def stage(self, name, content):
+        path = Path(self.repo) / name
+        if isinstance(content, bytes):
+            path.write_bytes(content)
+        else:
+            path.write_text(content)
+        self.git('add', name)
+
+    def scan(self, **kwargs):
+        return hook_engine.scan_staged(self.matcher, cache_path=self.cache_path, cwd=self.repo, **kwargs)
+
+    def test_matcher_reports_every_pattern_in_one_pass(self):
+        """Test one combined regex finds each pattern with its line number."""
+        hits = self.matcher.scan("x = 1\nAPI_KEY = 'abc'\nHeader: Bearer abc  # TODO\n")
+        self.assertEqual(
+            sorted((h.kind, h.pattern, h.line) for h in hits),
+            [('debug', 'TODO', 3), ('secret', 'api_key', 2), ('secret', 'bearer', 3)]
+        )
+
+    def test_matcher_case_sensitivity(self):
+        """Test secrets match case-insensitively and debug markers case-sensitively."""
+        hits = self.matcher.scan("aws_secret\ntodo\n")
+        self.assertEqual([(h.kind, h.pattern) for h in hits], [('secret', 'AWS_SECRET')])
+
+    def test_allowlisted_line_is_ignored(self):
+        """Test the allowlist pragma suppresses secrets on its line only."""
+        hits = self.matcher.scan("password=x  # pragma: allowlist secret\npassword=y\n")
+        self.assertEqual([h.line for h in hits], [2])
+
+    def test_staged_secret_is_detected(self):
+        """Test secrets in staged content are reported with path and line."""
+        self.stage('clean.py', "value = 1\n")
+        self.stage('config.env', "HOST=localhost\nPASSWORD=hunter2\n")
+        report = self.scan()
+        self.assertEqual(report['scanned'], 2)
+        self.assertEqual([(path, hit.pattern, hit.line) for path, hit in report['secrets']],
+                         [('config.env', 'password=', 2)])
+
+    def test_only_added_lines_are_reported(self):
+        """Test editing a file with a pre-existing match only reports what the commit adds."""
+        self.stage('main.tf', "client_id = var.client_id\n")
+        self.git('-c', 'user.name=t', '-c', 'user.email=t@t', 'commit', '-q', '--no-verify', '-m', 'base')
+        self.matcher = hook_engine.PatternMatcher(self.SECRETS + ['client_id'], self.DEBUG)
+
+        self.stage('main.tf', "# TODO tags\nclient_id = var.client_id\n")
+        report = self.scan()
+        self.assertEqual(report['secrets'], [])
+        self.assertEqual([(path, hit.pattern, hit.line) for path, hit in report['debug']],
+                         [('main.tf', 'TODO', 1)])
+
+        self.stage('main.tf', "# TODO tags\nclient_id = var.client_id\napi_key = 'abc'\n")
+        report = self.scan()
+        self.assertEqual([(path, hit.pattern, hit.line) for path, hit in report['secrets']],
+                         [('main.tf', 'api_key', 3)])
+
+    def test_quoted_paths_map_to_their_added_lines(self):
+        """Test paths git quotes in diff headers still match their staged blobs."""
+        self.stage('tab\tname.env', "password=abc\n")
+        self.stage('naïve.env', "password=abc\n")
+        report = self.scan()
+        self.assertEqual(sorted(path for path, hit in report['secrets']), ['naïve.env', 'tab\tname.env'])
+
+    def test_clean_blobs_are_not_rescanned(self):
+        """Test clean blobs are cached by SHA and only changed content is read again."""
+        self.stage('a.py', "print('a')\n")
+        self.stage('b.py', "b = 2\n")
+        first = self.scan()
+        self.assertEqual((first['scanned'], first['cached']), (2, 0))
+
+        self.stage('b.py', "b = 3\n")
+        second = self.scan()
+        self.assertEqual((second['scanned'], second['cached']), (1, 1))
+        # Warnings for cached blobs are replayed from the cache
+        self.assertEqual([(path, hit.pattern) for path, hit in second['debug']], [('a.py', 'print(')])
+
+    def test_blobs_with_secrets_are_never_cached(self):
+        """Test a blob containing a secret is rescanned on every run."""
+        self.stage('secret.txt', "password=abc\n")
+        self.scan()
+        report = self.scan()
+        self.assertEqual(report['scanned'], 1)
+        self.assertEqual(len(report['secrets']), 1)
+
+    def test_pattern_change_invalidates_cache(self):
+        """Test cached results are discarded when the pattern set changes."""
+        self.stage('a.py', "client_id = 'x'\n")
+        self.assertEqual(self.scan()['secrets'], [])
+        self.matcher = hook_engine.PatternMatcher(self.SECRETS + ['client_id'], self.DEBUG)
+        report = self.scan()
+        self.assertEqual(report['cached'], 0)
+        self.assertEqual(len(report['secrets']), 1)
+
+    def test_large_and_binary_files(self):
+        """Test oversized blobs are reported without being read and binaries are skipped."""
+        self.stage('big.txt', "x" * 2048)
+        self.stage('image.bin', b"\x89PNG\0\0password=secret")
+        report = self.scan(max_size=1024)
+        self.assertEqual(report['large_files'], [('big.txt', 2048)])
+        self.assertEqual(report['binary'], 1)
+        self.assertEqual(report['secrets'], [])
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
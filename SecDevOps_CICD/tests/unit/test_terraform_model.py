@@ -0,0 +1,64 @@
+import os
+
+from terraform_model import Expression, TerraformModule, parse, parse_file
+
+SAMPLE = '''
+# comment
+resource "azurerm_public_ip" "jenkins" {
+  name = "pip-${var.environment}"
+  allocation_method="Static"
+  zones    = ["1", "2"]
+  count    = var.enabled ? 1 : 0
+  tags = {
+    owner = "platform"
+    env   = var.environment
+  }
+
+  ip_configuration {
+    name = "internal"
+  }
+}
+'''
+
+
+class TestTerraformModel:
+    def test_values_are_independent_of_alignment(self):
+        """Test attribute values parse the same regardless of whitespace"""
+        resource = parse(SAMPLE)[0]
+        assert resource.labels == ["azurerm_public_ip", "jenkins"]
+        assert resource["allocation_method"] == "Static"
+        assert resource["name"] == "pip-${var.environment}"
+        assert resource["zones"] == ["1", "2"]
+        assert resource["tags"] == {"owner": "platform", "env": "var.environment"}
+
+    def test_expressions_keep_source_text(self):
+        """Test non-literal expressions are kept as Expression source"""
+        resource = parse(SAMPLE)[0]
+        assert isinstance(resource["count"], Expression)
+        assert resource["count"] == "var.enabled ? 1 : 0"
+        assert resource.child("ip_configuration")["name"] == "internal"
+
+    def test_module_index_by_attribute(self):
+        """Test resources can be found by type and attribute value"""
+        module = TerraformModule("sample", ".", parse(SAMPLE))
+        assert module.find("azurerm_public_ip", allocation_method="Static")
+        assert not module.find("azurerm_public_ip", allocation_method="Dynamic")
+        assert module.has_resource("azurerm_public_ip", "jenkins")
+
+    def test_parse_file_cached_by_mtime(self, tmp_path):
+        """Test files are re-parsed only when their mtime changes"""
+        tf_file = tmp_path / "main.tf"
+        tf_file.write_text(SAMPLE)
+        first = parse_file(tf_file)
+        assert parse_file(tf_file) is first
+
+        tf_file.write_text('variable "environment" {}\n')
+        stat = tf_file.stat()
+        os.utime(tf_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        assert parse_file(tf_file)[0].type == "variable"
+
+    def test_all_modules_parse(self, terraform_model):
+        """Test every SecDevOps_CICD module parses into resources"""
+        assert {"acr", "jenkins-vm", "networking"} <= set(terraform_model.modules)
+        for module in terraform_model.modules.values():
+            assert module.resources, f"{module.name} should declare resources"
@@ -0,0 +1,88 @@
+import json
+import stat
+import pytest
+
+from terraform_plan import TerraformPlanCache
+
+PLAN_JSON = {
+    "planned_values": {
+        "root_module": {
+            "resources": [{"address": "random_string.suffix", "type": "random_string"}],
+            "child_modules": [{
+                "address": "module.acr",
+                "resources": [{"address": "module.acr.azurerm_container_registry.main",
+                               "type": "azurerm_container_registry"}]
+            }]
+        }
+    }
+}
+
+# Stand-in terraform binary: logs each subcommand, "plan" fails when FAIL_PLAN exists
+FAKE_TERRAFORM = """#!/bin/sh
+echo "$1" >> "{log}"
+case "$1" in
+  version) echo '{{"terraform_version": "1.6.0"}}' ;;
+  plan) [ -e "{fail}" ] && exit 1; exit 0 ;;
+  show) cat "{plan_json}" ;;
+esac
+exit 0
+"""
+
+
+class TestTerraformPlanCache:
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
+        """Setup a throwaway terraform directory and fake terraform binary"""
+        self.terraform_dir = tmp_path / "terraform"
+        (self.terraform_dir / "environments").mkdir(parents=True)
+        (self.terraform_dir / "main.tf").write_text('resource "random_string" "suffix" {}\n')
+        (self.terraform_dir / "environments" / "dev.tfvars").write_text('environment = "dev"\n')
+
+        self.log = tmp_path / "calls.log"
+        self.fail_flag = tmp_path / "FAIL_PLAN"
+        plan_json = tmp_path / "plan.json"
+        plan_json.write_text(json.dumps(PLAN_JSON))
+        self.terraform = tmp_path / "terraform-bin"
+        self.terraform.write_text(FAKE_TERRAFORM.format(log=self.log, fail=self.fail_flag, plan_json=plan_json))
+        self.terraform.chmod(self.terraform.stat().st_mode | stat.S_IEXEC)
+        self.cache_dir = tmp_path / "cache"
+
+    def make_cache(self):
+        return TerraformPlanCache(self.terraform_dir, self.cache_dir,
+                                  var_file="environments/dev.tfvars", terraform=str(self.terraform))
+
+    def calls(self):
+        lines = self.log.read_text().split() if self.log.exists() else []
+        return [line for line in lines if line != "version"]
+
+    def test_plan_runs_once_and_is_reused(self):
+        """Test a second session loads the stored plan without running terraform"""
+        first = self.make_cache().get()
+        assert first.succeeded and not first.cached
+        assert self.calls() == ["init", "validate", "plan", "show"]
+        assert "module.acr.azurerm_container_registry.main" in first.resource_addresses()
+
+        second = self.make_cache().get()
+        assert second.cached
+        assert second.resource_types() == {"random_string", "azurerm_container_registry"}
+        assert self.calls() == ["init", "validate", "plan", "show"]
+
+    def test_config_change_invalidates_cache(self):
+        """Test editing a .tf file produces a new key and a fresh plan"""
+        first = self.make_cache().get()
+        (self.terraform_dir / "main.tf").write_text('resource "random_string" "other" {}\n')
+        second = self.make_cache().get()
+        assert second.key != first.key
+        assert not second.cached
+        assert self.calls().count("plan") == 2
+
+    def test_failed_plan_is_not_stored(self):
+        """Test a failing plan is retried by the next session"""
+        self.fail_flag.touch()
+        result = self.make_cache().get()
+        assert result.plan.returncode == 1
+        assert not result.succeeded
+
+        self.fail_flag.unlink()
+        assert self.make_cache().get().succeeded
+        assert self.calls().count("plan") == 2
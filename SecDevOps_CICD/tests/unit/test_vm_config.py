@@ -1,165 +1,122 @@
 import pytest
-import os
-from pathlib import Path
 
 class TestJenkinsVM:
     @pytest.fixture(autouse=True)
-    def setup(self):
+    def setup(self, terraform_dir, terraform_model):
         """Setup test environment"""
-        self.terraform_dir = Path(__file__).parent.parent.parent / "terraform"
+        self.terraform_dir = terraform_dir
         self.module_dir = self.terraform_dir / "modules" / "jenkins-vm"
-        
+        self.module = terraform_model.module("jenkins-vm")
+        self.vm = self.module.resource("azurerm_linux_virtual_machine", "jenkins")
+
     def test_module_structure_exists(self):
         """Test that jenkins-vm module structure exists"""
         assert self.module_dir.exists(), "jenkins-vm module directory should exist"
-        
+
         main_tf = self.module_dir / "main.tf"
         variables_tf = self.module_dir / "variables.tf"
         outputs_tf = self.module_dir / "outputs.tf"
-        
+
         assert main_tf.exists(), "main.tf should exist in jenkins-vm module"
         assert variables_tf.exists(), "variables.tf should exist in jenkins-vm module"
         assert outputs_tf.exists(), "outputs.tf should exist in jenkins-vm module"
-    
+
     def test_public_ip_configuration(self):
         """Test public IP is configured correctly"""
-        main_tf = self.module_dir / "main.tf"
-        if main_tf.exists():
-            content = main_tf.read_text()
-            assert 'resource "azurerm_public_ip" "jenkins"' in content
-            assert 'allocation_method   = "Static"' in content
-            assert 'sku                = "Standard"' in content
-            assert 'domain_name_label' in content
-            assert 'pip-jenkins-${var.environment}' in content
-    
+        pip = self.module.resource("azurerm_public_ip", "jenkins")
+        assert pip["allocation_method"] == "Static"
+        assert pip["sku"] == "Standard"
+        assert "domain_name_label" in pip
+        assert pip["name"] == "pip-jenkins-${var.environment}"
+
     def test_network_interface_configuration(self):
         """Test network interface is properly configured"""
-        main_tf = self.module_dir / "main.tf"
-        if main_tf.exists():
-            content = main_tf.read_text()
-            assert 'resource "azurerm_network_interface" "jenkins"' in content
-            assert 'nic-jenkins-${var.environment}' in content
-            assert 'ip_configuration' in content
-            assert 'public_ip_address_id' in content
-            assert 'subnet_id' in content
-    
+        nic = self.module.resource("azurerm_network_interface", "jenkins")
+        assert nic["name"] == "nic-jenkins-${var.environment}"
+        ip_config = nic.child("ip_configuration")
+        assert ip_config["public_ip_address_id"] == "azurerm_public_ip.jenkins.id"
+        assert ip_config["subnet_id"] == "var.subnet_id"
+
     def test_vm_configuration(self):
         """Test VM resource configuration"""
-        main_tf = self.module_dir / "main.tf"
-        if main_tf.exists():
-            content = main_tf.read_text()
-            assert 'resource "azurerm_linux_virtual_machine" "jenkins"' in content
-            assert 'vm-jenkins-${var.environment}' in content
-            assert 'size               = "Standard_D4s_v3"' in content
-            assert 'disable_password_authentication = true' in content
-            assert 'admin_username = "azureuser"' in content
-    
+        assert self.vm["name"] == "vm-jenkins-${var.environment}"
+        assert self.vm["size"] == "Standard_D4s_v3"
+        assert self.vm["disable_password_authentication"] is True
+        assert self.vm["admin_username"] == "azureuser"
+
     def test_vm_os_disk(self):
         """Test VM OS disk configuration"""
-        main_tf = self.module_dir / "main.tf"
-        if main_tf.exists():
-            content = main_tf.read_text()
-            assert 'os_disk' in content
-            assert 'storage_account_type = "Premium_LRS"' in content
-            assert 'disk_size_gb        = 128' in content
-            assert 'caching              = "ReadWrite"' in content
-    
+        os_disk = self.vm.child("os_disk")
+        assert os_disk["storage_account_type"] == "Premium_LRS"
+        assert os_disk["disk_size_gb"] == 128
+        assert os_disk["caching"] == "ReadWrite"
+
     def test_vm_image_configuration(self):
         """Test VM uses Ubuntu 22.04 LTS"""
-        main_tf = self.module_dir / "main.tf"
-        if main_tf.exists():
-            content = main_tf.read_text()
-            assert 'source_image_reference' in content
-            assert 'publisher = "Canonical"' in content
-            assert '"22_04-lts' in content.lower() or '22.04' in content
-            assert 'offer' in content
-    
+        image = self.vm.child("source_image_reference")
+        assert image["publisher"] == "Canonical"
+        assert image["sku"].lower().startswith("22_04-lts")
+        assert "offer" in image
+
     def test_ssh_key_configuration(self):
         """Test SSH key authentication is configured"""
-        main_tf = self.module_dir / "main.tf"
-        if main_tf.exists():
-            content = main_tf.read_text()
-            assert 'admin_ssh_key' in content
-            assert 'public_key' in content
-            assert 'username   = "azureuser"' in content
-    
+        ssh_key = self.vm.child("admin_ssh_key")
+        assert "public_key" in ssh_key
+        assert ssh_key["username"] == "azureuser"
+
     def test_boot_diagnostics(self):
         """Test boot diagnostics is enabled"""
-        main_tf = self.module_dir / "main.tf"
-        if main_tf.exists():
-            content = main_tf.read_text()
-            assert 'boot_diagnostics' in content
-            assert 'storage_account' in content.lower()
-    
+        diagnostics = self.vm.child("boot_diagnostics")
+        assert diagnostics["storage_account_uri"].startswith("azurerm_storage_account.")
+
     def test_managed_identity(self):
         """Test VM has managed identity"""
-        main_tf = self.module_dir / "main.tf"
-        if main_tf.exists():
-            content = main_tf.read_text()
-            assert 'identity' in content
-            assert 'type = "SystemAssigned"' in content
-    
+        assert self.vm.child("identity")["type"] == "SystemAssigned"
+
     def test_monitor_agent_extension(self):
         """Test Azure Monitor agent is configured"""
-        main_tf = self.module_dir / "main.tf"
-        if main_tf.exists():
-            content = main_tf.read_text()
-            assert 'resource "azurerm_virtual_machine_extension" "monitor_agent"' in content
-            assert 'AzureMonitorLinuxAgent' in content
-            assert 'auto_upgrade_minor_version = true' in content
-    
+        extension = self.module.resource("azurerm_virtual_machine_extension", "monitor_agent")
+        assert extension["type"] == "AzureMonitorLinuxAgent"
+        assert extension["auto_upgrade_minor_version"] is True
+
     def test_auto_shutdown_schedule(self):
         """Test auto-shutdown is configured for cost savings"""
-        main_tf = self.module_dir / "main.tf"
-        if main_tf.exists():
-            content = main_tf.read_text()
-            assert 'azurerm_dev_test_global_vm_shutdown_schedule' in content
-            assert 'daily_recurrence_time = "2000"' in content
-            assert 'enabled           = true' in content
-    
+        schedules = self.module.resources_of_type("azurerm_dev_test_global_vm_shutdown_schedule")
+        assert schedules, "auto-shutdown schedule should be defined"
+        assert schedules[0]["daily_recurrence_time"] == "2000"
+        assert schedules[0]["enabled"] is True
+
     def test_backup_configuration(self):
         """Test VM backup is configured"""
-        main_tf = self.module_dir / "main.tf"
-        if main_tf.exists():
-            content = main_tf.read_text()
-            # Check for backup configuration
-            assert 'backup' in content.lower() or 'azurerm_backup_protected_vm' in content
-    
+        # Check for backup configuration
+        assert self.module.has_resource("azurerm_backup_protected_vm")
+
     def test_module_variables(self):
         """Test module has all required variables"""
-        variables_tf = self.module_dir / "variables.tf"
-        if variables_tf.exists():
-            content = variables_tf.read_text()
-            required_vars = [
-                'variable "environment"',
-                'variable "location"',
-                'variable "resource_group_name"',
-                'variable "subnet_id"',
-                'variable "tags"',
-                'variable "ssh_public_key_path"'
-            ]
-            for var in required_vars:
-                assert var in content, f"{var} should be defined"
-    
+        required_vars = [
+            'environment',
+            'location',
+            'resource_group_name',
+            'subnet_id',
+            'tags',
+            'ssh_public_key_path'
+        ]
+        for var in required_vars:
+            assert var in self.module.variables, f'variable "{var}" should be defined'
+
     def test_module_outputs(self):
         """Test module provides necessary outputs"""
-        outputs_tf = self.module_dir / "outputs.tf"
-        if outputs_tf.exists():
-            content = outputs_tf.read_text()
-            required_outputs = [
-                'output "vm_id"',
-                'output "public_ip_address"',
-                'output "public_ip_fqdn"',
-                'output "private_ip_address"'
-            ]
-            for output in required_outputs:
-                assert output in content, f"{output} should be defined"
-    
+        required_outputs = [
+            'vm_id',
+            'public_ip_address',
+            'public_ip_fqdn',
+            'private_ip_address'
+        ]
+        for output in required_outputs:
+            assert output in self.module.outputs, f'output "{output}" should be defined'
+
     def test_storage_account_for_diagnostics(self):
         """Test storage account exists for boot diagnostics"""
-        main_tf = self.module_dir / "main.tf"
-        if main_tf.exists():
-            content = main_tf.read_text()
-            assert 'resource "azurerm_storage_account" "diagnostics"' in content
-            assert 'account_tier             = "Standard"' in content
-            assert 'account_replication_type = "LRS"' in content
\ No newline at end of file
+        storage = self.module.resource("azurerm_storage_account", "diagnostics")
+        assert storage["account_tier"] == "Standard"
+        assert storage["account_replication_type"] == "LRS"
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for scripts/parse-zap-results.py.
+
+For every combination of report format (json-native, json-flat, xml), report
+size (1k, 100k, 1m alerts) and output mode (jenkins, sarif, detailed) a fresh
+Python process loads ZAPResultsParser, parses a synthetic report from
+zap_report_generator.py and generates the mode's output, measuring:
+
+    parse_seconds     ZAPResultsParser.parse()
+    output_seconds    generate_jenkins_report / export_sarif /
+                      generate_summary + generate_detailed_report + check_thresholds
+    peak_rss_mb       peak resident set size of the process
+
+Every case also checks that the parsed summary matches the generator's
+counts. Each run is appended to a JSON-lines history file; a metric more than
+--tolerance above the median of the last --window runs on the same machine
+is reported as a regression and fails the run with exit code 1. Runs record
+a hash of parse-zap-results.py, so a regression can be traced to a change.
+
+    python scripts/benchmarks/zap_parser_bench.py --sizes 1k 100k
+    python scripts/benchmarks/zap_parser_bench.py --formats xml --modes jenkins --repeat 5
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import platform
+import resource
+import statistics
+import subprocess
+import importlib.util
+from contextlib import redirect_stdout
+from datetime import datetime
+from pathlib import Path
+
+from zap_report_generator import FORMATS, GENERATOR_VERSION, write_report
+
+BENCH_DIR = Path(__file__).resolve().parent
+REPO_ROOT = BENCH_DIR.parent.parent
+PARSER_SCRIPT = REPO_ROOT / 'scripts' / 'parse-zap-results.py'
+DEFAULT_WORK_DIR = REPO_ROOT / '.cache' / 'benchmarks'
+DEFAULT_HISTORY = DEFAULT_WORK_DIR / 'parse-zap-results.jsonl'
+
+SIZES = {'1k': 1000, '100k': 100000, '1m': 1000000}
+MODES = ('jenkins', 'sarif', 'detailed')
+METRICS = ('parse_seconds', 'output_seconds', 'peak_rss_mb')
+# Differences below these are noise, whatever the relative change
+NOISE_FLOOR = {'parse_seconds': 0.02, 'output_seconds': 0.02, 'peak_rss_mb': 5.0}
+
+
+def load_parser_module(path: Path = PARSER_SCRIPT):
+    """Import parse-zap-results.py (not importable by name because of the dashes)"""
+    spec = importlib.util.spec_from_file_location('parse_zap_results', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def run_case(report: str, fmt: str, mode: str, output_dir: str) -> dict:
+    """Parse one report and generate one output mode in this process"""
+    module = load_parser_module()
+    parser = module.ZAPResultsParser(report, 'xml' if fmt == 'xml' else 'json')
+    sink = io.StringIO()
+
+    start = time.perf_counter()
+    with redirect_stdout(sink):
+        ok = parser.parse()
+    parse_seconds = time.perf_counter() - start
+    if not ok:
+        raise RuntimeError(f"parse failed: {sink.getvalue().strip()}")
+    parse_rss = peak_rss_mb()
+
+    start = time.perf_counter()
+    with redirect_stdout(sink):
+        if mode == 'jenkins':
+            json.dumps(parser.generate_jenkins_report(), indent=2)
+        elif mode == 'sarif':
+            sarif_file = os.path.join(output_dir, f'{os.getpid()}.sarif')
+            parser.export_sarif(sarif_file)
+            os.remove(sarif_file)
+        else:
+            parser.generate_summary()
+            parser.generate_detailed_report()
+            parser.check_thresholds()
+    output_seconds = time.perf_counter() - start
+
+    return {
+        'parse_seconds': parse_seconds,
+        'output_seconds': output_seconds,
+        'parse_rss_mb': parse_rss,
+        'peak_rss_mb': peak_rss_mb(),
+        'summary': dict(parser.summary),
+    }
+
+
+def measure(report: Path, fmt: str, mode: str, repeat: int, work_dir: Path) -> dict:
+    """Run a case `repeat` times in fresh processes; median times, maximum RSS"""
+    runs = []
+    for _ in range(repeat):
+        cmd = [sys.executable, str(Path(__file__).resolve()), '--worker', str(report), fmt, mode, str(work_dir)]
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"{fmt}/{mode} on {report.name} failed:\n{result.stderr.strip()}")
+        runs.append(json.loads(result.stdout.strip().splitlines()[-1]))
+    return {
+        'parse_seconds': round(statistics.median(r['parse_seconds'] for r in runs), 4),
+        'output_seconds': round(statistics.median(r['output_seconds'] for r in runs), 4),
+        'parse_rss_mb': round(max(r['parse_rss_mb'] for r in runs), 1),
+        'peak_rss_mb': round(max(r['peak_rss_mb'] for r in runs), 1),
+        'summary': runs[0]['summary'],
+    }
+
+
+def ensure_report(work_dir: Path, fmt: str, size: str, seed: int):
+    """Generate (or reuse) a synthetic report; returns (path, expected summary)"""
+    reports_dir = work_dir / 'zap-reports'
+    reports_dir.mkdir(parents=True, exist_ok=True)
+    stem = f"{fmt}-{size}-s{seed}-g{GENERATOR_VERSION}"
+    report = reports_dir / f"{stem}.{'xml' if fmt == 'xml' else 'json'}"
+    meta = reports_dir / f"{stem}.summary.json"
+    if report.exists() and meta.exists():
+        return report, json.loads(meta.read_text())
+    tmp = report.with_suffix('.tmp')
+    summary = write_report(str(tmp), SIZES[size], fmt, seed)
+    os.replace(tmp, report)
+    meta.write_text(json.dumps(summary))
+    return report, summary
+
+
+def parser_version() -> str:
+    """Short hash of parse-zap-results.py"""
+    return hashlib.sha256(PARSER_SCRIPT.read_bytes()).hexdigest()[:12]
+
+
+def machine_fingerprint() -> dict:
+    return {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+        'generator': GENERATOR_VERSION,
+    }
+
+
+def load_history(path: Path) -> list:
+    if not path.exists():
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def find_regressions(results: dict, history: list, fingerprint: dict, tolerance: float, window: int) -> list:
+    """Metrics more than `tolerance` above the median of the last `window` comparable runs"""
+    comparable = [run for run in history if run['meta'].get('fingerprint') == fingerprint][-window:]
+    regressions = []
+    for case, current in results.items():
+        for metric in METRICS:
+            previous = [run['results'][case][metric] for run in comparable if case in run['results']]
+            if not previous:
+                continue
+            baseline = statistics.median(previous)
+            if current[metric] > baseline * (1 + tolerance) and current[metric] - baseline > NOISE_FLOOR[metric]:
+                regressions.append(f"{case} {metric}: {current[metric]} > median {baseline} of "
+                                   f"{len(previous)} run(s) +{tolerance:.0%}")
+    return regressions
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--worker':
+        report, fmt, mode, output_dir = sys.argv[2:6]
+        print(json.dumps(run_case(report, fmt, mode, output_dir)))
+        return
+
+    parser = argparse.ArgumentParser(description='Benchmark parse-zap-results.py')
+    parser.add_argument('--formats', nargs='+', choices=FORMATS, default=list(FORMATS))
+    parser.add_argument('--sizes', nargs='+', choices=list(SIZES), default=list(SIZES))
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=list(MODES))
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per case (median time, max RSS)')
+    parser.add_argument('--seed', type=int, default=42, help='Synthetic report seed')
+    parser.add_argument('--work-dir', default=str(DEFAULT_WORK_DIR), help='Where generated reports are kept')
+    parser.add_argument('--history', default=str(DEFAULT_HISTORY), help='JSON-lines history file')
+    parser.add_argument('--window', type=int, default=5, help='History runs the baseline median is taken over')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed relative regression')
+    parser.add_argument('--output', help='Also write this run as JSON to this file')
+    parser.add_argument('--no-store', action='store_true', help='Do not append this run to the history')
+    args = parser.parse_args()
+
+    work_dir = Path(args.work_dir)
+    work_dir.mkdir(parents=True, exist_ok=True)
+    history_file = Path(args.history)
+
+    print("=" * 60)
+    print("parse-zap-results.py benchmark")
+    print("=" * 60)
+
+    results = {}
+    failed = False
+    for size in args.sizes:
+        for fmt in args.formats:
+            report, expected = ensure_report(work_dir, fmt, size, args.seed)
+            for mode in args.modes:
+                case = f"{fmt}/{size}/{mode}"
+                result = measure(report, fmt, mode, max(1, args.repeat), work_dir)
+                if result.pop('summary') != expected:
+                    print(f"❌ {case}: parsed summary does not match the generated report")
+                    failed = True
+                results[case] = result
+                print(f"{case:<26} parse {result['parse_seconds']:>8.3f}s  output {result['output_seconds']:>8.3f}s  "
+                      f"peak RSS {result['peak_rss_mb']:>8.1f} MB")
+
+    fingerprint = machine_fingerprint()
+    run = {
+        'meta': {
+            'timestamp': datetime.utcnow().isoformat(),
+            'parser_version': parser_version(),
+            'fingerprint': fingerprint,
+            'repeat': args.repeat,
+            'seed': args.seed,
+        },
+        'results': results,
+    }
+
+    regressions = find_regressions(results, load_history(history_file), fingerprint, args.tolerance, args.window)
+    if not args.no_store:
+        history_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(history_file, 'a') as f:
+            f.write(json.dumps(run) + '\n')
+        print(f"Run appended to {history_file}")
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(run, f, indent=2)
+
+    for message in regressions:
+        print(f"❌ {message}")
+    if regressions or failed:
+        sys.exit(1)
+    print("✅ No regressions against history")
+
+
+if __name__ == '__main__':
+    main()
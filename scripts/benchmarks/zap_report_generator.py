@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Deterministic synthetic OWASP ZAP reports for benchmarks and tests.
+
+The same (alerts, seed) always produces byte-identical reports, in the three
+shapes parse-zap-results.py accepts:
+
+    json-native   {"alerts": [...]} as returned by /JSON/core/view/alerts/
+    json-flat     a bare JSON list of the same alerts
+    xml           OWASPZAPReport XML (one alertitem per alert)
+
+Alerts are drawn from a fixed catalogue of ZAP rules, so - as in real scans -
+a few long descriptions and solutions repeat across most alerts, while URLs
+carry numeric ids and UUIDs. Reports are written incrementally and never held
+in memory, so 1M-alert reports can be generated on a CI agent.
+
+    python scripts/benchmarks/zap_report_generator.py --alerts 100000 --format xml -o report.xml
+"""
+
+import json
+import random
+import argparse
+from typing import Dict, Iterator, List
+from xml.sax.saxutils import escape
+
+FORMATS = ('json-native', 'json-flat', 'xml')
+GENERATOR_VERSION = 1
+
+RISK_WEIGHTS = (('High', 1), ('Medium', 6), ('Low', 25), ('Informational', 68))
+RISK_CODES = {'Informational': 0, 'Low': 1, 'Medium': 2, 'High': 3}
+CONFIDENCES = ('Low', 'Medium', 'High', 'Confirmed')
+
+# (plugin id, alert name, cwe, wasc, risk)
+RULES = [
+    ('40012', 'Cross Site Scripting (Reflected)', 79, 8, 'High'),
+    ('40014', 'Cross Site Scripting (Persistent)', 79, 8, 'High'),
+    ('40018', 'SQL Injection', 89, 19, 'High'),
+    ('90020', 'Remote OS Command Injection', 78, 31, 'High'),
+    ('6', 'Path Traversal', 22, 33, 'High'),
+    ('10202', 'Absence of Anti-CSRF Tokens', 352, 9, 'Medium'),
+    ('10038', 'Content Security Policy (CSP) Header Not Set', 693, 15, 'Medium'),
+    ('10020', 'Missing Anti-clickjacking Header', 1021, 15, 'Medium'),
+    ('10098', 'Cross-Domain Misconfiguration', 264, 14, 'Medium'),
+    ('90022', 'Application Error Disclosure', 200, 13, 'Medium'),
+    ('10035', 'Strict-Transport-Security Header Not Set', 319, 15, 'Low'),
+    ('10021', 'X-Content-Type-Options Header Missing', 693, 15, 'Low'),
+    ('10037', 'Server Leaks Information via "X-Powered-By" HTTP Response Header Field(s)', 200, 13, 'Low'),
+    ('10036', 'Server Leaks Version Information via "Server" HTTP Response Header Field', 200, 13, 'Low'),
+    ('10010', 'Cookie No HttpOnly Flag', 1004, 13, 'Low'),
+    ('10011', 'Cookie Without Secure Flag', 614, 13, 'Low'),
+    ('10054', 'Cookie without SameSite Attribute', 1275, 13, 'Low'),
+    ('10096', 'Timestamp Disclosure - Unix', 200, 13, 'Low'),
+    ('10027', 'Information Disclosure - Suspicious Comments', 200, 13, 'Informational'),
+    ('10109', 'Modern Web Application', -1, -1, 'Informational'),
+    ('10049', 'Storable and Cacheable Content', 524, 13, 'Informational'),
+    ('10015', 'Re-examine Cache-control Directives', 525, 13, 'Informational'),
+    ('10104', 'User Agent Fuzzer', 0, 0, 'Informational'),
+    ('10111', 'Authentication Request Identified', -1, -1, 'Informational'),
+    ('10112', 'Session Management Response Identified', -1, -1, 'Informational'),
+]
+
+ROUTES = [
+    '/', '/login', '/logout', '/api/users/{id}', '/api/users/{id}/settings', '/api/projects/{id}',
+    '/api/projects/{id}/deployments/{id}', '/api/test-results/{uuid}', '/static/js/app.{hash}.js',
+    '/static/css/main.{hash}.css', '/search?q={word}', '/reports/{id}/download', '/admin/audit/{id}',
+]
+WORDS = ('alpha', 'beta', 'gamma', 'delta', 'admin', 'report', 'deploy', 'scan')
+HOSTS = ('https://app.staging.example.com', 'https://api.staging.example.com')
+PARAMS = ('', 'id', 'q', 'session', 'X-Frame-Options', 'Content-Security-Policy', 'csrf_token')
+
+
+def _text(rule_name: str, kind: str, sentences: int) -> str:
+    return ' '.join(f"{kind} for {rule_name}, sentence {i}: the application response was analysed and "
+                    f"the behaviour matches the rule's detection pattern." for i in range(sentences))
+
+
+CATALOGUE = [
+    {
+        'pluginId': plugin_id,
+        'alert': name,
+        'name': name,
+        'cweid': str(cwe),
+        'wascid': str(wasc),
+        'risk': risk,
+        'description': _text(name, 'Description', 4),
+        'solution': _text(name, 'Solution', 2),
+        'reference': f"https://www.zaproxy.org/docs/alerts/{plugin_id}/",
+    }
+    for plugin_id, name, cwe, wasc, risk in RULES
+]
+RULES_BY_RISK: Dict[str, List[dict]] = {}
+for _rule in CATALOGUE:
+    RULES_BY_RISK.setdefault(_rule['risk'], []).append(_rule)
+
+
+def _url(rng: random.Random) -> str:
+    route = rng.choice(ROUTES)
+    route = route.replace('{uuid}', '%08x-%04x-4%03x-a%03x-%012x' % (
+        rng.getrandbits(32), rng.getrandbits(16), rng.getrandbits(12), rng.getrandbits(12), rng.getrandbits(48)))
+    route = route.replace('{hash}', '%010x' % rng.getrandbits(40)).replace('{word}', rng.choice(WORDS))
+    while '{id}' in route:
+        route = route.replace('{id}', str(rng.randint(1, 99999)), 1)
+    return rng.choice(HOSTS) + route
+
+
+def generate_alerts(count: int, seed: int = 42) -> Iterator[dict]:
+    """Yield `count` alerts in /JSON/core/view/alerts/ shape"""
+    rng = random.Random(seed)
+    risks = [risk for risk, _ in RISK_WEIGHTS]
+    weights = [weight for _, weight in RISK_WEIGHTS]
+    for i in range(count):
+        rule = rng.choice(RULES_BY_RISK[rng.choices(risks, weights)[0]])
+        url = _url(rng)
+        yield {
+            'sourceid': '3',
+            'other': '',
+            'method': rng.choice(('GET', 'GET', 'GET', 'POST')),
+            'evidence': '',
+            'pluginId': rule['pluginId'],
+            'cweid': rule['cweid'],
+            'confidence': rng.choice(CONFIDENCES),
+            'wascid': rule['wascid'],
+            'description': rule['description'],
+            'messageId': str(i + 1),
+            'inputVector': '',
+            'url': url,
+            'tags': {},
+            'reference': rule['reference'],
+            'solution': rule['solution'],
+            'alert': rule['alert'],
+            'param': rng.choice(PARAMS),
+            'attack': '',
+            'name': rule['name'],
+            'risk': rule['risk'],
+            'id': str(i),
+            'alertRef': rule['pluginId'],
+        }
+
+
+def expected_summary(count: int, seed: int = 42) -> Dict[str, int]:
+    """Alert count per risk that parse-zap-results.py should report"""
+    summary = {'High': 0, 'Medium': 0, 'Low': 0, 'Informational': 0}
+    for alert in generate_alerts(count, seed):
+        summary[alert['risk']] += 1
+    return summary
+
+
+def _write_json(f, alerts: Iterator[dict], wrapped: bool):
+    f.write('{"alerts": [' if wrapped else '[')
+    for i, alert in enumerate(alerts):
+        f.write(('\n' if i == 0 else ',\n') + json.dumps(alert))
+    f.write('\n]}\n' if wrapped else '\n]\n')
+
+
+def _write_xml(f, alerts: Iterator[dict]):
+    f.write('<?xml version="1.0"?>\n')
+    f.write('<OWASPZAPReport programName="ZAP" version="2.14.0" generated="Thu, 1 Jan 2026 00:00:00">\n')
+    f.write(f'<site name="{HOSTS[0]}" host="{HOSTS[0][8:]}" port="443" ssl="true">\n<alerts>\n')
+    for alert in alerts:
+        f.write(
+            '<alertitem>'
+            f'<pluginid>{alert["pluginId"]}</pluginid>'
+            f'<alertRef>{alert["alertRef"]}</alertRef>'
+            f'<alert>{escape(alert["alert"])}</alert>'
+            f'<name>{escape(alert["name"])}</name>'
+            f'<riskcode>{RISK_CODES[alert["risk"]]}</riskcode>'
+            f'<confidence>{alert["confidence"]}</confidence>'
+            f'<riskdesc>{alert["risk"]} ({alert["confidence"]})</riskdesc>'
+            f'<desc>{escape(alert["description"])}</desc>'
+            '<instances><instance>'
+            f'<uri>{escape(alert["url"])}</uri><method>{alert["method"]}</method>'
+            f'<param>{escape(alert["param"])}</param><attack></attack><evidence></evidence>'
+            '</instance></instances><count>1</count>'
+            f'<solution>{escape(alert["solution"])}</solution>'
+            f'<reference>{escape(alert["reference"])}</reference>'
+            f'<cweid>{alert["cweid"]}</cweid><wascid>{alert["wascid"]}</wascid>'
+            f'<sourceid>{alert["sourceid"]}</sourceid>'
+            '</alertitem>\n'
+        )
+    f.write('</alerts>\n</site>\n</OWASPZAPReport>\n')
+
+
+def write_report(path: str, count: int, fmt: str = 'json-native', seed: int = 42) -> Dict[str, int]:
+    """Write a synthetic report of `count` alerts to path; returns the alert count per risk"""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format {fmt}; expected one of {FORMATS}")
+    summary = {'High': 0, 'Medium': 0, 'Low': 0, 'Informational': 0}
+
+    def counted(alerts):
+        for alert in alerts:
+            summary[alert['risk']] += 1
+            yield alert
+
+    with open(path, 'w', buffering=1 << 20) as f:
+        if fmt == 'xml':
+            _write_xml(f, counted(generate_alerts(count, seed)))
+        else:
+            _write_json(f, counted(generate_alerts(count, seed)), wrapped=fmt == 'json-native')
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a deterministic synthetic ZAP report')
+    parser.add_argument('--alerts', type=int, default=1000, help='Number of alerts (default: 1000)')
+    parser.add_argument('--format', choices=FORMATS, default='json-native')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('-o', '--output', required=True, help='Report file to write')
+    args = parser.parse_args()
+
+    write_report(args.output, args.alerts, args.format, args.seed)
+    print(f"✅ {args.alerts} alerts written to {args.output} ({args.format})")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,11 +1,269 @@
 #!/usr/bin/env python3
 
+import re
 import json
 import sys
 import argparse
+from collections import Counter
 from datetime import datetime
-from typing import Dict, List, Any
-import xml.etree.ElementTree as ET
+from html import escape
+from pathlib import Path
+from typing import Dict, Iterable, List, Any, Optional, Tuple
+
+# Streaming decoders are shared with the security results aggregator
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'security'))
+
+from report_stream import JSONStream, iter_xml_elements  # noqa: E402
+
+_MISSING = object()
+
+
+class Codebook:
+    """Dictionary encoding: every distinct value is stored once and referred to by its index"""
+    
+    def __init__(self, values=()):
+        self.values = []
+        self.codes = {}
+        for value in values:
+            self.encode(value)
+    
+    def encode(self, value) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+# Codes follow ZAP's riskcode and confidence numbering; other values are appended
+RISKS = Codebook(['Informational', 'Low', 'Medium', 'High'])
+CONFIDENCES = Codebook(['False Positive', 'Low', 'Medium', 'High', 'Confirmed'])
+
+# Fields that are the same for every alert of a rule, stored once per rule
+RULE_FIELDS = ('pluginId', 'alert', 'name', 'description', 'solution', 'reference',
+               'cwe', 'cweid', 'wascid')
+RULE_INDEX = {field: i for i, field in enumerate(RULE_FIELDS)}
+ALERT_FIELDS = ('risk', 'confidence', 'url') + RULE_FIELDS
+
+
+class ZAPAlert:
+    """Compact alert record.
+    
+    Risk and confidence are integer codes and the rule text is a tuple shared
+    by all alerts of the same rule, so a report with hundreds of thousands of
+    alerts holds each description and solution once. Supports the read-only
+    dict access (get, [], in) the report generators use; fields other than
+    ALERT_FIELDS are not kept.
+    """
+    
+    __slots__ = ('rule', 'risk', 'confidence', 'url')
+    
+    def __init__(self, alert: Dict[str, Any], rules: Dict[Tuple, Tuple]):
+        get = alert.get
+        # Spelled out in RULE_FIELDS order: this runs once per alert
+        rule = (get('pluginId', _MISSING), get('alert', _MISSING), get('name', _MISSING),
+                get('description', _MISSING), get('solution', _MISSING), get('reference', _MISSING),
+                get('cwe', _MISSING), get('cweid', _MISSING), get('wascid', _MISSING))
+        self.rule = rules.setdefault(rule, rule)
+        self.risk = RISKS.encode(get('risk', _MISSING))
+        self.confidence = CONFIDENCES.encode(get('confidence', _MISSING))
+        self.url = get('url', _MISSING)
+    
+    def _value(self, key: str):
+        if key == 'risk':
+            return RISKS.values[self.risk]
+        if key == 'confidence':
+            return CONFIDENCES.values[self.confidence]
+        if key == 'url':
+            return self.url
+        index = RULE_INDEX.get(key)
+        return _MISSING if index is None else self.rule[index]
+    
+    def get(self, key: str, default=None):
+        value = self._value(key)
+        return default if value is _MISSING else value
+    
+    def __getitem__(self, key: str):
+        value = self._value(key)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+    
+    def __contains__(self, key: str) -> bool:
+        return self._value(key) is not _MISSING
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {field: self[field] for field in ALERT_FIELDS if field in self}
+
+
+# Path segments that identify a resource rather than a route
+DIGIT = re.compile(r'\d')
+UUID_SEGMENT = re.compile(
+    r'[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}'
+)
+HASH_RUN = re.compile(r'(?<![0-9A-Za-z])(?=[A-Za-z]*\d)[0-9a-fA-F]{8,}(?![0-9A-Za-z])')
+PARAM_SEGMENT = '{param}'
+SEVERITIES = ('High', 'Medium', 'Low', 'Informational')
+# Route templates listed in the Jenkins and SARIF outputs
+ROUTE_LIMIT = 25
+# HTML report: findings per page, routes and URLs listed per finding, findings rendered
+HTML_PAGE_SIZE = 50
+HTML_SAMPLES = 10
+HTML_MAX_FINDINGS = 1000
+
+# Jenkins serves archived HTML with a Content-Security-Policy that blocks
+# inline styles (style-src 'self'), so the report links a sibling stylesheet
+HTML_STYLE = """body { font-family: Arial, sans-serif; margin: 20px; }
+table { border-collapse: collapse; margin: 10px 0; }
+td, th { border: 1px solid #ddd; padding: 4px 8px; text-align: left; }
+details { border-left: 4px solid #6c757d; margin: 6px 0; padding: 4px 8px; background: #f8f9fa; }
+details.high { border-color: #dc3545; }
+details.medium { border-color: #fd7e14; }
+details.low { border-color: #0d6efd; }
+summary { cursor: pointer; }
+nav a { margin-right: 6px; }
+.page { display: none; }
+.page:target, .page:first-of-type { display: block; }
+main:has(.page:target) .page:first-of-type:not(:target) { display: none; }
+"""
+
+HTML_HEAD = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>OWASP ZAP Findings - {title}</title>
+<link rel="stylesheet" href="{stylesheet}">
+</head>
+<body>
+"""
+
+
+class RouteNode:
+    """Trie node: one path segment, with the alert counts of URLs ending here"""
+    
+    __slots__ = ('children', 'counts')
+    
+    def __init__(self):
+        self.children: Dict[str, 'RouteNode'] = {}
+        self.counts: Optional[Dict[str, int]] = None
+    
+    def merge(self, other: 'RouteNode'):
+        if other.counts:
+            counts = self.counts = self.counts or {}
+            for risk, count in other.counts.items():
+                counts[risk] = counts.get(risk, 0) + count
+        for segment, child in other.children.items():
+            mine = self.children.get(segment)
+            if mine is None:
+                self.children[segment] = child
+            else:
+                mine.merge(child)
+
+
+class RouteTrie:
+    """Infer route templates from alert URLs.
+    
+    URLs are inserted into a prefix trie keyed by origin and path segments.
+    Numeric and UUID segments become {id} and {uuid} and hex runs inside a
+    segment {hash} on insert; a node with more than `max_literals` distinct
+    literal children is a path parameter, and its children are merged into
+    one {param} subtree. Alert counts live on the nodes, so templates and
+    their counts come from one walk over the trie, never the alerts again.
+    """
+    
+    def __init__(self, max_literals: int = 20):
+        self.max_literals = max_literals
+        self.root = RouteNode()
+        self.collapsed = True
+    
+    @staticmethod
+    def normalize(segment: str) -> str:
+        if segment.isdigit():
+            return '{id}'
+        if len(segment) == 36 and UUID_SEGMENT.fullmatch(segment):
+            return '{uuid}'
+        return HASH_RUN.sub('{hash}', segment) if DIGIT.search(segment) else segment
+    
+    def _walk(self, url: str, create: bool) -> Tuple[Optional[RouteNode], List[str]]:
+        # Cheaper than urlsplit, which dominates the cost of clustering
+        path = url.partition('#')[0].partition('?')[0]
+        scheme_end = path.find('://')
+        if scheme_end < 0:
+            origin = ''
+        else:
+            slash = path.find('/', scheme_end + 3)
+            origin, path = (path, '') if slash < 0 else (path[:slash], path[slash:])
+        node = self.root.children.get(origin)
+        if node is None:
+            if not create:
+                return None, [origin]
+            node = self.root.children[origin] = RouteNode()
+        route = [origin]
+        for segment in path.split('/'):
+            if not segment:
+                continue
+            segment = self.normalize(segment)
+            child = node.children.get(segment)
+            if child is None and PARAM_SEGMENT in node.children:
+                segment, child = PARAM_SEGMENT, node.children[PARAM_SEGMENT]
+            if child is None:
+                if not create:
+                    return None, route + [segment]
+                child = node.children[segment] = RouteNode()
+            node = child
+            route.append(segment)
+        return node, route
+    
+    def add(self, url: Optional[str], risk: str):
+        """Count one alert on the route of `url`"""
+        if not url:
+            return
+        node, _ = self._walk(url, create=True)
+        counts = node.counts = node.counts or {}
+        counts[risk] = counts.get(risk, 0) + 1
+        self.collapsed = False
+    
+    def collapse(self):
+        """Merge high-cardinality literal segments into {param} subtrees"""
+        if self.collapsed:
+            return
+        stack = list(self.root.children.values())
+        while stack:
+            node = stack.pop()
+            literals = [segment for segment in node.children if not segment.startswith('{')]
+            if len(literals) > self.max_literals:
+                param = node.children.setdefault(PARAM_SEGMENT, RouteNode())
+                for segment in literals:
+                    param.merge(node.children.pop(segment))
+            stack.extend(node.children.values())
+        self.collapsed = True
+    
+    @staticmethod
+    def _template(path: List[str]) -> str:
+        return path[0] + '/' + '/'.join(path[1:])
+    
+    def template(self, url: Optional[str]) -> str:
+        """Route template of `url`; call after all URLs were added"""
+        if not url:
+            return 'N/A'
+        self.collapse()
+        return self._template(self._walk(url, create=False)[1])
+    
+    def templates(self) -> List[Dict[str, Any]]:
+        """Every route template with its alert count per severity, busiest first"""
+        self.collapse()
+        routes = []
+        stack = [(node, [origin]) for origin, node in self.root.children.items()]
+        while stack:
+            node, path = stack.pop()
+            if node.counts:
+                route = {'template': self._template(path), 'total': sum(node.counts.values())}
+                route.update((risk, node.counts.get(risk, 0)) for risk in SEVERITIES)
+                routes.append(route)
+            stack.extend((child, path + [segment]) for segment, child in node.children.items())
+        routes.sort(key=lambda r: (-r['High'], -r['Medium'], -r['total'], r['template']))
+        return routes
+
 
 class ZAPResultsParser:
     """Parse and analyze OWASP ZAP scan results"""
@@ -13,7 +271,11 @@ class ZAPResultsParser:
     def __init__(self, report_file: str, format: str = 'json'):
         self.report_file = report_file
         self.format = format
-        self.alerts = []
+        self.alerts: List[ZAPAlert] = []
+        self.rules: Dict[Tuple, Tuple] = {}
+        # False when evaluate_gate() stopped before the end of the report
+        self.complete = True
+        self.routes = RouteTrie()
         self.summary = {
             'High': 0,
             'Medium': 0,
@@ -44,17 +306,14 @@ class ZAPResultsParser:
     def parse_json(self) -> bool:
         """Parse JSON format report"""
         try:
-            with open(self.report_file, 'r') as f:
-                data = json.load(f)
-            
-            if 'alerts' in data:
-                self.alerts = data['alerts']
-            elif isinstance(data, list):
-                self.alerts = data
-            else:
+            # Alerts are decoded one at a time and compacted straight away
+            stream = JSONStream(self.report_file, ('alerts',))
+            alerts = [ZAPAlert(alert, self.rules) for alert in stream]
+            if not stream.streamed:
                 print("Unknown JSON structure")
                 return False
             
+            self.alerts = alerts
             self.categorize_alerts()
             return True
         except Exception as e:
@@ -64,20 +323,8 @@ class ZAPResultsParser:
     def parse_xml(self) -> bool:
         """Parse XML format report"""
         try:
-            tree = ET.parse(self.report_file)
-            root = tree.getroot()
-            
-            for alert in root.findall('.//alertitem'):
-                alert_dict = {
-                    'risk': alert.find('riskdesc').text.split(' ')[0] if alert.find('riskdesc') is not None else 'Informational',
-                    'alert': alert.find('alert').text if alert.find('alert') is not None else 'Unknown',
-                    'url': alert.find('uri').text if alert.find('uri') is not None else '',
-                    'description': alert.find('desc').text if alert.find('desc') is not None else '',
-                    'solution': alert.find('solution').text if alert.find('solution') is not None else '',
-                    'confidence': alert.find('confidence').text if alert.find('confidence') is not None else 'Low',
-                    'cwe': alert.find('cweid').text if alert.find('cweid') is not None else '0'
-                }
-                self.alerts.append(alert_dict)
+            for alert in iter_xml_elements(self.report_file, 'alertitem'):
+                self.alerts.append(ZAPAlert(self.xml_alert(alert), self.rules))
             
             self.categorize_alerts()
             return True
@@ -85,12 +332,78 @@ class ZAPResultsParser:
             print(f"Error parsing XML: {e}")
             return False
     
+    def evaluate_gate(self) -> bool:
+        """Count severities for the gate without keeping any alerts.
+        
+        Reading stops at the first High finding over its threshold: from then
+        on the gate fails as a High failure whatever the rest of the report
+        holds, so the summary is left partial and `complete` is False. Any
+        other outcome needs the whole report and yields the full summary.
+        """
+        try:
+            summary, limit = self.summary, self.thresholds['High']
+            for risk, url in self.iter_risks():
+                if risk in summary:
+                    summary[risk] += 1
+                    self.routes.add(url, risk)
+                    if risk == 'High' and summary['High'] > limit:
+                        self.complete = False
+                        break
+            return True
+        except Exception as e:
+            print(f"Error parsing report: {e}")
+            return False
+    
+    def iter_risks(self) -> Iterable[Tuple[str, Optional[str]]]:
+        """Yield the risk and URL of each alert in the report, in report order"""
+        if self.format == 'xml':
+            for alert in iter_xml_elements(self.report_file, 'alertitem'):
+                riskdesc, uri = alert.find('riskdesc'), alert.find('.//uri')
+                yield (riskdesc.text.split(' ')[0] if riskdesc is not None else 'Informational',
+                       uri.text if uri is not None else None)
+        elif self.format == 'json':
+            stream = JSONStream(self.report_file, ('alerts',))
+            for alert in stream:
+                yield alert.get('risk', 'Informational'), alert.get('url')
+            if not stream.streamed:
+                raise ValueError("Unknown JSON structure")
+        else:
+            raise ValueError(f"Unsupported format: {self.format}")
+    
+    @staticmethod
+    def xml_alert(alert) -> Dict[str, Any]:
+        """Convert an <alertitem> element into an alert dict"""
+        return {
+            'risk': (alert.find('riskdesc').text.split(' ')[0]
+                     if alert.find('riskdesc') is not None else 'Informational'),
+            'alert': alert.find('alert').text if alert.find('alert') is not None else 'Unknown',
+            # Standard reports list the URLs under <instances>
+            'url': alert.find('.//uri').text if alert.find('.//uri') is not None else '',
+            'description': alert.find('desc').text if alert.find('desc') is not None else '',
+            'solution': alert.find('solution').text if alert.find('solution') is not None else '',
+            'confidence': (alert.find('confidence').text
+                           if alert.find('confidence') is not None else 'Low'),
+            'cwe': alert.find('cweid').text if alert.find('cweid') is not None else '0'
+        }
+    
+    def categorize_alert(self, alert: Dict[str, Any]):
+        """Count one alert in the severity summary"""
+        risk = alert.get('risk', 'Informational')
+        if risk in self.summary:
+            self.summary[risk] += 1
+            self.routes.add(alert.get('url'), risk)
+    
+    def add_alerts(self, alerts: Iterable[Dict[str, Any]]):
+        """Compact and count alerts as they arrive, e.g. one ZAP API page at a time"""
+        for alert in alerts:
+            record = ZAPAlert(alert, self.rules)
+            self.alerts.append(record)
+            self.categorize_alert(record)
+    
     def categorize_alerts(self):
         """Categorize alerts by severity"""
         for alert in self.alerts:
-            risk = alert.get('risk', 'Informational')
-            if risk in self.summary:
-                self.summary[risk] += 1
+            self.categorize_alert(alert)
     
     def generate_summary(self) -> str:
         """Generate a summary report"""
@@ -112,8 +425,32 @@ class ZAPResultsParser:
         report.append(f"📊 Total:         {total}")
         report.append("")
         
+        routes = self.routes.templates()
+        if routes:
+            report.append(f"Top Routes ({len(routes)} templates):")
+            report.append("-" * 40)
+            for route in routes[:10]:
+                report.append(f"{route['total']:>7}  {route['template']}  "
+                              f"(H: {route['High']}, M: {route['Medium']}, L: {route['Low']})")
+            report.append("")
+        
         return "\n".join(report)
     
+    def group_by_route(self, alerts: Iterable[Any]) -> List[Tuple[Any, str, int]]:
+        """Group alerts by rule and route template.
+
+        Returns (first alert, template, count) tuples in first-seen order.
+        """
+        groups: Dict[Tuple, List] = {}
+        for alert in alerts:
+            key = (alert.get('alert'), self.routes.template(alert.get('url')))
+            group = groups.get(key)
+            if group is None:
+                groups[key] = [alert, key[1], 1]
+            else:
+                group[2] += 1
+        return [tuple(group) for group in groups.values()]
+    
     def generate_detailed_report(self) -> str:
         """Generate detailed findings report"""
         report = []
@@ -125,18 +462,18 @@ class ZAPResultsParser:
         if high_alerts:
             report.append("HIGH SEVERITY FINDINGS:")
             report.append("=" * 40)
-            for alert in high_alerts[:5]:  # Show first 5
+            for alert, template, count in self.group_by_route(high_alerts)[:5]:  # Show first 5
                 report.append(f"⚠️  {alert.get('alert', 'Unknown')}")
-                report.append(f"   URL: {alert.get('url', 'N/A')}")
+                report.append(f"   Route: {template} ({count} alerts)")
                 report.append(f"   CWE: {alert.get('cwe', 'N/A')}")
                 report.append("")
         
         if medium_alerts:
             report.append("MEDIUM SEVERITY FINDINGS:")
             report.append("=" * 40)
-            for alert in medium_alerts[:5]:  # Show first 5
+            for alert, template, count in self.group_by_route(medium_alerts)[:5]:  # Show first 5
                 report.append(f"⚠️  {alert.get('alert', 'Unknown')}")
-                report.append(f"   URL: {alert.get('url', 'N/A')}")
+                report.append(f"   Route: {template} ({count} alerts)")
                 report.append("")
         
         return "\n".join(report)
@@ -149,7 +486,8 @@ class ZAPResultsParser:
         for severity, count in self.summary.items():
             if count > self.thresholds[severity]:
                 passed = False
-                messages.append(f"❌ {severity} severity exceeds threshold: {count} > {self.thresholds[severity]}")
+                messages.append(f"❌ {severity} severity exceeds threshold: "
+                                f"{count} > {self.thresholds[severity]}")
             elif count > 0 and severity != 'Informational':
                 messages.append(f"⚠️  {severity} severity: {count} findings")
         
@@ -161,11 +499,19 @@ class ZAPResultsParser:
     def generate_jenkins_report(self) -> Dict[str, Any]:
         """Generate report suitable for Jenkins"""
         passed, messages = self.check_thresholds()
+        if not self.complete:
+            messages.append("⏹️  Stopped at the first blocking finding: "
+                            "counts are lower bounds")
+        
+        routes = self.routes.templates()
         
         return {
             'passed': passed,
+            'complete': self.complete,
             'summary': self.summary,
             'total': sum(self.summary.values()),
+            'routes': routes[:ROUTE_LIMIT],
+            'routeCount': len(routes),
             'messages': messages,
             'report_file': self.report_file,
             'timestamp': datetime.now().isoformat()
@@ -184,12 +530,16 @@ class ZAPResultsParser:
                         "rules": []
                     }
                 },
-                "results": []
+                "results": [],
+                "properties": {
+                    "routes": self.routes.templates()[:ROUTE_LIMIT]
+                }
             }]
         }
         
         for alert in self.alerts:
             if alert.get('risk') in ['High', 'Medium']:
+                template = self.routes.template(alert.get('url'))
                 result = {
                     "ruleId": f"ZAP-{alert.get('cwe', '0')}",
                     "level": "error" if alert.get('risk') == 'High' else "warning",
@@ -202,7 +552,13 @@ class ZAPResultsParser:
                                 "uri": alert.get('url', 'unknown')
                             }
                         }
-                    }]
+                    }],
+                    "partialFingerprints": {
+                        "routeTemplate/v1": template
+                    },
+                    "properties": {
+                        "routeTemplate": template
+                    }
                 }
                 sarif["runs"][0]["results"].append(result)
         
@@ -210,10 +566,107 @@ class ZAPResultsParser:
             json.dump(sarif, f, indent=2)
         
         print(f"SARIF report exported to: {output_file}")
+    
+    def group_findings(self, min_risk: str = 'Informational',
+                       samples: int = HTML_SAMPLES) -> List[Dict[str, Any]]:
+        """De-duplicate alerts into one finding per rule and risk, most severe and frequent first.
+        
+        Each finding keeps its alert count, the count per route template and
+        the first `samples` URLs, so its size does not grow with the scan.
+        """
+        risks = set(SEVERITIES[:SEVERITIES.index(min_risk) + 1])
+        findings: Dict[Tuple, Dict[str, Any]] = {}
+        for alert in self.alerts:
+            risk = alert.get('risk')
+            if risk not in risks:
+                continue
+            key = (alert.get('pluginId'), alert.get('alert'), risk)
+            finding = findings.get(key)
+            if finding is None:
+                finding = findings[key] = {'alert': alert, 'risk': risk, 'count': 0,
+                                           'routes': Counter(), 'urls': []}
+            finding['count'] += 1
+            url = alert.get('url')
+            finding['routes'][self.routes.template(url)] += 1
+            if url and len(finding['urls']) < samples:
+                finding['urls'].append(url)
+        return sorted(findings.values(), key=lambda f: (SEVERITIES.index(f['risk']), -f['count']))
+    
+    def export_html(self, output_file: str, min_risk: str = 'Informational',
+                    page_size: int = HTML_PAGE_SIZE, max_findings: int = HTML_MAX_FINDINGS):
+        """Export a compact HTML report of the de-duplicated findings.
+        
+        Findings are written as collapsed <details> blocks in pages of
+        `page_size`, switched with #page-N links; at most `max_findings` are
+        rendered, so the report stays small however many alerts the scan had.
+        The styles go to a .css file next to `output_file` (findings.html ->
+        findings.css), which has to be archived along with it.
+        """
+        findings = self.group_findings(min_risk)
+        shown = findings[:max_findings]
+        pages = max(1, -(-len(shown) // page_size))
+        passed, messages = self.check_thresholds()
+        stylesheet = Path(output_file).with_suffix('.css')
+        stylesheet.write_text(HTML_STYLE, encoding='utf-8')
+        
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write(HTML_HEAD.format(title=escape(self.report_file),
+                                     stylesheet=escape(stylesheet.name)))
+            f.write("<h1>OWASP ZAP Security Scan Results</h1>\n")
+            f.write(f"<p><strong>Report:</strong> {escape(self.report_file)} &nbsp; "
+                    f"<strong>Date:</strong> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} &nbsp; "
+                    f"<strong>Status:</strong> {'PASSED' if passed else 'FAILED'}</p>\n")
+            f.write("<table><tr>" + "".join(f"<th>{risk}</th>" for risk in SEVERITIES)
+                    + "<th>Total</th></tr><tr>"
+                    + "".join(f"<td>{self.summary[risk]}</td>" for risk in SEVERITIES)
+                    + f"<td>{sum(self.summary.values())}</td></tr></table>\n")
+            f.write("<ul>" + "".join(f"<li>{escape(message)}</li>" for message in messages)
+                    + "</ul>\n")
+            
+            f.write("<h2>Top Routes</h2>\n<table><tr><th>Route</th><th>Alerts</th>"
+                    "<th>High</th><th>Medium</th></tr>")
+            for route in self.routes.templates()[:10]:
+                f.write(f"<tr><td>{escape(route['template'])}</td><td>{route['total']}</td>"
+                        f"<td>{route['High']}</td><td>{route['Medium']}</td></tr>")
+            f.write("</table>\n")
+            
+            f.write(f"<h2>Findings ({len(shown)} of {len(findings)}, {min_risk} and above)</h2>\n")
+            nav = ("<nav>" + "".join(f'<a href="#page-{n}">{n}</a>' for n in range(1, pages + 1))
+                   + "</nav>\n")
+            f.write(nav + "<main>\n")
+            for page in range(pages):
+                f.write(f'<section class="page" id="page-{page + 1}">\n')
+                for finding in shown[page * page_size:(page + 1) * page_size]:
+                    f.write(self._html_finding(finding))
+                f.write("</section>\n")
+            f.write("</main>\n" + nav + "</body>\n</html>\n")
+        
+        print(f"HTML report exported to: {output_file}")
+    
+    @staticmethod
+    def _html_finding(finding: Dict[str, Any]) -> str:
+        alert, routes = finding['alert'], finding['routes']
+        rows = "".join(f"<tr><td>{escape(template)}</td><td>{count}</td></tr>"
+                       for template, count in routes.most_common(HTML_SAMPLES))
+        more = (f"<p>{len(routes) - HTML_SAMPLES} more routes</p>"
+                if len(routes) > HTML_SAMPLES else "")
+        urls = "".join(f"<li>{escape(url)}</li>" for url in finding['urls'])
+        risk = finding['risk']
+        cwe = alert.get('cweid', alert.get('cwe', 'N/A'))
+        return (f'<details class="{risk.lower()}"><summary><strong>{risk}</strong> '
+                f"{escape(str(alert.get('alert', 'Unknown')))} &mdash; "
+                f"{finding['count']} alerts on {len(routes)} routes</summary>\n"
+                f"<p>Plugin {escape(str(alert.get('pluginId', 'N/A')))}, CWE {escape(str(cwe))}, "
+                f"confidence {escape(str(alert.get('confidence', 'N/A')))}</p>\n"
+                f"<p>{escape(str(alert.get('description', '')))}</p>\n"
+                f"<p><strong>Solution:</strong> {escape(str(alert.get('solution', '')))}</p>\n"
+                f"<table><tr><th>Route</th><th>Alerts</th></tr>{rows}</table>{more}\n"
+                f"<ul>{urls}</ul></details>\n")
 
 def main():
     parser = argparse.ArgumentParser(description='Parse OWASP ZAP scan results')
-    parser.add_argument('report_file', help='Path to ZAP report file')
+    parser.add_argument('report_file',
+                        help='Path to ZAP report file (may be gzip or zstd compressed)')
     parser.add_argument('--format', choices=['json', 'xml'], default='json', 
                        help='Report format (default: json)')
     parser.add_argument('--detailed', action='store_true', 
@@ -221,6 +674,10 @@ def main():
     parser.add_argument('--jenkins', action='store_true',
                        help='Output Jenkins-compatible JSON')
     parser.add_argument('--sarif', help='Export to SARIF format file')
+    parser.add_argument('--html', help='Export a compact HTML report of the de-duplicated findings')
+    parser.add_argument('--html-min-risk', choices=list(reversed(SEVERITIES)),
+                       default='Informational',
+                       help='Lowest severity included in the HTML report (default: Informational)')
     parser.add_argument('--threshold-high', type=int, default=0,
                        help='Maximum allowed high severity findings')
     parser.add_argument('--threshold-medium', type=int, default=5,
@@ -237,8 +694,8 @@ def main():
     if args.threshold_medium is not None:
         parser.thresholds['Medium'] = args.threshold_medium
     
-    # Parse the report
-    if not parser.parse():
+    # The Jenkins gate only needs counts; everything else needs the alerts
+    if not (parser.evaluate_gate() if args.jenkins else parser.parse()):
         sys.exit(1)
     
     # Generate output based on options
@@ -250,6 +707,9 @@ def main():
     elif args.sarif:
         # Export to SARIF format
         parser.export_sarif(args.sarif)
+    elif args.html:
+        # Export compact HTML report
+        parser.export_html(args.html, min_risk=args.html_min_risk)
     else:
         # Standard output
         print(parser.generate_summary())
@@ -0,0 +1,513 @@
+#!/usr/bin/env python3
+"""
+Quality-gate engine for the Jenkins pipeline.
+
+Evaluates the security, DAST, coverage, test and performance gates and
+returns one machine-readable verdict:
+
+  1. load      - every gate input (registered with @gate_input) is read
+                 concurrently and normalized into a small metrics dict.
+                 Security findings come from the aggregator's dashboard
+                 dataset (or are aggregated on the spot), the ZAP report is
+                 counted with ZAPResultsParser.evaluate_gate(), and the
+                 test report is streamed so only its stats are decoded.
+  2. evaluate  - every gate (registered with @gate) checks its metrics
+                 against the thresholds in one pass; violations are
+                 collected per gate and for the whole build.
+  3. verdict   - written to reports/quality-gate-report.json (and .html).
+                 The verdict carries a key hashed from the thresholds and
+                 the size and mtime of every input; while that key is
+                 unchanged the gate results are reused and only the build
+                 number, branch and timestamp are refreshed.
+
+Thresholds default to DEFAULT_THRESHOLDS; thresholds-config.json next to
+this script overrides them per gate. OVERRIDE_QUALITY_GATES=true reports a
+failed verdict as overridden and exits 0.
+
+Usage:
+    ./scripts/quality-gates/quality_gate_engine.py
+    ./scripts/quality-gates/quality_gate_engine.py --security-dataset security-dashboard-42.json
+    ./scripts/quality-gates/quality_gate_engine.py --gates dast \\
+        --zap-report zap/reports/latest.json --output reports/dast-gate.json
+"""
+
+import os
+import sys
+import json
+import hashlib
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from html import escape
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR / 'security'))
+
+from report_stream import JSONStream  # noqa: E402
+from security_results_aggregator import (  # noqa: E402
+    DEFAULT_REPORT_DIRS,
+    SecurityResultsAggregator,
+    load_zap_parser,
+)
+
+THRESHOLDS_FILE = Path(__file__).resolve().parent / 'thresholds-config.json'
+DEFAULT_OUTPUT = 'reports/quality-gate-report.json'
+
+DEFAULT_THRESHOLDS = {
+    'security': {
+        'critical': 0,      # Zero tolerance for critical vulnerabilities
+        'high': 5,          # Maximum 5 high vulnerabilities
+        'medium': 20,       # Maximum 20 medium vulnerabilities
+        'low': 100,         # Maximum 100 low vulnerabilities
+    },
+    'dast': {
+        'High': 0,          # Same defaults as ZAPResultsParser
+        'Medium': 5,
+        'Low': 20,
+        'Informational': 100,
+    },
+    'coverage': {
+        'overall': 80,      # Minimum 80% line coverage
+        'branches': 75,     # Minimum 75% branch coverage
+        'functions': 80,    # Minimum 80% function coverage
+    },
+    'tests': {
+        'passRate': 100,    # Minimum 100% test pass rate
+        'minTests': 50,     # Minimum 50 tests
+    },
+    'performance': {
+        'buildTime': 600,         # Maximum 10 minutes build time (seconds)
+        'p95ResponseTime': 500,   # Maximum 500ms P95 response time
+        'errorRate': 1,           # Maximum 1% error rate
+    },
+}
+
+# Gate input: (path, engine) -> normalized metrics, None when the input is missing
+INPUTS: Dict[str, Callable[[Optional[str], 'QualityGateEngine'], Optional[Dict[str, Any]]]] = {}
+# Gate: (metrics of its input, thresholds) -> gate result
+GATES: Dict[str, 'Gate'] = {}
+
+
+class Gate:
+    def __init__(self, name: str, title: str, input_name: str, evaluate: Callable, required: bool):
+        self.name = name
+        self.title = title
+        self.input_name = input_name
+        self.evaluate = evaluate
+        self.required = required
+
+
+def gate_input(name):
+    """Register the loader of the gate input `name`"""
+    def register(load):
+        INPUTS[name] = load
+        return load
+    return register
+
+
+def gate(name, title, input_name, required=False):
+    """Register a gate; a `required` gate fails when its input is missing, others are skipped"""
+    def register(evaluate):
+        GATES[name] = Gate(name, title, input_name, evaluate, required)
+        return evaluate
+    return register
+
+
+def _exists(path: Optional[str]) -> bool:
+    return bool(path) and os.path.isfile(path)
+
+
+def _build_info() -> Dict[str, str]:
+    """Fields that describe the build a verdict is reported for, not its inputs"""
+    return {
+        'timestamp': datetime.now().isoformat(),
+        'buildNumber': os.environ.get('BUILD_NUMBER', 'local'),
+        'branch': os.environ.get('GIT_BRANCH', 'unknown'),
+    }
+
+
+def _violation(kind: str, metric: str, value, threshold, message: str) -> Dict[str, Any]:
+    return {'type': kind, 'metric': metric, 'value': value, 'threshold': threshold,
+            'message': message}
+
+
+@gate_input('security')
+def load_security(path: Optional[str], engine: 'QualityGateEngine') -> Optional[Dict[str, Any]]:
+    """Severity counts from a dashboard dataset, or from aggregating the tool reports"""
+    if _exists(path):
+        with open(path) as f:
+            dataset = json.load(f)
+    else:
+        dataset = SecurityResultsAggregator(engine.report_dirs).aggregate()
+    if all(tool.get('status') == 'NO_DATA' for tool in dataset['tools'].values()):
+        return None
+    summary = dataset['summary']
+    return {
+        'critical': summary['criticalIssues'],
+        'high': summary['highIssues'],
+        'medium': summary['mediumIssues'],
+        'low': summary['lowIssues'],
+        'tools': {name: tool['status'] for name, tool in dataset['tools'].items()},
+    }
+
+
+@gate_input('zap')
+def load_zap(path: Optional[str], engine: 'QualityGateEngine') -> Optional[Dict[str, Any]]:
+    """ZAP severity counts; reading stops once the High threshold is exceeded"""
+    if not _exists(path):
+        return None
+    report_format = 'xml' if path.endswith(('.xml', '.xml.gz', '.xml.zst')) else 'json'
+    parser = load_zap_parser().ZAPResultsParser(path, report_format)
+    parser.thresholds.update(engine.thresholds['dast'])
+    if not parser.evaluate_gate():
+        raise ValueError(f"{path}: unreadable ZAP report")
+    return {'summary': dict(parser.summary), 'complete': parser.complete}
+
+
+@gate_input('coverage')
+def load_coverage(path: Optional[str], engine: 'QualityGateEngine') -> Optional[Dict[str, Any]]:
+    """Totals of an Istanbul coverage-summary.json"""
+    if not _exists(path):
+        return None
+    with open(path) as f:
+        total = json.load(f).get('total') or {}
+    return {metric: total[metric]['pct']
+            for metric in ('lines', 'branches', 'functions', 'statements') if metric in total}
+
+
+@gate_input('tests')
+def load_tests(path: Optional[str], engine: 'QualityGateEngine') -> Optional[Dict[str, Any]]:
+    """Stats of a Mocha JSON report; the per-test arrays are streamed past, not kept"""
+    if not _exists(path):
+        return None
+    stream = JSONStream(path, ('tests', 'passes', 'failures', 'pending'))
+    for _ in stream:
+        pass
+    stats = stream.meta.get('stats') or {}
+    total = stats.get('tests', 0)
+    return {
+        'total': total,
+        'passed': stats.get('passes', 0),
+        'failed': stats.get('failures', 0),
+        'skipped': stats.get('pending', 0),
+        'passRate': stats.get('passes', 0) / total * 100 if total else 0.0,
+        'skipRate': stats.get('pending', 0) / total * 100 if total else 0.0,
+        'duration': stats.get('duration'),
+    }
+
+
+@gate_input('performance')
+def load_performance(path: Optional[str], engine: 'QualityGateEngine') -> Optional[Dict[str, Any]]:
+    """Build duration (BUILD_DURATION) plus P95 and error rate of the performance report"""
+    metrics = {'buildTime': float(os.environ.get('BUILD_DURATION') or 0)}
+    if _exists(path):
+        with open(path) as f:
+            report = json.load(f)
+        nested = report.get('metrics') or {}
+        metrics['p95'] = report.get('p95', nested.get('p95'))
+        metrics['errorRate'] = report.get('errorRate', nested.get('errorRate'))
+    return metrics
+
+
+@gate('security', 'Security', 'security')
+def security_gate(metrics: Dict[str, Any], thresholds: Dict[str, int]) -> Dict[str, Any]:
+    violations = [
+        _violation('security', severity, metrics[severity], limit,
+                   f"Found {metrics[severity]} {severity} vulnerabilities (threshold: {limit})")
+        for severity, limit in thresholds.items() if metrics[severity] > limit
+    ]
+    return {'metrics': metrics, 'violations': violations}
+
+
+@gate('dast', 'DAST', 'zap')
+def dast_gate(metrics: Dict[str, Any], thresholds: Dict[str, int]) -> Dict[str, Any]:
+    summary = metrics['summary']
+    violations = [
+        _violation('dast', severity, summary[severity], limit,
+                   f"{severity} severity exceeds threshold: {summary[severity]} > {limit}")
+        for severity, limit in thresholds.items() if summary.get(severity, 0) > limit
+    ]
+    return {'metrics': metrics, 'summary': summary, 'violations': violations}
+
+
+@gate('coverage', 'Coverage', 'coverage', required=True)
+def coverage_gate(metrics: Dict[str, Any], thresholds: Dict[str, int]) -> Dict[str, Any]:
+    violations = []
+    for metric, threshold_name, label in (('lines', 'overall', 'Line'),
+                                          ('branches', 'branches', 'Branch'),
+                                          ('functions', 'functions', 'Function')):
+        value, limit = metrics.get(metric), thresholds[threshold_name]
+        if value is not None and value < limit:
+            violations.append(_violation('coverage', threshold_name, value, limit,
+                                         f"{label} coverage is {value}% (threshold: {limit}%)"))
+    return {'metrics': metrics, 'violations': violations}
+
+
+@gate('tests', 'Tests', 'tests', required=True)
+def test_gate(metrics: Dict[str, Any], thresholds: Dict[str, int]) -> Dict[str, Any]:
+    violations = []
+    if metrics['passRate'] < thresholds['passRate']:
+        violations.append(_violation('tests', 'passRate', metrics['passRate'],
+                                     thresholds['passRate'],
+                                     f"Test pass rate is {metrics['passRate']:.2f}% "
+                                     f"(threshold: {thresholds['passRate']}%)"))
+    if metrics['total'] < thresholds['minTests']:
+        violations.append(_violation('tests', 'minTests', metrics['total'], thresholds['minTests'],
+                                     f"Only {metrics['total']} tests found "
+                                     f"(minimum: {thresholds['minTests']})"))
+    return {'metrics': metrics, 'violations': violations}
+
+
+@gate('performance', 'Performance', 'performance')
+def performance_gate(metrics: Dict[str, Any], thresholds: Dict[str, int]) -> Dict[str, Any]:
+    violations = []
+    if metrics['buildTime'] > thresholds['buildTime']:
+        violations.append(_violation('performance', 'buildTime', metrics['buildTime'],
+                                     thresholds['buildTime'],
+                                     f"Build took {metrics['buildTime']:g}s "
+                                     f"(threshold: {thresholds['buildTime']}s)"))
+    if metrics.get('p95') and metrics['p95'] > thresholds['p95ResponseTime']:
+        violations.append(_violation('performance', 'p95ResponseTime', metrics['p95'],
+                                     thresholds['p95ResponseTime'],
+                                     f"P95 response time is {metrics['p95']}ms "
+                                     f"(threshold: {thresholds['p95ResponseTime']}ms)"))
+    if metrics.get('errorRate') and metrics['errorRate'] > thresholds['errorRate']:
+        violations.append(_violation('performance', 'errorRate', metrics['errorRate'],
+                                     thresholds['errorRate'],
+                                     f"Error rate is {metrics['errorRate']}% "
+                                     f"(threshold: {thresholds['errorRate']}%)"))
+    return {'metrics': metrics, 'violations': violations}
+
+
+def load_thresholds(path: Path = THRESHOLDS_FILE) -> Dict[str, Dict[str, Any]]:
+    """DEFAULT_THRESHOLDS with the per-gate overrides of thresholds-config.json"""
+    thresholds = {name: dict(values) for name, values in DEFAULT_THRESHOLDS.items()}
+    if path.exists():
+        try:
+            with open(path) as f:
+                for name, values in json.load(f).items():
+                    thresholds.setdefault(name, {}).update(values)
+        except (OSError, ValueError, AttributeError) as e:
+            print(f"⚠️  Failed to load custom thresholds, using defaults: {e}")
+    return thresholds
+
+
+class QualityGateEngine:
+    """Loads every gate input concurrently and evaluates all gates into one cached verdict"""
+
+    def __init__(self, paths: Dict[str, Optional[str]], gates: Optional[Iterable[str]] = None,
+                 thresholds: Optional[Dict[str, Dict[str, Any]]] = None,
+                 report_dirs: Iterable[str] = DEFAULT_REPORT_DIRS,
+                 cache_file: Optional[str] = None):
+        self.paths = dict(paths)
+        self.gates = list(gates) if gates else list(GATES)
+        self.thresholds = thresholds or load_thresholds()
+        self.report_dirs = list(report_dirs)
+        self.cache_file = cache_file
+        self.cached = False
+        self._verdict: Optional[Dict[str, Any]] = None
+
+    def _input_files(self) -> List[str]:
+        files = []
+        for name in self.gates:
+            input_name = GATES[name].input_name
+            if input_name == 'security' and not _exists(self.paths.get('security')):
+                aggregator = SecurityResultsAggregator(self.report_dirs)
+                files.extend(path for path in map(aggregator.locate, aggregator.tools) if path)
+            elif self.paths.get(input_name):
+                files.append(self.paths[input_name])
+        return files
+
+    def cache_key(self) -> str:
+        """Hash of the gates, thresholds and the size and mtime of every input file"""
+        environment = [os.environ.get(name)
+                       for name in ('BUILD_DURATION', 'OVERRIDE_QUALITY_GATES')]
+        settings = json.dumps([self.gates, self.thresholds, environment], sort_keys=True)
+        digest = hashlib.sha256(settings.encode())
+        for path in self._input_files():
+            try:
+                stat = os.stat(path)
+                digest.update(f"{path}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode())
+            except OSError:
+                digest.update(f"{path}\0missing\n".encode())
+        return digest.hexdigest()
+
+    def load(self) -> Dict[str, Any]:
+        """Load the inputs of the selected gates concurrently.
+
+        A failed load is returned as its exception.
+        """
+        names = sorted({GATES[name].input_name for name in self.gates})
+        loaded = {}
+        with ThreadPoolExecutor(max_workers=len(names) or 1) as executor:
+            futures = {name: executor.submit(INPUTS[name], self.paths.get(name), self)
+                       for name in names}
+            for name, future in futures.items():
+                try:
+                    loaded[name] = future.result()
+                except Exception as e:
+                    loaded[name] = e
+        return loaded
+
+    def evaluate(self) -> Dict[str, Any]:
+        """The verdict: evaluated once, then served from memory or from the cache file.
+
+        A cached verdict is re-stamped with the current build's number, branch
+        and timestamp, as only the gate results depend on the cache key.
+        """
+        if self._verdict is not None:
+            return self._verdict
+        key = self.cache_key()
+        if self.cache_file and os.path.isfile(self.cache_file):
+            try:
+                with open(self.cache_file) as f:
+                    cached = json.load(f)
+                if cached.get('cacheKey') == key:
+                    cached.update(_build_info())
+                    self.cached = True
+                    self._verdict = cached
+                    return cached
+            except ValueError:
+                pass
+
+        inputs = self.load()
+        verdict = {
+            'passed': True,
+            **_build_info(),
+            'cacheKey': key,
+            'gates': {},
+            'violations': [],
+        }
+        for name in self.gates:
+            spec = GATES[name]
+            metrics = inputs[spec.input_name]
+            if isinstance(metrics, Exception):
+                result = {'status': 'ERROR', 'violations': [
+                    _violation(name, 'input', None, None,
+                               f"{spec.title} input could not be read: {metrics}")]}
+            elif metrics is None:
+                missing = _violation(name, 'input', None, None, f"{spec.title} report not found")
+                result = {'status': 'NO_DATA', 'violations': [missing] if spec.required else []}
+            else:
+                result = spec.evaluate(metrics, self.thresholds[name])
+                result['status'] = 'FAIL' if result['violations'] else 'PASS'
+            result['name'] = spec.title
+            result['passed'] = not result['violations']
+            verdict['gates'][name] = result
+            verdict['violations'].extend(result['violations'])
+        verdict['passed'] = all(result['passed'] for result in verdict['gates'].values())
+        if not verdict['passed'] and os.environ.get('OVERRIDE_QUALITY_GATES') == 'true':
+            verdict['overridden'] = True
+        verdict['summary'] = {
+            'gates': len(verdict['gates']),
+            'passedGates': sum(result['passed'] for result in verdict['gates'].values()),
+            'violations': len(verdict['violations']),
+        }
+        self._verdict = verdict
+        return verdict
+
+
+def to_html(verdict: Dict[str, Any]) -> str:
+    gates = []
+    for result in verdict['gates'].values():
+        violations = ''.join(f"<div class=\"violation\">⚠️ {escape(v['message'])}</div>"
+                             for v in result['violations'])
+        metrics = ''.join(f"<tr><td>{escape(str(key))}</td><td>{escape(str(value))}</td></tr>"
+                          for key, value in (result.get('metrics') or {}).items())
+        gates.append(f"<div class=\"gate {'gate-passed' if result['passed'] else 'gate-failed'}\">"
+                     f"<h3>{escape(result['name'])}: {result['status']}</h3>{violations}"
+                     f"{f'<table>{metrics}</table>' if metrics else ''}</div>")
+    status = '✅ PASSED' if verdict['passed'] else '❌ FAILED'
+    return f"""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Quality Gate Report - Build {escape(verdict['buildNumber'])}</title>
+<style>
+body {{ font-family: Arial, sans-serif; margin: 20px; background: #f5f5f5; }}
+.header {{ background: {'#4CAF50' if verdict['passed'] else '#f44336'};
+           color: white; padding: 20px; }}
+.gate {{ background: white; margin: 10px 0; padding: 15px; }}
+.gate-passed {{ border-left: 5px solid #4CAF50; }}
+.gate-failed {{ border-left: 5px solid #f44336; }}
+.violation {{ color: #f44336; margin: 5px 0; }}
+td {{ padding: 4px 8px; border-bottom: 1px solid #ddd; }}
+</style>
+</head>
+<body>
+<div class="header"><h1>Quality Gate Report</h1>
+<p>Build: {escape(verdict['buildNumber'])} | Branch: {escape(verdict['branch'])}</p>
+<h2>Status: {status}</h2></div>
+{''.join(gates)}
+<p>Generated: {escape(verdict['timestamp'])}</p>
+</body>
+</html>
+"""
+
+
+def print_verdict(verdict: Dict[str, Any], cached: bool):
+    print("=" * 60)
+    print("QUALITY GATE EVALUATION RESULTS")
+    print("=" * 60)
+    print(f"Build: {verdict['buildNumber']}  Branch: {verdict['branch']}"
+          f"{'  (cached verdict)' if cached else ''}")
+    for name, result in verdict['gates'].items():
+        icon = {'PASS': '✅', 'FAIL': '❌', 'ERROR': '❌'}.get(result['status'], '⚪')
+        print(f"{icon} {result['name']:<12} {result['status']}")
+        for violation in result['violations']:
+            print(f"   ⚠️  {violation['message']}")
+    print("-" * 60)
+    print(f"Overall Status: {'✅ PASSED' if verdict['passed'] else '❌ FAILED'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Evaluate all quality gates into one verdict')
+    parser.add_argument('--gates', nargs='+', choices=list(GATES), help='Only evaluate these gates')
+    parser.add_argument('--security-dataset',
+                        help='Dashboard dataset of security_results_aggregator.py '
+                             '(default: aggregate the tool reports)')
+    parser.add_argument('--reports-dir', action='append', dest='report_dirs',
+                        help='Directory searched for tool reports '
+                             '(repeatable, default: reports and .)')
+    parser.add_argument('--zap-report',
+                        default=os.environ.get('ZAP_REPORT', 'zap/reports/latest.json'))
+    parser.add_argument('--coverage',
+                        default=os.environ.get('COVERAGE_REPORT', 'coverage/coverage-summary.json'))
+    parser.add_argument('--tests',
+                        default=os.environ.get('TEST_REPORT', 'reports/test-report.json'))
+    parser.add_argument('--performance',
+                        default=os.environ.get('PERF_REPORT', 'reports/performance-report.json'))
+    parser.add_argument('--output', default=DEFAULT_OUTPUT,
+                        help=f'Verdict JSON (default: {DEFAULT_OUTPUT})')
+    parser.add_argument('--html', help='Also write an HTML report (default: next to --output)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Re-evaluate even if the inputs are unchanged')
+    args = parser.parse_args()
+
+    engine = QualityGateEngine(
+        {'security': args.security_dataset, 'zap': args.zap_report, 'coverage': args.coverage,
+         'tests': args.tests, 'performance': args.performance},
+        gates=args.gates, report_dirs=args.report_dirs or DEFAULT_REPORT_DIRS,
+        cache_file=None if args.no_cache else args.output,
+    )
+    verdict = engine.evaluate()
+    print_verdict(verdict, engine.cached)
+    if verdict.get('overridden'):
+        print("⚠️  WARNING: Quality gates override is enabled!")
+
+    # Written for cached verdicts too: they carry this build's number and timestamp
+    html_file = args.html or str(Path(args.output).with_suffix('.html'))
+    for path, content in ((args.output, json.dumps(verdict, indent=2)),
+                          (html_file, to_html(verdict))):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(content)
+        print(f"Report saved: {path}")
+
+    sys.exit(0 if verdict['passed'] or verdict.get('overridden') else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -16,7 +16,9 @@ NC='\033[0m'
 ZAP_HOST="${ZAP_HOST:-localhost}"
 ZAP_PORT="${ZAP_PORT:-8080}"
 ZAP_API_KEY="${ZAP_API_KEY:-secdevops-api-key}"
+ZAP_FAIL_FAST="${ZAP_FAIL_FAST:-false}"
 REPORT_DIR="./zap/reports"
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 TIMESTAMP=$(date +%Y%m%d_%H%M%S)
 
 # Function to print colored output
@@ -67,46 +69,24 @@ run_baseline_scan() {
 # Function to run full scan
 run_full_scan() {
     local target=$1
-    local report_name="${REPORT_DIR}/full_${TIMESTAMP}"
+    local report_name=$2
     
     log "🔍 Running full scan on: $target" "$BLUE"
     log "⚠️  This may take 30+ minutes..." "$YELLOW"
     
-    # Start spider
-    log "🕷️  Starting spider..." "$BLUE"
-    spider_id=$(curl -s "http://${ZAP_HOST}:${ZAP_PORT}/JSON/spider/action/scan/?apikey=${ZAP_API_KEY}&url=${target}&maxChildren=10&recurse=true" | jq -r '.scan')
-    
-    # Wait for spider to complete
-    while true; do
-        progress=$(curl -s "http://${ZAP_HOST}:${ZAP_PORT}/JSON/spider/view/status/?apikey=${ZAP_API_KEY}&scanId=${spider_id}" | jq -r '.status')
-        if [ "$progress" = "100" ]; then
-            break
-        fi
-        echo -ne "\r🕷️  Spider progress: ${progress}%"
-        sleep 5
-    done
-    echo ""
-    log "✅ Spider scan complete" "$GREEN"
-    
-    # Start active scan
-    log "⚔️  Starting active scan..." "$BLUE"
-    scan_id=$(curl -s "http://${ZAP_HOST}:${ZAP_PORT}/JSON/ascan/action/scan/?apikey=${ZAP_API_KEY}&url=${target}&recurse=true&inScopeOnly=false&scanPolicyName=&method=&postData=" | jq -r '.scan')
-    
-    # Wait for active scan to complete
-    while true; do
-        progress=$(curl -s "http://${ZAP_HOST}:${ZAP_PORT}/JSON/ascan/view/status/?apikey=${ZAP_API_KEY}&scanId=${scan_id}" | jq -r '.status')
-        if [ "$progress" = "100" ]; then
-            break
-        fi
-        echo -ne "\r⚔️  Active scan progress: ${progress}%"
-        sleep 10
-    done
-    echo ""
-    log "✅ Active scan complete" "$GREEN"
+    # Spider, active scan, alert paging and reports over the ZAP API;
+    # exits with the threshold verdict once the active scan finishes, or
+    # as soon as a threshold is exceeded when ZAP_FAIL_FAST=true
+    local fail_fast=()
+    if [ "$ZAP_FAIL_FAST" = "true" ]; then
+        fail_fast=(--fail-fast --stop-scan)
+    fi
     
-    # Generate reports
-    generate_reports "$report_name"
-    echo "${report_name}"
+    python3 "${SCRIPT_DIR}/zap_api_client.py" "$target" \
+        --zap-url "http://${ZAP_HOST}:${ZAP_PORT}" \
+        --api-key "$ZAP_API_KEY" \
+        --report-base "$report_name" \
+        "${fail_fast[@]}"
 }
 
 # Function to run API scan
@@ -141,24 +121,6 @@ run_api_scan() {
     echo "${report_name}"
 }
 
-# Function to generate reports
-generate_reports() {
-    local report_base=$1
-    
-    log "📊 Generating reports..." "$BLUE"
-    
-    # HTML Report
-    curl -s "http://${ZAP_HOST}:${ZAP_PORT}/OTHER/core/other/htmlreport/?apikey=${ZAP_API_KEY}" > "${report_base}.html"
-    
-    # JSON Report
-    curl -s "http://${ZAP_HOST}:${ZAP_PORT}/JSON/core/view/alerts/?apikey=${ZAP_API_KEY}&baseurl=${target}" > "${report_base}.json"
-    
-    # XML Report
-    curl -s "http://${ZAP_HOST}:${ZAP_PORT}/OTHER/core/other/xmlreport/?apikey=${ZAP_API_KEY}" > "${report_base}.xml"
-    
-    log "✅ Reports generated" "$GREEN"
-}
-
 # Function to parse results
 parse_results() {
     local report_file=$1
@@ -169,29 +131,7 @@ parse_results() {
     fi
     
     log "📋 Scan Results Summary:" "$BLUE"
-    
-    # Parse JSON report for findings
-    local high=$(jq '[.alerts[] | select(.risk=="High")] | length' "${report_file}.json")
-    local medium=$(jq '[.alerts[] | select(.risk=="Medium")] | length' "${report_file}.json")
-    local low=$(jq '[.alerts[] | select(.risk=="Low")] | length' "${report_file}.json")
-    local info=$(jq '[.alerts[] | select(.risk=="Informational")] | length' "${report_file}.json")
-    
-    echo -e "${RED}🔴 High: $high${NC}"
-    echo -e "${YELLOW}🟡 Medium: $medium${NC}"
-    echo -e "${BLUE}🔵 Low: $low${NC}"
-    echo -e "${NC}⚪ Info: $info${NC}"
-    
-    # Check thresholds
-    if [ "$high" -gt 0 ]; then
-        log "❌ FAILED: High severity vulnerabilities found!" "$RED"
-        return 1
-    elif [ "$medium" -gt 5 ]; then
-        log "⚠️  WARNING: Too many medium severity issues" "$YELLOW"
-        return 2
-    else
-        log "✅ PASSED: No critical issues found" "$GREEN"
-        return 0
-    fi
+    python3 "${SCRIPT_DIR}/parse-zap-results.py" "${report_file}.json"
 }
 
 # Main function
@@ -223,16 +163,20 @@ main() {
         wait_for_zap || exit 1
     fi
     
-    # Run appropriate scan
+    # Run appropriate scan and evaluate results
     case "$SCAN_TYPE" in
         baseline)
             report=$(run_baseline_scan "$TARGET_URL")
+            parse_results "$report" && result=0 || result=$?
             ;;
         full)
-            report=$(run_full_scan "$TARGET_URL")
+            # The API client evaluates results while it collects them
+            report="${REPORT_DIR}/full_${TIMESTAMP}"
+            run_full_scan "$TARGET_URL" "$report" && result=0 || result=$?
             ;;
         api)
             report=$(run_api_scan "$TARGET_URL" "$API_SPEC")
+            parse_results "$report" && result=0 || result=$?
             ;;
         *)
             log "❌ Invalid scan type. Use: baseline, full, or api" "$RED"
@@ -240,9 +184,10 @@ main() {
             ;;
     esac
     
-    # Parse and display results
-    parse_results "$report"
-    result=$?
+    # Stable names for the pipeline's parse and publish steps
+    for ext in json html xml; do
+        [ -f "${report}.${ext}" ] && ln -sf "$(basename "${report}").${ext}" "${REPORT_DIR}/latest.${ext}"
+    done
     
     # Output report locations
     log "" "$NC"
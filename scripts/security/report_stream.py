@@ -0,0 +1,184 @@
+"""
+Streaming decoders for security tool reports.
+
+Reports of large scans (ZAP alerts, Trivy or Dependency-Check results) can be
+hundreds of megabytes. These readers hand out one array item or XML element
+at a time instead of loading the document, and are shared by
+parse-zap-results.py and security_results_aggregator.py.
+
+Reports compressed with gzip or zstd (recognised by their magic number, not
+the file name) are decompressed on the fly; zstd needs the `zstandard`
+package. Uncompressed reports are memory-mapped and decoded straight from
+the mapping.
+"""
+
+import gzip
+import json
+import mmap
+import codecs
+import xml.etree.ElementTree as ET
+from contextlib import contextmanager
+from typing import Any, BinaryIO, Dict, Iterable, Iterator
+
+CHUNK_SIZE = 1 << 20
+GZIP_MAGIC = b'\x1f\x8b'
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+# Archived reports may carry these suffixes after their own extension
+COMPRESSED_SUFFIXES = ('.gz', '.zst')
+
+
+class ReportFormatError(ValueError):
+    """A report does not have the structure its ingester expects"""
+
+
+@contextmanager
+def open_report(path: str) -> Iterator[BinaryIO]:
+    """Open a report for binary reading, decompressing gzip and zstd transparently"""
+    with open(path, 'rb') as f:
+        magic = f.read(4)
+        f.seek(0)
+        if magic.startswith(GZIP_MAGIC):
+            with gzip.GzipFile(fileobj=f) as stream:
+                yield stream
+        elif magic == ZSTD_MAGIC:
+            try:
+                import zstandard
+            except ImportError:
+                raise ReportFormatError(f"{path}: reading zstd-compressed reports needs the zstandard package")
+            with zstandard.ZstdDecompressor().stream_reader(f) as stream:
+                yield stream
+        elif not magic:
+            # Empty files cannot be mapped
+            yield f
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                yield mapped
+
+
+class JSONStream:
+    """Decode a JSON report one array item at a time.
+
+    Iterating yields the items of the top-level members named in `keys`
+    whose values are arrays, or the items of a top-level array. A document
+    that is neither (a single object without `keys`, or JSON lines) yields
+    each top-level value. Other top-level members are decoded whole into
+    `meta`, which is complete once iteration has finished; `streamed` tells
+    whether an array was found.
+    """
+
+    def __init__(self, path: str, keys: Iterable[str] = (), chunk_size: int = CHUNK_SIZE):
+        self.path = path
+        self.keys = tuple(keys)
+        self.chunk_size = chunk_size
+        self.meta: Dict[str, Any] = {}
+        self.streamed = False
+        self._decoder = json.JSONDecoder()
+        self._utf8 = None
+        self._file = None
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+
+    def __iter__(self) -> Iterator[Any]:
+        with open_report(self.path) as f:
+            self._file, self._buf, self._pos, self._eof = f, '', 0, False
+            self._utf8 = codecs.getincrementaldecoder('utf-8-sig')()
+            first = self._peek()
+            if first == '[':
+                yield from self._array()
+            elif first == '{' and self.keys:
+                yield from self._members()
+            while self._peek():
+                yield self._value()
+
+    def _fill(self, size: int):
+        # A multi-byte character split across reads is held back by the decoder
+        data = self._file.read(size)
+        if not data:
+            self._eof = True
+        chunk = self._utf8.decode(data, final=not data)
+        self._buf = self._buf[self._pos:] + chunk
+        self._pos = 0
+
+    def _peek(self) -> str:
+        """Next non-whitespace character ('' at end of file)"""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in ' \t\r\n':
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if self._eof:
+                return ''
+            self._fill(self.chunk_size)
+
+    def _next(self) -> str:
+        char = self._peek()
+        self._pos += 1
+        return char
+
+    def _value(self) -> Any:
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            else:
+                # A number or literal at the end of the buffer may continue in the next chunk
+                if end < len(self._buf) or self._eof:
+                    self._pos = end
+                    return value
+            # Grow geometrically so a value larger than a chunk is decoded in linear time
+            self._fill(max(self.chunk_size, len(self._buf) - self._pos))
+
+    def _array(self) -> Iterator[Any]:
+        self._next()
+        self.streamed = True
+        if self._peek() == ']':
+            self._next()
+            return
+        while True:
+            yield self._value()
+            char = self._next()
+            if char == ']':
+                return
+            if char != ',':
+                raise ReportFormatError(f"{self.path}: expected ',' or ']' in array, got {char!r}")
+
+    def _members(self) -> Iterator[Any]:
+        self._next()
+        if self._peek() == '}':
+            self._next()
+            return
+        while True:
+            key = self._value()
+            if self._next() != ':':
+                raise ReportFormatError(f"{self.path}: expected ':' after member {key!r}")
+            if key in self.keys and self._peek() == '[':
+                yield from self._array()
+            else:
+                self.meta[key] = self._value()
+            char = self._next()
+            if char == '}':
+                return
+            if char != ',':
+                raise ReportFormatError(f"{self.path}: expected ',' or '}}' in object, got {char!r}")
+
+
+def iter_xml_elements(path: str, tag: str) -> Iterator[ET.Element]:
+    """Yield every <tag> element below the root of an XML report.
+
+    Each element is detached from its parent once the caller is done with it,
+    so the tree never holds more than the element being processed.
+    """
+    parents = []
+    with open_report(path) as source:
+        for event, element in ET.iterparse(source, events=('start', 'end')):
+            if event == 'start':
+                parents.append(element)
+                continue
+            parents.pop()
+            if element.tag == tag and parents:
+                yield element
+                parents[-1].remove(element)
@@ -0,0 +1,665 @@
+#!/usr/bin/env python3
+"""
+Unified security-results aggregator for the Jenkins security stages.
+
+Reads the reports of TruffleHog, Snyk, Trivy, SonarQube, Semgrep, OWASP ZAP,
+Anchore, OWASP Dependency-Check and Gitleaks and turns them into one
+dashboard dataset:
+
+  1. ingest     - every tool has an ingester (registered with @ingester)
+                  that turns its report into normalized Finding records.
+                  Reports are parsed concurrently in a process pool, and
+                  each one is read exactly once with a streaming decoder
+                  (JSONStream for JSON and JSON lines, iterparse for XML)
+                  that decodes one finding at a time. Reports may be
+                  gzip- or zstd-compressed (e.g. trivy-scan.json.gz).
+  2. merge      - findings describing the same issue are merged: the same
+                  CVE in the same package version (Snyk, Trivy, Anchore,
+                  Dependency-Check), the same secret location (TruffleHog,
+                  Gitleaks) or the same rule at the same location.
+  3. report     - the dataset is written as JSON (security-dashboard-*.json,
+                  read by qualityGates.collectSecurityMetrics) and optionally
+                  as Prometheus metrics, Markdown and HTML.
+
+ZAP reports are read through ZAPResultsParser (scripts/parse-zap-results.py),
+so the dashboard's ZAP verdict uses the same thresholds as the DAST stage.
+
+Usage:
+    ./scripts/security/security_results_aggregator.py
+    ./scripts/security/security_results_aggregator.py --output security-dashboard-42.json \\
+        --prometheus reports/security-metrics.prom --report owaspZap=zap/reports/latest.json
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import importlib.util
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from html import escape
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from report_stream import COMPRESSED_SUFFIXES, JSONStream, iter_xml_elements
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+ZAP_PARSER_SCRIPT = REPO_ROOT / 'scripts' / 'parse-zap-results.py'
+
+DEFAULT_REPORT_DIRS = ['reports', '.']
+
+SEVERITIES = ('critical', 'high', 'medium', 'low', 'info')
+SEVERITY_ORDER = {severity: rank for rank, severity in enumerate(reversed(SEVERITIES))}
+
+
+# ---------------------------------------------------------------------------
+# Normalized findings
+# ---------------------------------------------------------------------------
+
+class Finding:
+    """One issue reported by a tool, normalized across tools"""
+
+    __slots__ = ('tool', 'category', 'severity', 'rule_id', 'title', 'location', 'line',
+                 'package', 'version', 'identifiers', 'tools')
+
+    def __init__(self, tool: str, category: str, severity: str, rule_id: str, title: str,
+                 location: str = '', line: Optional[int] = None, package: str = '',
+                 version: str = '', identifiers: Iterable[str] = ()):
+        self.tool = tool
+        self.category = category
+        self.severity = severity
+        self.rule_id = str(rule_id)
+        self.title = title
+        self.location = location or ''
+        self.line = line
+        self.package = package or ''
+        self.version = version or ''
+        self.identifiers = sorted({i for i in identifiers if i})
+        self.tools = [tool]
+
+    @property
+    def key(self) -> Tuple:
+        """Findings with equal keys describe the same issue"""
+        if self.category == 'secrets':
+            return ('secret', self.location, self.line)
+        if self.package:
+            cves = [i for i in self.identifiers if i.startswith('CVE-')]
+            return ('vulnerability', cves[0] if cves else self.rule_id, self.package.lower(),
+                    self.version)
+        return (self.tool, self.rule_id, self.location, self.line)
+
+    def merge(self, other: 'Finding'):
+        if SEVERITY_ORDER[other.severity] > SEVERITY_ORDER[self.severity]:
+            self.severity = other.severity
+        for tool in other.tools:
+            if tool not in self.tools:
+                self.tools.append(tool)
+        self.identifiers = sorted(set(self.identifiers) | set(other.identifiers))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'id': hashlib.sha1(repr(self.key).encode()).hexdigest()[:12],
+            'severity': self.severity,
+            'category': self.category,
+            'title': self.title,
+            'rule': self.rule_id,
+            'location': self.location,
+            'line': self.line,
+            'package': self.package,
+            'version': self.version,
+            'identifiers': self.identifiers,
+            'tools': self.tools,
+        }
+
+
+def merge_findings(findings: Iterable[Finding],
+                   merged: Optional[Dict[Tuple, Finding]] = None) -> Dict[Tuple, Finding]:
+    merged = {} if merged is None else merged
+    for finding in findings:
+        existing = merged.get(finding.key)
+        if existing is None:
+            merged[finding.key] = finding
+        else:
+            existing.merge(finding)
+    return merged
+
+
+# ---------------------------------------------------------------------------
+# Ingesters
+# ---------------------------------------------------------------------------
+
+class Ingester:
+    """Turns one tool's report into findings; parse() may add tool details to `info`"""
+
+    def __init__(self, name: str, category: str, reports: Tuple[str, ...],
+                 parse: Callable[[str, Dict[str, Any]], Iterator[Finding]], fail_on: str):
+        self.name = name
+        self.category = category
+        self.reports = reports
+        self.parse = parse
+        self.fail_on = fail_on
+
+
+INGESTERS: Dict[str, Ingester] = {}
+
+
+def ingester(name, category, *reports, fail_on='high'):
+    """Register a parser for the tool `name`; `reports` are the report file names it looks for"""
+    def register(parse):
+        INGESTERS[name] = Ingester(name, category, reports, parse, fail_on)
+        return parse
+    return register
+
+
+def _int(value) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+@ingester('truffleHog', 'secrets', 'trufflehog-scan.json', 'trufflehog-report.json', fail_on='low')
+def parse_trufflehog(path, info):
+    # v2 writes a JSON array, v3 one JSON object per line
+    verified = 0
+    for item in JSONStream(path):
+        git = item.get('SourceMetadata', {}).get('Data', {}).get('Git', {})
+        detector = (item.get('DetectorName') or item.get('detector_name') or item.get('reason')
+                    or 'secret')
+        if item.get('Verified', item.get('verified')):
+            verified += 1
+        yield Finding('truffleHog', 'secrets', 'critical', detector, f"{detector} secret",
+                      location=git.get('file') or item.get('path', ''),
+                      line=_int(git.get('line', item.get('line_number'))))
+    info['verified'] = verified
+
+
+@ingester('snyk', 'sca', 'snyk-vulnerabilities.json', 'snyk-report.json')
+def parse_snyk(path, info):
+    def findings(vulnerabilities):
+        for vuln in vulnerabilities:
+            identifiers = vuln.get('identifiers', {})
+            yield Finding('snyk', 'sca', vuln.get('severity', 'low').lower(), vuln.get('id', ''),
+                          vuln.get('title', ''), location=vuln.get('displayTargetFile', ''),
+                          package=vuln.get('packageName', ''), version=vuln.get('version', ''),
+                          identifiers=identifiers.get('CVE', []) + identifiers.get('CWE', []))
+
+    # `snyk test --all-projects` writes an array of per-project results
+    for item in JSONStream(path, ('vulnerabilities',)):
+        if 'vulnerabilities' in item and 'packageName' not in item:
+            yield from findings(item['vulnerabilities'])
+        else:
+            yield from findings([item])
+
+
+TRIVY_SEVERITY = {'CRITICAL': 'critical', 'HIGH': 'high', 'MEDIUM': 'medium', 'LOW': 'low'}
+
+
+@ingester('trivy', 'container', 'trivy-scan.json', 'trivy-report.json')
+def parse_trivy(path, info):
+    for result in JSONStream(path, ('Results',)):
+        for vuln in result.get('Vulnerabilities') or []:
+            yield Finding('trivy', 'container', TRIVY_SEVERITY.get(vuln.get('Severity'), 'info'),
+                          vuln.get('VulnerabilityID', ''),
+                          vuln.get('Title', vuln.get('VulnerabilityID', '')),
+                          location=result.get('Target', ''), package=vuln.get('PkgName', ''),
+                          version=vuln.get('InstalledVersion', ''),
+                          identifiers=([vuln.get('VulnerabilityID', '')]
+                                       + (vuln.get('CweIDs') or [])))
+
+
+SONAR_SEVERITY = {'BLOCKER': 'critical', 'CRITICAL': 'critical', 'MAJOR': 'high', 'MINOR': 'medium'}
+
+
+@ingester('sonarqube', 'sast', 'sonar-report.json', 'sonarqube-report.json', fail_on='critical')
+def parse_sonarqube(path, info):
+    stream = JSONStream(path, ('issues',))
+    for issue in stream:
+        yield Finding('sonarqube', 'sast', SONAR_SEVERITY.get(issue.get('severity'), 'info'),
+                      issue.get('rule', ''), issue.get('message', ''),
+                      location=issue.get('component', ''), line=_int(issue.get('line')))
+    info['qualityGate'] = stream.meta.get('qualityGate', 'UNKNOWN')
+    info['coverage'] = stream.meta.get('coverage', 0)
+
+
+SEMGREP_SEVERITY = {'ERROR': 'critical', 'WARNING': 'high', 'INFO': 'low'}
+
+
+@ingester('semgrep', 'sast', 'semgrep-report.json', fail_on='critical')
+def parse_semgrep(path, info):
+    for result in JSONStream(path, ('results',)):
+        extra = result.get('extra', {})
+        cwe = extra.get('metadata', {}).get('cwe', [])
+        yield Finding('semgrep', 'sast', SEMGREP_SEVERITY.get(extra.get('severity'), 'info'),
+                      result.get('check_id', ''), extra.get('message', ''),
+                      location=result.get('path', ''),
+                      line=_int(result.get('start', {}).get('line')),
+                      identifiers=[c.split(':')[0]
+                                   for c in ([cwe] if isinstance(cwe, str) else cwe)])
+
+
+ZAP_SEVERITY = {'High': 'high', 'Medium': 'medium', 'Low': 'low', 'Informational': 'info'}
+
+
+def load_zap_parser():
+    """ZAPResultsParser's module (parse-zap-results.py cannot be imported by name)"""
+    if 'parse_zap_results' not in sys.modules:
+        spec = importlib.util.spec_from_file_location('parse_zap_results', ZAP_PARSER_SCRIPT)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        sys.modules['parse_zap_results'] = module
+    return sys.modules['parse_zap_results']
+
+
+def _zap_instances(alert: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Expand a traditional-report alert (riskdesc + instances) into one API-shaped alert per URL"""
+    base = {
+        'risk': alert.get('riskdesc', 'Informational').split(' ')[0],
+        'alert': alert.get('alert') or alert.get('name', 'Unknown'),
+        'pluginId': alert.get('pluginid', ''),
+        'cweid': alert.get('cweid', '0'),
+        'confidence': alert.get('confidence', ''),
+    }
+    for instance in alert.get('instances') or [{}]:
+        yield dict(base, url=instance.get('uri', ''), param=instance.get('param', ''))
+
+
+def iter_zap_alerts(path: str, module) -> Iterator[Dict[str, Any]]:
+    """Alerts of an API (`alerts` or bare list), traditional JSON (`site`) or XML report"""
+    if path.endswith('.xml'):
+        for element in iter_xml_elements(path, 'alertitem'):
+            alert = module.ZAPResultsParser.xml_alert(element)
+            uris = [uri.text or '' for uri in element.iter('uri')] or [alert['url']]
+            for uri in uris:
+                yield dict(alert, url=uri)
+        return
+    for item in JSONStream(path, ('alerts', 'site')):
+        if isinstance(item.get('alerts'), list) and 'risk' not in item:
+            for alert in item['alerts']:
+                yield from _zap_instances(alert)
+        elif 'riskdesc' in item:
+            yield from _zap_instances(item)
+        else:
+            yield item
+
+
+@ingester('owaspZap', 'dast', 'zap-report.json', 'zap-report.xml')
+def parse_zap(path, info):
+    module = load_zap_parser()
+    zap = module.ZAPResultsParser(path, 'xml' if path.endswith('.xml') else 'json')
+    for alert in iter_zap_alerts(path, module):
+        zap.categorize_alert(alert)
+        cwe = str(alert.get('cweid', alert.get('cwe', '0')))
+        yield Finding('owaspZap', 'dast', ZAP_SEVERITY.get(alert.get('risk'), 'info'),
+                      alert.get('pluginId') or alert.get('alert', ''),
+                      alert.get('alert', 'Unknown'),
+                      location=alert.get('url', ''),
+                      identifiers=[f'CWE-{cwe}'] if cwe not in ('', '0', '-1') else [])
+    passed, messages = zap.check_thresholds()
+    info.update(passed=passed, summary=dict(zap.summary), thresholds=messages)
+
+
+ANCHORE_SEVERITY = {'Critical': 'critical', 'High': 'high', 'Medium': 'medium', 'Low': 'low'}
+
+
+@ingester('anchore', 'container', 'anchore-report.json')
+def parse_anchore(path, info):
+    stream = JSONStream(path, ('vulnerabilities',))
+    for vuln in stream:
+        yield Finding('anchore', 'container', ANCHORE_SEVERITY.get(vuln.get('severity'), 'info'),
+                      vuln.get('vuln', ''), vuln.get('vuln', ''),
+                      location=vuln.get('package_path', ''),
+                      package=vuln.get('package_name', ''), version=vuln.get('package_version', ''),
+                      identifiers=[vuln.get('vuln', '')])
+    info['policyStatus'] = stream.meta.get('policyStatus', 'UNKNOWN')
+
+
+def cvss_severity(score: float) -> str:
+    if score >= 9.0:
+        return 'critical'
+    if score >= 7.0:
+        return 'high'
+    if score >= 4.0:
+        return 'medium'
+    return 'low'
+
+
+@ingester('dependencyCheck', 'sca', 'dependency-check-report.json')
+def parse_dependency_check(path, info):
+    dependencies = 0
+    for dependency in JSONStream(path, ('dependencies',)):
+        dependencies += 1
+        packages = dependency.get('packages') or [{}]
+        # pkg:npm/lodash@4.17.20 -> lodash, 4.17.20
+        package, _, version = packages[0].get('id', '').rpartition('/')[2].partition('@')
+        for vuln in dependency.get('vulnerabilities') or []:
+            score = ((vuln.get('cvssv3') or {}).get('baseScore')
+                     or (vuln.get('cvssv2') or {}).get('score') or 0)
+            yield Finding('dependencyCheck', 'sca', cvss_severity(score), vuln.get('name', ''),
+                          vuln.get('name', ''), location=dependency.get('filePath', ''),
+                          package=package or dependency.get('fileName', ''), version=version,
+                          identifiers=[vuln.get('name', '')] + (vuln.get('cwes') or []))
+    info['totalDependencies'] = dependencies
+
+
+@ingester('gitLeaks', 'secrets', 'gitleaks-report.json', fail_on='low')
+def parse_gitleaks(path, info):
+    for leak in JSONStream(path):
+        yield Finding('gitLeaks', 'secrets', 'critical', leak.get('RuleID', ''),
+                      leak.get('Description') or leak.get('RuleID', 'secret'),
+                      location=leak.get('File', ''), line=_int(leak.get('StartLine')))
+
+
+# ---------------------------------------------------------------------------
+# Aggregation
+# ---------------------------------------------------------------------------
+
+def ingest_report(name: str, path: str) -> Dict[str, Any]:
+    """Parse one report; runs in a worker process"""
+    ingester = INGESTERS[name]
+    start = time.perf_counter()
+    info: Dict[str, Any] = {}
+    severities = dict.fromkeys(SEVERITIES, 0)
+    raw = 0
+
+    def counted(findings):
+        nonlocal raw
+        for finding in findings:
+            raw += 1
+            severities[finding.severity] += 1
+            yield finding
+
+    try:
+        merged = merge_findings(counted(ingester.parse(path, info)))
+    except Exception as e:
+        return {'tool': name, 'result': {'status': 'ERROR', 'report': path, 'error': str(e)},
+                'findings': []}
+
+    passed = info.pop('passed', None)
+    if passed is None:
+        passed = not any(count for severity, count in severities.items()
+                         if SEVERITY_ORDER[severity] >= SEVERITY_ORDER[ingester.fail_on])
+    result = {
+        'status': 'PASS' if passed else 'FAIL',
+        'report': path,
+        'findings': raw,
+        'severities': severities,
+        'duration_seconds': round(time.perf_counter() - start, 3),
+    }
+    result.update(info)
+    return {'tool': name, 'result': result, 'findings': list(merged.values())}
+
+
+class SecurityResultsAggregator:
+    """Ingests every available report and builds the dashboard dataset"""
+
+    def __init__(self, report_dirs: Iterable[str] = DEFAULT_REPORT_DIRS,
+                 reports: Optional[Dict[str, str]] = None, tools: Optional[Iterable[str]] = None,
+                 workers: Optional[int] = None, project: str = 'Oversight MVP'):
+        self.report_dirs = list(report_dirs)
+        self.reports = dict(reports or {})
+        self.tools = list(tools) if tools else list(INGESTERS)
+        self.workers = workers or min(len(self.tools), os.cpu_count() or 1, 8)
+        self.project = project
+
+    def locate(self, name: str) -> Optional[str]:
+        if name in self.reports:
+            return self.reports[name] if os.path.exists(self.reports[name]) else None
+        for directory in self.report_dirs:
+            for report in INGESTERS[name].reports:
+                for suffix in ('',) + COMPRESSED_SUFFIXES:
+                    path = os.path.join(directory, report + suffix)
+                    if os.path.isfile(path):
+                        return path
+        return None
+
+    def aggregate(self) -> Dict[str, Any]:
+        located = {name: self.locate(name) for name in self.tools}
+        jobs = [(name, path) for name, path in located.items() if path]
+        if self.workers > 1 and len(jobs) > 1:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                outcomes = list(executor.map(ingest_report, *zip(*jobs)))
+        else:
+            outcomes = [ingest_report(name, path) for name, path in jobs]
+        by_tool = {outcome['tool']: outcome for outcome in outcomes}
+
+        tools = {}
+        merged: Dict[Tuple, Finding] = {}
+        raw = 0
+        for name in self.tools:
+            if name not in by_tool:
+                tools[name] = {'status': 'NO_DATA', 'message': 'Report not found'}
+                continue
+            tools[name] = by_tool[name]['result']
+            raw += tools[name].get('findings', 0)
+            merge_findings(by_tool[name]['findings'], merged)
+
+        findings = sorted(merged.values(), key=lambda f: (-SEVERITY_ORDER[f.severity], f.category,
+                                                          f.title, f.location, f.line or 0))
+        return {
+            'timestamp': datetime.now().isoformat(),
+            'project': self.project,
+            'summary': summarize(findings, tools, raw),
+            'overallStatus': overall_status(findings),
+            'tools': tools,
+            'findings': [finding.to_dict() for finding in findings],
+        }
+
+
+def summarize(findings: List[Finding], tools: Dict[str, Dict[str, Any]],
+              raw: int) -> Dict[str, int]:
+    counts = dict.fromkeys(SEVERITIES, 0)
+    for finding in findings:
+        counts[finding.severity] += 1
+    return {
+        'totalIssues': sum(counts[s] for s in SEVERITIES if s != 'info'),
+        'criticalIssues': counts['critical'],
+        'highIssues': counts['high'],
+        'mediumIssues': counts['medium'],
+        'lowIssues': counts['low'],
+        'infoIssues': counts['info'],
+        'passedChecks': sum(1 for t in tools.values() if t['status'] == 'PASS'),
+        'failedChecks': sum(1 for t in tools.values() if t['status'] == 'FAIL'),
+        'uniqueFindings': len(findings),
+        'duplicateFindings': raw - len(findings),
+    }
+
+
+def overall_status(findings: List[Finding]) -> str:
+    reported = {f.severity for f in findings}
+    for severity in ('critical', 'high', 'medium', 'low'):
+        if severity in reported:
+            return severity.upper()
+    return 'PASS'
+
+
+# ---------------------------------------------------------------------------
+# Output
+# ---------------------------------------------------------------------------
+
+def to_prometheus(dataset: Dict[str, Any]) -> str:
+    summary = dataset['summary']
+    lines = [
+        '# HELP security_issues_total Total number of security issues',
+        '# TYPE security_issues_total gauge',
+    ]
+    lines += [f'security_issues_total{{severity="{s}"}} {summary[f"{s}Issues"]}'
+              for s in ('critical', 'high', 'medium', 'low')]
+    lines += [
+        '',
+        '# HELP security_checks_total Total number of security checks',
+        '# TYPE security_checks_total gauge',
+        f'security_checks_total{{status="passed"}} {summary["passedChecks"]}',
+        f'security_checks_total{{status="failed"}} {summary["failedChecks"]}',
+        '',
+        '# HELP security_tool_status Security tool execution status',
+        '# TYPE security_tool_status gauge',
+    ]
+    lines += [f'security_tool_status{{tool="{name}",status="{tool["status"]}"}} '
+              f'{int(tool["status"] == "PASS")}'
+              for name, tool in dataset['tools'].items()]
+    return '\n'.join(lines) + '\n'
+
+
+def _tool_detail(tool: Dict[str, Any]) -> str:
+    if tool['status'] in ('NO_DATA', 'ERROR'):
+        return tool.get('message') or tool.get('error', '')
+    return ', '.join(f"{s}: {n}" for s, n in tool['severities'].items() if n) or 'no findings'
+
+
+def to_markdown(dataset: Dict[str, Any]) -> str:
+    summary = dataset['summary']
+    lines = [
+        '# Security Dashboard Report',
+        '',
+        f"**Project:** {dataset['project']}  ",
+        f"**Scan Time:** {dataset['timestamp']}  ",
+        f"**Overall Status:** {dataset['overallStatus']}",
+        '',
+        '## Summary',
+        '',
+        '| Severity | Count |',
+        '|----------|-------|',
+    ]
+    lines += [f"| {s.capitalize()} | {summary[f'{s}Issues']} |"
+              for s in ('critical', 'high', 'medium', 'low')]
+    lines += [
+        f"| **Total** | **{summary['totalIssues']}** |",
+        '',
+        f"**Passed Checks:** {summary['passedChecks']}  ",
+        f"**Failed Checks:** {summary['failedChecks']}  ",
+        f"**Duplicates merged:** {summary['duplicateFindings']}",
+        '',
+        '## Tool Results',
+        '',
+        '| Tool | Status | Details |',
+        '|------|--------|---------|',
+    ]
+    lines += [f"| {name} | {tool['status']} | {_tool_detail(tool)} |"
+              for name, tool in dataset['tools'].items()]
+    return '\n'.join(lines) + '\n'
+
+
+def to_html(dataset: Dict[str, Any], limit: int = 500) -> str:
+    summary = dataset['summary']
+    metrics = ''.join(f"<div class=\"metric\"><h3>{escape(label)}</h3>"
+                      f"<div class=\"value\">{summary[key]}</div></div>"
+                      for label, key in (('Critical', 'criticalIssues'), ('High', 'highIssues'),
+                                         ('Medium', 'mediumIssues'), ('Low', 'lowIssues'),
+                                         ('Total', 'totalIssues'),
+                                         ('Passed Checks', 'passedChecks'),
+                                         ('Failed Checks', 'failedChecks')))
+    tools = ''.join(f"<tr><td>{escape(name)}</td>"
+                    f"<td class=\"{tool['status'].lower()}\">{tool['status']}</td>"
+                    f"<td>{escape(_tool_detail(tool))}</td></tr>"
+                    for name, tool in dataset['tools'].items())
+    findings = ''.join(f"<tr><td>{f['severity']}</td><td>{escape(f['title'])}</td>"
+                       f"<td>{escape(f['package'] or f['location'])}"
+                       f"{':' + str(f['line']) if f['line'] else ''}</td>"
+                       f"<td>{escape(', '.join(f['tools']))}</td></tr>"
+                       for f in dataset['findings'][:limit])
+    return f"""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Security Dashboard - {escape(dataset['timestamp'])}</title>
+<style>
+body {{ font-family: Arial, sans-serif; margin: 20px; }}
+.metric {{ display: inline-block; min-width: 140px; margin: 5px; padding: 10px;
+           background: #f8f9fa; }}
+.value {{ font-size: 24px; font-weight: bold; }}
+table {{ border-collapse: collapse; margin: 10px 0; }}
+td, th {{ border: 1px solid #ddd; padding: 4px 8px; text-align: left; }}
+.pass {{ color: #28a745; }} .fail {{ color: #dc3545; }} .no_data, .error {{ color: #6c757d; }}
+</style>
+</head>
+<body>
+<h1>Security Dashboard</h1>
+<p><strong>Project:</strong> {escape(dataset['project'])} &nbsp;
+<strong>Overall Status:</strong> {dataset['overallStatus']}</p>
+{metrics}
+<h2>Tool Results</h2>
+<table><tr><th>Tool</th><th>Status</th><th>Details</th></tr>{tools}</table>
+<h2>Findings ({min(limit, len(dataset['findings']))} of {len(dataset['findings'])})</h2>
+<table><tr><th>Severity</th><th>Title</th><th>Location</th><th>Tools</th></tr>{findings}</table>
+</body>
+</html>
+"""
+
+
+def print_summary(dataset: Dict[str, Any]):
+    summary = dataset['summary']
+    print("=" * 60)
+    print("SECURITY DASHBOARD")
+    print("=" * 60)
+    for name, tool in dataset['tools'].items():
+        icon = {'PASS': '✅', 'FAIL': '❌'}.get(tool['status'], '⚪')
+        print(f"{icon} {name:<16} {tool['status']:<8} {_tool_detail(tool)}")
+    print("-" * 60)
+    print(f"Overall Status: {dataset['overallStatus']}")
+    print(f"Total Issues: {summary['totalIssues']} (critical {summary['criticalIssues']}, "
+          f"high {summary['highIssues']}, medium {summary['mediumIssues']}, "
+          f"low {summary['lowIssues']})")
+    print(f"Duplicates merged: {summary['duplicateFindings']}")
+
+
+def parse_report_overrides(values: List[str]) -> Dict[str, str]:
+    reports = {}
+    for value in values:
+        name, sep, path = value.partition('=')
+        if not sep or name not in INGESTERS:
+            raise argparse.ArgumentTypeError(
+                f"--report expects TOOL=PATH with TOOL one of {', '.join(INGESTERS)}")
+        reports[name] = path
+    return reports
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Aggregate security tool reports into one dashboard dataset')
+    parser.add_argument('--reports-dir', action='append', dest='report_dirs',
+                        help='Directory searched for tool reports '
+                             '(repeatable, default: reports and .)')
+    parser.add_argument('--report', action='append', default=[], metavar='TOOL=PATH',
+                        help='Explicit report for a tool, e.g. owaspZap=zap/reports/latest.json')
+    parser.add_argument('--tools', nargs='+', choices=list(INGESTERS),
+                        help='Only ingest these tools')
+    parser.add_argument('--output', default=f'security-dashboard-{int(time.time() * 1000)}.json',
+                        help='Dashboard dataset (default: security-dashboard-<epoch ms>.json)')
+    parser.add_argument('--prometheus', help='Write Prometheus metrics to this file')
+    parser.add_argument('--markdown', help='Write a Markdown summary to this file')
+    parser.add_argument('--html', help='Write an HTML dashboard to this file')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Worker processes (default: one per report, max 8)')
+    parser.add_argument('--project', default='Oversight MVP')
+    args = parser.parse_args()
+
+    try:
+        reports = parse_report_overrides(args.report)
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+
+    aggregator = SecurityResultsAggregator(args.report_dirs or DEFAULT_REPORT_DIRS,
+                                           reports=reports, tools=args.tools,
+                                           workers=args.workers, project=args.project)
+    dataset = aggregator.aggregate()
+    print_summary(dataset)
+
+    outputs = [(args.output, lambda: json.dumps(dataset, indent=2)),
+               (args.prometheus, lambda: to_prometheus(dataset)),
+               (args.markdown, lambda: to_markdown(dataset)),
+               (args.html, lambda: to_html(dataset))]
+    for path, render in outputs:
+        if path:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            with open(path, 'w') as f:
+                f.write(render())
+            print(f"Report saved: {path}")
+
+    sys.exit(1 if dataset['overallStatus'] in ('CRITICAL', 'HIGH') else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,455 @@
+"""
+Parsed, indexed model of the Terraform configuration.
+
+Shared by the SecDevOps_CICD test suites and terraform_policy_scan.py.
+
+Every ``.tf`` file is parsed once into ``Block`` objects (resource, data,
+variable, output, module, ...). Tests query resources by type, name and
+attribute values instead of substring-matching raw HCL, so formatting
+changes such as re-aligned ``=`` signs no longer break them.
+
+Values are converted to Python where they are literals (strings, numbers,
+bools, lists, maps). Template strings keep their ``${...}`` interpolation
+as written and any other expression (references, function calls,
+conditionals, heredoc arguments) is kept as an ``Expression``, a ``str``
+holding the expression's source text.
+
+Parsed files are cached by path and mtime, so repeated loads within a
+session (or after unrelated files change) only re-parse what changed.
+"""
+
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+class HCLSyntaxError(ValueError):
+    """Raised when a .tf file cannot be parsed"""
+
+
+class Expression(str):
+    """Unevaluated HCL expression, e.g. ``var.tags`` or ``file(var.path)``"""
+
+    def __repr__(self):
+        return f'Expression({str.__repr__(self)})'
+
+
+_TOKEN_RE = re.compile(r'''
+    (?P<newline>\n)
+  | (?P<space>[ \t\r]+)
+  | (?P<comment>\#[^\n]*|//[^\n]*|/\*.*?\*/)
+  | (?P<heredoc><<-?(?P<marker>[A-Za-z_][A-Za-z0-9_]*)[ \t]*\n)
+  | (?P<number>\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)
+  | (?P<ident>[A-Za-z_][A-Za-z0-9_\-]*)
+  | (?P<string>")
+  | (?P<op>==|!=|<=|>=|&&|\|\||=>|\.\.\.|[{}\[\]()=,:.?!<>+\-*/%])
+''', re.VERBOSE | re.DOTALL)
+
+_OPEN = {'{': '}', '[': ']', '(': ')'}
+_CLOSE = set(_OPEN.values())
+
+
+class _Token:
+    __slots__ = ('kind', 'value', 'punct', 'start', 'end', 'line')
+
+    def __init__(self, kind, value, start, end, line):
+        self.kind = kind
+        self.value = value
+        # Punctuation only, so a string literal "}" never closes a block
+        self.punct = value if kind == 'op' else None
+        self.start = start
+        self.end = end
+        self.line = line
+
+
+def _scan_string(text: str, pos: int, path: str, line: int) -> Tuple[str, int, bool]:
+    """Scan a quoted string starting after the opening quote.
+
+    Returns the decoded value, the position after the closing quote and
+    whether the string contains ``${...}`` / ``%{...}`` templates.
+    """
+    out = []
+    templated = False
+    while pos < len(text):
+        ch = text[pos]
+        if ch == '"':
+            return ''.join(out), pos + 1, templated
+        if ch == '\\' and pos + 1 < len(text):
+            escaped = text[pos + 1]
+            out.append({'n': '\n', 't': '\t', 'r': '\r'}.get(escaped, escaped))
+            pos += 2
+            continue
+        if ch in '$%' and text.startswith('{', pos + 1):
+            # Keep the template verbatim, including nested quotes and braces
+            templated = True
+            depth = 0
+            start = pos
+            pos += 1
+            while pos < len(text):
+                c = text[pos]
+                if c == '{':
+                    depth += 1
+                elif c == '}':
+                    depth -= 1
+                    if depth == 0:
+                        break
+                elif c == '"':
+                    _, pos, _ = _scan_string(text, pos + 1, path, line)
+                    continue
+                pos += 1
+            out.append(text[start:pos + 1])
+            pos += 1
+            continue
+        if ch == '\n':
+            break
+        out.append(ch)
+        pos += 1
+    raise HCLSyntaxError(f'{path}:{line}: unterminated string')
+
+
+def tokenize(text: str, path: str = '<string>') -> List[_Token]:
+    """Split HCL source into tokens (comments and blanks dropped)"""
+    tokens = []
+    pos = 0
+    line = 1
+    while pos < len(text):
+        match = _TOKEN_RE.match(text, pos)
+        if not match:
+            raise HCLSyntaxError(f'{path}:{line}: unexpected character {text[pos]!r}')
+        kind = match.lastgroup if match.lastgroup != 'marker' else 'heredoc'
+        start, end = match.start(), match.end()
+
+        if kind == 'string':
+            value, end, templated = _scan_string(text, end, path, line)
+            tokens.append(_Token('template' if templated else 'string', value, start, end, line))
+        elif kind == 'heredoc':
+            marker = match.group('marker')
+            closing = re.compile(rf'^[ \t]*{re.escape(marker)}[ \t]*$', re.MULTILINE)
+            found = closing.search(text, end)
+            if not found:
+                raise HCLSyntaxError(f'{path}:{line}: unterminated heredoc {marker}')
+            body = text[end:found.start()]
+            if match.group(0).startswith('<<-'):
+                lines = body.split('\n')
+                indent = min((len(l) - len(l.lstrip()) for l in lines if l.strip()), default=0)
+                body = '\n'.join(l[indent:] for l in lines)
+            end = found.end()
+            tokens.append(_Token('template', body, start, end, line))
+        elif kind not in ('space', 'comment'):
+            tokens.append(_Token(kind, match.group(0), start, end, line))
+
+        line += text.count('\n', start, end)
+        pos = end
+    tokens.append(_Token('eof', '', len(text), len(text), line))
+    return tokens
+
+
+class Block:
+    """One HCL block, e.g. ``resource "azurerm_subnet" "jenkins" { ... }``"""
+
+    def __init__(self, type: str, labels: List[str], attributes: Dict[str, Any],
+                 blocks: List['Block'], path: str = '', line: int = 0):
+        self.type = type
+        self.labels = labels
+        self.attributes = attributes
+        self.blocks = blocks
+        self.path = path
+        self.line = line
+
+    def __repr__(self):
+        labels = ' '.join(f'"{label}"' for label in self.labels)
+        return f'<Block {self.type} {labels} at {self.path}:{self.line}>'
+
+    def __getitem__(self, key: str) -> Any:
+        return self.attributes[key]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.attributes or any(b.type == key for b in self.blocks)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.attributes.get(key, default)
+
+    def children(self, type: str) -> List['Block']:
+        """All nested blocks of the given type, in source order"""
+        return [b for b in self.blocks if b.type == type]
+
+    def child(self, type: str) -> 'Block':
+        """The first nested block of the given type"""
+        for block in self.blocks:
+            if block.type == type:
+                return block
+        raise KeyError(f'{self!r} has no {type} block')
+
+    def matches(self, **attrs: Any) -> bool:
+        return all(self.attributes.get(key) == value for key, value in attrs.items())
+
+
+class _NotLiteral(Exception):
+    pass
+
+
+class _Parser:
+    def __init__(self, text: str, path: str):
+        self.text = text
+        self.path = path
+        self.tokens = tokenize(text, path)
+        self.pos = 0
+
+    @property
+    def tok(self) -> _Token:
+        return self.tokens[self.pos]
+
+    def error(self, message: str):
+        raise HCLSyntaxError(f'{self.path}:{self.tok.line}: {message}')
+
+    def skip_newlines(self):
+        while self.tok.kind == 'newline':
+            self.pos += 1
+
+    def expect(self, value: str):
+        if self.tok.punct != value:
+            self.error(f'expected {value!r}, got {self.tok.value!r}')
+        self.pos += 1
+
+    def parse_body(self, closing: Optional[str]) -> Tuple[Dict[str, Any], List[Block]]:
+        attributes, blocks = {}, []
+        while True:
+            self.skip_newlines()
+            if closing and self.tok.punct == closing:
+                self.pos += 1
+                return attributes, blocks
+            if self.tok.kind == 'eof':
+                if closing:
+                    self.error(f'missing {closing!r}')
+                return attributes, blocks
+            if self.tok.kind != 'ident':
+                self.error(f'unexpected {self.tok.value!r}')
+
+            name, line = self.tok.value, self.tok.line
+            self.pos += 1
+            if self.tok.punct == '=':
+                self.pos += 1
+                attributes[name] = self.parse_expression()
+                continue
+
+            labels = []
+            while self.tok.kind in ('string', 'ident'):
+                labels.append(self.tok.value)
+                self.pos += 1
+            self.expect('{')
+            attrs, children = self.parse_body('}')
+            blocks.append(Block(name, labels, attrs, children, self.path, line))
+
+    def at_terminator(self) -> bool:
+        return self.tok.kind in ('newline', 'eof') or self.tok.punct == ',' or self.tok.punct in _CLOSE
+
+    def parse_expression(self) -> Any:
+        start = self.pos
+        try:
+            value = self.parse_literal()
+        except _NotLiteral:
+            self.pos = start
+        else:
+            if self.at_terminator():
+                return value
+            self.pos = start
+        return self.parse_raw()
+
+    def parse_raw(self) -> Expression:
+        """Consume an arbitrary expression, returning its source text"""
+        first = self.tok
+        depth = 0
+        last = first
+        while True:
+            tok = self.tok
+            if tok.kind == 'eof':
+                break
+            if depth == 0 and (tok.kind == 'newline' or tok.punct == ',' or tok.punct in _CLOSE):
+                break
+            if tok.punct in _OPEN:
+                depth += 1
+            elif tok.punct in _CLOSE:
+                depth -= 1
+            if tok.kind != 'newline':
+                last = tok
+            self.pos += 1
+        if last is first and first.kind in ('newline', 'eof'):
+            self.error('expected an expression')
+        return Expression(self.text[first.start:last.end].strip())
+
+    def parse_literal(self) -> Any:
+        tok = self.tok
+        if tok.kind in ('string', 'template'):
+            self.pos += 1
+            return tok.value
+        if tok.kind == 'number':
+            self.pos += 1
+            return float(tok.value) if any(c in tok.value for c in '.eE') else int(tok.value)
+        if tok.kind == 'ident' and tok.value in ('true', 'false', 'null'):
+            self.pos += 1
+            return {'true': True, 'false': False, 'null': None}[tok.value]
+        if tok.punct == '[':
+            self.pos += 1
+            items = []
+            while True:
+                self.skip_newlines()
+                if self.tok.punct == ']':
+                    self.pos += 1
+                    return items
+                items.append(self.parse_expression())
+                self.skip_newlines()
+                if self.tok.punct == ',':
+                    self.pos += 1
+                elif self.tok.punct != ']':
+                    raise _NotLiteral()
+        if tok.punct == '{':
+            self.pos += 1
+            items = {}
+            while True:
+                self.skip_newlines()
+                if self.tok.punct == '}':
+                    self.pos += 1
+                    return items
+                if self.tok.kind not in ('ident', 'string'):
+                    raise _NotLiteral()
+                key = self.tok.value
+                self.pos += 1
+                if self.tok.punct not in ('=', ':'):
+                    raise _NotLiteral()
+                self.pos += 1
+                items[key] = self.parse_expression()
+                if self.tok.punct == ',':
+                    self.pos += 1
+        raise _NotLiteral()
+
+
+def parse(text: str, path: str = '<string>') -> List[Block]:
+    """Parse HCL source into its top-level blocks"""
+    _, blocks = _Parser(text, path).parse_body(None)
+    return blocks
+
+
+_FILE_CACHE: Dict[str, Tuple[int, List[Block]]] = {}
+
+
+def parse_file(path) -> List[Block]:
+    """Parse a .tf file, reusing the cached result while its mtime is unchanged"""
+    path = str(path)
+    mtime = os.stat(path).st_mtime_ns
+    cached = _FILE_CACHE.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    with open(path, encoding='utf-8') as f:
+        blocks = parse(f.read(), path)
+    _FILE_CACHE[path] = (mtime, blocks)
+    return blocks
+
+
+class TerraformModule:
+    """All blocks of one Terraform module directory, indexed for lookup"""
+
+    def __init__(self, name: str, directory: Path, blocks: List[Block]):
+        self.name = name
+        self.directory = Path(directory)
+        self.blocks = blocks
+        self.resources: Dict[Tuple[str, str], Block] = {}
+        self.data: Dict[Tuple[str, str], Block] = {}
+        self.variables: Dict[str, Block] = {}
+        self.outputs: Dict[str, Block] = {}
+        self.modules: Dict[str, Block] = {}
+        self.locals: Dict[str, Any] = {}
+        self._by_type: Dict[str, List[Block]] = {}
+        self._by_attribute: Dict[Tuple[str, str, Any], List[Block]] = {}
+
+        for block in blocks:
+            if block.type == 'resource' and len(block.labels) == 2:
+                self.resources[tuple(block.labels)] = block
+                self._by_type.setdefault(block.labels[0], []).append(block)
+                for key, value in block.attributes.items():
+                    if isinstance(value, (str, int, float, bool)):
+                        self._by_attribute.setdefault((block.labels[0], key, value), []).append(block)
+            elif block.type == 'data' and len(block.labels) == 2:
+                self.data[tuple(block.labels)] = block
+            elif block.type == 'variable' and block.labels:
+                self.variables[block.labels[0]] = block
+            elif block.type == 'output' and block.labels:
+                self.outputs[block.labels[0]] = block
+            elif block.type == 'module' and block.labels:
+                self.modules[block.labels[0]] = block
+            elif block.type == 'locals':
+                self.locals.update(block.attributes)
+
+    def __repr__(self):
+        return f'<TerraformModule {self.name} ({len(self.resources)} resources)>'
+
+    def resource(self, type: str, name: str) -> Block:
+        """The resource ``type.name``; raises KeyError when it is not declared"""
+        try:
+            return self.resources[(type, name)]
+        except KeyError:
+            raise KeyError(f'resource "{type}" "{name}" not declared in module {self.name}') from None
+
+    def has_resource(self, type: str, name: Optional[str] = None) -> bool:
+        if name is None:
+            return type in self._by_type
+        return (type, name) in self.resources
+
+    def resources_of_type(self, type: str) -> List[Block]:
+        return list(self._by_type.get(type, []))
+
+    def find(self, type: str, **attrs: Any) -> List[Block]:
+        """Resources of a type whose attributes equal the given values"""
+        if not attrs:
+            return self.resources_of_type(type)
+        (key, value), *rest = attrs.items()
+        candidates = self._by_attribute.get((type, key, value), [])
+        return [block for block in candidates if block.matches(**dict(rest))]
+
+    def variable(self, name: str) -> Block:
+        return self.variables[name]
+
+    def output(self, name: str) -> Block:
+        return self.outputs[name]
+
+    @classmethod
+    def load(cls, directory, name: Optional[str] = None) -> 'TerraformModule':
+        directory = Path(directory)
+        blocks = []
+        for tf_file in sorted(directory.glob('*.tf')):
+            blocks.extend(parse_file(tf_file))
+        return cls(name or directory.name, directory, blocks)
+
+
+class TerraformModel:
+    """A root Terraform configuration and the modules below ``modules/``"""
+
+    def __init__(self, root: TerraformModule, modules: Dict[str, TerraformModule]):
+        self.root = root
+        self.modules = modules
+
+    def __repr__(self):
+        return f'<TerraformModel {self.root.directory} modules={sorted(self.modules)}>'
+
+    def module(self, name: str) -> TerraformModule:
+        try:
+            return self.modules[name]
+        except KeyError:
+            raise KeyError(f'no module {name!r} under {self.root.directory / "modules"}') from None
+
+    def all_modules(self) -> Iterator[TerraformModule]:
+        yield self.root
+        yield from self.modules.values()
+
+    def resources_of_type(self, type: str) -> List[Block]:
+        return [block for module in self.all_modules() for block in module.resources_of_type(type)]
+
+    @classmethod
+    def load(cls, terraform_dir) -> 'TerraformModel':
+        terraform_dir = Path(terraform_dir)
+        modules = {}
+        modules_dir = terraform_dir / 'modules'
+        if modules_dir.is_dir():
+            for module_dir in sorted(p for p in modules_dir.iterdir() if p.is_dir()):
+                modules[module_dir.name] = TerraformModule.load(module_dir)
+        return cls(TerraformModule.load(terraform_dir, name='root'), modules)
@@ -0,0 +1,727 @@
+#!/usr/bin/env python3
+"""
+Repository-wide Terraform static policy scanner.
+
+Indexes every .tf file of the repository's Terraform trees (terraform/,
+SecDevOps_CICD/terraform/, infrastructure/terraform/monitoring/) into one
+resource graph and evaluates NSG, WAF, ACR and VM policies against it.
+
+Scanning runs in three phases:
+  1. parse     - changed files are parsed in a process pool
+  2. evaluate  - per-resource rules run in the process pool for every file
+                 whose content or module variables changed
+  3. graph     - rules that follow references between resources (NSG
+                 associations, VM public exposure, gateway WAF policy,
+                 duplicate addresses) run over the whole index
+
+Parsed blocks and per-file findings are cached by content hash, so a CI run
+after a small change only re-parses and re-evaluates the files it touched.
+
+Usage:
+    ./scripts/security/terraform_policy_scan.py
+    ./scripts/security/terraform_policy_scan.py --sarif reports/terraform.sarif --junit reports/terraform-junit.xml
+    ./scripts/security/terraform_policy_scan.py --fail-on medium --workers 8
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import hashlib
+import argparse
+import xml.etree.ElementTree as ET
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from terraform_model import Block, Expression, HCLSyntaxError, parse
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+
+DEFAULT_TREES = ['terraform', 'SecDevOps_CICD/terraform', 'infrastructure/terraform/monitoring']
+DEFAULT_CACHE = REPO_ROOT / '.cache' / 'terraform-policy-scan.json'
+CACHE_VERSION = 1
+RULESET_VERSION = '1'
+
+SEVERITY_ORDER = {'low': 1, 'medium': 2, 'high': 3, 'critical': 4}
+SARIF_LEVELS = {'critical': 'error', 'high': 'error', 'medium': 'warning', 'low': 'note'}
+
+MANAGEMENT_PORTS = {22: 'SSH', 3389: 'RDP', 5985: 'WinRM', 5986: 'WinRM', 8080: 'Jenkins'}
+OPEN_SOURCES = {'*', '0.0.0.0/0', '::/0', 'internet', 'any'}
+
+REFERENCE_RE = re.compile(r'\b([a-z][a-z0-9]*_[a-z0-9_]+)\.([A-Za-z_][A-Za-z0-9_\-]*)')
+VARIABLE_RE = re.compile(r'^var\.([A-Za-z_][A-Za-z0-9_\-]*)$')
+
+
+# ---------------------------------------------------------------------------
+# Rules
+# ---------------------------------------------------------------------------
+
+class Rule:
+    """A policy rule; check() yields (message, line) pairs for violations"""
+
+    def __init__(self, rule_id: str, severity: str, description: str,
+                 resource_types: Tuple[str, ...], check: Callable):
+        self.id = rule_id
+        self.severity = severity
+        self.description = description
+        self.resource_types = resource_types
+        self.check = check
+
+
+RESOURCE_RULES: List[Rule] = []
+GRAPH_RULES: List[Rule] = []
+
+
+def resource_rule(rule_id, severity, description, *resource_types):
+    def register(check):
+        RESOURCE_RULES.append(Rule(rule_id, severity, description, resource_types, check))
+        return check
+    return register
+
+
+def graph_rule(rule_id, severity, description, *resource_types):
+    def register(check):
+        GRAPH_RULES.append(Rule(rule_id, severity, description, resource_types, check))
+        return check
+    return register
+
+
+def resolve(value: Any, variables: Dict[str, Any]) -> Any:
+    """Replace a bare ``var.name`` reference with the variable's default"""
+    if isinstance(value, Expression):
+        match = VARIABLE_RE.match(value)
+        if match and match.group(1) in variables:
+            return variables[match.group(1)]
+    return value
+
+
+def resolve_all(value: Any, variables: Dict[str, Any]) -> List[Any]:
+    """Resolve a list attribute; anything but a list (e.g. an unresolved expression) is one item"""
+    value = resolve(value, variables)
+    if value is None:
+        return []
+    return list(value) if isinstance(value, list) else [value]
+
+
+def port_range_includes(port_range: Any, port: int) -> bool:
+    if not isinstance(port_range, str):
+        return False
+    for part in port_range.split(','):
+        part = part.strip()
+        if part == '*':
+            return True
+        if '-' in part:
+            low, _, high = part.partition('-')
+            if low.isdigit() and high.isdigit() and int(low) <= port <= int(high):
+                return True
+        elif part.isdigit() and int(part) == port:
+            return True
+    return False
+
+
+@resource_rule('NSG001', 'high', 'Management ports must not be open to the internet',
+               'azurerm_network_security_group')
+def check_nsg_open_management_ports(block: Block, variables: Dict[str, Any]):
+    for rule in block.children('security_rule'):
+        if str(resolve(rule.get('direction'), variables)).lower() != 'inbound' \
+                or str(resolve(rule.get('access'), variables)).lower() != 'allow':
+            continue
+        sources = [resolve(rule.get('source_address_prefix'), variables)]
+        sources.extend(resolve_all(rule.get('source_address_prefixes'), variables))
+        if not any(isinstance(s, str) and s.lower() in OPEN_SOURCES for s in sources):
+            continue
+        ranges = [resolve(rule.get('destination_port_range'), variables)]
+        ranges.extend(resolve_all(rule.get('destination_port_ranges'), variables))
+        for port, service in MANAGEMENT_PORTS.items():
+            if any(port_range_includes(r, port) for r in ranges):
+                yield (f"security_rule '{rule.get('name')}' allows {service} ({port}) "
+                       f"from any source", rule.line)
+
+
+@resource_rule('NSG003', 'medium', 'Inbound allow rules should not permit every port',
+               'azurerm_network_security_group')
+def check_nsg_all_ports(block: Block, variables: Dict[str, Any]):
+    for rule in block.children('security_rule'):
+        if str(resolve(rule.get('direction'), variables)).lower() == 'inbound' \
+                and str(resolve(rule.get('access'), variables)).lower() == 'allow' \
+                and resolve(rule.get('destination_port_range'), variables) == '*':
+            yield f"security_rule '{rule.get('name')}' allows inbound traffic on all ports", rule.line
+
+
+@resource_rule('WAF001', 'high', 'WAF policy must be enabled in Prevention mode',
+               'azurerm_web_application_firewall_policy')
+def check_waf_prevention_mode(block: Block, variables: Dict[str, Any]):
+    settings = block.children('policy_settings')
+    if not settings:
+        yield 'policy_settings block is missing', block.line
+        return
+    enabled = resolve(settings[0].get('enabled', True), variables)
+    mode = resolve(settings[0].get('mode', 'Prevention'), variables)
+    if enabled is False:
+        yield 'WAF policy is disabled', settings[0].line
+    if isinstance(mode, str) and not isinstance(mode, Expression) and mode != 'Prevention':
+        yield f"WAF policy mode is '{mode}', expected 'Prevention'", settings[0].line
+
+
+@resource_rule('WAF002', 'high', 'WAF policy must use OWASP managed rules 3.2 or later',
+               'azurerm_web_application_firewall_policy')
+def check_waf_managed_rules(block: Block, variables: Dict[str, Any]):
+    rule_sets = [rule_set for managed in block.children('managed_rules')
+                 for rule_set in managed.children('managed_rule_set')]
+    owasp = [rs for rs in rule_sets if resolve(rs.get('type', 'OWASP'), variables) == 'OWASP']
+    if not owasp:
+        yield 'no OWASP managed_rule_set configured', block.line
+    for rule_set in owasp:
+        version = str(resolve(rule_set.get('version'), variables))
+        try:
+            too_old = tuple(int(p) for p in version.split('.')) < (3, 2)
+        except ValueError:
+            continue
+        if too_old:
+            yield f'OWASP rule set version {version} is older than 3.2', rule_set.line
+
+
+@resource_rule('WAF003', 'medium', 'WAF managed rule groups should not disable rules',
+               'azurerm_web_application_firewall_policy')
+def check_waf_disabled_rules(block: Block, variables: Dict[str, Any]):
+    for managed in block.children('managed_rules'):
+        for rule_set in managed.children('managed_rule_set'):
+            for override in rule_set.children('rule_group_override'):
+                disabled = resolve(override.get('disabled_rules'), variables)
+                if disabled:
+                    yield (f"rule group {override.get('rule_group_name')} disables "
+                           f"{len(disabled)} rule(s)", override.line)
+
+
+@resource_rule('ACR001', 'high', 'Container registry admin user must be disabled',
+               'azurerm_container_registry')
+def check_acr_admin(block: Block, variables: Dict[str, Any]):
+    if resolve(block.get('admin_enabled', False), variables) is True:
+        yield 'admin_enabled = true exposes a shared admin credential', block.line
+
+
+@resource_rule('ACR002', 'medium', 'Container registry network access should default to Deny',
+               'azurerm_container_registry')
+def check_acr_network(block: Block, variables: Dict[str, Any]):
+    if resolve(block.get('public_network_access_enabled', True), variables) is False:
+        return
+    rule_sets = block.children('network_rule_set')
+    if not rule_sets:
+        yield 'no network_rule_set; registry is reachable from any network', block.line
+    elif resolve(rule_sets[0].get('default_action', 'Allow'), variables) == 'Allow':
+        yield 'network_rule_set default_action is Allow', rule_sets[0].line
+
+
+@resource_rule('ACR003', 'low', 'Container registry should enforce content trust',
+               'azurerm_container_registry')
+def check_acr_trust(block: Block, variables: Dict[str, Any]):
+    trust = block.children('trust_policy')
+    if not trust or resolve(trust[0].get('enabled', False), variables) is not True:
+        yield 'trust_policy is not enabled', block.line
+
+
+@resource_rule('ACR004', 'high', 'Registry webhooks must use HTTPS',
+               'azurerm_container_registry_webhook')
+def check_acr_webhook_https(block: Block, variables: Dict[str, Any]):
+    uri = resolve(block.get('service_uri'), variables)
+    if isinstance(uri, str) and uri.startswith('http://'):
+        yield f'webhook service_uri {uri} is not HTTPS', block.line
+
+
+@resource_rule('VM001', 'high', 'Linux VMs must disable password authentication',
+               'azurerm_linux_virtual_machine')
+def check_vm_password_auth(block: Block, variables: Dict[str, Any]):
+    if resolve(block.get('disable_password_authentication', True), variables) is not True:
+        yield 'password authentication is enabled', block.line
+    if 'admin_password' in block.attributes:
+        yield 'admin_password is set', block.line
+
+
+@resource_rule('VM003', 'low', 'VMs should use a managed identity', 'azurerm_linux_virtual_machine')
+def check_vm_identity(block: Block, variables: Dict[str, Any]):
+    if not block.children('identity'):
+        yield 'no managed identity configured', block.line
+
+
+@resource_rule('VM004', 'medium', 'VM OS disks should use premium or encrypted storage',
+               'azurerm_linux_virtual_machine')
+def check_vm_disk(block: Block, variables: Dict[str, Any]):
+    for disk in block.children('os_disk'):
+        storage = resolve(disk.get('storage_account_type'), variables)
+        if storage == 'Standard_LRS' and 'disk_encryption_set_id' not in disk.attributes:
+            yield 'os_disk uses Standard_LRS without a disk encryption set', disk.line
+
+
+# ---------------------------------------------------------------------------
+# Index
+# ---------------------------------------------------------------------------
+
+def encode_value(value: Any) -> Any:
+    if isinstance(value, Expression):
+        return {'$expr': str(value)}
+    if isinstance(value, list):
+        return [encode_value(v) for v in value]
+    if isinstance(value, dict):
+        return {k: encode_value(v) for k, v in value.items()}
+    return value
+
+
+def decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if set(value) == {'$expr'}:
+            return Expression(value['$expr'])
+        return {k: decode_value(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [decode_value(v) for v in value]
+    return value
+
+
+def block_to_dict(block: Block) -> Dict[str, Any]:
+    return {
+        'type': block.type,
+        'labels': block.labels,
+        'line': block.line,
+        'attributes': {k: encode_value(v) for k, v in block.attributes.items()},
+        'blocks': [block_to_dict(b) for b in block.blocks]
+    }
+
+
+def block_from_dict(data: Dict[str, Any], path: str) -> Block:
+    return Block(data['type'], data['labels'],
+                 {k: decode_value(v) for k, v in data['attributes'].items()},
+                 [block_from_dict(b, path) for b in data['blocks']],
+                 path, data['line'])
+
+
+def iter_strings(value: Any) -> Iterable[str]:
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, list):
+        for item in value:
+            yield from iter_strings(item)
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from iter_strings(item)
+
+
+def block_strings(block: Block) -> Iterable[str]:
+    for value in block.attributes.values():
+        yield from iter_strings(value)
+    for child in block.blocks:
+        yield from block_strings(child)
+
+
+class Resource:
+    def __init__(self, module: str, block: Block, relpath: str):
+        self.module = module
+        self.block = block
+        self.type, self.name = block.labels
+        self.relpath = relpath
+        self.address = f'{self.type}.{self.name}'
+
+    @property
+    def key(self) -> Tuple[str, str, str]:
+        return (self.module, self.type, self.name)
+
+    @property
+    def qualified_address(self) -> str:
+        return f'{self.module}:{self.address}'
+
+
+class ResourceIndex:
+    """All resources of the scanned trees with reference edges between them"""
+
+    def __init__(self):
+        self.resources: Dict[Tuple[str, str, str], List[Resource]] = defaultdict(list)
+        self.by_type: Dict[str, List[Resource]] = defaultdict(list)
+        self.variables: Dict[str, Dict[str, Any]] = defaultdict(dict)
+        self.references: Dict[Tuple[str, str, str], set] = defaultdict(set)
+        self.referenced_by: Dict[Tuple[str, str, str], set] = defaultdict(set)
+
+    def add_file(self, module: str, relpath: str, blocks: List[Block]):
+        for block in blocks:
+            if block.type == 'resource' and len(block.labels) == 2:
+                resource = Resource(module, block, relpath)
+                self.resources[resource.key].append(resource)
+                self.by_type[resource.type].append(resource)
+            elif block.type == 'variable' and block.labels and 'default' in block.attributes:
+                self.variables[module][block.labels[0]] = block.attributes['default']
+
+    def link(self):
+        """Record an edge for every reference to another resource in the same module"""
+        for key, resources in self.resources.items():
+            module = key[0]
+            for resource in resources:
+                for text in block_strings(resource.block):
+                    for type_, name in REFERENCE_RE.findall(text):
+                        target = (module, type_, name)
+                        if target in self.resources and target != key:
+                            self.references[key].add(target)
+                            self.referenced_by[target].add(key)
+
+    def get(self, key: Tuple[str, str, str]) -> Optional[Resource]:
+        found = self.resources.get(key)
+        return found[0] if found else None
+
+    def referrers(self, resource: Resource, type_: str) -> List[Resource]:
+        return [self.get(k) for k in sorted(self.referenced_by.get(resource.key, ())) if k[1] == type_]
+
+    def referenced(self, resource: Resource, type_: str) -> List[Resource]:
+        return [self.get(k) for k in sorted(self.references.get(resource.key, ())) if k[1] == type_]
+
+
+@graph_rule('NSG002', 'medium', 'Network security groups must be associated with a subnet or NIC',
+            'azurerm_network_security_group')
+def check_nsg_associated(resource: Resource, index: ResourceIndex):
+    associations = index.referrers(resource, 'azurerm_subnet_network_security_group_association') + \
+        index.referrers(resource, 'azurerm_network_interface_security_group_association')
+    if not associations:
+        yield 'NSG is not associated with any subnet or network interface', resource.block.line
+
+
+@graph_rule('VM002', 'medium', 'VMs should not be directly exposed through a public IP',
+            'azurerm_linux_virtual_machine')
+def check_vm_public_ip(resource: Resource, index: ResourceIndex):
+    for nic in index.referenced(resource, 'azurerm_network_interface'):
+        for public_ip in index.referenced(nic, 'azurerm_public_ip'):
+            yield (f'reachable from the internet via {nic.address} -> {public_ip.address}',
+                   resource.block.line)
+
+
+@graph_rule('WAF004', 'high', 'Application gateways must be protected by a WAF policy',
+            'azurerm_application_gateway')
+def check_gateway_waf(resource: Resource, index: ResourceIndex):
+    block = resource.block
+    if block.children('waf_configuration'):
+        return
+    policies = index.referenced(resource, 'azurerm_web_application_firewall_policy')
+    if 'firewall_policy_id' not in block.attributes or not policies:
+        sku = block.children('sku')
+        tier = sku[0].get('tier') if sku else None
+        yield f'no firewall_policy_id or waf_configuration (sku tier {tier})', block.line
+
+
+@graph_rule('TF001', 'high', 'Resource addresses must be unique within a module')
+def check_duplicate_address(resource: Resource, index: ResourceIndex):
+    duplicates = index.resources[resource.key]
+    if len(duplicates) > 1 and duplicates[0] is not resource:
+        first = duplicates[0]
+        yield (f'{resource.address} is already declared in {first.relpath}:{first.block.line}',
+               resource.block.line)
+
+
+# ---------------------------------------------------------------------------
+# Scanner
+# ---------------------------------------------------------------------------
+
+def finding(rule: Rule, resource_type: str, resource_name: str, relpath: str,
+            line: int, message: str, module: str) -> Dict[str, Any]:
+    return {
+        'rule_id': rule.id,
+        'severity': rule.severity,
+        'description': rule.description,
+        'message': message,
+        'resource': f'{resource_type}.{resource_name}',
+        'module': module,
+        'file': relpath,
+        'line': line
+    }
+
+
+def parse_worker(path: str) -> Dict[str, Any]:
+    """Parse one file (runs in a worker process)"""
+    try:
+        text = Path(path).read_text(encoding='utf-8')
+        return {'blocks': [block_to_dict(b) for b in parse(text, path)]}
+    except (HCLSyntaxError, OSError, UnicodeDecodeError) as e:
+        return {'error': str(e)}
+
+
+def evaluate_worker(task: Tuple[str, str, str, List[Dict[str, Any]], Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Evaluate per-resource rules for one file (runs in a worker process)"""
+    relpath, path, module, blocks, variables = task
+    variables = {k: decode_value(v) for k, v in variables.items()}
+    findings = []
+    for data in blocks:
+        block = block_from_dict(data, path)
+        if block.type != 'resource' or len(block.labels) != 2:
+            continue
+        for rule in RESOURCE_RULES:
+            if block.labels[0] not in rule.resource_types:
+                continue
+            for message, line in rule.check(block, variables):
+                findings.append(finding(rule, *block.labels, relpath, line, message, module))
+    return findings
+
+
+class TerraformPolicyScanner:
+    """Index the Terraform trees and evaluate the policy rules"""
+
+    def __init__(self, trees: List[str], root: Path = REPO_ROOT, cache_file: Optional[Path] = DEFAULT_CACHE,
+                 workers: Optional[int] = None):
+        self.root = Path(root)
+        self.trees = trees
+        self.cache_file = Path(cache_file) if cache_file else None
+        self.workers = workers or min(os.cpu_count() or 1, 8)
+        self.cache = self._load_cache()
+        self.stats = {'files': 0, 'parsed': 0, 'evaluated': 0, 'cached': 0, 'resources': 0}
+
+    def _load_cache(self) -> Dict[str, Any]:
+        if not self.cache_file or not self.cache_file.exists():
+            return {}
+        try:
+            data = json.loads(self.cache_file.read_text())
+        except ValueError:
+            return {}
+        if data.get('version') != CACHE_VERSION or data.get('ruleset') != RULESET_VERSION:
+            return {}
+        return data.get('files', {})
+
+    def _save_cache(self, files: Dict[str, Any]):
+        if not self.cache_file:
+            return
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.cache_file.with_suffix('.tmp')
+        tmp.write_text(json.dumps({'version': CACHE_VERSION, 'ruleset': RULESET_VERSION, 'files': files}))
+        os.replace(tmp, self.cache_file)
+
+    def discover(self) -> List[Tuple[str, Path, str]]:
+        """(relative path, absolute path, module directory) for every .tf file"""
+        files = []
+        for tree in self.trees:
+            tree_dir = self.root / tree
+            for path in sorted(tree_dir.rglob('*.tf')):
+                if '.terraform' in path.parts:
+                    continue
+                relpath = path.relative_to(self.root).as_posix()
+                files.append((relpath, path, path.parent.relative_to(self.root).as_posix()))
+        return files
+
+    def _map(self, executor, fn, items):
+        if executor is None:
+            return [fn(item) for item in items]
+        return list(executor.map(fn, items, chunksize=max(1, len(items) // (self.workers * 4))))
+
+    def scan(self) -> Dict[str, Any]:
+        start = time.perf_counter()
+        files = self.discover()
+        self.stats['files'] = len(files)
+
+        entries = {}
+        to_parse = []
+        for relpath, path, module in files:
+            sha = hashlib.sha256(path.read_bytes()).hexdigest()
+            cached = self.cache.get(relpath)
+            if cached and cached['sha'] == sha:
+                entries[relpath] = cached
+            else:
+                entries[relpath] = {'sha': sha, 'module': module}
+                to_parse.append((relpath, path))
+
+        executor = None
+        if self.workers > 1 and len(to_parse) > 1:
+            executor = ProcessPoolExecutor(max_workers=self.workers)
+        try:
+            # Phase 1: parse changed files
+            for (relpath, _), result in zip(to_parse, self._map(executor, parse_worker,
+                                                                 [str(p) for _, p in to_parse])):
+                entries[relpath].update(result)
+            self.stats['parsed'] = len(to_parse)
+
+            index = ResourceIndex()
+            for relpath, path, module in files:
+                blocks = [block_from_dict(b, str(path)) for b in entries[relpath].get('blocks', [])]
+                index.add_file(module, relpath, blocks)
+            index.link()
+            self.stats['resources'] = sum(len(r) for r in index.resources.values())
+
+            # Phase 2: per-resource rules for files whose content or module variables changed
+            tasks = []
+            for relpath, path, module in files:
+                entry = entries[relpath]
+                variables = {k: encode_value(v) for k, v in sorted(index.variables[module].items())}
+                context = hashlib.sha256(json.dumps(variables, sort_keys=True).encode()).hexdigest()
+                if entry.get('context') == context and 'findings' in entry:
+                    self.stats['cached'] += 1
+                    continue
+                entry['context'] = context
+                tasks.append((relpath, str(path), module, entry.get('blocks', []), variables))
+            for task, findings in zip(tasks, self._map(executor, evaluate_worker, tasks)):
+                entries[task[0]]['findings'] = findings
+            self.stats['evaluated'] = len(tasks)
+        finally:
+            if executor:
+                executor.shutdown()
+
+        # Phase 3: graph rules over the whole index
+        findings = [f for relpath, _, _ in files for f in entries[relpath].get('findings', [])]
+        for rule in GRAPH_RULES:
+            candidates = (r for t in rule.resource_types for r in index.by_type.get(t, [])) \
+                if rule.resource_types else (r for rs in index.resources.values() for r in rs)
+            for resource in candidates:
+                for message, line in rule.check(resource, index):
+                    findings.append(finding(rule, resource.type, resource.name, resource.relpath,
+                                            line, message, resource.module))
+
+        errors = [{'file': relpath, 'error': entries[relpath]['error']}
+                  for relpath, _, _ in files if 'error' in entries[relpath]]
+        self._save_cache({relpath: entries[relpath] for relpath, _, _ in files})
+
+        findings.sort(key=lambda f: (-SEVERITY_ORDER[f['severity']], f['file'], f['line'], f['rule_id']))
+        self.stats['duration_seconds'] = round(time.perf_counter() - start, 3)
+        return {
+            'findings': findings,
+            'errors': errors,
+            'resources': [r for rs in index.resources.values() for r in rs],
+            'stats': self.stats
+        }
+
+
+# ---------------------------------------------------------------------------
+# Reports
+# ---------------------------------------------------------------------------
+
+def all_rules() -> List[Rule]:
+    return RESOURCE_RULES + GRAPH_RULES
+
+
+def to_sarif(result: Dict[str, Any]) -> Dict[str, Any]:
+    """SARIF 2.1.0 log for GitHub code scanning / Jenkins Warnings NG"""
+    rules = all_rules()
+    rule_index = {rule.id: i for i, rule in enumerate(rules)}
+    return {
+        '$schema': 'https://json.schemastore.org/sarif-2.1.0.json',
+        'version': '2.1.0',
+        'runs': [{
+            'tool': {
+                'driver': {
+                    'name': 'terraform-policy-scan',
+                    'version': RULESET_VERSION,
+                    'rules': [{
+                        'id': rule.id,
+                        'shortDescription': {'text': rule.description},
+                        'defaultConfiguration': {'level': SARIF_LEVELS[rule.severity]},
+                        'properties': {'severity': rule.severity}
+                    } for rule in rules]
+                }
+            },
+            'results': [{
+                'ruleId': f['rule_id'],
+                'ruleIndex': rule_index[f['rule_id']],
+                'level': SARIF_LEVELS[f['severity']],
+                'message': {'text': f"{f['resource']}: {f['message']}"},
+                'locations': [{
+                    'physicalLocation': {
+                        'artifactLocation': {'uri': f['file']},
+                        'region': {'startLine': f['line']}
+                    }
+                }]
+            } for f in result['findings']]
+        }]
+    }
+
+
+def to_junit(result: Dict[str, Any]) -> ET.ElementTree:
+    """One testcase per scanned resource, failing with its findings"""
+    by_resource = defaultdict(list)
+    for f in result['findings']:
+        by_resource[(f['module'], f['resource'])].append(f)
+
+    checked_types = {t for rule in all_rules() for t in rule.resource_types}
+    suites = defaultdict(list)
+    for resource in result['resources']:
+        if resource.type in checked_types or by_resource.get((resource.module, resource.address)):
+            suites[resource.module].append(resource)
+
+    root = ET.Element('testsuites', name='terraform-policy-scan')
+    total_failures = 0
+    for module in sorted(suites):
+        resources = suites[module]
+        failures = sum(1 for r in resources if by_resource.get((module, r.address)))
+        total_failures += failures
+        suite = ET.SubElement(root, 'testsuite', name=module, tests=str(len(resources)),
+                              failures=str(failures))
+        for resource in resources:
+            case = ET.SubElement(suite, 'testcase', classname=module, name=resource.address,
+                                 file=resource.relpath, line=str(resource.block.line))
+            for f in by_resource.get((module, resource.address), []):
+                failure = ET.SubElement(case, 'failure', type=f['rule_id'],
+                                        message=f"[{f['severity'].upper()}] {f['message']}")
+                failure.text = f"{f['description']}\n{f['file']}:{f['line']}"
+    for error in result['errors']:
+        suite = ET.SubElement(root, 'testsuite', name=error['file'], tests='1', errors='1')
+        case = ET.SubElement(suite, 'testcase', classname='parse', name=error['file'])
+        ET.SubElement(case, 'error', message=error['error'])
+    root.set('tests', str(sum(len(r) for r in suites.values()) + len(result['errors'])))
+    root.set('failures', str(total_failures))
+    return ET.ElementTree(root)
+
+
+def print_summary(result: Dict[str, Any]):
+    stats = result['stats']
+    print("\n" + "=" * 60)
+    print("TERRAFORM POLICY SCAN")
+    print("=" * 60)
+    print(f"Files: {stats['files']} (parsed {stats['parsed']}, evaluated {stats['evaluated']}, "
+          f"cached {stats['cached']})")
+    print(f"Resources: {stats['resources']}  Duration: {stats['duration_seconds']}s")
+
+    counts = defaultdict(int)
+    for f in result['findings']:
+        counts[f['severity']] += 1
+    print(f"Findings: {len(result['findings'])} " +
+          ' '.join(f"{sev}={counts[sev]}" for sev in sorted(SEVERITY_ORDER, key=SEVERITY_ORDER.get, reverse=True)))
+    print("-" * 60)
+    for f in result['findings']:
+        print(f"[{f['severity'].upper():<8}] {f['rule_id']:<7} {f['file']}:{f['line']} "
+              f"{f['resource']}: {f['message']}")
+    for error in result['errors']:
+        print(f"[ERROR   ] parse   {error['file']}: {error['error']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Scan the repository Terraform trees against security policies')
+    parser.add_argument('trees', nargs='*', default=DEFAULT_TREES,
+                        help='Terraform directories relative to the repository root')
+    parser.add_argument('--sarif', help='Write SARIF 2.1.0 results to this file')
+    parser.add_argument('--junit', help='Write JUnit XML results to this file')
+    parser.add_argument('--json', help='Write raw findings as JSON to this file')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count, max 8)')
+    parser.add_argument('--cache', default=str(DEFAULT_CACHE), help='Per-file result cache')
+    parser.add_argument('--no-cache', action='store_true', help='Ignore and do not write the cache')
+    parser.add_argument('--fail-on', choices=list(SEVERITY_ORDER), default='high',
+                        help='Exit 1 when a finding has at least this severity (default: high)')
+    args = parser.parse_args()
+
+    scanner = TerraformPolicyScanner(args.trees, cache_file=None if args.no_cache else Path(args.cache),
+                                     workers=args.workers)
+    result = scanner.scan()
+    print_summary(result)
+
+    if args.sarif:
+        Path(args.sarif).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.sarif, 'w') as f:
+            json.dump(to_sarif(result), f, indent=2)
+        print(f"SARIF report: {args.sarif}")
+    if args.junit:
+        Path(args.junit).parent.mkdir(parents=True, exist_ok=True)
+        to_junit(result).write(args.junit, encoding='utf-8', xml_declaration=True)
+        print(f"JUnit report: {args.junit}")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'findings': result['findings'], 'errors': result['errors'],
+                       'stats': result['stats']}, f, indent=2)
+
+    threshold = SEVERITY_ORDER[args.fail_on]
+    blocking = [f for f in result['findings'] if SEVERITY_ORDER[f['severity']] >= threshold]
+    if blocking or result['errors']:
+        print(f"\n❌ {len(blocking)} finding(s) at or above '{args.fail_on}', {len(result['errors'])} parse error(s)")
+        sys.exit(1)
+    print("\n✅ No policy violations at or above the threshold")
+
+
+if __name__ == '__main__':
+    main()
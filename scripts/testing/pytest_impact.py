@@ -0,0 +1,312 @@
+"""
+Test impact mapping for pytest.
+
+Load it with ``-p pytest_impact`` (with scripts/testing on PYTHONPATH) and
+``--record-impact`` to record which repository files every test touches, via
+an ``open`` audit hook. File accesses are attributed to whatever is running
+when they happen:
+
+* a test's own setup/call/teardown                 -> that test
+* a fixture's setup (session fixtures run once)    -> that fixture, and so
+  every test that uses the fixture
+* importing a test module during collection        -> every test in it
+* anything else (conftest.py and its imports)      -> global: a change to it
+  affects the whole suite
+
+The map is written to ``--impact-file`` (default
+``<rootdir>/.test-impact.json``) together with the commit it was recorded
+at. select-tests.py combines it with a static path -> test mapping to run
+only the tests affected by a ``git diff`` range.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from collections import defaultdict
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+import pytest
+
+DEFAULT_IMPACT_FILE = '.test-impact.json'
+IMPACT_VERSION = 1
+TEST_FILE_GLOB = 'test_*.py'
+IGNORED_DIRS = {'.git', '.pytest_cache', '.cache', '.terraform', 'venv', '.venv', 'node_modules'}
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('impact', 'test impact mapping')
+    group.addoption('--record-impact', action='store_true',
+                    help='Record the files each test touches into the impact file')
+    group.addoption('--impact-file', default=None,
+                    help=f'Impact map location (default: <rootdir>/{DEFAULT_IMPACT_FILE})')
+
+
+def git_root(start: Path) -> Path:
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--show-toplevel'], cwd=start,
+                             capture_output=True, text=True, check=True).stdout.strip()
+        return Path(out)
+    except (OSError, subprocess.CalledProcessError):
+        return Path(start)
+
+
+def git_head(root: Path) -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=root,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def source_path(path: str) -> str:
+    """Map a cached bytecode file back to the module source it was compiled from"""
+    head, name = os.path.split(path)
+    if os.path.basename(head) == '__pycache__' and name.endswith('.pyc'):
+        return os.path.join(os.path.dirname(head), name.split('.', 1)[0] + '.py')
+    return path
+
+
+class FileAccessTracer:
+    """Collects repository files opened by the process, keyed by the current owner"""
+
+    def __init__(self, root: Path, exclude: Iterable[Path] = ()):
+        self.root = str(root.resolve()) + os.sep
+        self.exclude = {str(Path(p).resolve()) for p in exclude}
+        self.owners: List[Tuple[str, str]] = []
+        self.accessed: Dict[Tuple[str, str], Set[str]] = defaultdict(set)
+        self.active = False
+
+    def audit(self, event, args):
+        if not self.active or event != 'open':
+            return
+        path = args[0]
+        if isinstance(path, int) or path is None:
+            return
+        path = os.path.abspath(os.fsdecode(path))
+        if not path.startswith(self.root) or path in self.exclude:
+            return
+        rel = source_path(path[len(self.root):]).replace(os.sep, '/')
+        if IGNORED_DIRS.intersection(rel.split('/')):
+            return
+        self.accessed[self.owners[-1] if self.owners else ('global', '')].add(rel)
+
+    def push(self, kind: str, name: str):
+        self.owners.append((kind, name))
+
+    def pop(self):
+        self.owners.pop()
+
+
+class ImpactRecorder:
+    def __init__(self, rootdir: Path, impact_file: Optional[str]):
+        self.rootdir = Path(rootdir)
+        self.impact_file = Path(impact_file) if impact_file else self.rootdir / DEFAULT_IMPACT_FILE
+        self.repo_root = git_root(self.rootdir)
+        self.tracer = FileAccessTracer(self.repo_root, exclude=[self.impact_file])
+        self.tests: Dict[str, Dict[str, object]] = {}
+        self.test_modules: Set[str] = set()
+        # Audit hooks cannot be removed; the tracer is switched off at session end instead
+        sys.addaudithook(self.tracer.audit)
+        self.tracer.active = True
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_make_collect_report(self, collector):
+        if isinstance(collector, pytest.Module):
+            module = self.relpath(collector.path)
+            self.test_modules.add(module)
+            self.tracer.push('module', module)
+            yield
+            self.tracer.pop()
+        else:
+            yield
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_fixture_setup(self, fixturedef, request):
+        self.tracer.push('fixture', fixturedef.argname)
+        yield
+        self.tracer.pop()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        self.tests[item.nodeid] = {
+            'module': self.relpath(item.path),
+            'fixtures': sorted(getattr(item, 'fixturenames', ())),
+        }
+        self.tracer.push('test', item.nodeid)
+        yield
+        self.tracer.pop()
+
+    def relpath(self, path) -> str:
+        return Path(path).resolve().relative_to(self.repo_root.resolve()).as_posix()
+
+    def build_map(self) -> Dict[str, object]:
+        accessed = self.tracer.accessed
+        tests = {}
+        for nodeid, info in self.tests.items():
+            tests[nodeid] = dict(info, files=sorted(accessed.get(('test', nodeid), ())))
+        return {
+            'version': IMPACT_VERSION,
+            'commit': git_head(self.repo_root),
+            'rootdir': self.relpath(self.rootdir) if self.rootdir != self.repo_root else '.',
+            'global': sorted(accessed.get(('global', ''), ())),
+            'modules': {name: sorted(files) for (kind, name), files in accessed.items() if kind == 'module'},
+            'fixtures': {name: sorted(files) for (kind, name), files in accessed.items() if kind == 'fixture'},
+            'test_modules': sorted(self.test_modules),
+            'tests': tests,
+        }
+
+    def pytest_sessionfinish(self, session, exitstatus):
+        self.tracer.active = False
+        if exitstatus in (pytest.ExitCode.OK, pytest.ExitCode.TESTS_FAILED) and self.tests:
+            write_impact_map(self.impact_file, self.build_map())
+
+    def pytest_report_header(self, config):
+        return f'recording test impact into {self.impact_file}'
+
+
+def write_impact_map(path: Path, impact: Dict[str, object]):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    with os.fdopen(fd, 'w') as f:
+        json.dump(impact, f, indent=1, sort_keys=True)
+        f.write('\n')
+    os.replace(tmp_path, path)
+
+
+def load_impact_map(path: Path) -> Optional[Dict[str, object]]:
+    try:
+        with open(path) as f:
+            impact = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return impact if impact.get('version') == IMPACT_VERSION else None
+
+
+class Selection(NamedTuple):
+    """Tests to run: None means the full suite, with the reason in `reasons`"""
+    targets: Optional[List[str]]
+    reasons: Dict[str, str]
+
+    @property
+    def full(self) -> bool:
+        return self.targets is None
+
+
+def tests_by_dependency(impact: Dict[str, object]) -> Dict[str, Set[str]]:
+    """Invert the map: repository file -> node ids that (transitively) touched it"""
+    fixtures = impact['fixtures']
+    modules = impact['modules']
+    dependents: Dict[str, Set[str]] = defaultdict(set)
+    for nodeid, info in impact['tests'].items():
+        files = set(info['files'])
+        files.update(modules.get(info['module'], ()))
+        for name in info['fixtures']:
+            files.update(fixtures.get(name, ()))
+        files.add(info['module'])
+        for path in files:
+            dependents[path].add(nodeid)
+    return dependents
+
+
+def select_tests(changed: Sequence[str], impact: Dict[str, object], suite_dir: str,
+                 static_rules: Sequence[Tuple[str, Sequence[str]]] = (),
+                 code_suffixes: Sequence[str] = (), exclude: Sequence[str] = ()) -> Selection:
+    """Tests of the suite in suite_dir affected by the changed repository paths
+
+    Static rules (suite-relative glob -> suite-relative test modules) take
+    precedence over the recorded map, so a path they cover selects exactly
+    their tests even if a shared session fixture read it for every test.
+    Changed test modules always select themselves. A change to a global
+    dependency, or to a code file neither mapping knows about, selects the
+    full suite.
+    """
+    prefix = '' if suite_dir in ('', '.') else suite_dir.rstrip('/') + '/'
+    dependents = tests_by_dependency(impact)
+    global_files = set(impact['global'])
+    modules = defaultdict(list)
+    for nodeid, info in impact['tests'].items():
+        modules[info['module']].append(nodeid)
+
+    targets: Set[str] = set()
+    reasons: Dict[str, str] = {}
+    for path in changed:
+        if not path.startswith(prefix) or any(path.startswith(e.rstrip('/') + '/') for e in exclude):
+            continue
+        rel = path[len(prefix):]
+        if fnmatch(os.path.basename(rel), TEST_FILE_GLOB) and rel.endswith('.py'):
+            targets.add(rel)
+            reasons[rel] = f'{path} changed'
+            continue
+        static = [tests for pattern, tests in static_rules if fnmatch(rel, pattern)]
+        if static:
+            for tests in static:
+                for test in tests:
+                    targets.add(test)
+                    reasons[test] = f'{path} changed (static mapping)'
+            continue
+        if os.path.basename(rel) == 'conftest.py':
+            # A conftest only applies to the tests below its directory
+            directory = os.path.dirname(rel) or '.'
+            targets.add(directory)
+            reasons[directory] = f'{path} changed'
+            continue
+        if path in global_files:
+            return Selection(None, {'*': f'{path} is loaded by every test (conftest or its imports)'})
+        if path in dependents:
+            for nodeid in dependents[path]:
+                targets.add(nodeid)
+                reasons.setdefault(nodeid, f'{path} changed (recorded access)')
+            continue
+        if path.endswith(tuple(code_suffixes)):
+            return Selection(None, {'*': f'{path} is not in the impact map'})
+
+    selected = sorted(collapse_targets(targets, modules, prefix))
+    for target in selected:
+        if target not in reasons:
+            reasons[target] = next(r for n, r in sorted(reasons.items()) if n.startswith(target + '::'))
+    return Selection(selected, reasons)
+
+
+def collapse_targets(targets: Set[str], modules: Dict[str, List[str]], prefix: str) -> Set[str]:
+    """Drop node ids whose module is already selected as a whole, and select fully covered modules"""
+    whole = {t for t in targets if '::' not in t}
+    nodes = {t for t in targets if '::' in t}
+    for module, nodeids in modules.items():
+        rel = module[len(prefix):] if module.startswith(prefix) else module
+        if set(nodeids) <= nodes:
+            whole.add(rel)
+    return whole | {n for n in nodes if n.split('::')[0] not in whole}
+
+
+def stale_reason(impact: Optional[Dict[str, object]], suite_root: Path, test_dirs: Sequence[str],
+                 changed_since_recording: Optional[Sequence[str]]) -> Optional[str]:
+    """Why the recorded map cannot be trusted, or None if it can"""
+    if impact is None:
+        return 'no impact map recorded'
+    if changed_since_recording is None:
+        return f"recorded commit {impact.get('commit')} is not in this repository"
+    recorded = set(impact['test_modules'])
+    repo_prefix = '' if impact['rootdir'] == '.' else impact['rootdir'] + '/'
+    current = {repo_prefix + p.relative_to(suite_root).as_posix()
+               for d in test_dirs for p in (suite_root / d).rglob(TEST_FILE_GLOB)
+               if not IGNORED_DIRS.intersection(p.parts)}
+    if current != recorded:
+        return 'test modules were added or removed since the map was recorded'
+    global_files = set(impact['global'])
+    for path in changed_since_recording:
+        if path in global_files or os.path.basename(path) == 'conftest.py':
+            return f'{path} changed since the map was recorded'
+    return None
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_load_initial_conftests(early_config, parser, args):
+    # Start tracing before the initial conftest.py files (and what they import) are loaded
+    options = early_config.known_args_namespace
+    if options.record_impact:
+        recorder = ImpactRecorder(early_config.rootpath, options.impact_file)
+        early_config.pluginmanager.register(recorder, 'impact-recorder')
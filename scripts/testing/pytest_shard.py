@@ -0,0 +1,169 @@
+"""
+Duration-aware test sharding for pytest.
+
+Load it with ``-p pytest_shard`` (with scripts/testing on PYTHONPATH). It
+does three things:
+
+* records setup + call + teardown time per test and merges it into a timing
+  file (``--store-durations``, default ``<rootdir>/.test-durations.json``)
+* splits the collected tests into ``--num-shards`` balanced shards using the
+  recorded durations, keeping only shard ``--shard-id`` (0-based). Tests are
+  packed longest-first onto the currently lightest shard, so shards finish at
+  about the same time. The split only depends on the node ids and the timing
+  file, so every CI agent computes the same partition
+* marks tests under an ``integration/`` directory ``integration`` and tests
+  recorded slower than ``--slow-threshold`` seconds ``slow``, so
+  ``-m "not slow and not integration"`` selects the fast unit tier even for
+  tests that were never decorated
+
+Run shards on one machine with run-sharded-tests.py, or on N CI agents with:
+
+    PYTHONPATH=scripts/testing pytest -p pytest_shard --num-shards N --shard-id $AGENT_INDEX
+"""
+
+import json
+import os
+import tempfile
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+import pytest
+
+DEFAULT_DURATIONS_FILE = '.test-durations.json'
+DEFAULT_UNKNOWN_SECONDS = 0.1
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('shard', 'duration-aware test sharding')
+    group.addoption('--num-shards', type=int, default=1, help='Split the suite into this many shards')
+    group.addoption('--shard-id', type=int, default=0, help='Run only this shard (0-based)')
+    group.addoption('--durations-file', default=None,
+                    help=f'Timing file to balance shards with (default: <rootdir>/{DEFAULT_DURATIONS_FILE})')
+    group.addoption('--store-durations', action='store_true',
+                    help='Merge the measured test durations into the timing file')
+    group.addoption('--durations-output', default=None,
+                    help='Write measured durations here instead of --durations-file')
+    group.addoption('--slow-threshold', type=float, default=1.0,
+                    help='Mark tests recorded slower than this many seconds as slow (0 disables)')
+
+
+def load_durations(path: Path) -> Dict[str, float]:
+    try:
+        with open(path) as f:
+            return {k: float(v) for k, v in json.load(f).items()}
+    except (OSError, ValueError):
+        return {}
+
+
+def store_durations(path: Path, measured: Dict[str, float]):
+    """Merge measured durations into path, replacing it atomically"""
+    durations = load_durations(path)
+    durations.update({k: round(v, 4) for k, v in measured.items()})
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    with os.fdopen(fd, 'w') as f:
+        json.dump(dict(sorted(durations.items())), f, indent=2)
+        f.write('\n')
+    os.replace(tmp_path, path)
+
+
+def estimate(nodeids: Sequence[str], durations: Dict[str, float]) -> Dict[str, float]:
+    """Recorded duration per test; unknown tests get the mean of their module, then of the suite"""
+    known = [durations[n] for n in nodeids if n in durations]
+    default = sum(known) / len(known) if known else DEFAULT_UNKNOWN_SECONDS
+    by_module = defaultdict(list)
+    for nodeid in nodeids:
+        if nodeid in durations:
+            by_module[nodeid.split('::')[0]].append(durations[nodeid])
+
+    estimates = {}
+    for nodeid in nodeids:
+        if nodeid in durations:
+            estimates[nodeid] = durations[nodeid]
+        else:
+            siblings = by_module.get(nodeid.split('::')[0])
+            estimates[nodeid] = sum(siblings) / len(siblings) if siblings else default
+    return estimates
+
+
+def pack_shards(nodeids: Sequence[str], durations: Dict[str, float], num_shards: int) -> List[List[str]]:
+    """Longest-processing-time-first packing of tests into num_shards shards"""
+    estimates = estimate(nodeids, durations)
+    shards = [[] for _ in range(num_shards)]
+    loads = [0.0] * num_shards
+    for nodeid in sorted(nodeids, key=lambda n: (-estimates[n], n)):
+        lightest = min(range(num_shards), key=lambda i: (loads[i], i))
+        shards[lightest].append(nodeid)
+        loads[lightest] += estimates[nodeid]
+    return shards
+
+
+class ShardPlugin:
+    def __init__(self, config):
+        self.config = config
+        self.num_shards = config.getoption('num_shards')
+        self.shard_id = config.getoption('shard_id')
+        if self.num_shards < 1 or not 0 <= self.shard_id < self.num_shards:
+            raise pytest.UsageError(f'--shard-id must be in [0, {self.num_shards - 1}]')
+        durations_file = config.getoption('durations_file')
+        self.durations_file = Path(durations_file) if durations_file \
+            else Path(config.rootpath) / DEFAULT_DURATIONS_FILE
+        output = config.getoption('durations_output')
+        self.output_file = Path(output) if output else self.durations_file
+        self.store = config.getoption('store_durations') or output is not None
+        self.slow_threshold = config.getoption('slow_threshold')
+        self.durations = load_durations(self.durations_file)
+        self.measured: Dict[str, float] = defaultdict(float)
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_collection_modifyitems(self, config, items):
+        # Markers go on before -m deselection, which runs after tryfirst hooks
+        for item in items:
+            if 'integration' in item.path.parts and not item.get_closest_marker('integration'):
+                item.add_marker(pytest.mark.integration)
+            if self.slow_threshold and self.durations.get(item.nodeid, 0.0) >= self.slow_threshold \
+                    and not item.get_closest_marker('slow'):
+                item.add_marker(pytest.mark.slow)
+
+    def select_shard(self, config, items):
+        if self.num_shards == 1:
+            return
+        shards = pack_shards([item.nodeid for item in items], self.durations, self.num_shards)
+        selected = set(shards[self.shard_id])
+        keep = [item for item in items if item.nodeid in selected]
+        deselected = [item for item in items if item.nodeid not in selected]
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+        items[:] = keep
+
+    def pytest_runtest_logreport(self, report):
+        self.measured[report.nodeid] += report.duration
+
+    def pytest_sessionfinish(self, session):
+        if self.store and self.measured:
+            store_durations(self.output_file, self.measured)
+
+    def pytest_report_header(self, config):
+        if self.num_shards > 1:
+            return (f'shard {self.shard_id + 1}/{self.num_shards} '
+                    f'(durations: {self.durations_file}, {len(self.durations)} recorded)')
+
+
+class _ShardSelector:
+    """Runs after -m/-k deselection so shards are balanced over the selected tests"""
+
+    def __init__(self, plugin: ShardPlugin):
+        self.plugin = plugin
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_collection_modifyitems(self, config, items):
+        self.plugin.select_shard(config, items)
+
+
+def pytest_configure(config):
+    config.addinivalue_line('markers', 'integration: Integration tests')
+    config.addinivalue_line('markers', 'slow: Slow running tests')
+    plugin = ShardPlugin(config)
+    config.pluginmanager.register(plugin, 'shard')
+    config.pluginmanager.register(_ShardSelector(plugin), 'shard-selector')
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Run the pytest suites as duration-balanced shards in parallel.
+
+Each shard is a separate pytest process loaded with the pytest_shard
+plugin. Shards are balanced with the suite's recorded timing file and, with
+--store-durations, the measured times of all shards are merged back into it.
+
+Suites:
+    secdevops   SecDevOps_CICD/tests (SecDevOps_CICD/pytest.ini)
+    repo        tests/ at the repository root (sprint2, test_data_api, security)
+
+Tiers:
+    fast        -m "not slow and not integration"
+    all         every test
+
+Examples:
+    ./scripts/testing/run-sharded-tests.py --tier fast
+    ./scripts/testing/run-sharded-tests.py --suite secdevops --jobs 4 --store-durations
+    ./scripts/testing/run-sharded-tests.py --junit-dir reports/shards -- -x
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+
+from pytest_shard import DEFAULT_DURATIONS_FILE, load_durations, store_durations
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+REPO_ROOT = SCRIPT_DIR.parent.parent
+
+SUITES = {
+    'secdevops': (REPO_ROOT / 'SecDevOps_CICD', ['tests']),
+    'repo': (REPO_ROOT, ['tests']),
+}
+
+TIERS = {
+    'fast': ['-m', 'not slow and not integration'],
+    'all': [],
+}
+
+# pytest exit code when a shard ends up with no tests (e.g. everything deselected)
+NO_TESTS_COLLECTED = 5
+
+
+def run_suite(name, jobs, tier, store, junit_dir, extra_args):
+    """Run one suite as `jobs` parallel shards; returns (exit code, wall seconds)"""
+    cwd, paths = SUITES[name]
+    durations_file = cwd / DEFAULT_DURATIONS_FILE
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [str(SCRIPT_DIR), env.get('PYTHONPATH')]))
+
+    work_dir = Path(tempfile.mkdtemp(prefix=f'shards-{name}-'))
+    processes = []
+    start = time.perf_counter()
+    for shard in range(jobs):
+        output = work_dir / f'durations-{shard}.json'
+        cmd = [sys.executable, '-m', 'pytest', '-p', 'pytest_shard', *paths, *TIERS[tier],
+               f'--num-shards={jobs}', f'--shard-id={shard}', f'--durations-file={durations_file}',
+               f'--durations-output={output}', '-q']
+        if junit_dir:
+            cmd.append(f'--junitxml={Path(junit_dir).resolve() / f"{name}-shard-{shard}.xml"}')
+        cmd.extend(extra_args)
+        log = open(work_dir / f'shard-{shard}.log', 'w+')
+        processes.append((shard, subprocess.Popen(cmd, cwd=cwd, env=env, stdout=log, stderr=subprocess.STDOUT),
+                          log, output, time.perf_counter()))
+
+    exit_code = 0
+    measured = {}
+    for shard, process, log, output, shard_start in processes:
+        code = process.wait()
+        elapsed = time.perf_counter() - shard_start
+        log.seek(0)
+        lines = log.read().rstrip().splitlines()
+        log.close()
+        summary = lines[-1] if lines else ''
+        print(f"  [{name} {shard + 1}/{jobs}] {elapsed:6.2f}s  exit {code}  {summary}")
+        if code not in (0, NO_TESTS_COLLECTED):
+            print('\n'.join(f'    {line}' for line in lines[-40:]))
+            exit_code = exit_code or code
+        measured.update(load_durations(output))
+    shutil.rmtree(work_dir, ignore_errors=True)
+
+    if store and measured:
+        store_durations(durations_file, measured)
+        print(f"  [{name}] durations stored in {durations_file.relative_to(REPO_ROOT)}")
+    return exit_code, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run pytest suites as balanced parallel shards')
+    parser.add_argument('--suite', choices=list(SUITES) + ['all'], default='all')
+    parser.add_argument('--tier', choices=list(TIERS), default='all')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help='Shards per suite (default: CPU count)')
+    parser.add_argument('--store-durations', action='store_true', help='Merge measured durations into the timing files')
+    parser.add_argument('--junit-dir', help='Write one JUnit XML file per shard into this directory')
+    parser.add_argument('pytest_args', nargs=argparse.REMAINDER, help='Extra pytest arguments after --')
+    args = parser.parse_args()
+
+    extra_args = args.pytest_args[1:] if args.pytest_args[:1] == ['--'] else args.pytest_args
+    if args.junit_dir:
+        Path(args.junit_dir).mkdir(parents=True, exist_ok=True)
+
+    suites = list(SUITES) if args.suite == 'all' else [args.suite]
+    exit_code = 0
+    for name in suites:
+        print(f"Running {name} ({args.tier} tier) in {args.jobs} shard(s)...")
+        code, wall = run_suite(name, max(1, args.jobs), args.tier, args.store_durations, args.junit_dir, extra_args)
+        print(f"  [{name}] finished in {wall:.2f}s")
+        exit_code = exit_code or code
+
+    sys.exit(exit_code)
+
+
+if __name__ == '__main__':
+    main()
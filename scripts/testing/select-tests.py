@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Run only the tests affected by a git diff range.
+
+Changed paths are mapped to tests in two ways (see pytest_impact.py):
+
+* STATIC_MAP: hand-maintained rules for paths whose dependents are known,
+  e.g. a Terraform module and the tests of that module. A path matching a
+  rule selects exactly the rule's tests
+* the recorded impact map: the files each test, its fixtures and its module
+  imports actually opened during the last --record run
+
+The full suite runs instead when the map is missing or stale (test modules
+added/removed, or conftest.py / a session-wide dependency changed since it
+was recorded), when a changed file is loaded by every test, or when a changed
+code file is in neither mapping.
+
+Examples:
+    ./scripts/testing/select-tests.py --record                 # full run, rebuilds the maps
+    ./scripts/testing/select-tests.py                          # uncommitted changes vs HEAD
+    ./scripts/testing/select-tests.py --base origin/main --list
+    ./scripts/testing/select-tests.py --base "$remote_sha" --head "$local_sha" -- -q
+"""
+
+import os
+import sys
+import argparse
+import subprocess
+from pathlib import Path
+
+from pytest_impact import DEFAULT_IMPACT_FILE, load_impact_map, select_tests, stale_reason
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+REPO_ROOT = SCRIPT_DIR.parent.parent
+
+# name: (suite root relative to the repository, test dirs, repository paths owned by other suites)
+SUITES = {
+    'secdevops': ('SecDevOps_CICD', ['tests'], []),
+    'repo': ('.', ['tests'], ['SecDevOps_CICD']),
+}
+
+# Suite-relative path glob -> suite-relative test modules
+STATIC_MAP = {
+    'secdevops': [
+        ('terraform/modules/acr/*', ['tests/unit/test_acr_config.py', 'tests/integration/test_acr_integration.py']),
+        ('terraform/modules/networking/*', ['tests/unit/test_networking.py',
+                                            'tests/integration/test_networking_integration.py']),
+        ('terraform/modules/jenkins-vm/*', ['tests/unit/test_vm_config.py', 'tests/integration/test_vm_integration.py']),
+        ('scripts/git-hooks/*', ['tests/unit/test_git_hooks.py']),
+    ],
+    'repo': [
+        ('sql/states/*', ['tests/test_data_api']),
+    ],
+}
+
+# Changed files with these suffixes that neither mapping knows about force a full run
+CODE_SUFFIXES = ('.py', '.tf', '.tfvars', '.sql', '.sh', '.ini', '.cfg', '.toml', '.json', '.yml', '.yaml')
+
+NULL_SHA = '0' * 40
+
+
+def git(*args):
+    result = subprocess.run(['git', *args], cwd=REPO_ROOT, capture_output=True, text=True)
+    return result.stdout if result.returncode == 0 else None
+
+
+def changed_paths(base, head):
+    """Paths changed between base and head (head=None: the working tree, including untracked files)"""
+    if head:
+        out = git('diff', '--name-only', '--no-renames', base, head)
+        return None if out is None else out.split()
+    out = git('diff', '--name-only', '--no-renames', base)
+    untracked = git('ls-files', '--others', '--exclude-standard')
+    return None if out is None else out.split() + (untracked or '').split()
+
+
+def run_suite(name, base, head, list_only, extra_args):
+    suite_dir, test_dirs, exclude = SUITES[name]
+    cwd = REPO_ROOT / suite_dir
+    prefix = '' if suite_dir == '.' else suite_dir + '/'
+    impact = load_impact_map(cwd / DEFAULT_IMPACT_FILE)
+
+    changed = None if base == NULL_SHA else changed_paths(base, head)
+    if changed is None:
+        selection, why = None, f'cannot diff {base}..{head or "working tree"}'
+    else:
+        since_recording = changed_paths(impact['commit'], None) if impact and impact.get('commit') else None
+        why = stale_reason(impact, cwd, test_dirs, since_recording)
+        selection = None if why else select_tests(changed, impact, suite_dir, STATIC_MAP[name],
+                                                  CODE_SUFFIXES, exclude)
+        if selection is not None and selection.full:
+            why = selection.reasons['*']
+
+    if selection is not None and not selection.full:
+        targets = set(selection.targets)
+        if targets:
+            # Tests edited since the map was recorded may depend on files it does not know about
+            targets.update(p[len(prefix):] for p in since_recording
+                           if p.startswith(prefix) and os.path.basename(p).startswith('test_') and p.endswith('.py'))
+        targets = sorted(t for t in targets if (cwd / t.split('::')[0]).exists())
+        if not targets:
+            print(f"[{name}] no affected tests")
+            return 0
+        print(f"[{name}] {len(targets)} affected target(s):")
+        for target in targets:
+            print(f"  {target}  ({selection.reasons.get(target, 'edited since the map was recorded')})")
+        args = targets
+    else:
+        print(f"[{name}] running the full suite: {why}")
+        args = test_dirs
+
+    if list_only:
+        return 0
+    code = subprocess.call([sys.executable, '-m', 'pytest', *args, *extra_args], cwd=cwd)
+    # No tests collected (everything deselected by -m) is not a failure
+    return 0 if code == 5 else code
+
+
+def record_suite(name, extra_args):
+    suite_dir, test_dirs, _ = SUITES[name]
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [str(SCRIPT_DIR), env.get('PYTHONPATH')]))
+    print(f"[{name}] recording the impact map...")
+    # Modules that fail to import are still recorded, so they do not make the map look stale
+    return subprocess.call([sys.executable, '-m', 'pytest', '-p', 'pytest_impact', '--record-impact',
+                            '--continue-on-collection-errors', *test_dirs, *extra_args],
+                           cwd=REPO_ROOT / suite_dir, env=env)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run only the tests affected by a git diff range')
+    parser.add_argument('--suite', choices=list(SUITES) + ['all'], default='all')
+    parser.add_argument('--base', default='HEAD', help='Diff base revision (default: HEAD)')
+    parser.add_argument('--head', help='Diff head revision (default: the working tree)')
+    parser.add_argument('--list', action='store_true', help='Print the selection without running it')
+    parser.add_argument('--record', action='store_true', help='Run the full suite and record the impact map')
+    parser.add_argument('pytest_args', nargs=argparse.REMAINDER, help='Extra pytest arguments after --')
+    args = parser.parse_args()
+
+    extra_args = args.pytest_args[1:] if args.pytest_args[:1] == ['--'] else args.pytest_args
+    suites = list(SUITES) if args.suite == 'all' else [args.suite]
+    exit_code = 0
+    for name in suites:
+        if args.record:
+            code = record_suite(name, extra_args)
+        else:
+            code = run_suite(name, args.base, args.head, args.list, extra_args)
+        exit_code = exit_code or code
+
+    sys.exit(exit_code)
+
+
+if __name__ == '__main__':
+    main()
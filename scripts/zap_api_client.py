@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+OWASP ZAP API client for full DAST scans.
+
+Drives a running ZAP daemon over one keep-alive HTTP connection:
+
+  1. spider       - starts the spider and polls its progress
+  2. active scan  - starts the active scan and polls its progress; alerts
+                    raised so far are paged in (`start`/`count`) between
+                    polls, so the results are complete when the scan ends
+  3. reports      - every alert page is fed into ZAPResultsParser and
+                    appended to <report-base>.json (same shape as
+                    /JSON/core/view/alerts/); <report-base>.html is the
+                    parser's compact findings report and ZAP's XML report
+                    is streamed to <report-base>.xml
+
+Polling is adaptive: the interval drops back to --poll-min while a scan
+makes progress and doubles up to --poll-max while it stalls. With
+--fail-fast the High threshold, the only one that fails the build, is
+checked after every poll, and the client exits 1 (optionally stopping the
+scan with --stop-scan) as soon as it is exceeded, instead of waiting for
+the scan to finish. Medium and lower findings never cut a scan short.
+
+Usage:
+    ./scripts/zap_api_client.py https://staging.oversight.local \\
+        --report-base zap/reports/full_20260101
+    ./scripts/zap_api_client.py https://staging.oversight.local --fail-fast --stop-scan
+    ZAP_HOST=zap ZAP_PORT=8090 ./scripts/zap_api_client.py http://test-app:8080 --page-size 1000
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import http.client
+import importlib.util
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urlencode, urlsplit
+
+PARSER_SCRIPT = Path(__file__).resolve().parent / 'parse-zap-results.py'
+
+DEFAULT_PAGE_SIZE = 500
+
+
+def load_parser_module():
+    """parse-zap-results.py's module (not importable by name because of the dashes)"""
+    if 'parse_zap_results' not in sys.modules:
+        spec = importlib.util.spec_from_file_location('parse_zap_results', PARSER_SCRIPT)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        sys.modules['parse_zap_results'] = module
+    return sys.modules['parse_zap_results']
+
+
+class ZAPError(Exception):
+    """The ZAP API rejected a request or could not be reached"""
+
+
+class ZAPClient:
+    """Minimal ZAP API client over a single persistent HTTP/1.1 connection"""
+
+    def __init__(self, base_url: str, api_key: Optional[str] = None, timeout: float = 30.0):
+        parts = urlsplit(base_url)
+        self.https = parts.scheme == 'https'
+        self.host = parts.hostname or 'localhost'
+        self.port = parts.port or (443 if self.https else 80)
+        self.api_key = api_key
+        self.timeout = timeout
+        self.requests = 0
+        self._conn: Optional[http.client.HTTPConnection] = None
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _connection(self) -> http.client.HTTPConnection:
+        if self._conn is None:
+            cls = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+            self._conn = cls(self.host, self.port, timeout=self.timeout)
+        return self._conn
+
+    def _open(self, path: str, params: Dict[str, Any]) -> http.client.HTTPResponse:
+        """Send a GET and return the response; the caller must read it completely"""
+        url = f"{path}?{urlencode(params)}" if params else path
+        headers = {'Accept': '*/*'}
+        if self.api_key:
+            headers['X-ZAP-API-Key'] = self.api_key
+        while True:
+            reused = self._conn is not None
+            try:
+                conn = self._connection()
+                conn.request('GET', url, headers=headers)
+                self.requests += 1
+                return conn.getresponse()
+            except (OSError, http.client.HTTPException) as e:
+                self.close()
+                # Only a reused connection may have been closed by the server while idle
+                if not reused:
+                    raise ZAPError(f"{path}: {e}") from e
+
+    def call(self, component: str, kind: str, name: str, **params) -> Dict[str, Any]:
+        """Call /JSON/<component>/<view|action>/<name>/ and return the decoded response"""
+        path = f"/JSON/{component}/{kind}/{name}/"
+        response = self._open(path, params)
+        body = response.read()
+        try:
+            data = json.loads(body)
+        except ValueError:
+            raise ZAPError(f"{path}: HTTP {response.status}, response is not JSON")
+        if response.status != 200:
+            message = data.get('message', data.get('code', ''))
+            raise ZAPError(f"{path}: HTTP {response.status} {message}")
+        return data
+
+    def download(self, name: str, output_file: str, chunk_size: int = 1 << 16):
+        """Stream an /OTHER/core/other/<name>/ report to a file"""
+        path = f"/OTHER/core/other/{name}/"
+        response = self._open(path, {})
+        if response.status != 200:
+            response.read()
+            raise ZAPError(f"{path}: HTTP {response.status}")
+        with open(output_file, 'wb') as f:
+            while True:
+                chunk = response.read(chunk_size)
+                if not chunk:
+                    break
+                f.write(chunk)
+
+    def version(self) -> str:
+        return self.call('core', 'view', 'version')['version']
+
+    def spider(self, url: str, max_children: int = 10, recurse: bool = True) -> str:
+        return self.call('spider', 'action', 'scan', url=url, maxChildren=max_children,
+                         recurse=str(recurse).lower())['scan']
+
+    def spider_status(self, scan_id: str) -> int:
+        return int(self.call('spider', 'view', 'status', scanId=scan_id)['status'])
+
+    def active_scan(self, url: str, recurse: bool = True, in_scope_only: bool = False) -> str:
+        return self.call('ascan', 'action', 'scan', url=url, recurse=str(recurse).lower(),
+                         inScopeOnly=str(in_scope_only).lower())['scan']
+
+    def active_scan_status(self, scan_id: str) -> int:
+        return int(self.call('ascan', 'view', 'status', scanId=scan_id)['status'])
+
+    def stop_spider(self, scan_id: str):
+        self.call('spider', 'action', 'stop', scanId=scan_id)
+
+    def stop_active_scan(self, scan_id: str):
+        self.call('ascan', 'action', 'stop', scanId=scan_id)
+
+    def alerts(self, baseurl: str, start: int, count: int) -> List[Dict[str, Any]]:
+        return self.call('core', 'view', 'alerts', baseurl=baseurl, start=start,
+                         count=count)['alerts']
+
+
+class AdaptivePoller:
+    """Poll interval that resets while a scan progresses and backs off while it stalls"""
+
+    def __init__(self, minimum: float = 1.0, maximum: float = 30.0, factor: float = 2.0,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.factor = factor
+        self.sleep = sleep
+        self.interval = minimum
+        self._last_progress: Optional[int] = None
+
+    def wait(self, progress: int) -> float:
+        """Sleep before the next poll; returns the interval used"""
+        if self._last_progress is not None and progress <= self._last_progress:
+            self.interval = min(self.maximum, self.interval * self.factor)
+        else:
+            self.interval = self.minimum
+        self._last_progress = progress
+        self.sleep(self.interval)
+        return self.interval
+
+
+class AlertCollector:
+    """Pages alerts out of ZAP into ZAPResultsParser and a JSON report file"""
+
+    def __init__(self, client: ZAPClient, parser, baseurl: str = '',
+                 page_size: int = DEFAULT_PAGE_SIZE, output_file: Optional[str] = None):
+        self.client = client
+        self.parser = parser
+        self.baseurl = baseurl
+        self.page_size = page_size
+        self.offset = 0
+        self.pages = 0
+        self._out = open(output_file, 'w') if output_file else None
+        if self._out:
+            self._out.write('{"alerts": [')
+
+    def drain(self) -> int:
+        """Fetch every alert after the current offset; returns how many were new"""
+        fetched = 0
+        while True:
+            page = self.client.alerts(self.baseurl, self.offset, self.page_size)
+            self.pages += 1
+            if page:
+                self.parser.add_alerts(page)
+                if self._out:
+                    self._out.write(''.join(('\n' if self.offset + i == 0 else ',\n')
+                                            + json.dumps(alert)
+                                            for i, alert in enumerate(page)))
+                self.offset += len(page)
+                fetched += len(page)
+            if len(page) < self.page_size:
+                return fetched
+
+    def close(self):
+        if self._out:
+            self._out.write('\n]}\n')
+            self._out.close()
+            self._out = None
+
+
+def wait_for_zap(client: ZAPClient, attempts: int = 30,
+                 poller: Optional[AdaptivePoller] = None) -> str:
+    """ZAP's version once the API answers"""
+    poller = poller or AdaptivePoller(minimum=1.0, maximum=5.0)
+    for attempt in range(attempts):
+        try:
+            return client.version()
+        except ZAPError:
+            if attempt == attempts - 1:
+                raise
+            poller.wait(0)
+
+
+def run_scan(client: ZAPClient, target: str, collector: AlertCollector,
+             poller_factory: Callable[[], AdaptivePoller] = AdaptivePoller,
+             max_children: int = 10, fail_fast: bool = False, stop_scan: bool = False,
+             log: Callable[[str], None] = print) -> bool:
+    """Spider and actively scan `target`, collecting alerts between status polls.
+
+    With `fail_fast`, the High threshold is checked after every poll and the
+    scan is abandoned (and with `stop_scan` stopped in ZAP) as soon as it is
+    exceeded, the same blocking rule as ZAPResultsParser.evaluate_gate.
+    Counts only grow while a scan runs, so that verdict is final.
+    Returns False when the scan was abandoned.
+    """
+    def watch(label: str, scan_id: str, status: Callable[[str], int],
+              stop: Callable[[str], Any]) -> bool:
+        poller = poller_factory()
+        parser = collector.parser
+        while True:
+            progress = status(scan_id)
+            new = collector.drain()
+            if fail_fast and parser.summary['High'] > parser.thresholds['High']:
+                log(f"❌ High threshold exceeded at {label} progress {progress}% "
+                    f"after {collector.offset} alerts")
+                if stop_scan:
+                    stop(scan_id)
+                    log(f"🛑 {label} stopped")
+                return False
+            if progress >= 100:
+                return True
+            log(f"{label} progress: {progress}% ({collector.offset} alerts, +{new})")
+            poller.wait(progress)
+
+    log(f"🕷️  Starting spider on {target}...")
+    spider_id = client.spider(target, max_children=max_children)
+    if not watch("🕷️  Spider", spider_id, client.spider_status, client.stop_spider):
+        return False
+    log("✅ Spider scan complete")
+
+    log("⚔️  Starting active scan...")
+    scan_id = client.active_scan(target)
+    if not watch("⚔️  Active scan", scan_id, client.active_scan_status, client.stop_active_scan):
+        return False
+    log(f"✅ Active scan complete: {collector.offset} alerts in {collector.pages} page(s)")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run a full OWASP ZAP scan through the ZAP API')
+    parser.add_argument('target', help='URL to spider and scan')
+    parser.add_argument('--zap-url', default=f"http://{os.environ.get('ZAP_HOST', 'localhost')}:"
+                                             f"{os.environ.get('ZAP_PORT', '8080')}",
+                        help='ZAP API address (default: http://$ZAP_HOST:$ZAP_PORT)')
+    parser.add_argument('--api-key', default=os.environ.get('ZAP_API_KEY', 'secdevops-api-key'))
+    parser.add_argument('--report-base',
+                        default=f"zap/reports/full_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+                        help='Reports are written to <report-base>.json/.html/.xml')
+    parser.add_argument('--page-size', type=int, default=DEFAULT_PAGE_SIZE,
+                        help='Alerts fetched per API call')
+    parser.add_argument('--max-children', type=int, default=10, help='Spider maxChildren')
+    parser.add_argument('--poll-min', type=float, default=2.0,
+                        help='Poll interval while a scan progresses')
+    parser.add_argument('--poll-max', type=float, default=30.0,
+                        help='Longest poll interval while a scan stalls')
+    parser.add_argument('--fail-fast', action='store_true',
+                        help='Exit 1 as soon as the High threshold is exceeded '
+                             'instead of waiting for the scan to end')
+    parser.add_argument('--stop-scan', action='store_true',
+                        help='With --fail-fast, also stop the running ZAP scan')
+    parser.add_argument('--threshold-high', type=int, default=0,
+                        help='Maximum allowed high severity findings')
+    parser.add_argument('--threshold-medium', type=int, default=5,
+                        help='Maximum allowed medium severity findings')
+    args = parser.parse_args()
+
+    Path(args.report_base).parent.mkdir(parents=True, exist_ok=True)
+    json_report = f"{args.report_base}.json"
+    results = load_parser_module().ZAPResultsParser(json_report)
+    results.thresholds['High'] = args.threshold_high
+    results.thresholds['Medium'] = args.threshold_medium
+
+    client = ZAPClient(args.zap_url, api_key=args.api_key)
+    try:
+        print(f"✅ ZAP {wait_for_zap(client)} is ready at {args.zap_url}")
+        collector = AlertCollector(client, results, baseurl=args.target, page_size=args.page_size,
+                                   output_file=json_report)
+        try:
+            completed = run_scan(client, args.target, collector,
+                                 poller_factory=lambda: AdaptivePoller(args.poll_min,
+                                                                       args.poll_max),
+                                 max_children=args.max_children, fail_fast=args.fail_fast,
+                                 stop_scan=args.stop_scan)
+        finally:
+            collector.close()
+        client.download('xmlreport', f"{args.report_base}.xml")
+    except ZAPError as e:
+        print(f"❌ ZAP API error: {e}")
+        sys.exit(2)
+    finally:
+        client.close()
+    # Rendered from the collected alerts: ZAP's own HTML report is slow to build and to open
+    results.export_html(f"{args.report_base}.html")
+    print(f"📊 Reports: {args.report_base}.json/.html/.xml ({client.requests} API requests)")
+    if not completed:
+        print("⚠️  Scan abandoned early: results cover the alerts raised so far")
+
+    print(results.generate_summary())
+    passed, messages = results.check_thresholds()
+    for message in messages:
+        print(message)
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == '__main__':
+    main()
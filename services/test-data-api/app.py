@@ -1,13 +1,23 @@
 #!/usr/bin/env python3
 
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request
 from flask_cors import CORS
 import psycopg2
+from psycopg2.extensions import ISOLATION_LEVEL_REPEATABLE_READ
 import os
+import json
 import time
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
+
+from fingerprints import record_fingerprints, recorded_state, table_fingerprint, verify_fingerprints
+from state_loader import ParallelStateLoader, set_tables_logged, table_persistence
+from subsetting import SUBSET_NAME_RE, SubsetError, SubsetExtractor, discover_subsets
+from stats_refresh import StatsRefresher, install_stats_tracking, refresh_stats_view
+from table_stream import describe_table, make_etag, stream_rows
 
 app = Flask(__name__)
 CORS(app)
@@ -28,44 +38,87 @@ DB_CONFIG = {
     'password': os.environ.get('DB_PASSWORD', 'TestPassword123!')
 }
 
+# Named database endpoints for fan-out transitions. DB_TARGETS is a JSON object
+# mapping a name to connection settings merged over DB_CONFIG, e.g.
+# {"dev": {"host": "10.40.1.20"}, "staging": {"host": "10.40.3.20"}}
+DB_TARGETS = {'default': DB_CONFIG}
+DB_TARGETS.update({
+    name: dict(DB_CONFIG, **overrides)
+    for name, overrides in json.loads(os.environ.get('DB_TARGETS', '{}')).items()
+})
+DB_FANOUT_WORKERS = int(os.environ.get('DB_FANOUT_WORKERS', '4'))
+
+# Locations of the SQL state files, extracted subset states and pg_dump backups
+SQL_STATES_DIR = os.environ.get('SQL_STATES_DIR', '/app/sql/states')
+SUBSET_DIR = os.environ.get('SUBSET_DIR', '/app/subsets')
+BACKUP_DIR = os.environ.get('BACKUP_DIR', '/app/backups')
+
+# States loaded in fast mode (UNLOGGED tables, synchronous_commit=off)
+FAST_STATES = [s.strip() for s in os.environ.get('DB_FAST_STATES', '').split(',') if s.strip()]
+
 # Available database states
 DB_STATES = {
     'schema-only': {
         'description': 'Empty database with schema only',
-        'sql_file': '/app/sql/states/schema-only.sql'
+        'sql_file': os.path.join(SQL_STATES_DIR, 'schema-only.sql'),
+        'fast': 'schema-only' in FAST_STATES
     },
     'framework': {
         'description': 'Basic framework data (users, roles, settings)',
-        'sql_file': '/app/sql/states/framework-data.sql'
+        'sql_file': os.path.join(SQL_STATES_DIR, 'framework-data.sql'),
+        'fast': 'framework' in FAST_STATES
     },
     'full': {
         'description': 'Complete test data set',
-        'sql_file': '/app/sql/states/full-test-data.sql'
+        'sql_file': os.path.join(SQL_STATES_DIR, 'full-test-data.sql'),
+        'fast': 'full' in FAST_STATES
     }
 }
+BUILTIN_STATES = set(DB_STATES)
+
+# Keys per batch when walking and exporting a subset
+DB_SUBSET_BATCH = int(os.environ.get('DB_SUBSET_BATCH', '1000'))
+
+# Rows per round trip when streaming table data
+DATA_FETCH_SIZE = int(os.environ.get('DATA_FETCH_SIZE', '1000'))
+
+# system_stats refresh: 'off', 'debounced' (refresh after changes settle) or
+# 'incremental' (debounced, over trigger-maintained row counters)
+STATS_REFRESH_MODE = os.environ.get('STATS_REFRESH_MODE', 'debounced')
+STATS_DEBOUNCE_SECONDS = float(os.environ.get('STATS_DEBOUNCE_SECONDS', '2'))
+STATS_MAX_DELAY_SECONDS = float(os.environ.get('STATS_MAX_DELAY_SECONDS', '10'))
+
+# State loading: 'parallel' (per-table worker pool) or 'serial' (single transaction)
+DB_LOADER = os.environ.get('DB_LOADER', 'parallel')
+DB_LOAD_WORKERS = int(os.environ.get('DB_LOAD_WORKERS', '4'))
 
 # Current state tracking
 current_state = 'unknown'
 last_state_change = None
 
+# Background refresher for system_stats on DB_CONFIG
+stats_refresher = None
+_stats_lock = threading.Lock()
 
-def get_db_connection():
-    """Create database connection"""
+
+def get_db_connection(db_config: Optional[Dict[str, Any]] = None):
+    """Create database connection (to DB_CONFIG unless another target is given)"""
     try:
-        conn = psycopg2.connect(**DB_CONFIG)
+        conn = psycopg2.connect(**(db_config or DB_CONFIG))
         return conn
     except Exception as e:
         logger.error(f"Database connection failed: {e}")
         raise
 
 
-def execute_sql_file(filepath: str) -> bool:
+def execute_sql_file(filepath: str, db_config: Optional[Dict[str, Any]] = None) -> bool:
     """Execute SQL file against database"""
+    conn = None
     try:
         with open(filepath, 'r') as file:
             sql = file.read()
         
-        conn = get_db_connection()
+        conn = get_db_connection(db_config)
         cursor = conn.cursor()
         
         # Execute SQL in transaction
@@ -84,6 +137,127 @@ def execute_sql_file(filepath: str) -> bool:
         return False
 
 
+def apply_state_file(filepath: str, fast: bool = False,
+                     db_config: Optional[Dict[str, Any]] = None) -> Tuple[bool, Optional[Dict[str, Any]]]:
+    """Load a state file with the configured loader.
+
+    Returns (success, load report); on failure the report carries the error.
+    """
+    if DB_LOADER == 'serial':
+        if fast:
+            logger.warning("Fast mode requires the parallel loader, loading with full durability")
+        if execute_sql_file(filepath, db_config):
+            return True, None
+        return False, {'error': f'Failed to execute SQL file {filepath}'}
+
+    try:
+        loader = ParallelStateLoader(db_config or DB_CONFIG, workers=DB_LOAD_WORKERS, fast=fast)
+        report = loader.load(filepath)
+        for phase, timings in report['phases'].items():
+            logger.info(f"Load phase {phase}: wall {timings['wall_seconds']:.2f}s, "
+                        f"cpu {timings['cpu_seconds']:.2f}s, worker {timings['worker_seconds']:.2f}s")
+        return True, report
+    except Exception as e:
+        logger.error(f"Failed to load SQL file {filepath}: {e}")
+        return False, {'error': str(e)}
+
+
+def record_state_fingerprints(state: str,
+                              db_config: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+    """Record table fingerprints for a freshly built state (best effort)"""
+    try:
+        conn = get_db_connection(db_config)
+        try:
+            return record_fingerprints(conn, state)
+        finally:
+            conn.close()
+    except Exception as e:
+        logger.error(f"Failed to record fingerprints for state {state}: {e}")
+        return None
+
+
+def ensure_stats_refresher() -> Optional[StatsRefresher]:
+    """Start the system_stats refresher for DB_CONFIG unless refresh is off"""
+    global stats_refresher
+    if STATS_REFRESH_MODE == 'off':
+        return None
+    with _stats_lock:
+        if stats_refresher is not None and stats_refresher.db_config != DB_CONFIG:
+            stats_refresher.stop()
+            stats_refresher = None
+        if stats_refresher is None:
+            stats_refresher = StatsRefresher(DB_CONFIG, debounce=STATS_DEBOUNCE_SECONDS,
+                                             max_delay=STATS_MAX_DELAY_SECONDS)
+        return stats_refresher.start()
+
+
+def manage_system_stats(db_config: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+    """Install system_stats change tracking on a freshly loaded state (best effort).
+
+    Only the primary database (DB_CONFIG) has a refresher listening for the
+    triggers' notifications, so other fan-out targets are left untracked and
+    keep the system_stats snapshot taken when their state was loaded.
+    """
+    if STATS_REFRESH_MODE == 'off':
+        return None
+    if db_config is not None and db_config != DB_CONFIG:
+        return None
+    try:
+        conn = get_db_connection(db_config)
+        try:
+            result = install_stats_tracking(conn, incremental=STATS_REFRESH_MODE == 'incremental')
+        finally:
+            conn.close()
+    except Exception as e:
+        logger.error(f"Failed to install system_stats tracking: {e}")
+        return None
+    ensure_stats_refresher()
+    return result
+
+
+def apply_state_to_targets(state: str, targets: List[str], fast: bool) -> Dict[str, Dict[str, Any]]:
+    """Apply one state to several database targets concurrently.
+
+    At most DB_FANOUT_WORKERS targets load at the same time; a failing target
+    does not stop the others.
+    """
+    sql_file = available_states()[state]['sql_file']
+    
+    def apply(target: str) -> Dict[str, Any]:
+        start = time.time()
+        db_config = DB_TARGETS[target]
+        success, load_report = apply_state_file(sql_file, fast=fast, db_config=db_config)
+        if success:
+            record_state_fingerprints(state, db_config)
+            manage_system_stats(db_config)
+        result = {
+            'status': 'success' if success else 'failed',
+            'duration_seconds': round(time.time() - start, 4)
+        }
+        if success and load_report:
+            result['load'] = load_report
+        elif not success:
+            result['error'] = load_report['error']
+        logger.info(f"Target {target}: {result['status']} in {result['duration_seconds']:.2f} seconds")
+        return result
+
+    with ThreadPoolExecutor(max_workers=max(1, min(DB_FANOUT_WORKERS, len(targets)))) as executor:
+        return dict(zip(targets, executor.map(apply, targets)))
+
+
+def available_states() -> Dict[str, Dict[str, Any]]:
+    """DB_STATES plus the subset states currently in SUBSET_DIR.
+
+    Subsets are read from disk on every call rather than registered in the
+    process that extracted them, so every API worker sees the same states.
+    """
+    states = dict(DB_STATES)
+    for name, subset in discover_subsets(SUBSET_DIR).items():
+        if name not in BUILTIN_STATES:
+            states[name] = dict(subset, fast=name in FAST_STATES, subset=True)
+    return states
+
+
 def get_current_state() -> str:
     """Detect current database state based on data presence"""
     try:
@@ -122,6 +296,12 @@ def get_current_state() -> str:
                     state = 'full'
             else:
                 state = 'schema-only'
+            
+            # Subsets hold the same tables as the built-in states; trust the
+            # state the fingerprints were recorded for
+            recorded = recorded_state(conn)
+            if available_states().get(recorded, {}).get('subset'):
+                state = recorded
         
         cursor.close()
         conn.close()
@@ -132,6 +312,13 @@ def get_current_state() -> str:
         return 'unknown'
 
 
+@app.before_request
+def start_background_tasks():
+    """Start the system_stats refresher with the first request"""
+    if stats_refresher is None and STATS_REFRESH_MODE != 'off':
+        ensure_stats_refresher()
+
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
@@ -155,11 +342,14 @@ def get_db_state():
     global current_state, last_state_change
     
     current_state = get_current_state()
+    states = available_states()
     
     return jsonify({
         'current_state': current_state,
-        'available_states': list(DB_STATES.keys()),
-        'state_descriptions': {k: v['description'] for k, v in DB_STATES.items()},
+        'available_states': list(states.keys()),
+        'state_descriptions': {k: v['description'] for k, v in states.items()},
+        'fast_states': [k for k, v in states.items() if v['fast']],
+        'available_targets': list(DB_TARGETS.keys()),
         'last_change': last_state_change.isoformat() if last_state_change else None
     })
 
@@ -174,30 +364,75 @@ def set_db_state():
         return jsonify({'error': 'Missing state parameter'}), 400
     
     requested_state = data['state']
-    if requested_state not in DB_STATES:
+    states = available_states()
+    if requested_state not in states:
         return jsonify({
-            'error': f'Invalid state. Must be one of: {list(DB_STATES.keys())}'
+            'error': f'Invalid state. Must be one of: {list(states.keys())}'
         }), 400
     
-    logger.info(f"Switching database to state: {requested_state}")
+    fast = bool(data.get('fast', states[requested_state]['fast']))
+    
+    # Fan out to several named databases
+    targets = data.get('targets')
+    if targets is not None:
+        if targets == 'all':
+            targets = list(DB_TARGETS.keys())
+        if (not isinstance(targets, list) or not targets
+                or any(t not in DB_TARGETS for t in targets)):
+            return jsonify({
+                'error': f'Invalid targets. Must be "all" or a list of: {list(DB_TARGETS.keys())}'
+            }), 400
+        
+        logger.info(f"Switching {len(targets)} targets to state: {requested_state}")
+        start_time = time.time()
+        results = apply_state_to_targets(requested_state, targets, fast)
+        
+        if results.get('default', {}).get('status') == 'success':
+            current_state = requested_state
+            last_state_change = datetime.utcnow()
+        
+        failed = [t for t, result in results.items() if result['status'] != 'success']
+        if not failed:
+            status = 'success'
+        elif len(failed) == len(targets):
+            status = 'failed'
+        else:
+            status = 'partial'
+        
+        return jsonify({
+            'status': status,
+            'new_state': requested_state,
+            'targets': results,
+            'failed_targets': failed,
+            'duration_seconds': time.time() - start_time,
+            'slowest_target_seconds': max(r['duration_seconds'] for r in results.values()),
+            'timestamp': datetime.utcnow().isoformat()
+        }), 200 if not failed else 500
+    
+    logger.info(f"Switching database to state: {requested_state}{' (fast mode)' if fast else ''}")
     start_time = time.time()
     
     # Execute state transition
-    success = execute_sql_file(DB_STATES[requested_state]['sql_file'])
+    success, load_report = apply_state_file(states[requested_state]['sql_file'], fast=fast)
     
     if success:
         current_state = requested_state
+        record_state_fingerprints(requested_state)
+        manage_system_stats()
         last_state_change = datetime.utcnow()
         duration = time.time() - start_time
         
         logger.info(f"State transition completed in {duration:.2f} seconds")
         
-        return jsonify({
+        response = {
             'status': 'success',
             'new_state': current_state,
             'duration_seconds': duration,
             'timestamp': last_state_change.isoformat()
-        })
+        }
+        if load_report:
+            response['load'] = load_report
+        return jsonify(response)
     else:
         return jsonify({
             'status': 'failed',
@@ -212,7 +447,8 @@ def reset_db_state():
     global last_state_change
     
     current = get_current_state()
-    if current == 'unknown' or current not in DB_STATES:
+    states = available_states()
+    if current == 'unknown' or current not in states:
         return jsonify({
             'error': 'Cannot reset unknown state. Set a specific state first.'
         }), 400
@@ -221,20 +457,26 @@ def reset_db_state():
     start_time = time.time()
     
     # Re-apply current state
-    success = execute_sql_file(DB_STATES[current]['sql_file'])
+    success, load_report = apply_state_file(states[current]['sql_file'],
+                                            fast=states[current]['fast'])
     
     if success:
+        record_state_fingerprints(current)
+        manage_system_stats()
         last_state_change = datetime.utcnow()
         duration = time.time() - start_time
         
         logger.info(f"State reset completed in {duration:.2f} seconds")
         
-        return jsonify({
+        response = {
             'status': 'success',
             'state': current,
             'duration_seconds': duration,
             'timestamp': last_state_change.isoformat()
-        })
+        }
+        if load_report:
+            response['load'] = load_report
+        return jsonify(response)
     else:
         return jsonify({
             'status': 'failed',
@@ -242,17 +484,227 @@ def reset_db_state():
         }), 500
 
 
+@app.route('/api/test/db-targets', methods=['GET'])
+def get_db_targets():
+    """List the named database targets available for fan-out"""
+    return jsonify({
+        'targets': {
+            name: {'host': config['host'], 'port': config['port'], 'database': config['database']}
+            for name, config in DB_TARGETS.items()
+        },
+        'max_parallel': DB_FANOUT_WORKERS
+    })
+
+
+@app.route('/api/test/db-verify', methods=['GET'])
+def verify_db_state():
+    """Verify every table against the fingerprints recorded when the state was built"""
+    try:
+        conn = get_db_connection()
+        try:
+            result = verify_fingerprints(conn)
+        finally:
+            conn.close()
+    except Exception as e:
+        logger.error(f"State verification failed: {e}")
+        return jsonify({'status': 'failed', 'error': str(e)}), 500
+    
+    if not result['verified']:
+        logger.warning(f"State verification failed: drifted={result['drifted_tables']} "
+                       f"missing={result['missing_tables']} unexpected={result['unexpected_tables']}")
+    
+    return jsonify(result), 200 if result['verified'] else 409
+
+
+@app.route('/api/test/db-durability', methods=['GET'])
+def get_db_durability():
+    """Report which tables are logged (WAL-protected) and which are unlogged"""
+    try:
+        conn = get_db_connection()
+        try:
+            tables = table_persistence(conn)
+        finally:
+            conn.close()
+    except Exception as e:
+        logger.error(f"Failed to read table persistence: {e}")
+        return jsonify({'status': 'failed', 'error': str(e)}), 500
+    
+    return jsonify({
+        'logged_tables': sorted(t for t, info in tables.items() if info['logged']),
+        'unlogged_tables': sorted(t for t, info in tables.items() if not info['logged'])
+    })
+
+
+@app.route('/api/test/db-durability', methods=['POST'])
+def set_db_durability():
+    """Flip all tables to LOGGED (default) or UNLOGGED"""
+    data = request.get_json(silent=True) or {}
+    logged = bool(data.get('logged', True))
+    
+    logger.info(f"Setting all tables {'LOGGED' if logged else 'UNLOGGED'}")
+    try:
+        result = set_tables_logged(DB_CONFIG, logged=logged)
+    except Exception as e:
+        logger.error(f"Failed to change table durability: {e}")
+        return jsonify({'status': 'failed', 'error': str(e)}), 500
+    
+    return jsonify(dict(result, status='success'))
+
+
+@app.route('/api/test/db-subset', methods=['POST'])
+def create_subset():
+    """Extract a referentially consistent slice of a target into a new named state"""
+    data = request.get_json(silent=True) or {}
+    
+    name = data.get('name')
+    if not isinstance(name, str) or not SUBSET_NAME_RE.match(name):
+        return jsonify({
+            'error': 'Missing or invalid name (lowercase letters, digits, "-" and "_")'
+        }), 400
+    if name in BUILTIN_STATES:
+        return jsonify({'error': f'Cannot overwrite built-in state {name}'}), 400
+    if not data.get('root'):
+        return jsonify({'error': 'Missing root parameter'}), 400
+    
+    source = data.get('source', 'default')
+    if source not in DB_TARGETS:
+        return jsonify({
+            'error': f'Invalid source. Must be one of: {list(DB_TARGETS.keys())}'
+        }), 400
+    
+    ids = data.get('ids')
+    include = data.get('include', [])
+    try:
+        limit = int(data.get('limit', 10))
+        batch_size = int(data.get('batch_size', DB_SUBSET_BATCH))
+    except (TypeError, ValueError):
+        return jsonify({'error': 'limit and batch_size must be integers'}), 400
+    if limit < 1 or batch_size < 1:
+        return jsonify({'error': 'limit and batch_size must be positive'}), 400
+    if ids is not None and not isinstance(ids, list):
+        return jsonify({'error': 'ids must be a list'}), 400
+    if not isinstance(include, list):
+        return jsonify({'error': 'include must be a list of tables'}), 400
+    
+    sql_file = os.path.join(SUBSET_DIR, f'{name}.sql')
+    description = str(data.get('description') or f"Subset of {data['root']} from {source}")
+    logger.info(f"Extracting subset {name} from {source} rooted at {data['root']}")
+    try:
+        os.makedirs(SUBSET_DIR, exist_ok=True)
+        extractor = SubsetExtractor(DB_TARGETS[source], DB_STATES['schema-only']['sql_file'],
+                                    batch_size=batch_size)
+        report = extractor.extract(data['root'], sql_file, limit=limit, ids=ids, include=include,
+                                   description=description)
+    except SubsetError as e:
+        return jsonify({'status': 'failed', 'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Subset extraction failed: {e}")
+        return jsonify({'status': 'failed', 'error': str(e)}), 500
+    
+    return jsonify(dict(report, status='success', state=name, source=source,
+                        timestamp=datetime.utcnow().isoformat()))
+
+
+@app.route('/api/test/data/<table>', methods=['GET'])
+def get_table_data(table):
+    """Stream the rows of a table as NDJSON, one keyset page at a time"""
+    columns_arg = request.args.get('columns')
+    requested = [c.strip() for c in columns_arg.split(',') if c.strip()] if columns_arg else None
+    after = request.args.get('after')
+    limit = request.args.get('limit')
+    if limit is not None:
+        try:
+            limit = int(limit)
+        except ValueError:
+            limit = 0
+        if limit < 1:
+            return jsonify({'error': 'limit must be a positive integer'}), 400
+    
+    try:
+        conn = get_db_connection()
+    except Exception as e:
+        return jsonify({'status': 'failed', 'error': str(e)}), 500
+    
+    try:
+        # One snapshot for the fingerprint and the rows it tags
+        conn.set_session(isolation_level=ISOLATION_LEVEL_REPEATABLE_READ, readonly=True)
+        info = describe_table(conn, table)
+        if info is None:
+            conn.close()
+            return jsonify({'error': f'Unknown table {table}'}), 404
+        if after is not None and not info.key:
+            conn.close()
+            return jsonify({'error': f'Table {table} has no single-column key to page on'}), 400
+        try:
+            columns = info.projection(requested)
+        except ValueError as e:
+            conn.close()
+            return jsonify({'error': str(e)}), 400
+        fingerprint = table_fingerprint(conn, table)
+    except Exception as e:
+        conn.close()
+        logger.error(f"Failed to read table {table}: {e}")
+        return jsonify({'status': 'failed', 'error': str(e)}), 500
+    
+    etag = make_etag(fingerprint, table, columns, after, limit)
+    if request.if_none_match.contains(etag):
+        conn.close()
+        response = Response(status=304)
+    else:
+        try:
+            chunks = stream_rows(conn, info, columns, after=after, limit=limit,
+                                 fetch_size=DATA_FETCH_SIZE)
+        except psycopg2.DataError as e:
+            conn.close()
+            return jsonify({'error': f'Invalid after value: {e}'.strip()}), 400
+        except Exception as e:
+            conn.close()
+            logger.error(f"Failed to read table {table}: {e}")
+            return jsonify({'status': 'failed', 'error': str(e)}), 500
+        response = Response(chunks, mimetype='application/x-ndjson')
+        response.call_on_close(conn.close)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+@app.route('/api/test/stats-refresh', methods=['GET'])
+def get_stats_refresh():
+    """Report the system_stats refresh mode and the background refresher's progress"""
+    return jsonify({
+        'mode': STATS_REFRESH_MODE,
+        'refresher': stats_refresher.status() if stats_refresher else None
+    })
+
+
+@app.route('/api/test/stats-refresh', methods=['POST'])
+def refresh_stats():
+    """Refresh system_stats now, without waiting for the debounce"""
+    try:
+        conn = get_db_connection()
+        try:
+            conn.autocommit = True
+            result = refresh_stats_view(conn)
+        finally:
+            conn.close()
+    except Exception as e:
+        logger.error(f"system_stats refresh failed: {e}")
+        return jsonify({'status': 'failed', 'error': str(e)}), 500
+    
+    return jsonify(dict(result, status='success' if result['refreshed'] else 'skipped'))
+
+
 @app.route('/api/test/db-backup', methods=['POST'])
 def backup_current_state():
     """Create backup of current database state"""
     timestamp = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
-    backup_file = f'/app/backups/backup_{timestamp}.sql'
+    backup_file = os.path.join(BACKUP_DIR, f'backup_{timestamp}.sql')
     
     try:
-        os.makedirs('/app/backups', exist_ok=True)
+        os.makedirs(BACKUP_DIR, exist_ok=True)
         
         # Create pg_dump backup
-        os.system(f"PGPASSWORD={DB_CONFIG['password']} pg_dump -h {DB_CONFIG['host']} -U {DB_CONFIG['user']} -d {DB_CONFIG['database']} > {backup_file}")
+        os.system(f"PGPASSWORD={DB_CONFIG['password']} pg_dump -h {DB_CONFIG['host']} -p {DB_CONFIG['port']} -U {DB_CONFIG['user']} -d {DB_CONFIG['database']} > {backup_file}")
         
         return jsonify({
             'status': 'success',
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Load-test and benchmark harness for the test-data-api.
+
+Starts a disposable local PostgreSQL cluster (see local_pg.py), serves
+app.py in-process on a free port and measures latency percentiles and
+throughput of every endpoint:
+
+    health          GET  /health
+    get_db_state    GET  /api/test/db-state
+    set_db_state    POST /api/test/db-state
+    db_reset        POST /api/test/db-reset
+    db_backup       POST /api/test/db-backup
+
+Read-only endpoints run with --concurrency parallel clients. Endpoints that
+rebuild or dump the database run with one client, since concurrent state
+switches on one database would only measure lock waits.
+
+--scale N adds N thousand audit_logs and notifications rows on top of the
+full state (as a 'scaled' state loaded through the API). Results are written
+as JSON and compared against a stored baseline; a p95 latency or throughput
+regression beyond --tolerance fails with exit code 1.
+
+    python benchmarks/api_load.py --requests 200 --concurrency 8 --scale 50
+    python benchmarks/api_load.py --update-baseline
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import argparse
+import shutil
+import logging
+import platform
+import tempfile
+import threading
+import http.client
+from datetime import datetime
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+SERVICE_DIR = Path(__file__).resolve().parent.parent
+STATES_DIR = SERVICE_DIR.parent.parent / 'sql' / 'states'
+DEFAULT_BASELINE = Path(__file__).resolve().parent / 'api_load_baseline.json'
+
+sys.path.insert(0, str(SERVICE_DIR))
+
+from local_pg import LocalPostgres  # noqa: E402
+
+SCALED_STATE_SQL = """\\i {states_dir}/full-test-data.sql
+
+INSERT INTO audit_logs (user_id, action, resource_type, resource_id, details, created_at)
+SELECT 1 + g % 10, 'benchmark.event', 'benchmark', g, jsonb_build_object('seq', g),
+       NOW() - make_interval(secs => g)
+FROM generate_series(1, {rows}) AS g;
+
+INSERT INTO notifications (user_id, type, title, message, is_read, data)
+SELECT 1 + g % 10, 'benchmark', 'Benchmark notification ' || g, repeat('x', 200), g % 2 = 0,
+       jsonb_build_object('seq', g)
+FROM generate_series(1, {rows}) AS g;
+"""
+
+# name: (method, path, body, runs concurrently)
+SCENARIOS = {
+    'health': ('GET', '/health', None, True),
+    'get_db_state': ('GET', '/api/test/db-state', None, True),
+    'set_db_state': ('POST', '/api/test/db-state', {'state': '{state}'}, False),
+    'db_reset': ('POST', '/api/test/db-reset', None, False),
+    'db_backup': ('POST', '/api/test/db-backup', None, False),
+}
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of samples"""
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def request(port, method, path, body=None):
+    """Send one request, return (latency seconds, HTTP status)"""
+    payload = json.dumps(body) if body is not None else None
+    headers = {'Content-Type': 'application/json'} if payload is not None else {}
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=300)
+    start = time.perf_counter()
+    try:
+        conn.request(method, path, body=payload, headers=headers)
+        response = conn.getresponse()
+        response.read()
+        return time.perf_counter() - start, response.status
+    finally:
+        conn.close()
+
+
+def run_scenario(port, method, path, body, requests, concurrency, warmup):
+    """Issue requests with the given concurrency and summarise latencies"""
+    for _ in range(warmup):
+        request(port, method, path, body)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(lambda _: request(port, method, path, body), range(requests)))
+    wall = time.perf_counter() - start
+
+    latencies = [latency for latency, _ in results]
+    errors = sum(1 for _, status in results if status >= 400)
+    return {
+        'requests': requests,
+        'concurrency': concurrency,
+        'errors': errors,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 2),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 2),
+        'mean_ms': round(sum(latencies) / len(latencies) * 1000, 2),
+        'max_ms': round(max(latencies) * 1000, 2),
+        'throughput_rps': round(requests / wall, 2),
+        'wall_seconds': round(wall, 4)
+    }
+
+
+def compare_to_baseline(results, baseline, tolerance):
+    """Return a list of regression messages (empty when within tolerance)"""
+    regressions = []
+    for name, base in baseline.get('results', {}).items():
+        current = results.get(name)
+        if current is None:
+            continue
+        if current['errors'] > base.get('errors', 0):
+            regressions.append(f"{name}: {current['errors']} errors (baseline {base.get('errors', 0)})")
+        if current['p95_ms'] > base['p95_ms'] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {current['p95_ms']}ms > baseline {base['p95_ms']}ms "
+                               f"+{tolerance:.0%}")
+        if current['throughput_rps'] < base['throughput_rps'] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {current['throughput_rps']} rps < baseline "
+                               f"{base['throughput_rps']} rps -{tolerance:.0%}")
+    return regressions
+
+
+def start_api(db_config, backup_dir):
+    """Import app.py against db_config and serve it on a free port"""
+    os.environ.update({
+        'DB_HOST': db_config['host'],
+        'DB_PORT': str(db_config['port']),
+        'DB_NAME': db_config['database'],
+        'DB_USER': db_config['user'],
+        'DB_PASSWORD': db_config['password'],
+        'SQL_STATES_DIR': str(STATES_DIR),
+        'BACKUP_DIR': backup_dir
+    })
+    import app as api
+    from werkzeug.serving import make_server
+
+    logging.getLogger('app').setLevel(logging.WARNING)
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+
+    server = make_server('127.0.0.1', 0, api.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return api, server
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the test-data-api endpoints')
+    parser.add_argument('--requests', type=int, default=100, help='Requests per read-only scenario')
+    parser.add_argument('--write-requests', type=int, default=10,
+                        help='Requests per state switch/reset/backup scenario')
+    parser.add_argument('--concurrency', type=int, default=8, help='Parallel clients for read-only scenarios')
+    parser.add_argument('--scale', type=int, default=0,
+                        help='Thousands of extra audit_logs/notifications rows (default: 0)')
+    parser.add_argument('--warmup', type=int, default=2, help='Unmeasured requests per scenario')
+    parser.add_argument('--scenarios', nargs='+', choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument('--use-env-db', action='store_true',
+                        help='Use the DB_* environment variables instead of a local cluster')
+    parser.add_argument('--output', default='api-load-results.json', help='Results JSON file')
+    parser.add_argument('--baseline', default=str(DEFAULT_BASELINE), help='Baseline JSON file')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Allowed relative regression of p95 latency and throughput')
+    parser.add_argument('--update-baseline', action='store_true', help='Store results as the new baseline')
+    args = parser.parse_args()
+
+    cluster = None
+    if args.use_env_db:
+        db_config = {
+            'host': os.environ.get('DB_HOST', 'localhost'),
+            'port': os.environ.get('DB_PORT', '5432'),
+            'database': os.environ.get('DB_NAME', 'oversight_test'),
+            'user': os.environ.get('DB_USER', 'testadmin'),
+            'password': os.environ.get('DB_PASSWORD', 'TestPassword123!')
+        }
+    else:
+        cluster = LocalPostgres().start()
+        db_config = cluster.db_config()
+        # pg_dump for /api/test/db-backup comes from the same installation
+        os.environ['PATH'] = cluster.bin_dir + os.pathsep + os.environ.get('PATH', '')
+
+    work_dir = tempfile.mkdtemp(prefix='test-data-api-bench-')
+    try:
+        api, server = start_api(db_config, os.path.join(work_dir, 'backups'))
+        port = server.server_port
+
+        state = 'full'
+        if args.scale:
+            scaled_file = os.path.join(work_dir, 'scaled-test-data.sql')
+            with open(scaled_file, 'w') as f:
+                f.write(SCALED_STATE_SQL.format(states_dir=STATES_DIR, rows=args.scale * 1000))
+            api.DB_STATES['scaled'] = {
+                'description': f'Full test data plus {args.scale}k benchmark rows',
+                'sql_file': scaled_file,
+                'fast': False
+            }
+            state = 'scaled'
+
+        # Every scenario starts from the benchmark state
+        _, status = request(port, 'POST', '/api/test/db-state', {'state': state})
+        if status != 200:
+            print(f"Could not load state {state} (HTTP {status})")
+            sys.exit(2)
+
+        results = {}
+        for name in args.scenarios:
+            method, path, body, concurrent = SCENARIOS[name]
+            if body is not None:
+                body = {k: v.format(state=state) for k, v in body.items()}
+            results[name] = run_scenario(
+                port, method, path, body,
+                requests=args.requests if concurrent else args.write_requests,
+                concurrency=args.concurrency if concurrent else 1,
+                warmup=args.warmup
+            )
+            r = results[name]
+            print(f"{name:<14} p50 {r['p50_ms']:>9.2f}ms  p95 {r['p95_ms']:>9.2f}ms  "
+                  f"p99 {r['p99_ms']:>9.2f}ms  {r['throughput_rps']:>9.2f} rps  errors {r['errors']}")
+
+        server.shutdown()
+    finally:
+        if cluster:
+            cluster.stop()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    report = {
+        'meta': {
+            'timestamp': datetime.utcnow().isoformat(),
+            'state': state,
+            'scale': args.scale,
+            'concurrency': args.concurrency,
+            'requests': args.requests,
+            'write_requests': args.write_requests,
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'cpus': os.cpu_count()
+        },
+        'results': results
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.update_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline updated: {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one")
+        return
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline['meta'].get('scale') != args.scale:
+        print(f"Warning: baseline scale {baseline['meta'].get('scale')} differs from --scale {args.scale}")
+
+    regressions = compare_to_baseline(results, baseline, args.tolerance)
+    for message in regressions:
+        print(f"❌ {message}")
+    if regressions:
+        sys.exit(1)
+    print("✅ No regressions against baseline")
+
+
+if __name__ == '__main__':
+    main()
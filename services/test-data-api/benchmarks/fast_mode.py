@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Compare state load times with full durability and in fast mode.
+
+Each state is loaded --repeat times per mode with the same loader the API
+uses. Connection settings come from the same DB_* environment variables as
+app.py; point them at a disposable database, every run drops the public
+schema.
+
+    DB_HOST=localhost DB_NAME=scratch python benchmarks/fast_mode.py --repeat 5
+"""
+
+import os
+import sys
+import json
+import argparse
+import statistics
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from state_loader import ParallelStateLoader  # noqa: E402
+
+STATES_DIR = Path(__file__).resolve().parents[3] / 'sql' / 'states'
+STATE_FILES = {
+    'schema-only': 'schema-only.sql',
+    'framework': 'framework-data.sql',
+    'full': 'full-test-data.sql'
+}
+
+
+def db_config_from_env():
+    return {
+        'host': os.environ.get('DB_HOST', 'localhost'),
+        'port': os.environ.get('DB_PORT', '5432'),
+        'database': os.environ.get('DB_NAME', 'oversight_test'),
+        'user': os.environ.get('DB_USER', 'testadmin'),
+        'password': os.environ.get('DB_PASSWORD', 'TestPassword123!')
+    }
+
+
+def benchmark_state(db_config, sql_file, fast, repeat, workers):
+    """Load one state repeatedly, return wall-clock samples in seconds"""
+    samples = []
+    for _ in range(repeat):
+        report = ParallelStateLoader(db_config, workers=workers, fast=fast).load(str(sql_file))
+        samples.append(report['wall_seconds'])
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark durable vs fast state loads')
+    parser.add_argument('--states', nargs='+', choices=list(STATE_FILES), default=list(STATE_FILES),
+                        help='States to benchmark (default: all)')
+    parser.add_argument('--repeat', type=int, default=5, help='Loads per state and mode')
+    parser.add_argument('--workers', type=int, default=4, help='Loader worker connections')
+    parser.add_argument('--output', help='Write results as JSON to this file')
+    args = parser.parse_args()
+
+    db_config = db_config_from_env()
+    results = {}
+
+    for state in args.states:
+        sql_file = STATES_DIR / STATE_FILES[state]
+        durable = benchmark_state(db_config, sql_file, False, args.repeat, args.workers)
+        fast = benchmark_state(db_config, sql_file, True, args.repeat, args.workers)
+        results[state] = {
+            'durable_median_seconds': round(statistics.median(durable), 4),
+            'fast_median_seconds': round(statistics.median(fast), 4),
+            'speedup': round(statistics.median(durable) / statistics.median(fast), 2),
+            'durable_samples': durable,
+            'fast_samples': fast
+        }
+
+    print(f"{'State':<14}{'Durable (s)':>14}{'Fast (s)':>12}{'Speedup':>10}")
+    for state, result in results.items():
+        print(f"{state:<14}{result['durable_median_seconds']:>14.4f}"
+              f"{result['fast_median_seconds']:>12.4f}{result['speedup']:>9.2f}x")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'repeat': args.repeat, 'workers': args.workers, 'results': results}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
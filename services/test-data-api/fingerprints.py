@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Per-table content fingerprints for state verification.
+
+A fingerprint is the row count plus the sum of a 64-bit hash of every row
+(hash_record_extended() on PostgreSQL 14+, a hash of the row's text form on
+older servers). The sum is order-independent, so no sort is needed. The hashing
+runs server-side in a set-returning function that aggregates every public
+table, so fingerprinting the whole schema is a single query.
+
+Fingerprints are recorded right after a state is built, in a schema of its
+own so that dropping and recreating ``public`` leaves them alone, and any
+later verification is a single round trip comparing the live tables with
+the recorded ones.
+"""
+
+import time
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+import psycopg2.errors
+
+STORE_SCHEMA = 'test_data_api'
+
+ENSURE_STORE_SQL = f"""
+    CREATE SCHEMA IF NOT EXISTS {STORE_SCHEMA};
+    CREATE TABLE IF NOT EXISTS {STORE_SCHEMA}.state_fingerprints (
+        table_name TEXT PRIMARY KEY,
+        state TEXT NOT NULL,
+        row_count BIGINT NOT NULL,
+        fingerprint TEXT NOT NULL,
+        recorded_at TIMESTAMP NOT NULL
+    );
+    CREATE OR REPLACE FUNCTION {STORE_SCHEMA}.table_fingerprints()
+    RETURNS TABLE (table_name TEXT, row_count BIGINT, fingerprint TEXT) AS $$
+    DECLARE
+        t RECORD;
+        row_hash TEXT := CASE WHEN current_setting('server_version_num')::int >= 140000
+                              THEN 'hash_record_extended(r, 0)'
+                              ELSE 'hashtextextended(r::text, 0)' END;
+    BEGIN
+        FOR t IN
+            SELECT c.relname
+            FROM pg_class c
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE n.nspname = 'public' AND c.relkind = 'r'
+        LOOP
+            table_name := t.relname;
+            EXECUTE format(
+                'SELECT count(*), COALESCE(sum(%s), 0)::text FROM public.%I r',
+                row_hash, t.relname
+            ) INTO row_count, fingerprint;
+            RETURN NEXT;
+        END LOOP;
+    END;
+    $$ LANGUAGE plpgsql STABLE;
+"""
+
+RECORD_SQL = f"""
+    DELETE FROM {STORE_SCHEMA}.state_fingerprints;
+    INSERT INTO {STORE_SCHEMA}.state_fingerprints
+        (table_name, state, row_count, fingerprint, recorded_at)
+    SELECT table_name, %(state)s, row_count, fingerprint, %(recorded_at)s
+    FROM {STORE_SCHEMA}.table_fingerprints()
+    RETURNING table_name, row_count, fingerprint
+"""
+
+VERIFY_SQL = f"""
+    SELECT COALESCE(c.table_name, r.table_name),
+           r.state, r.recorded_at,
+           r.row_count, c.row_count,
+           r.fingerprint, c.fingerprint
+    FROM {STORE_SCHEMA}.table_fingerprints() c
+    FULL OUTER JOIN {STORE_SCHEMA}.state_fingerprints r ON r.table_name = c.table_name
+    ORDER BY 1
+"""
+
+RECORDED_STATE_SQL = f"""
+    SELECT state FROM {STORE_SCHEMA}.state_fingerprints LIMIT 1
+"""
+
+
+MISSING_STORE_ERRORS = (
+    psycopg2.errors.UndefinedTable,
+    psycopg2.errors.UndefinedFunction,
+    psycopg2.errors.InvalidSchemaName
+)
+
+
+def ensure_store(conn):
+    """Create the fingerprint store if it does not exist yet"""
+    with conn.cursor() as cursor:
+        cursor.execute(ENSURE_STORE_SQL)
+    conn.commit()
+
+
+def record_fingerprints(conn, state: str) -> Dict[str, Any]:
+    """Fingerprint every public table and record the result for state"""
+    start = time.perf_counter()
+    ensure_store(conn)
+    with conn.cursor() as cursor:
+        cursor.execute(RECORD_SQL, {'state': state, 'recorded_at': datetime.utcnow()})
+        rows = cursor.fetchall()
+    conn.commit()
+
+    return {
+        'state': state,
+        'tables': {name: {'rows': count, 'fingerprint': fp} for name, count, fp in rows},
+        'duration_seconds': round(time.perf_counter() - start, 4)
+    }
+
+
+def recorded_state(conn) -> Optional[str]:
+    """Name of the state the fingerprints were recorded for, if any"""
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(RECORDED_STATE_SQL)
+            row = cursor.fetchone()
+    except MISSING_STORE_ERRORS:
+        row = None
+    conn.rollback()
+    return row[0] if row else None
+
+
+def table_fingerprint(conn, table: str) -> Dict[str, Any]:
+    """Live fingerprint of one public table (or view).
+
+    Reads the table in the caller's transaction and leaves it open, so the
+    result describes the same snapshot as the queries that follow.
+    """
+    row_hash = ('hash_record_extended(r, 0)' if conn.server_version >= 140000
+                else 'hashtextextended(r::text, 0)')
+    with conn.cursor() as cursor:
+        cursor.execute(
+            f'SELECT count(*), COALESCE(sum({row_hash}), 0)::text FROM public."{table}" r'
+        )
+        row_count, fingerprint = cursor.fetchone()
+    return {'rows': row_count, 'fingerprint': fingerprint}
+
+
+def verify_fingerprints(conn) -> Dict[str, Any]:
+    """Compare live table fingerprints with the recorded ones in one query.
+
+    Returns the recorded state and, per table, expected and actual row
+    counts. A table is drifted when its content changed, missing when it
+    was dropped and unexpected when it did not exist at record time.
+    """
+    start = time.perf_counter()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(VERIFY_SQL)
+            rows = cursor.fetchall()
+    except MISSING_STORE_ERRORS:
+        # Nothing recorded yet: report every live table as unexpected
+        conn.rollback()
+        ensure_store(conn)
+        with conn.cursor() as cursor:
+            cursor.execute(VERIFY_SQL)
+            rows = cursor.fetchall()
+    conn.rollback()
+
+    state = None
+    recorded_at = None
+    tables = {}
+    drifted, missing, unexpected = [], [], []
+
+    for name, rec_state, rec_at, expected_rows, actual_rows, expected_fp, actual_fp in rows:
+        if rec_state is not None:
+            state, recorded_at = rec_state, rec_at
+        if expected_fp is None:
+            status = 'unexpected'
+            unexpected.append(name)
+        elif actual_fp is None:
+            status = 'missing'
+            missing.append(name)
+        elif expected_fp != actual_fp or expected_rows != actual_rows:
+            status = 'drifted'
+            drifted.append(name)
+        else:
+            status = 'ok'
+        tables[name] = {
+            'status': status,
+            'expected_rows': expected_rows,
+            'actual_rows': actual_rows
+        }
+
+    return {
+        'state': state,
+        'recorded_at': recorded_at.isoformat() if recorded_at else None,
+        'verified': state is not None and not (drifted or missing or unexpected),
+        'drifted_tables': drifted,
+        'missing_tables': missing,
+        'unexpected_tables': unexpected,
+        'tables': tables,
+        'duration_seconds': round(time.perf_counter() - start, 4)
+    }
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Disposable local PostgreSQL cluster for benchmarks and tests.
+
+The cluster is initialised with initdb into a temporary directory (on tmpfs
+when /dev/shm is available), listens only on a Unix socket inside that
+directory and is deleted again on stop(). PostgreSQL binaries are looked up
+in PG_BIN, then PATH, then the usual Debian/RHEL install locations.
+
+PostgreSQL refuses to run as root; when started by root (as in the service
+container) the server processes run as PG_OS_USER (default: postgres).
+"""
+
+import os
+import glob
+import shutil
+import socket
+import tempfile
+import subprocess
+from typing import Dict, Any, Optional
+
+import psycopg2
+
+SEARCH_PATTERNS = [
+    '/usr/lib/postgresql/*/bin',
+    '/usr/pgsql-*/bin',
+    '/usr/local/pgsql/bin',
+]
+
+
+def find_pg_bin() -> Optional[str]:
+    """Return the directory holding initdb/pg_ctl, or None if not installed"""
+    candidates = [os.environ.get('PG_BIN')]
+    initdb = shutil.which('initdb')
+    if initdb:
+        candidates.append(os.path.dirname(initdb))
+    for pattern in SEARCH_PATTERNS:
+        candidates.extend(sorted(glob.glob(pattern), reverse=True))
+
+    for candidate in candidates:
+        if candidate and os.path.exists(os.path.join(candidate, 'initdb')) \
+                and os.path.exists(os.path.join(candidate, 'pg_ctl')):
+            return candidate
+    return None
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class LocalPostgres:
+    """Throwaway PostgreSQL cluster, usable as a context manager"""
+
+    def __init__(self, user: str = 'testadmin', bin_dir: Optional[str] = None,
+                 base_dir: Optional[str] = None, settings: Optional[Dict[str, str]] = None):
+        self.user = user
+        self.bin_dir = bin_dir or find_pg_bin()
+        if not self.bin_dir:
+            raise RuntimeError("PostgreSQL binaries not found; set PG_BIN to the directory with initdb")
+        if base_dir is None and os.path.isdir('/dev/shm'):
+            base_dir = '/dev/shm'
+        self.base_dir = tempfile.mkdtemp(prefix='test-data-api-pg-', dir=base_dir)
+        self.data_dir = os.path.join(self.base_dir, 'data')
+        self.socket_dir = self.base_dir
+        self.port = _free_port()
+        # Durability is pointless for a cluster that is deleted afterwards
+        self.settings = dict({'fsync': 'off', 'full_page_writes': 'off'}, **(settings or {}))
+        self.os_user = None
+        if hasattr(os, 'geteuid') and os.geteuid() == 0:
+            self.os_user = os.environ.get('PG_OS_USER', 'postgres')
+            shutil.chown(self.base_dir, user=self.os_user)
+        self.started = False
+
+    def _run(self, *args: str):
+        subprocess.run(
+            [os.path.join(self.bin_dir, args[0]), *args[1:]],
+            check=True, capture_output=True, text=True, user=self.os_user
+        )
+
+    def start(self) -> 'LocalPostgres':
+        """initdb and start the server"""
+        self._run('initdb', '-D', self.data_dir, '-U', self.user, '-A', 'trust',
+                  '--no-sync', '-E', 'UTF8')
+        options = [f"-k {self.socket_dir}", f"-p {self.port}", "-c listen_addresses=''"]
+        options.extend(f"-c {name}={value}" for name, value in self.settings.items())
+        self._run('pg_ctl', '-D', self.data_dir, '-o', ' '.join(options),
+                  '-l', os.path.join(self.base_dir, 'server.log'), '-w', 'start')
+        self.started = True
+        return self
+
+    def stop(self):
+        """Stop the server and delete the cluster"""
+        if self.started:
+            try:
+                self._run('pg_ctl', '-D', self.data_dir, '-m', 'immediate', '-w', 'stop')
+            finally:
+                self.started = False
+        shutil.rmtree(self.base_dir, ignore_errors=True)
+
+    def db_config(self, database: str = 'postgres') -> Dict[str, Any]:
+        """Connection settings in the DB_CONFIG format used by app.py"""
+        return {
+            'host': self.socket_dir,
+            'port': str(self.port),
+            'database': database,
+            'user': self.user,
+            'password': ''
+        }
+
+    def create_database(self, name: str, template: Optional[str] = None):
+        """Create a database, optionally cloned from a template database"""
+        conn = psycopg2.connect(**self.db_config())
+        conn.autocommit = True
+        try:
+            with conn.cursor() as cursor:
+                statement = f'CREATE DATABASE "{name}"'
+                if template:
+                    statement += f' TEMPLATE "{template}"'
+                cursor.execute(statement)
+        finally:
+            conn.close()
+
+    def drop_database(self, name: str):
+        conn = psycopg2.connect(**self.db_config())
+        conn.autocommit = True
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(f'DROP DATABASE IF EXISTS "{name}" WITH (FORCE)')
+        finally:
+            conn.close()
+
+    def __enter__(self) -> 'LocalPostgres':
+        try:
+            return self.start()
+        except Exception:
+            self.stop()
+            raise
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,479 @@
+#!/usr/bin/env python3
+"""
+Parallel loader for the SQL state files under sql/states.
+
+A state file is split into statements and turned into a load plan:
+
+- schema statements (DDL, functions, DO blocks, ...) run in file order on a
+  single connection and act as barriers;
+- runs of INSERT statements between two barriers are grouped per table and
+  loaded concurrently over a small worker pool, following the foreign-key
+  dependency graph so a table only starts once the tables it references
+  are committed;
+- CREATE INDEX and REFRESH MATERIALIZED VIEW statements are deferred and run
+  in parallel once all data is loaded.
+
+psql's ``\\i`` include meta-command is expanded inline, so framework-data.sql
+and full-test-data.sql can be loaded without psql.
+
+Fast mode trades durability for speed on disposable test databases: tables
+are created UNLOGGED (no WAL) and every load connection runs with
+synchronous_commit=off. Unlogged tables are emptied after a server crash;
+set_tables_logged() converts them back when a state has to survive one.
+"""
+
+import os
+import re
+import time
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, List, Set, Tuple, Any
+
+import psycopg2
+
+logger = logging.getLogger(__name__)
+
+_IDENT = r'((?:"[^"]+"|[\w$]+)(?:\.(?:"[^"]+"|[\w$]+))?)'
+
+INSERT_RE = re.compile(r'^INSERT\s+INTO\s+' + _IDENT, re.IGNORECASE)
+CREATE_TABLE_RE = re.compile(
+    r'^CREATE\s+(?:(?:UNLOGGED|TEMP|TEMPORARY)\s+)?TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?' + _IDENT,
+    re.IGNORECASE
+)
+CREATE_INDEX_RE = re.compile(
+    r'^CREATE\s+(?:UNIQUE\s+)?INDEX\b.*?\bON\s+(?:ONLY\s+)?' + _IDENT,
+    re.IGNORECASE | re.DOTALL
+)
+REFRESH_RE = re.compile(
+    r'^REFRESH\s+MATERIALIZED\s+VIEW\s+(?:CONCURRENTLY\s+)?' + _IDENT,
+    re.IGNORECASE
+)
+PLAIN_CREATE_TABLE_RE = re.compile(r'^CREATE\s+TABLE\b', re.IGNORECASE)
+REFERENCES_RE = re.compile(r'\bREFERENCES\s+' + _IDENT, re.IGNORECASE)
+SOURCE_TABLE_RE = re.compile(r'\b(?:FROM|JOIN)\s+' + _IDENT, re.IGNORECASE)
+DOLLAR_TAG_RE = re.compile(r'\$[A-Za-z_]*\$')
+
+
+def normalize_name(name: str) -> str:
+    """Normalize a table identifier (strip quotes and the public schema)"""
+    name = name.replace('"', '').lower()
+    if name.startswith('public.'):
+        name = name[len('public.'):]
+    return name
+
+
+def split_sql(sql: str) -> List[str]:
+    """Split SQL text into statements.
+
+    Comments are dropped; quoted strings, quoted identifiers and
+    dollar-quoted bodies are kept intact. psql meta-commands (lines starting
+    with a backslash) are returned as their own statements.
+    """
+    statements = []
+    current = []
+    i = 0
+    length = len(sql)
+
+    def flush():
+        statement = ''.join(current).strip()
+        if statement:
+            statements.append(statement)
+        current.clear()
+
+    while i < length:
+        char = sql[i]
+
+        if char == '-' and sql.startswith('--', i):
+            end = sql.find('\n', i)
+            i = length if end == -1 else end
+        elif char == '/' and sql.startswith('/*', i):
+            end = sql.find('*/', i + 2)
+            i = length if end == -1 else end + 2
+        elif char in ("'", '"'):
+            end = i + 1
+            while end < length:
+                if sql[end] == char:
+                    if end + 1 < length and sql[end + 1] == char:
+                        end += 2
+                        continue
+                    break
+                end += 1
+            current.append(sql[i:end + 1])
+            i = end + 1
+        elif char == '$' and DOLLAR_TAG_RE.match(sql, i):
+            tag = DOLLAR_TAG_RE.match(sql, i).group(0)
+            end = sql.find(tag, i + len(tag))
+            end = length if end == -1 else end + len(tag)
+            current.append(sql[i:end])
+            i = end
+        elif char == '\\' and not ''.join(current).strip():
+            end = sql.find('\n', i)
+            end = length if end == -1 else end
+            statements.append(sql[i:end].strip())
+            current.clear()
+            i = end
+        elif char == ';':
+            flush()
+            i += 1
+        else:
+            current.append(char)
+            i += 1
+
+    flush()
+    return statements
+
+
+def _resolve_include(path: str, including_file: str) -> str:
+    """Resolve a \\i path, falling back to the including file's directory"""
+    if os.path.exists(path):
+        return path
+    local = os.path.join(os.path.dirname(including_file), os.path.basename(path))
+    if os.path.exists(local):
+        return local
+    raise FileNotFoundError(f"Included SQL file not found: {path}")
+
+
+def read_statements(filepath: str, _seen: Set[str] = None) -> List[str]:
+    """Read a SQL file into statements, expanding \\i / \\include recursively"""
+    seen = set(_seen or ())
+    real_path = os.path.realpath(filepath)
+    if real_path in seen:
+        raise ValueError(f"Recursive include of {filepath}")
+    seen.add(real_path)
+
+    with open(filepath, 'r') as file:
+        sql = file.read()
+
+    statements = []
+    for statement in split_sql(sql):
+        if statement.startswith('\\'):
+            parts = statement.split(None, 1)
+            if parts[0] in ('\\i', '\\include', '\\ir', '\\include_relative') and len(parts) > 1:
+                include = parts[1].strip().strip("'")
+                if parts[0] in ('\\ir', '\\include_relative'):
+                    include = os.path.join(os.path.dirname(filepath), include)
+                statements.extend(read_statements(_resolve_include(include, filepath), seen))
+            else:
+                logger.warning(f"Ignoring unsupported psql meta-command: {parts[0]}")
+            continue
+        statements.append(statement)
+    return statements
+
+
+def build_dependency_graph(statements: List[str]) -> Dict[str, Set[str]]:
+    """Map each created table to the tables its foreign keys reference"""
+    graph = {}
+    for statement in statements:
+        match = CREATE_TABLE_RE.match(statement)
+        if match:
+            table = normalize_name(match.group(1))
+            references = {normalize_name(ref) for ref in REFERENCES_RE.findall(statement)}
+            graph.setdefault(table, set()).update(references - {table})
+    return graph
+
+
+def make_unlogged(statement: str) -> str:
+    """Rewrite a plain CREATE TABLE statement to CREATE UNLOGGED TABLE"""
+    return PLAIN_CREATE_TABLE_RE.sub('CREATE UNLOGGED TABLE', statement, count=1)
+
+
+def topological_order(graph: Dict[str, Set[str]]) -> List[str]:
+    """Order tables so every table comes after the tables it references.
+
+    Tables caught in a reference cycle are appended in name order.
+    """
+    remaining = {table: set(deps) - {table} for table, deps in graph.items()}
+    order = []
+    while remaining:
+        ready = sorted(t for t, deps in remaining.items() if not deps & set(remaining))
+        if not ready:
+            ready = sorted(remaining)
+        for table in ready:
+            remaining.pop(table)
+        order.extend(ready)
+    return order
+
+
+class LoadPlan:
+    """Ordered execution plan for a state file"""
+
+    def __init__(self, statements: List[str], unlogged: bool = False):
+        if unlogged:
+            statements = [make_unlogged(statement) for statement in statements]
+        self.graph = build_dependency_graph(statements)
+        # Each step is ('sql', [statements]) or ('data', {table: [(index, statement)]})
+        self.steps = []
+        # Post-load work: (kind, target, statement)
+        self.deferred = []
+
+        refreshes = OrderedDict()
+        for index, statement in enumerate(statements):
+            insert = INSERT_RE.match(statement)
+            index_match = CREATE_INDEX_RE.match(statement)
+            refresh = REFRESH_RE.match(statement)
+
+            if insert:
+                table = normalize_name(insert.group(1))
+                if not self.steps or self.steps[-1][0] != 'data':
+                    self.steps.append(('data', OrderedDict()))
+                self.steps[-1][1].setdefault(table, []).append((index, statement))
+            elif index_match:
+                self.deferred.append(('index', normalize_name(index_match.group(1)), statement))
+            elif refresh:
+                view = normalize_name(refresh.group(1))
+                refreshes.pop(view, None)
+                refreshes[view] = statement
+            else:
+                if not self.steps or self.steps[-1][0] != 'sql':
+                    self.steps.append(('sql', []))
+                self.steps[-1][1].append(statement)
+
+        self.deferred.extend(('refresh', view, stmt) for view, stmt in refreshes.items())
+
+    @classmethod
+    def from_file(cls, filepath: str, unlogged: bool = False) -> 'LoadPlan':
+        return cls(read_statements(filepath), unlogged=unlogged)
+
+    def table_dependencies(self, batch: Dict[str, List[Tuple[int, str]]]) -> Dict[str, Set[str]]:
+        """Dependencies between the tables of one data batch.
+
+        Besides declared foreign keys, an INSERT ... SELECT reading another
+        table of the same batch depends on that table.
+        """
+        tables = set(batch)
+        dependencies = {}
+        for table, statements in batch.items():
+            depends_on = set(self.graph.get(table, ()))
+            for _, statement in statements:
+                depends_on.update(normalize_name(src) for src in SOURCE_TABLE_RE.findall(statement))
+            dependencies[table] = (depends_on & tables) - {table}
+        return dependencies
+
+
+class _Phase:
+    """Wall-clock, CPU and summed worker time for one load phase"""
+
+    def __init__(self):
+        self.wall_seconds = 0.0
+        self.cpu_seconds = 0.0
+        self.worker_seconds = 0.0
+        self.statements = 0
+
+    @contextmanager
+    def measure(self):
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield self
+        finally:
+            self.wall_seconds += time.perf_counter() - wall_start
+            self.cpu_seconds += time.process_time() - cpu_start
+
+    def add(self, statements: int, seconds: float):
+        self.statements += statements
+        self.worker_seconds += seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'wall_seconds': round(self.wall_seconds, 4),
+            'cpu_seconds': round(self.cpu_seconds, 4),
+            'worker_seconds': round(self.worker_seconds, 4),
+            'statements': self.statements
+        }
+
+
+class ParallelStateLoader:
+    """Load a state file over a pool of database connections.
+
+    Unlike execute_sql_file() the load is not a single transaction: each
+    schema step and each table is committed on its own connection. A failed
+    load leaves the database in an undefined state and should be followed by
+    a fresh state switch.
+
+    With fast=True tables are created UNLOGGED and every connection sets
+    synchronous_commit=off for the duration of the load.
+    """
+
+    def __init__(self, db_config: Dict[str, Any], workers: int = 4, fast: bool = False):
+        self.db_config = db_config
+        self.workers = max(1, workers)
+        self.fast = fast
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        conn = psycopg2.connect(**self.db_config)
+        if self.fast:
+            with conn.cursor() as cursor:
+                cursor.execute("SET synchronous_commit = off")
+            conn.commit()
+        return conn
+
+    def _worker_connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def _close_connections(self):
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def _execute(self, conn, statements: List[str]) -> float:
+        """Execute statements on conn in one transaction, return seconds spent"""
+        start = time.perf_counter()
+        try:
+            with conn.cursor() as cursor:
+                for statement in statements:
+                    cursor.execute(statement)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        return time.perf_counter() - start
+
+    def _run_job(self, statements: List[str]) -> float:
+        return self._execute(self._worker_connection(), statements)
+
+    def _load_batch(self, executor, batch, dependencies, phase, tables_report):
+        """Load one batch of tables, starting each as soon as its parents are done"""
+        pending = dict(dependencies)
+        running = {}
+        done = set()
+
+        while pending or running:
+            ready = [table for table, deps in pending.items() if deps <= done]
+            if not ready and not running:
+                # Dependency cycle: load the remaining tables together in file order
+                ready = [tuple(pending)]
+            for job in ready:
+                tables = job if isinstance(job, tuple) else (job,)
+                statements = sorted(s for t in tables for s in batch[t])
+                for table in tables:
+                    pending.pop(table, None)
+                future = executor.submit(self._run_job, [s for _, s in statements])
+                running[future] = (tables, len(statements))
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                tables, count = running.pop(future)
+                seconds = future.result()
+                phase.add(count, seconds)
+                done.update(tables)
+                for table in tables:
+                    tables_report[table] = round(tables_report.get(table, 0.0) + seconds, 4)
+
+    def load(self, filepath: str) -> Dict[str, Any]:
+        """Load a state file and return per-phase timings"""
+        started = time.perf_counter()
+        plan = LoadPlan.from_file(filepath, unlogged=self.fast)
+        schema, data, post_load = _Phase(), _Phase(), _Phase()
+        tables_report = {}
+
+        try:
+            main_conn = self._connect()
+            with self._lock:
+                self._connections.append(main_conn)
+
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                for kind, payload in plan.steps:
+                    if kind == 'sql':
+                        with schema.measure():
+                            schema.add(len(payload), self._execute(main_conn, payload))
+                    else:
+                        with data.measure():
+                            self._load_batch(executor, payload, plan.table_dependencies(payload),
+                                             data, tables_report)
+
+                with post_load.measure():
+                    futures = [executor.submit(self._run_job, [statement])
+                               for _, _, statement in plan.deferred]
+                    for future in futures:
+                        post_load.add(1, future.result())
+        finally:
+            self._close_connections()
+
+        return {
+            'loader': 'parallel',
+            'workers': self.workers,
+            'fast': self.fast,
+            'wall_seconds': round(time.perf_counter() - started, 4),
+            'phases': {
+                'schema': schema.to_dict(),
+                'data': dict(data.to_dict(), tables=tables_report),
+                'post_load': dict(post_load.to_dict(),
+                                  indexes=sum(1 for kind, _, _ in plan.deferred if kind == 'index'),
+                                  refreshes=[target for kind, target, _ in plan.deferred
+                                             if kind == 'refresh'])
+            }
+        }
+
+
+PERSISTENCE_QUERY = """
+    SELECT c.relname,
+           c.relpersistence = 'p' AS logged,
+           COALESCE(array_agg(DISTINCT r.relname) FILTER (WHERE r.relname IS NOT NULL), '{}')
+    FROM pg_class c
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    LEFT JOIN pg_constraint k ON k.conrelid = c.oid AND k.contype = 'f'
+    LEFT JOIN pg_class r ON r.oid = k.confrelid
+    WHERE n.nspname = 'public' AND c.relkind = 'r'
+    GROUP BY c.relname, c.relpersistence
+"""
+
+
+def table_persistence(conn) -> Dict[str, Dict[str, Any]]:
+    """Return {table: {'logged': bool, 'references': set}} for the public schema"""
+    with conn.cursor() as cursor:
+        cursor.execute(PERSISTENCE_QUERY)
+        return {
+            name: {'logged': logged, 'references': set(references)}
+            for name, logged, references in cursor.fetchall()
+        }
+
+
+def set_tables_logged(db_config: Dict[str, Any], logged: bool = True) -> Dict[str, Any]:
+    """Flip every public table to LOGGED (or back to UNLOGGED).
+
+    A logged table may not reference an unlogged one, so tables are switched
+    parents-first when making them logged and children-first otherwise. All
+    changes happen in one transaction.
+    """
+    start = time.perf_counter()
+    conn = psycopg2.connect(**db_config)
+    try:
+        tables = table_persistence(conn)
+        order = topological_order({t: info['references'] for t, info in tables.items()})
+        if not logged:
+            order.reverse()
+
+        changed = [table for table in order if tables[table]['logged'] != logged]
+        with conn.cursor() as cursor:
+            for table in changed:
+                cursor.execute(
+                    f'ALTER TABLE "{table}" SET {"LOGGED" if logged else "UNLOGGED"}'
+                )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+    return {
+        'logged': logged,
+        'changed_tables': changed,
+        'duration_seconds': round(time.perf_counter() - start, 4)
+    }
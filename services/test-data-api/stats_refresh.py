@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Managed refresh of the ``system_stats`` materialized view.
+
+framework-data.sql creates system_stats with a unique index on its ``id``
+column, so it can be refreshed CONCURRENTLY: the new contents are built next
+to the old ones and swapped in with a diff, and dashboards reading the view
+never wait for a refresh.
+
+After a state is loaded, install_stats_tracking() puts statement-level
+triggers on the counted tables. In ``debounced`` mode they only send a
+NOTIFY on STATS_CHANNEL; in ``incremental`` mode they also keep per-table
+row counts up to date from the statement's transition tables, and the view
+is redefined over those counters, so a refresh reads five numbers instead
+of counting five tables. Concurrent writers to one counted table serialise
+on its counter row until they commit, which is fine for a test database.
+
+StatsRefresher listens on STATS_CHANNEL in a background thread and
+refreshes the view once changes have been quiet for ``debounce`` seconds,
+or at the latest ``max_delay`` seconds after the first pending change. An
+advisory lock keeps several API workers from refreshing at the same time.
+The API runs one refresher, for its primary database; extra fan-out targets
+are not tracked and keep the system_stats contents from their last load.
+"""
+
+import time
+import select
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+import psycopg2
+import psycopg2.errors
+
+from fingerprints import STORE_SCHEMA
+
+logger = logging.getLogger(__name__)
+
+STATS_VIEW = 'system_stats'
+STATS_CHANNEL = 'system_stats_changed'
+STATS_MODES = ('off', 'debounced', 'incremental')
+# pg_try_advisory_lock key held while refreshing
+REFRESH_LOCK_KEY = 0x73746174
+
+# View column -> counted table, as defined in framework-data.sql
+STATS_COUNTERS = OrderedDict([
+    ('total_users', 'users'),
+    ('total_projects', 'projects'),
+    ('total_environments', 'environments'),
+    ('total_deployments', 'deployments'),
+    ('total_scans', 'security_scans'),
+])
+
+TRACKING_FUNCTIONS_SQL = f"""
+    CREATE SCHEMA IF NOT EXISTS {STORE_SCHEMA};
+    CREATE TABLE IF NOT EXISTS {STORE_SCHEMA}.row_counts (
+        table_name TEXT PRIMARY KEY,
+        row_count BIGINT NOT NULL
+    );
+    CREATE OR REPLACE FUNCTION {STORE_SCHEMA}.notify_stats_change() RETURNS trigger AS $$
+    BEGIN
+        PERFORM pg_notify('{STATS_CHANNEL}', TG_TABLE_NAME);
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+    CREATE OR REPLACE FUNCTION {STORE_SCHEMA}.count_inserted() RETURNS trigger AS $$
+    BEGIN
+        UPDATE {STORE_SCHEMA}.row_counts SET row_count = row_count + (SELECT count(*) FROM new_rows)
+        WHERE table_name = TG_TABLE_NAME;
+        PERFORM pg_notify('{STATS_CHANNEL}', TG_TABLE_NAME);
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+    CREATE OR REPLACE FUNCTION {STORE_SCHEMA}.count_deleted() RETURNS trigger AS $$
+    BEGIN
+        UPDATE {STORE_SCHEMA}.row_counts SET row_count = row_count - (SELECT count(*) FROM old_rows)
+        WHERE table_name = TG_TABLE_NAME;
+        PERFORM pg_notify('{STATS_CHANNEL}', TG_TABLE_NAME);
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+    CREATE OR REPLACE FUNCTION {STORE_SCHEMA}.count_truncated() RETURNS trigger AS $$
+    BEGIN
+        UPDATE {STORE_SCHEMA}.row_counts SET row_count = 0 WHERE table_name = TG_TABLE_NAME;
+        PERFORM pg_notify('{STATS_CHANNEL}', TG_TABLE_NAME);
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+"""
+
+TRIGGER_NAMES = ('stats_change', 'stats_insert', 'stats_delete', 'stats_truncate')
+
+
+def _notify_triggers(table: str) -> str:
+    return f"""
+        CREATE TRIGGER stats_change AFTER INSERT OR DELETE OR TRUNCATE ON "{table}"
+            FOR EACH STATEMENT EXECUTE FUNCTION {STORE_SCHEMA}.notify_stats_change();
+    """
+
+
+def _counter_triggers(table: str) -> str:
+    return f"""
+        CREATE TRIGGER stats_insert AFTER INSERT ON "{table}"
+            REFERENCING NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION {STORE_SCHEMA}.count_inserted();
+        CREATE TRIGGER stats_delete AFTER DELETE ON "{table}"
+            REFERENCING OLD TABLE AS old_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION {STORE_SCHEMA}.count_deleted();
+        CREATE TRIGGER stats_truncate AFTER TRUNCATE ON "{table}"
+            FOR EACH STATEMENT EXECUTE FUNCTION {STORE_SCHEMA}.count_truncated();
+        INSERT INTO {STORE_SCHEMA}.row_counts (table_name, row_count)
+        SELECT '{table}', count(*) FROM "{table}"
+        ON CONFLICT (table_name) DO UPDATE SET row_count = EXCLUDED.row_count;
+    """
+
+
+def _counter_view() -> str:
+    columns = ',\n'.join(
+        f"COALESCE((SELECT row_count FROM {STORE_SCHEMA}.row_counts "
+        f"WHERE table_name = '{table}'), 0) AS {column}"
+        for column, table in STATS_COUNTERS.items()
+    )
+    return f"""
+        DROP MATERIALIZED VIEW {STATS_VIEW};
+        CREATE MATERIALIZED VIEW {STATS_VIEW} AS
+        SELECT 1 AS id,
+        {columns},
+        CURRENT_TIMESTAMP AS last_updated;
+        CREATE UNIQUE INDEX idx_{STATS_VIEW}_id ON {STATS_VIEW} (id);
+    """
+
+
+def install_stats_tracking(conn, incremental: bool = False) -> Dict[str, Any]:
+    """Install change triggers (and counters) for system_stats in one transaction.
+
+    Does nothing when the database has no system_stats view (schema-only).
+    Safe to run again; existing triggers are replaced.
+    """
+    start = time.perf_counter()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute('SELECT to_regclass(%s) IS NOT NULL', (f'public.{STATS_VIEW}',))
+            if not cursor.fetchone()[0]:
+                conn.rollback()
+                return {'installed': False, 'reason': f'no {STATS_VIEW} view'}
+
+            cursor.execute(TRACKING_FUNCTIONS_SQL)
+            for table in STATS_COUNTERS.values():
+                for name in TRIGGER_NAMES:
+                    cursor.execute(f'DROP TRIGGER IF EXISTS {name} ON "{table}"')
+                cursor.execute(_counter_triggers(table) if incremental else _notify_triggers(table))
+            if incremental:
+                cursor.execute(_counter_view())
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    return {
+        'installed': True,
+        'mode': 'incremental' if incremental else 'debounced',
+        'tables': list(STATS_COUNTERS.values()),
+        'duration_seconds': round(time.perf_counter() - start, 4)
+    }
+
+
+def refresh_stats_view(conn) -> Dict[str, Any]:
+    """Refresh system_stats on an autocommit connection.
+
+    Uses REFRESH ... CONCURRENTLY and falls back to a plain refresh while the
+    view is not populated yet or lacks its unique index. Returns
+    refreshed=False when the view does not exist or another session holds
+    the refresh lock.
+    """
+    start = time.perf_counter()
+    with conn.cursor() as cursor:
+        cursor.execute('SELECT pg_try_advisory_lock(%s)', (REFRESH_LOCK_KEY,))
+        if not cursor.fetchone()[0]:
+            return {'refreshed': False, 'reason': 'refresh in progress elsewhere'}
+        try:
+            concurrent = True
+            try:
+                cursor.execute(f'REFRESH MATERIALIZED VIEW CONCURRENTLY {STATS_VIEW}')
+            except (psycopg2.errors.FeatureNotSupported,
+                    psycopg2.errors.ObjectNotInPrerequisiteState):
+                concurrent = False
+                cursor.execute(f'REFRESH MATERIALIZED VIEW {STATS_VIEW}')
+        except psycopg2.errors.UndefinedTable:
+            return {'refreshed': False, 'reason': f'no {STATS_VIEW} view'}
+        finally:
+            cursor.execute('SELECT pg_advisory_unlock(%s)', (REFRESH_LOCK_KEY,))
+
+    return {
+        'refreshed': True,
+        'concurrent': concurrent,
+        'duration_seconds': round(time.perf_counter() - start, 4)
+    }
+
+
+class StatsRefresher:
+    """Background thread refreshing system_stats after data changes settle"""
+
+    poll_interval = 0.5
+    reconnect_delay = 5.0
+
+    def __init__(self, db_config: Dict[str, Any], debounce: float = 2.0, max_delay: float = 10.0):
+        self.db_config = db_config
+        self.debounce = debounce
+        self.max_delay = max(max_delay, debounce)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._first_change = None
+        self._last_change = None
+        self.listening = False
+        self.notifications = 0
+        self.refreshes = 0
+        self.last_refresh = None
+        self.last_error = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> 'StatsRefresher':
+        if not self.running:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='stats-refresher', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def mark_changed(self):
+        """Schedule a refresh, as a notification from the database would"""
+        now = time.monotonic()
+        with self._lock:
+            if self._first_change is None:
+                self._first_change = now
+            self._last_change = now
+
+    def _seconds_until_due(self) -> Optional[float]:
+        """Seconds until the pending refresh is due, None when nothing is pending"""
+        with self._lock:
+            if self._first_change is None:
+                return None
+            now = time.monotonic()
+            return max(0.0, min(self._last_change + self.debounce - now,
+                                self._first_change + self.max_delay - now))
+
+    def _refresh(self, conn):
+        with self._lock:
+            first_change, self._first_change, self._last_change = self._first_change, None, None
+        result = refresh_stats_view(conn)
+        if not result['refreshed'] and result['reason'] == 'refresh in progress elsewhere':
+            # Another worker is refreshing; try again once it should be done
+            self.mark_changed()
+            return
+        if result['refreshed']:
+            self.refreshes += 1
+            self.last_refresh = dict(result, at=datetime.utcnow().isoformat(),
+                                     lag_seconds=round(time.monotonic() - first_change, 4))
+            logger.info(f"Refreshed {STATS_VIEW} in {result['duration_seconds']:.2f}s "
+                        f"({'concurrently' if result['concurrent'] else 'blocking'})")
+
+    def _run(self):
+        while not self._stop.is_set():
+            conn = None
+            try:
+                conn = psycopg2.connect(**self.db_config)
+                conn.autocommit = True
+                with conn.cursor() as cursor:
+                    cursor.execute(f'LISTEN {STATS_CHANNEL}')
+                self.listening = True
+
+                while not self._stop.is_set():
+                    due = self._seconds_until_due()
+                    timeout = self.poll_interval if due is None else min(due, self.poll_interval)
+                    if select.select([conn], [], [], timeout)[0]:
+                        conn.poll()
+                        if conn.notifies:
+                            self.notifications += len(conn.notifies)
+                            conn.notifies.clear()
+                            self.mark_changed()
+                    if self._seconds_until_due() == 0.0:
+                        self._refresh(conn)
+            except psycopg2.Error as e:
+                self.last_error = str(e).strip()
+                logger.warning(f"Stats refresher lost its connection: {self.last_error}")
+                self._stop.wait(self.reconnect_delay)
+            finally:
+                self.listening = False
+                if conn is not None:
+                    conn.close()
+
+    def status(self) -> Dict[str, Any]:
+        due = self._seconds_until_due()
+        return {
+            'running': self.running,
+            'listening': self.listening,
+            'pending': due is not None,
+            'due_in_seconds': round(due, 4) if due is not None else None,
+            'debounce_seconds': self.debounce,
+            'max_delay_seconds': self.max_delay,
+            'notifications': self.notifications,
+            'refreshes': self.refreshes,
+            'last_refresh': self.last_refresh,
+            'last_error': self.last_error
+        }
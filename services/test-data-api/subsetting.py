@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Referentially consistent subsets of a larger database.
+
+A subset starts from a few rows of a root table (the first ``limit`` keys or
+an explicit list of ids) and is closed over the foreign-key graph of the
+tables created by schema-only.sql:
+
+1. Descendants - rows of every table reachable from the root through
+   foreign keys pointing at it (projects -> environments -> deployments ->
+   test_results, ...), parents before children;
+2. Ancestors - every row a selected row references, so the slice loads
+   without foreign-key violations (deployments -> users, ...), children
+   before parents;
+3. Includes - optional extra tables whose rows reference anything already
+   selected (e.g. the audit_logs of the users in the slice), followed by
+   another ancestor pass for their own references.
+
+Selected keys never travel to the client as a whole: they are kept in
+temporary key tables on the source server, and both the closure and the
+final row export walk those key tables in keyset batches
+(``WHERE key > last ORDER BY key LIMIT batch``). The client holds at most
+one batch of keys or rows at a time, whatever the size of the source.
+
+Everything runs in a single REPEATABLE READ transaction, so the slice is
+consistent even while the source is being written to. The source needs
+permission to create temporary tables (a primary or a writable copy, not a
+hot standby).
+
+The slice is streamed into a state file that includes schema-only.sql,
+inserts the rows table by table in foreign-key order and moves every serial
+sequence past the copied ids. It loads like any other state.
+"""
+
+import os
+import re
+import time
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Iterator, Tuple
+
+import psycopg2
+import psycopg2.extras
+from psycopg2.extensions import ISOLATION_LEVEL_REPEATABLE_READ
+
+from state_loader import build_dependency_graph, read_statements, topological_order
+
+logger = logging.getLogger(__name__)
+
+SUBSET_NAME_RE = re.compile(r'^[a-z0-9][a-z0-9_-]{0,62}$')
+HEADER_PREFIX = '-- Subset State: '
+
+KEY_QUERY = """
+    SELECT c.relname, a.attname
+    FROM pg_constraint k
+    JOIN pg_class c ON c.oid = k.conrelid
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    JOIN pg_attribute a ON a.attrelid = k.conrelid AND a.attnum = k.conkey[1]
+    WHERE k.contype = 'p' AND n.nspname = 'public' AND cardinality(k.conkey) = 1
+"""
+
+FOREIGN_KEY_QUERY = """
+    SELECT c.relname, a.attname, p.relname, pa.attname
+    FROM pg_constraint k
+    JOIN pg_class c ON c.oid = k.conrelid
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    JOIN pg_class p ON p.oid = k.confrelid
+    JOIN pg_attribute a ON a.attrelid = k.conrelid AND a.attnum = k.conkey[1]
+    JOIN pg_attribute pa ON pa.attrelid = k.confrelid AND pa.attnum = k.confkey[1]
+    WHERE k.contype = 'f' AND n.nspname = 'public' AND cardinality(k.conkey) = 1
+    ORDER BY 1, 2
+"""
+
+
+class SubsetError(ValueError):
+    """Invalid subset request (unknown table, unsupported key, bad name)"""
+
+
+class ForeignKey:
+    """Single-column foreign key child.column -> parent.parent_column"""
+
+    def __init__(self, child: str, column: str, parent: str, parent_column: str):
+        self.child = child
+        self.column = column
+        self.parent = parent
+        self.parent_column = parent_column
+
+    def __repr__(self):
+        return f'{self.child}.{self.column} -> {self.parent}.{self.parent_column}'
+
+
+def key_table(table: str) -> str:
+    return f'"subset_{table}"'
+
+
+def discover_subsets(directory: str) -> Dict[str, Dict[str, str]]:
+    """Find subset state files written by earlier extractions.
+
+    Returns {name: {'description', 'sql_file'}} for every ``<name>.sql`` in
+    directory whose first line is a subset header.
+    """
+    subsets = {}
+    if not os.path.isdir(directory):
+        return subsets
+    for filename in sorted(os.listdir(directory)):
+        name, ext = os.path.splitext(filename)
+        if ext != '.sql' or not SUBSET_NAME_RE.match(name):
+            continue
+        path = os.path.join(directory, filename)
+        with open(path, 'r') as file:
+            header = file.readline()
+        if header.startswith(HEADER_PREFIX):
+            subsets[name] = {'description': header[len(HEADER_PREFIX):].strip(), 'sql_file': path}
+    return subsets
+
+
+class SubsetExtractor:
+    """Extract a referentially consistent slice of db_config into a state file.
+
+    schema_file is the state file the slice is built on (schema-only.sql):
+    only its tables are copied and the generated state includes it.
+    """
+
+    def __init__(self, db_config: Dict[str, Any], schema_file: str, batch_size: int = 1000):
+        self.db_config = db_config
+        self.schema_file = schema_file
+        self.batch_size = max(1, batch_size)
+        self.tables = set(build_dependency_graph(read_statements(schema_file)))
+
+    def _catalog(self, cursor) -> Tuple[Dict[str, str], List[ForeignKey]]:
+        """Primary key column per table and the foreign keys between schema tables"""
+        cursor.execute(KEY_QUERY)
+        keys = {table: column for table, column in cursor.fetchall() if table in self.tables}
+        cursor.execute(FOREIGN_KEY_QUERY)
+        foreign_keys = [
+            ForeignKey(*row) for row in cursor.fetchall()
+            if row[0] in keys and row[2] in keys
+        ]
+        return keys, foreign_keys
+
+    def _key_batches(self, cursor, table: str) -> Iterator[List[Any]]:
+        """Selected keys of table, batch_size at a time in key order"""
+        last = None
+        while True:
+            if last is None:
+                cursor.execute(f'SELECT key FROM {key_table(table)} ORDER BY key LIMIT %s',
+                               (self.batch_size,))
+            else:
+                cursor.execute(f'SELECT key FROM {key_table(table)} WHERE key > %s '
+                               f'ORDER BY key LIMIT %s', (last, self.batch_size))
+            batch = [row[0] for row in cursor.fetchall()]
+            if not batch:
+                return
+            yield batch
+            last = batch[-1]
+
+    def _pull_children(self, cursor, fk: ForeignKey, keys: Dict[str, str]) -> int:
+        """Select the fk.child rows pointing at selected fk.parent rows"""
+        sql = (
+            f'INSERT INTO {key_table(fk.child)} '
+            f'SELECT c."{keys[fk.child]}" FROM "{fk.child}" c WHERE c."{fk.column}" IN '
+            f'(SELECT p."{fk.parent_column}" FROM "{fk.parent}" p '
+            f'WHERE p."{keys[fk.parent]}" = ANY(%s)) '
+            f'ON CONFLICT DO NOTHING'
+        )
+        added = 0
+        for batch in self._key_batches(cursor, fk.parent):
+            cursor.execute(sql, (batch,))
+            added += cursor.rowcount
+        return added
+
+    def _pull_parents(self, cursor, fk: ForeignKey, keys: Dict[str, str]) -> int:
+        """Select the fk.parent rows referenced by selected fk.child rows"""
+        sql = (
+            f'INSERT INTO {key_table(fk.parent)} '
+            f'SELECT p."{keys[fk.parent]}" FROM "{fk.parent}" p WHERE p."{fk.parent_column}" IN '
+            f'(SELECT c."{fk.column}" FROM "{fk.child}" c '
+            f'WHERE c."{keys[fk.child]}" = ANY(%s)) '
+            f'ON CONFLICT DO NOTHING'
+        )
+        added = 0
+        for batch in self._key_batches(cursor, fk.child):
+            cursor.execute(sql, (batch,))
+            added += cursor.rowcount
+        return added
+
+    def _close_ancestors(self, cursor, order: List[str], foreign_keys: List[ForeignKey],
+                         keys: Dict[str, str]):
+        """Add every row referenced by a selected row, children first"""
+        for table in reversed(order):
+            for fk in foreign_keys:
+                if fk.child != table:
+                    continue
+                if fk.parent == table:
+                    # Self reference: follow the chain until it stops growing
+                    while self._pull_parents(cursor, fk, keys):
+                        pass
+                else:
+                    self._pull_parents(cursor, fk, keys)
+
+    def _write_rows(self, cursor, file, table: str, key: str) -> int:
+        """Stream the selected rows of table into file as multi-row INSERTs"""
+        written = 0
+        for batch in self._key_batches(cursor, table):
+            cursor.execute(f'SELECT * FROM "{table}" WHERE "{key}" = ANY(%s) ORDER BY "{key}"',
+                           (batch,))
+            columns = ', '.join(f'"{column.name}"' for column in cursor.description)
+            placeholder = '(' + ', '.join(['%s'] * len(cursor.description)) + ')'
+            rows = cursor.fetchall()
+            file.write(f'INSERT INTO "{table}" ({columns}) VALUES\n')
+            file.write(',\n'.join(cursor.mogrify(placeholder, row).decode('utf-8') for row in rows))
+            file.write(';\n')
+            written += len(rows)
+        return written
+
+    def _write_state(self, cursor, filepath: str, header: List[str], order: List[str],
+                     keys: Dict[str, str]) -> Dict[str, int]:
+        """Write the state file for the selected keys, return rows per table"""
+        tables = {}
+        with open(filepath, 'w', encoding='utf-8') as file:
+            file.write('\n'.join(header) + '\n\n')
+            file.write(f'\\i {os.path.abspath(self.schema_file)}\n\n')
+            for table in order:
+                count = self._write_rows(cursor, file, table, keys[table])
+                if count:
+                    tables[table] = count
+            file.write('\n-- Move sequences past the copied ids\n')
+            for table in tables:
+                file.write(
+                    f"SELECT setval(pg_get_serial_sequence('\"{table}\"', '{keys[table]}'), "
+                    f"MAX(\"{keys[table]}\")) FROM \"{table}\";\n"
+                )
+        return tables
+
+    def extract(self, root: str, output_file: str, limit: int = 10,
+                ids: Optional[List[Any]] = None, include: Optional[List[str]] = None,
+                description: Optional[str] = None) -> Dict[str, Any]:
+        """Extract the slice rooted at root and write it to output_file.
+
+        The root rows are ids when given, otherwise the first limit keys of
+        root. Returns the row count per table and timings.
+        """
+        start = time.perf_counter()
+        include = list(include or [])
+        for table in [root] + include:
+            if table not in self.tables:
+                raise SubsetError(f'Unknown table {table}. Must be one of: {sorted(self.tables)}')
+
+        conn = psycopg2.connect(**self.db_config)
+        try:
+            conn.set_session(isolation_level=ISOLATION_LEVEL_REPEATABLE_READ)
+            conn.set_client_encoding('UTF8')
+            # Keep json/jsonb as text so rows can be written back verbatim
+            psycopg2.extras.register_default_json(conn, loads=lambda value: value)
+            psycopg2.extras.register_default_jsonb(conn, loads=lambda value: value)
+
+            with conn.cursor() as cursor:
+                keys, foreign_keys = self._catalog(cursor)
+                for table in [root] + include:
+                    if table not in keys:
+                        raise SubsetError(f'Table {table} has no single-column primary key')
+
+                graph = {table: set() for table in keys}
+                for fk in foreign_keys:
+                    graph[fk.child].add(fk.parent)
+                order = topological_order(graph)
+
+                for table in order:
+                    cursor.execute(
+                        f'CREATE TEMP TABLE {key_table(table)} ON COMMIT DROP AS '
+                        f'SELECT "{keys[table]}" AS key FROM "{table}" WITH NO DATA'
+                    )
+                    cursor.execute(f'ALTER TABLE {key_table(table)} ADD PRIMARY KEY (key)')
+
+                # Root rows
+                if ids is not None:
+                    cursor.execute(
+                        f'INSERT INTO {key_table(root)} SELECT "{keys[root]}" FROM "{root}" '
+                        f'WHERE "{keys[root]}" = ANY(%s)', (list(ids),)
+                    )
+                else:
+                    cursor.execute(
+                        f'INSERT INTO {key_table(root)} SELECT "{keys[root]}" FROM "{root}" '
+                        f'ORDER BY "{keys[root]}" LIMIT %s', (limit,)
+                    )
+
+                # Descendants of the root, parents first
+                reached = {root}
+                for table in order:
+                    for fk in foreign_keys:
+                        if fk.child == table and fk.parent in reached and fk.parent != table:
+                            self._pull_children(cursor, fk, keys)
+                            reached.add(table)
+
+                self._close_ancestors(cursor, order, foreign_keys, keys)
+
+                if include:
+                    for table in include:
+                        for fk in foreign_keys:
+                            if fk.child == table and fk.parent != table:
+                                self._pull_children(cursor, fk, keys)
+                    self._close_ancestors(cursor, order, foreign_keys, keys)
+
+                header = [
+                    HEADER_PREFIX + ' '.join((description or f'Subset of {root}').split()),
+                    f'-- Root: {root} ' + (f'{len(ids)} ids' if ids is not None else f'limit {limit}')
+                    + (f', include: {", ".join(include)}' if include else ''),
+                    f'-- Extracted: {datetime.utcnow().isoformat()}'
+                ]
+                partial_file = output_file + '.partial'
+                try:
+                    tables = self._write_state(cursor, partial_file, header, order, keys)
+                except Exception:
+                    if os.path.exists(partial_file):
+                        os.remove(partial_file)
+                    raise
+                os.replace(partial_file, output_file)
+            conn.rollback()
+        finally:
+            conn.close()
+
+        duration = round(time.perf_counter() - start, 4)
+        logger.info(f"Extracted subset of {root}: {sum(tables.values())} rows from "
+                    f"{len(tables)} tables in {duration:.2f}s")
+        return {
+            'root': root,
+            'sql_file': output_file,
+            'tables': tables,
+            'total_rows': sum(tables.values()),
+            'batch_size': self.batch_size,
+            'duration_seconds': duration
+        }
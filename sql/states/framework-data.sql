@@ -58,17 +58,23 @@ INSERT INTO notifications (user_id, type, title, message, data) VALUES
 
 -- Insert initial audit log entry
 INSERT INTO audit_logs (user_id, action, resource_type, resource_id, details) VALUES
-(1, 'database.initialized', 'system', 0, '{"state": "framework", "timestamp": "' || CURRENT_TIMESTAMP || '"}');
+(1, 'database.initialized', 'system', 0, ('{"state": "framework", "timestamp": "' || CURRENT_TIMESTAMP || '"}')::jsonb);
 
--- Create materialized view for quick stats
+-- Create materialized view for quick stats (populated by the refresh below,
+-- once all data is loaded)
 CREATE MATERIALIZED VIEW system_stats AS
 SELECT 
+    1 as id,
     (SELECT COUNT(*) FROM users) as total_users,
     (SELECT COUNT(*) FROM projects) as total_projects,
     (SELECT COUNT(*) FROM environments) as total_environments,
     (SELECT COUNT(*) FROM deployments) as total_deployments,
     (SELECT COUNT(*) FROM security_scans) as total_scans,
-    CURRENT_TIMESTAMP as last_updated;
+    CURRENT_TIMESTAMP as last_updated
+WITH NO DATA;
+
+-- Unique index so the view can be refreshed CONCURRENTLY without blocking readers
+CREATE UNIQUE INDEX idx_system_stats_id ON system_stats(id);
 
 -- Refresh the materialized view
 REFRESH MATERIALIZED VIEW system_stats;
@@ -4,6 +4,25 @@
 -- First apply framework state
 \i /app/sql/states/framework-data.sql
 
+-- framework-data.sql restarts every sequence at 100; continue numbering from
+-- the framework rows instead so the ids referenced below line up
+DO $$
+DECLARE
+    t RECORD;
+BEGIN
+    FOR t IN
+        SELECT table_name
+        FROM information_schema.columns
+        WHERE table_schema = 'public' AND column_name = 'id'
+          AND column_default LIKE 'nextval%'
+    LOOP
+        EXECUTE format(
+            'SELECT setval(pg_get_serial_sequence(%L, ''id''), COALESCE((SELECT MAX(id) FROM %I), 0) + 1, false)',
+            t.table_name, t.table_name
+        );
+    END LOOP;
+END $$;
+
 -- Additional test users
 INSERT INTO users (username, email, password_hash, first_name, last_name, role) VALUES
 ('qa_lead', 'qa_lead@secdevops.com', '$2b$12$LQvRTWLNqwiANmCRb0TTHO.U0CuLbgXLK0HXfxQvKlTPzLyPQPtK.', 'Alice', 'QALead', 'tester'),
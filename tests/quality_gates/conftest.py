@@ -0,0 +1,7 @@
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).parent.parent.parent
+QUALITY_GATES_DIR = REPO_ROOT / "scripts" / "quality-gates"
+
+sys.path.insert(0, str(QUALITY_GATES_DIR))
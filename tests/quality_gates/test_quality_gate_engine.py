@@ -0,0 +1,135 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from quality_gate_engine import DEFAULT_THRESHOLDS, QualityGateEngine
+
+ENGINE = Path(__file__).parent.parent.parent / "scripts" / "quality-gates" / "quality_gate_engine.py"
+
+
+def thresholds(**overrides):
+    values = {name: dict(limits) for name, limits in DEFAULT_THRESHOLDS.items()}
+    for name, limits in overrides.items():
+        values[name].update(limits)
+    return values
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    """Gate inputs of a passing build; tests break one of them"""
+    dataset = {"tools": {"snyk": {"status": "PASS"}, "trivy": {"status": "NO_DATA"}},
+               "summary": {"criticalIssues": 0, "highIssues": 2, "mediumIssues": 4, "lowIssues": 9}}
+    coverage = {"total": {name: {"pct": pct} for name, pct in
+                          (("lines", 85.5), ("branches", 78), ("functions", 90), ("statements", 86))}}
+    tests = {"stats": {"tests": 60, "passes": 60, "failures": 0, "pending": 0, "duration": 1234},
+             "tests": [{"title": f"test {i}"} for i in range(60)], "passes": [], "failures": [], "pending": []}
+    zap = {"alerts": [{"risk": "Low", "url": "https://app.test/"}] * 3}
+    paths = {}
+    for name, content in (("security", dataset), ("coverage", coverage), ("tests", tests),
+                          ("zap", zap), ("performance", {"metrics": {"p95": 320, "errorRate": 0.2}})):
+        paths[name] = str(tmp_path / f"{name}.json")
+        Path(paths[name]).write_text(json.dumps(content))
+    return paths
+
+
+def write(path, content):
+    Path(path).write_text(json.dumps(content))
+    # Make sure the cache key sees the change even within one mtime tick
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+
+class TestQualityGateEngine:
+    def test_all_gates_pass(self, inputs):
+        """Test every gate is evaluated from its normalized input"""
+        verdict = QualityGateEngine(inputs, thresholds=thresholds()).evaluate()
+        assert verdict["passed"] is True
+        assert {name: gate["status"] for name, gate in verdict["gates"].items()} == {
+            "security": "PASS", "dast": "PASS", "coverage": "PASS", "tests": "PASS", "performance": "PASS"}
+        assert verdict["gates"]["tests"]["metrics"]["passRate"] == 100
+        assert verdict["gates"]["dast"]["summary"]["Low"] == 3
+
+    def test_violations_are_collected_per_gate_and_build(self, inputs):
+        """Test failing gates list their violations and fail the verdict"""
+        write(inputs["coverage"], {"total": {"lines": {"pct": 70}, "branches": {"pct": 60}, "functions": {"pct": 95}}})
+        write(inputs["zap"], {"alerts": [{"risk": "High"}] * 4})
+        verdict = QualityGateEngine(inputs, thresholds=thresholds(security={"high": 1})).evaluate()
+        assert verdict["passed"] is False
+        assert [v["metric"] for v in verdict["gates"]["coverage"]["violations"]] == ["overall", "branches"]
+        assert verdict["gates"]["security"]["violations"][0]["message"] == \
+            "Found 2 high vulnerabilities (threshold: 1)"
+        # The DAST count stops at the first High over the threshold
+        assert verdict["gates"]["dast"]["summary"]["High"] == 1
+        assert verdict["gates"]["dast"]["metrics"]["complete"] is False
+        assert len(verdict["violations"]) == verdict["summary"]["violations"] == 4
+
+    def test_missing_and_unreadable_inputs(self, inputs, tmp_path):
+        """Test required gates fail without input, optional ones are skipped and broken ones error"""
+        inputs["tests"] = str(tmp_path / "missing.json")
+        inputs["zap"] = str(tmp_path / "missing.json")
+        Path(inputs["coverage"]).write_text("{not json")
+        verdict = QualityGateEngine(inputs, thresholds=thresholds()).evaluate()
+        gates = verdict["gates"]
+        assert gates["tests"]["status"] == "NO_DATA" and gates["tests"]["passed"] is False
+        assert gates["dast"]["status"] == "NO_DATA" and gates["dast"]["passed"] is True
+        assert gates["coverage"]["status"] == "ERROR"
+        assert verdict["passed"] is False
+
+    def test_verdict_is_cached_until_an_input_changes(self, inputs, tmp_path, monkeypatch):
+        """Test the stored verdict is reused for unchanged inputs and thresholds"""
+        cache = tmp_path / "verdict.json"
+        monkeypatch.setenv("BUILD_NUMBER", "41")
+        first = QualityGateEngine(inputs, thresholds=thresholds(), cache_file=str(cache)).evaluate()
+        cache.write_text(json.dumps(first))
+
+        monkeypatch.setenv("BUILD_NUMBER", "42")
+        engine = QualityGateEngine(inputs, thresholds=thresholds(), cache_file=str(cache))
+        verdict = engine.evaluate()
+        assert engine.cached
+        assert verdict["buildNumber"] == "42" and verdict["timestamp"] >= first["timestamp"]
+        assert verdict["gates"] == first["gates"] and verdict["cacheKey"] == first["cacheKey"]
+
+        engine = QualityGateEngine(inputs, thresholds=thresholds(tests={"minTests": 100}), cache_file=str(cache))
+        assert not engine.evaluate()["passed"] and not engine.cached
+
+        write(inputs["tests"], {"stats": {"tests": 60, "passes": 59, "failures": 1, "pending": 0}})
+        engine = QualityGateEngine(inputs, thresholds=thresholds(), cache_file=str(cache))
+        assert engine.evaluate()["gates"]["tests"]["status"] == "FAIL" and not engine.cached
+
+
+class TestCommandLine:
+    def test_writes_verdict_and_honours_override(self, inputs, tmp_path):
+        """Test the CLI writes the verdict, exits 1 on failure and 0 when overridden"""
+        output = tmp_path / "reports" / "quality-gate-report.json"
+        write(inputs["zap"], {"alerts": [{"risk": "High"}]})
+        cmd = [sys.executable, str(ENGINE), "--security-dataset", inputs["security"], "--zap-report", inputs["zap"],
+               "--coverage", inputs["coverage"], "--tests", inputs["tests"], "--performance", inputs["performance"],
+               "--output", str(output)]
+        result = subprocess.run(cmd, capture_output=True, text=True, cwd=tmp_path)
+        assert result.returncode == 1, result.stdout + result.stderr
+        verdict = json.loads(output.read_text())
+        assert verdict["gates"]["dast"]["status"] == "FAIL"
+        assert output.with_suffix(".html").exists()
+
+        result = subprocess.run(cmd, capture_output=True, text=True, cwd=tmp_path,
+                                env=dict(os.environ, BUILD_NUMBER="43"))
+        assert "(cached verdict)" in result.stdout
+        assert json.loads(output.read_text())["buildNumber"] == "43"
+        assert "Build 43" in output.with_suffix(".html").read_text()
+
+        result = subprocess.run(cmd, capture_output=True, text=True, cwd=tmp_path,
+                                env=dict(os.environ, OVERRIDE_QUALITY_GATES="true"))
+        assert result.returncode == 0
+        assert json.loads(output.read_text())["overridden"] is True
+
+    def test_selected_gates_only(self, inputs, tmp_path):
+        """Test --gates limits evaluation to the named gates"""
+        output = tmp_path / "dast.json"
+        result = subprocess.run([sys.executable, str(ENGINE), "--gates", "dast", "--zap-report", inputs["zap"],
+                                 "--output", str(output)], capture_output=True, text=True, cwd=tmp_path)
+        assert result.returncode == 0, result.stdout + result.stderr
+        assert list(json.loads(output.read_text())["gates"]) == ["dast"]
@@ -0,0 +1,7 @@
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).parent.parent.parent
+SECURITY_SCRIPTS_DIR = REPO_ROOT / "scripts" / "security"
+
+sys.path.insert(0, str(SECURITY_SCRIPTS_DIR))
@@ -0,0 +1,250 @@
+import gzip
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from report_stream import ReportFormatError, iter_xml_elements
+from security_results_aggregator import JSONStream, SecurityResultsAggregator, to_prometheus
+
+AGGREGATOR = Path(__file__).parent.parent.parent / "scripts" / "security" / "security_results_aggregator.py"
+
+REPORTS = {
+    "trufflehog-scan.json": "\n".join(json.dumps(item) for item in [
+        {"DetectorName": "AWS", "Verified": True,
+         "SourceMetadata": {"Data": {"Git": {"file": "config/settings.py", "line": 12}}}},
+        {"DetectorName": "Slack", "Verified": False,
+         "SourceMetadata": {"Data": {"Git": {"file": "scripts/notify.sh", "line": 3}}}},
+    ]),
+    "gitleaks-report.json": [
+        {"RuleID": "aws-access-token", "Description": "AWS Access Token", "File": "config/settings.py",
+         "StartLine": 12},
+    ],
+    "snyk-vulnerabilities.json": {
+        "ok": False,
+        "vulnerabilities": [
+            {"id": "SNYK-JS-LODASH-1", "title": "Prototype Pollution", "severity": "high",
+             "packageName": "lodash", "version": "4.17.20",
+             "identifiers": {"CVE": ["CVE-2021-23337"], "CWE": ["CWE-94"]}, "from": ["app", "lodash"]},
+            {"id": "SNYK-JS-LODASH-1", "title": "Prototype Pollution", "severity": "high",
+             "packageName": "lodash", "version": "4.17.20",
+             "identifiers": {"CVE": ["CVE-2021-23337"], "CWE": ["CWE-94"]}, "from": ["app", "a", "lodash"]},
+            {"id": "SNYK-JS-MINIMIST-2", "title": "Prototype Pollution", "severity": "medium",
+             "packageName": "minimist", "version": "1.2.5", "identifiers": {"CVE": ["CVE-2021-44906"]}},
+        ],
+        "summary": "3 vulnerable dependency paths",
+    },
+    "trivy-scan.json": {
+        "SchemaVersion": 2,
+        "Results": [
+            {"Target": "app (alpine 3.18)", "Vulnerabilities": [
+                {"VulnerabilityID": "CVE-2021-23337", "PkgName": "lodash", "InstalledVersion": "4.17.20",
+                 "Severity": "CRITICAL", "Title": "lodash: command injection"},
+                {"VulnerabilityID": "CVE-2023-0001", "PkgName": "openssl", "InstalledVersion": "3.1.0",
+                 "Severity": "LOW", "Title": "openssl: timing"},
+            ]},
+            {"Target": "package-lock.json"},
+        ],
+    },
+    "sonar-report.json": {
+        "issues": [
+            {"rule": "python:S2068", "severity": "BLOCKER", "component": "app.py", "line": 5,
+             "message": "Hard-coded password"},
+            {"rule": "python:S1481", "severity": "MINOR", "component": "app.py", "line": 9,
+             "message": "Unused local variable"},
+        ],
+        "qualityGate": "ERROR",
+        "coverage": 81.5,
+    },
+    "semgrep-report.json": {
+        "results": [
+            {"check_id": "python.flask.debug", "path": "app.py", "start": {"line": 40},
+             "extra": {"severity": "WARNING", "message": "Debug mode enabled",
+                       "metadata": {"cwe": ["CWE-489: Active Debug Code"]}}},
+        ],
+        "errors": [],
+    },
+    "zap-report.json": {
+        "@version": "2.14.0",
+        "site": [{"@name": "https://staging.example.com", "alerts": [
+            {"pluginid": "40012", "alert": "Cross Site Scripting (Reflected)", "riskdesc": "High (Medium)",
+             "cweid": "79", "instances": [{"uri": "https://staging.example.com/search?q=a"},
+                                          {"uri": "https://staging.example.com/search?q=b"}]},
+            {"pluginid": "10021", "alert": "X-Content-Type-Options Header Missing", "riskdesc": "Low (Medium)",
+             "cweid": "693", "instances": [{"uri": "https://staging.example.com/"}]},
+        ]}],
+    },
+    "anchore-report.json": {
+        "vulnerabilities": [
+            {"vuln": "CVE-2023-0001", "package_name": "openssl", "package_version": "3.1.0", "severity": "Medium"},
+        ],
+        "policyStatus": "pass",
+    },
+    "dependency-check-report.json": {
+        "dependencies": [
+            {"fileName": "lodash.js", "filePath": "node_modules/lodash/lodash.js",
+             "packages": [{"id": "pkg:npm/lodash@4.17.20"}],
+             "vulnerabilities": [{"name": "CVE-2021-23337", "cvssv3": {"baseScore": 7.2}}]},
+            {"fileName": "left-pad.js", "packages": [{"id": "pkg:npm/left-pad@1.3.0"}]},
+        ],
+    },
+}
+
+
+@pytest.fixture
+def reports_dir(tmp_path):
+    """Reports of all nine tools as the Jenkins stages write them"""
+    for name, content in REPORTS.items():
+        (tmp_path / name).write_text(content if isinstance(content, str) else json.dumps(content))
+    return tmp_path
+
+
+def finding(dataset, **fields):
+    matches = [f for f in dataset["findings"] if all(f[k] == v for k, v in fields.items())]
+    assert len(matches) == 1, matches
+    return matches[0]
+
+
+class TestJSONStream:
+    def test_streams_array_member_and_keeps_metadata(self, tmp_path):
+        """Test items of a keyed array are streamed across chunk boundaries"""
+        path = tmp_path / "report.json"
+        items = [{"id": i, "text": "x" * (i % 7), "score": i * 1.5} for i in range(500)]
+        path.write_text(json.dumps({"version": 12345, "items": items, "status": {"ok": True}}))
+        stream = JSONStream(str(path), ("items",), chunk_size=16)
+        assert list(stream) == items
+        assert stream.meta == {"version": 12345, "status": {"ok": True}}
+
+    def test_top_level_array_and_json_lines(self, tmp_path):
+        """Test a bare array, JSON lines and an empty file"""
+        array, lines, empty = tmp_path / "a.json", tmp_path / "b.json", tmp_path / "c.json"
+        array.write_text("[1, 22, 333]")
+        lines.write_text('{"a": 1}\n{"a": 2}\n')
+        empty.write_text("")
+        assert list(JSONStream(str(array), ("ignored",), chunk_size=2)) == [1, 22, 333]
+        assert list(JSONStream(str(lines), chunk_size=3)) == [{"a": 1}, {"a": 2}]
+        assert list(JSONStream(str(empty))) == []
+
+    def test_compressed_reports_are_decompressed(self, tmp_path):
+        """Test gzip reports are recognised by content, not by name"""
+        items = [{"id": i, "name": "caf\u00e9 \u2603"} for i in range(300)]
+        document = json.dumps({"items": items}).encode()
+        (tmp_path / "report.json.gz").write_bytes(gzip.compress(document))
+        (tmp_path / "report.bin").write_bytes(gzip.compress(document))
+        (tmp_path / "report.xml.gz").write_bytes(gzip.compress(b"<r><i n='1'/><i n='2'/></r>"))
+        assert list(JSONStream(str(tmp_path / "report.json.gz"), ("items",), chunk_size=7)) == items
+        assert list(JSONStream(str(tmp_path / "report.bin"), ("items",))) == items
+        assert [e.get("n") for e in iter_xml_elements(str(tmp_path / "report.xml.gz"), "i")] == ["1", "2"]
+
+    def test_zstd_reports_are_decompressed(self, tmp_path):
+        """Test zstd reports are streamed through zstandard"""
+        zstandard = pytest.importorskip("zstandard")
+        items = [{"id": i, "name": "caf\u00e9 \u2603"} for i in range(300)]
+        document = json.dumps({"items": items}).encode()
+        (tmp_path / "report.json.zst").write_bytes(zstandard.ZstdCompressor().compress(document))
+        assert list(JSONStream(str(tmp_path / "report.json.zst"), ("items",), chunk_size=7)) == items
+
+    def test_zstd_without_zstandard_is_reported(self, tmp_path, monkeypatch):
+        """Test a zstd report without the zstandard package raises a format error"""
+        path = tmp_path / "report.json.zst"
+        path.write_bytes(b"\x28\xb5\x2f\xfd" + b"\x00" * 16)
+        monkeypatch.setitem(sys.modules, "zstandard", None)
+        with pytest.raises(ReportFormatError, match="zstandard"):
+            list(JSONStream(str(path)))
+
+    def test_malformed_report_raises(self, tmp_path):
+        """Test truncated JSON is reported instead of silently ignored"""
+        path = tmp_path / "report.json"
+        path.write_text('{"items": [{"id": 1}, {"id": ')
+        with pytest.raises(ValueError):
+            list(JSONStream(str(path), ("items",)))
+
+
+class TestSecurityResultsAggregator:
+    def test_tool_results(self, reports_dir):
+        """Test every tool report is ingested with the expected verdict"""
+        dataset = SecurityResultsAggregator([str(reports_dir)], workers=1).aggregate()
+        tools = dataset["tools"]
+        assert {name: tool["status"] for name, tool in tools.items()} == {
+            "truffleHog": "FAIL", "snyk": "FAIL", "trivy": "FAIL", "sonarqube": "FAIL", "semgrep": "PASS",
+            "owaspZap": "FAIL", "anchore": "PASS", "dependencyCheck": "FAIL", "gitLeaks": "FAIL",
+        }
+        assert tools["truffleHog"]["verified"] == 1
+        assert tools["snyk"]["findings"] == 3
+        assert tools["sonarqube"]["qualityGate"] == "ERROR"
+        assert tools["anchore"]["policyStatus"] == "pass"
+        assert tools["dependencyCheck"]["totalDependencies"] == 2
+
+    def test_zap_verdict_comes_from_zap_results_parser(self, reports_dir):
+        """Test ZAP instances are counted and checked against the parser thresholds"""
+        zap = SecurityResultsAggregator([str(reports_dir)], tools=["owaspZap"], workers=1).aggregate()["tools"]["owaspZap"]
+        assert zap["summary"] == {"High": 2, "Medium": 0, "Low": 1, "Informational": 0}
+        assert zap["thresholds"][0] == "❌ High severity exceeds threshold: 2 > 0"
+
+    def test_duplicates_across_tools_are_merged(self, reports_dir):
+        """Test the same CVE or secret reported by several tools becomes one finding"""
+        dataset = SecurityResultsAggregator([str(reports_dir)], workers=1).aggregate()
+        lodash = finding(dataset, package="lodash")
+        assert lodash["severity"] == "critical"
+        assert sorted(lodash["tools"]) == ["dependencyCheck", "snyk", "trivy"]
+        assert sorted(finding(dataset, package="openssl")["tools"]) == ["anchore", "trivy"]
+        assert sorted(finding(dataset, location="config/settings.py")["tools"]) == ["gitLeaks", "truffleHog"]
+
+        summary = dataset["summary"]
+        assert summary["uniqueFindings"] == len(dataset["findings"]) == 11
+        assert summary["duplicateFindings"] == 5
+        assert summary["criticalIssues"] == 4
+        assert dataset["overallStatus"] == "CRITICAL"
+
+    def test_compressed_reports_are_located(self, reports_dir):
+        """Test archived reports with a compression suffix are found"""
+        report = reports_dir / "trivy-scan.json"
+        (reports_dir / "trivy-scan.json.gz").write_bytes(gzip.compress(report.read_bytes()))
+        expected = SecurityResultsAggregator([str(reports_dir)], tools=["trivy"], workers=1).aggregate()
+        report.unlink()
+        dataset = SecurityResultsAggregator([str(reports_dir)], tools=["trivy"], workers=1).aggregate()
+        assert dataset["findings"] == expected["findings"]
+
+    def test_missing_and_broken_reports(self, tmp_path):
+        """Test absent reports are NO_DATA and unreadable ones ERROR"""
+        (tmp_path / "semgrep-report.json").write_text("{not json")
+        dataset = SecurityResultsAggregator([str(tmp_path)], workers=1).aggregate()
+        assert dataset["tools"]["semgrep"]["status"] == "ERROR"
+        assert dataset["tools"]["snyk"] == {"status": "NO_DATA", "message": "Report not found"}
+        assert dataset["overallStatus"] == "PASS"
+        assert 'security_tool_status{tool="semgrep",status="ERROR"} 0' in to_prometheus(dataset)
+
+    def test_parallel_matches_sequential(self, reports_dir):
+        """Test the process pool produces the same dataset as in-process parsing"""
+        sequential = SecurityResultsAggregator([str(reports_dir)], workers=1).aggregate()
+        parallel = SecurityResultsAggregator([str(reports_dir)], workers=4).aggregate()
+        assert parallel["findings"] == sequential["findings"]
+        assert parallel["summary"] == sequential["summary"]
+
+
+class TestCommandLine:
+    def test_writes_dashboard_outputs(self, reports_dir, tmp_path):
+        """Test the CLI writes all outputs and fails on critical findings"""
+        out = tmp_path / "out"
+        result = subprocess.run(
+            [sys.executable, str(AGGREGATOR), "--reports-dir", str(reports_dir),
+             "--report", f"owaspZap={reports_dir / 'zap-report.json'}",
+             "--output", str(out / "security-dashboard-1.json"), "--prometheus", str(out / "metrics.prom"),
+             "--markdown", str(out / "dashboard.md"), "--html", str(out / "dashboard.html")],
+            capture_output=True, text=True,
+        )
+        assert result.returncode == 1, result.stdout + result.stderr
+        dataset = json.loads((out / "security-dashboard-1.json").read_text())
+        assert dataset["summary"]["criticalIssues"] == 4
+        assert 'security_issues_total{severity="critical"} 4' in (out / "metrics.prom").read_text()
+        assert "| **Total** | **11** |" in (out / "dashboard.md").read_text()
+        assert "Cross Site Scripting (Reflected)" in (out / "dashboard.html").read_text()
+
+    def test_rejects_unknown_tool_override(self, tmp_path):
+        """Test --report only accepts registered tools"""
+        result = subprocess.run([sys.executable, str(AGGREGATOR), "--report", "nessus=x.json"],
+                                capture_output=True, text=True, cwd=tmp_path)
+        assert result.returncode == 2
+        assert "TOOL=PATH" in result.stderr
@@ -0,0 +1,162 @@
+import pytest
+
+from terraform_policy_scan import TerraformPolicyScanner, to_junit, to_sarif
+
+PREFIXES_TF = '''
+resource "azurerm_network_security_group" "listed" {
+  security_rule {
+    name                    = "Admin"
+    direction               = "Inbound"
+    access                  = "Allow"
+    destination_port_ranges = ["443", "3389"]
+    source_address_prefixes = ["10.0.0.0/8", "*"]
+  }
+}
+
+resource "azurerm_network_security_group" "computed" {
+  security_rule {
+    name                    = "Admin"
+    direction               = "Inbound"
+    access                  = "Allow"
+    destination_port_ranges = ["22"]
+    source_address_prefixes = var.public ? ["*"] : var.admin_cidrs
+  }
+}
+'''
+
+NETWORK_TF = '''
+resource "azurerm_network_security_group" "open" {
+  name = "nsg-open"
+
+  security_rule {
+    name                   = "SSH"
+    direction              = "Inbound"
+    access                 = "Allow"
+    destination_port_range = "20-25"
+    source_address_prefix  = "*"
+  }
+}
+
+resource "azurerm_network_security_group" "locked" {
+  name = "nsg-locked"
+
+  security_rule {
+    name                   = "SSH"
+    direction              = "Inbound"
+    access                 = "Allow"
+    destination_port_range = "22"
+    source_address_prefix  = var.admin_ip
+  }
+}
+
+resource "azurerm_subnet_network_security_group_association" "locked" {
+  network_security_group_id = azurerm_network_security_group.locked.id
+}
+'''
+
+WAF_TF = '''
+resource "azurerm_web_application_firewall_policy" "main" {
+  policy_settings {
+    enabled = true
+    mode    = var.waf_mode
+  }
+
+  managed_rules {
+    managed_rule_set {
+      type    = "OWASP"
+      version = "3.2"
+    }
+  }
+}
+'''
+
+VARIABLES_TF = '''
+variable "admin_ip" {
+  default = "10.0.0.4/32"
+}
+
+variable "waf_mode" {
+  default = "Detection"
+}
+'''
+
+
+class TestTerraformPolicyScanner:
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
+        """Setup a Terraform tree with known violations"""
+        self.root = tmp_path
+        self.tree = tmp_path / "infra"
+        self.tree.mkdir()
+        (self.tree / "network.tf").write_text(NETWORK_TF)
+        (self.tree / "waf.tf").write_text(WAF_TF)
+        (self.tree / "variables.tf").write_text(VARIABLES_TF)
+        self.cache_file = tmp_path / "cache.json"
+
+    def scan(self, workers=1):
+        scanner = TerraformPolicyScanner(["infra"], root=self.root, cache_file=self.cache_file, workers=workers)
+        return scanner.scan()
+
+    def rule_hits(self, result):
+        return sorted((f["rule_id"], f["resource"]) for f in result["findings"])
+
+    def test_policy_findings(self):
+        """Test resource and graph rules report the expected violations"""
+        result = self.scan()
+        assert self.rule_hits(result) == [
+            ("NSG001", "azurerm_network_security_group.open"),
+            ("NSG002", "azurerm_network_security_group.open"),
+            ("WAF001", "azurerm_web_application_firewall_policy.main"),
+        ]
+        waf = next(f for f in result["findings"] if f["rule_id"] == "WAF001")
+        assert "Detection" in waf["message"]
+        assert waf["file"] == "infra/waf.tf"
+
+    def test_address_and_port_lists(self):
+        """Test list attributes are checked per item and unresolved expressions as a whole"""
+        (self.tree / "prefixes.tf").write_text(PREFIXES_TF)
+        nsg001 = [f for f in self.scan()["findings"] if f["rule_id"] == "NSG001"]
+        assert sorted(f["resource"] for f in nsg001) == [
+            "azurerm_network_security_group.listed",
+            "azurerm_network_security_group.open",
+        ]
+        assert "RDP (3389)" in next(f["message"] for f in nsg001 if f["resource"].endswith(".listed"))
+
+    def test_process_pool_matches_serial_scan(self):
+        """Test evaluating in worker processes gives the same findings"""
+        serial = self.scan(workers=1)
+        self.cache_file.unlink()
+        assert self.rule_hits(self.scan(workers=2)) == self.rule_hits(serial)
+
+    def test_unchanged_files_are_not_rescanned(self):
+        """Test only changed files are parsed and evaluated again"""
+        self.scan()
+        (self.tree / "network.tf").write_text(NETWORK_TF.replace('"*"', '"10.1.0.0/16"'))
+        result = self.scan()
+        assert result["stats"]["parsed"] == 1
+        assert result["stats"]["evaluated"] == 1
+        assert result["stats"]["cached"] == 2
+        assert "NSG001" not in {f["rule_id"] for f in result["findings"]}
+
+    def test_variable_change_reevaluates_module(self):
+        """Test a changed variable default re-evaluates files without re-parsing them"""
+        self.scan()
+        (self.tree / "variables.tf").write_text(VARIABLES_TF.replace("Detection", "Prevention"))
+        result = self.scan()
+        assert result["stats"]["parsed"] == 1
+        assert result["stats"]["evaluated"] == 3
+        assert "WAF001" not in {f["rule_id"] for f in result["findings"]}
+
+    def test_sarif_and_junit_reports(self):
+        """Test SARIF results and JUnit failures reference the findings"""
+        result = self.scan()
+        sarif = to_sarif(result)
+        results = sarif["runs"][0]["results"]
+        assert len(results) == 3
+        assert results[0]["locations"][0]["physicalLocation"]["artifactLocation"]["uri"].startswith("infra/")
+
+        suites = to_junit(result).getroot()
+        assert suites.get("failures") == "2"
+        cases = {case.get("name"): case for case in suites.iter("testcase")}
+        assert cases["azurerm_network_security_group.locked"].find("failure") is None
+        assert len(cases["azurerm_network_security_group.open"].findall("failure")) == 2
@@ -0,0 +1,108 @@
+import itertools
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).parent.parent.parent
+SERVICE_DIR = REPO_ROOT / "services" / "test-data-api"
+STATES_DIR = REPO_ROOT / "sql" / "states"
+
+sys.path.insert(0, str(SERVICE_DIR))
+
+from local_pg import LocalPostgres, find_pg_bin  # noqa: E402
+
+EMPTY_STATE = "empty"
+
+_database_names = itertools.count()
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "db_state(name): state the test database is cloned from (default: empty)"
+    )
+
+
+@pytest.fixture
+def states_dir():
+    """Directory holding the SQL state files"""
+    return STATES_DIR
+
+
+@pytest.fixture(scope="session")
+def local_pg():
+    """Throwaway PostgreSQL cluster on tmpfs, started once per session"""
+    if not find_pg_bin():
+        pytest.skip("PostgreSQL binaries not found; set PG_BIN to the directory with initdb")
+    with LocalPostgres() as cluster:
+        yield cluster
+
+
+@pytest.fixture(scope="session")
+def api_module(local_pg, tmp_path_factory):
+    """app.py imported against the local cluster and the repository's state files"""
+    pytest.importorskip("flask_cors")
+    with pytest.MonkeyPatch.context() as mp:
+        config = local_pg.db_config()
+        mp.setenv("DB_HOST", config["host"])
+        mp.setenv("DB_PORT", config["port"])
+        mp.setenv("DB_NAME", config["database"])
+        mp.setenv("DB_USER", config["user"])
+        mp.setenv("DB_PASSWORD", config["password"])
+        mp.setenv("SQL_STATES_DIR", str(STATES_DIR))
+        mp.setenv("BACKUP_DIR", str(tmp_path_factory.mktemp("backups")))
+        mp.setenv("SUBSET_DIR", str(tmp_path_factory.mktemp("subsets")))
+        # Tests drive the system_stats refresher themselves
+        mp.setenv("STATS_REFRESH_MODE", "off")
+        # pg_dump for /api/test/db-backup comes from the same installation
+        mp.setenv("PATH", local_pg.bin_dir, prepend=os.pathsep)
+        import app
+        yield app
+
+
+@pytest.fixture(scope="session")
+def state_template(local_pg, api_module):
+    """Template database per state, built on first use through the app's own loader"""
+    templates = {}
+
+    def build(state):
+        if state == EMPTY_STATE:
+            return None
+        if state not in templates:
+            name = f"template_{state.replace('-', '_')}"
+            local_pg.create_database(name)
+            config = local_pg.db_config(name)
+            success, report = api_module.apply_state_file(
+                api_module.DB_STATES[state]["sql_file"], fast=api_module.DB_STATES[state]["fast"],
+                db_config=config
+            )
+            if not success:
+                pytest.fail(f"Could not build state {state}: {report['error']}")
+            api_module.record_state_fingerprints(state, config)
+            templates[state] = name
+        return templates[state]
+
+    return build
+
+
+@pytest.fixture
+def db_config(request, local_pg, state_template):
+    """Connection settings of a fresh database cloned from the test's db_state template"""
+    marker = request.node.get_closest_marker("db_state")
+    state = marker.args[0] if marker else EMPTY_STATE
+    name = f"test_{next(_database_names)}"
+    local_pg.create_database(name, template=state_template(state))
+    yield local_pg.db_config(name)
+    local_pg.drop_database(name)
+
+
+@pytest.fixture
+def api(api_module, db_config, tmp_path, monkeypatch):
+    """Flask test client for app.py, bound to this test's own database"""
+    monkeypatch.setattr(api_module, "DB_CONFIG", db_config)
+    monkeypatch.setitem(api_module.DB_TARGETS, "default", db_config)
+    monkeypatch.setattr(api_module, "BACKUP_DIR", str(tmp_path / "backups"))
+    monkeypatch.setattr(api_module, "current_state", "unknown")
+    monkeypatch.setattr(api_module, "last_state_change", None)
+    return api_module.app.test_client()
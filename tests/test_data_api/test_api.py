@@ -0,0 +1,206 @@
+import threading
+import time
+
+import psycopg2
+import pytest
+
+
+def count_rows(db_config, table):
+    conn = psycopg2.connect(**db_config)
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(f"SELECT COUNT(*) FROM {table}")
+            return cursor.fetchone()[0]
+    finally:
+        conn.close()
+
+
+def persistence(db_config):
+    """{table: relpersistence} for the public tables"""
+    conn = psycopg2.connect(**db_config)
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("""
+                SELECT c.relname, c.relpersistence FROM pg_class c
+                JOIN pg_namespace n ON n.oid = c.relnamespace
+                WHERE n.nspname = 'public' AND c.relkind IN ('r', 'p')
+            """)
+            return dict(cursor.fetchall())
+    finally:
+        conn.close()
+
+
+class TestHealth:
+    def test_reports_database_connected(self, api):
+        """Test the health check reaches the local database"""
+        response = api.get("/health")
+        assert response.status_code == 200
+        assert response.get_json()["database"] == "connected"
+
+
+class TestDbState:
+    def test_empty_database(self, api):
+        """Test a database without tables is reported empty"""
+        assert api.get("/api/test/db-state").get_json()["current_state"] == "empty"
+
+    @pytest.mark.db_state("framework")
+    def test_cloned_state_is_detected(self, api):
+        """Test a database cloned from a state template is detected as that state"""
+        assert api.get("/api/test/db-state").get_json()["current_state"] == "framework"
+
+    def test_switch_state(self, api, db_config):
+        """Test switching state loads the state file into the test database"""
+        response = api.post("/api/test/db-state", json={"state": "full"})
+        assert response.status_code == 200, response.get_json()
+        assert response.get_json()["new_state"] == "full"
+        assert api.get("/api/test/db-state").get_json()["current_state"] == "full"
+        assert count_rows(db_config, "test_results") > 0
+
+    def test_invalid_state_is_rejected(self, api):
+        """Test unknown states are rejected without touching the database"""
+        response = api.post("/api/test/db-state", json={"state": "nope"})
+        assert response.status_code == 400
+
+
+class TestIsolation:
+    @pytest.mark.db_state("full")
+    def test_changes_stay_in_own_database(self, api, db_config):
+        """Test data deleted by one test is present again in the next clone"""
+        conn = psycopg2.connect(**db_config)
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("TRUNCATE test_results CASCADE")
+            conn.commit()
+        finally:
+            conn.close()
+        assert count_rows(db_config, "test_results") == 0
+
+    @pytest.mark.db_state("full")
+    def test_fresh_clone_has_full_data(self, api, db_config):
+        """Test every test starts from an unmodified copy of the template"""
+        assert count_rows(db_config, "test_results") > 0
+
+
+class TestDurability:
+    def test_fast_state_is_unlogged_until_switched_back(self, api, db_config):
+        """Test a fast load creates UNLOGGED tables and the endpoint makes them LOGGED again"""
+        response = api.post("/api/test/db-state", json={"state": "full", "fast": True})
+        assert response.status_code == 200, response.get_json()
+        tables = persistence(db_config)
+        assert len(tables) == 11 and set(tables.values()) == {"u"}
+
+        durability = api.get("/api/test/db-durability").get_json()
+        assert durability["logged_tables"] == []
+        assert durability["unlogged_tables"] == sorted(tables)
+
+        response = api.post("/api/test/db-durability", json={"logged": True})
+        assert response.status_code == 200, response.get_json()
+        assert sorted(response.get_json()["changed_tables"]) == sorted(tables)
+        assert set(persistence(db_config).values()) == {"p"}
+        assert api.get("/api/test/db-durability").get_json()["unlogged_tables"] == []
+        assert count_rows(db_config, "test_results") > 0
+
+    @pytest.mark.db_state("full")
+    def test_tables_can_be_made_unlogged(self, api, db_config):
+        """Test POST logged=false flips a normal load to UNLOGGED, children first"""
+        response = api.post("/api/test/db-durability", json={"logged": False})
+        assert response.status_code == 200, response.get_json()
+        changed = response.get_json()["changed_tables"]
+        assert changed.index("test_results") < changed.index("users")
+        assert set(persistence(db_config).values()) == {"u"}
+
+        # Already unlogged: nothing left to change
+        assert api.post("/api/test/db-durability", json={"logged": False}).get_json()["changed_tables"] == []
+
+
+class TestVerifyAndReset:
+    @pytest.mark.db_state("full")
+    def test_clone_verifies_against_recorded_fingerprints(self, api):
+        """Test fingerprints recorded on the template travel with the clone"""
+        response = api.get("/api/test/db-verify")
+        assert response.status_code == 200, response.get_json()
+        assert response.get_json()["verified"] is True
+
+    @pytest.mark.db_state("framework")
+    def test_drift_is_detected_and_reset_restores_state(self, api, db_config):
+        """Test drift fails verification and db-reset rebuilds the state"""
+        conn = psycopg2.connect(**db_config)
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("DELETE FROM settings")
+            conn.commit()
+        finally:
+            conn.close()
+        assert api.get("/api/test/db-verify").status_code == 409
+
+        response = api.post("/api/test/db-reset")
+        assert response.status_code == 200, response.get_json()
+        assert api.get("/api/test/db-verify").status_code == 200
+
+
+@pytest.fixture
+def second_target(api_module, local_pg, monkeypatch):
+    """Extra empty database registered as the "second" fan-out target"""
+    name = "fanout_second"
+    local_pg.create_database(name)
+    monkeypatch.setitem(api_module.DB_TARGETS, "second", local_pg.db_config(name))
+    yield local_pg.db_config(name)
+    local_pg.drop_database(name)
+
+
+class TestFanOut:
+    def test_state_loads_on_every_target(self, api, db_config, second_target):
+        """Test one request loads the state into each listed target"""
+        response = api.post("/api/test/db-state", json={"state": "full", "targets": ["default", "second"]})
+        assert response.status_code == 200, response.get_json()
+        result = response.get_json()
+        assert result["status"] == "success"
+        assert result["failed_targets"] == []
+        assert set(result["targets"]) == {"default", "second"}
+        assert count_rows(db_config, "test_results") > 0
+        assert count_rows(second_target, "test_results") > 0
+
+    def test_unreachable_target_gives_partial_result(self, api, api_module, db_config, local_pg,
+                                                     monkeypatch):
+        """Test a failing target is reported per target while the others load"""
+        monkeypatch.setitem(api_module.DB_TARGETS, "broken", local_pg.db_config("does_not_exist"))
+        response = api.post("/api/test/db-state", json={"state": "framework", "targets": "all"})
+        assert response.status_code == 500
+        result = response.get_json()
+        assert result["status"] == "partial"
+        assert result["failed_targets"] == ["broken"]
+        assert result["targets"]["broken"]["error"]
+        assert result["targets"]["default"]["status"] == "success"
+        assert count_rows(db_config, "users") > 0
+
+    @pytest.mark.parametrize("targets", [["default", "nope"], "default", [], {"default": True}])
+    def test_invalid_targets_are_rejected(self, api, targets):
+        """Test unknown target names and anything but "all" or a list fail with 400"""
+        response = api.post("/api/test/db-state", json={"state": "full", "targets": targets})
+        assert response.status_code == 400
+        assert "Invalid targets" in response.get_json()["error"]
+
+    def test_parallel_loads_are_capped(self, api, api_module, monkeypatch):
+        """Test no more than DB_FANOUT_WORKERS targets load at the same time"""
+        lock = threading.Lock()
+        running = {"now": 0, "max": 0}
+
+        def slow_apply(filepath, fast=False, db_config=None):
+            with lock:
+                running["now"] += 1
+                running["max"] = max(running["max"], running["now"])
+            time.sleep(0.2)
+            with lock:
+                running["now"] -= 1
+            return True, None
+
+        for name in ("t1", "t2", "t3", "t4"):
+            monkeypatch.setitem(api_module.DB_TARGETS, name, api_module.DB_CONFIG)
+        monkeypatch.setattr(api_module, "apply_state_file", slow_apply)
+        monkeypatch.setattr(api_module, "record_state_fingerprints", lambda *args: None)
+        monkeypatch.setattr(api_module, "DB_FANOUT_WORKERS", 2)
+
+        response = api.post("/api/test/db-state",
+                            json={"state": "full", "targets": ["t1", "t2", "t3", "t4"]})
+        assert response.status_code == 200, response.get_json()
+        assert running["max"] == 2
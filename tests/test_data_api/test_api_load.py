@@ -0,0 +1,41 @@
+from benchmarks.api_load import compare_to_baseline, percentile
+
+
+def scenario(p95_ms, throughput_rps, errors=0):
+    return {"p95_ms": p95_ms, "throughput_rps": throughput_rps, "errors": errors}
+
+
+class TestPercentile:
+    def test_nearest_rank(self):
+        """Test percentiles use the nearest-rank method"""
+        samples = list(range(1, 101))
+        assert percentile(samples, 50) == 50
+        assert percentile(samples, 95) == 95
+        assert percentile(samples, 99) == 99
+        assert percentile([3.0], 99) == 3.0
+
+    def test_empty_samples(self):
+        """Test an empty sample list yields zero"""
+        assert percentile([], 95) == 0.0
+
+
+class TestBaselineComparison:
+    baseline = {"results": {"health": scenario(40.0, 200.0), "db_reset": scenario(130.0, 7.5)}}
+
+    def test_within_tolerance_passes(self):
+        """Test small variations are not regressions"""
+        results = {"health": scenario(48.0, 170.0), "db_reset": scenario(120.0, 8.0)}
+        assert compare_to_baseline(results, self.baseline, 0.25) == []
+
+    def test_latency_throughput_and_errors_regress(self):
+        """Test slower p95, lower throughput and new errors are reported"""
+        results = {"health": scenario(60.0, 100.0), "db_reset": scenario(130.0, 7.5, errors=2)}
+        regressions = compare_to_baseline(results, self.baseline, 0.25)
+        assert len(regressions) == 3
+        assert any(r.startswith("health: p95") for r in regressions)
+        assert any(r.startswith("health: throughput") for r in regressions)
+        assert any(r.startswith("db_reset: 2 errors") for r in regressions)
+
+    def test_scenarios_not_run_are_ignored(self):
+        """Test scenarios skipped with --scenarios are not compared"""
+        assert compare_to_baseline({"health": scenario(40.0, 200.0)}, self.baseline, 0.25) == []
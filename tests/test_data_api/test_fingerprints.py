@@ -0,0 +1,50 @@
+from datetime import datetime
+from unittest.mock import MagicMock
+
+from fingerprints import verify_fingerprints
+
+
+def make_connection(rows):
+    """Connection mock whose cursor returns the given verification rows"""
+    conn = MagicMock()
+    cursor = conn.cursor.return_value.__enter__.return_value
+    cursor.fetchall.return_value = rows
+    return conn
+
+
+class TestVerifyFingerprints:
+    recorded_at = datetime(2024, 1, 20, 12, 0, 0)
+
+    def test_matching_tables_verify(self):
+        """Test identical fingerprints verify the recorded state"""
+        conn = make_connection([
+            ("settings", "framework", self.recorded_at, 15, 15, "42", "42"),
+            ("users", "framework", self.recorded_at, 6, 6, "-7", "-7"),
+        ])
+        result = verify_fingerprints(conn)
+        assert result["verified"] is True
+        assert result["state"] == "framework"
+        assert result["recorded_at"] == "2024-01-20T12:00:00"
+        assert result["tables"]["users"] == {"status": "ok", "expected_rows": 6, "actual_rows": 6}
+
+    def test_reports_drifted_missing_and_unexpected_tables(self):
+        """Test each kind of difference is reported per table"""
+        conn = make_connection([
+            ("extra", None, None, None, 0, None, "0"),
+            ("settings", "full", self.recorded_at, 15, 15, "42", "43"),
+            ("users", "full", self.recorded_at, 10, 10, "-7", "-7"),
+            ("vulnerabilities", "full", self.recorded_at, 4, None, "9", None),
+        ])
+        result = verify_fingerprints(conn)
+        assert result["verified"] is False
+        assert result["drifted_tables"] == ["settings"]
+        assert result["missing_tables"] == ["vulnerabilities"]
+        assert result["unexpected_tables"] == ["extra"]
+        assert result["tables"]["users"]["status"] == "ok"
+
+    def test_nothing_recorded_is_not_verified(self):
+        """Test a database without recorded fingerprints does not verify"""
+        conn = make_connection([("users", None, None, None, 6, None, "-7")])
+        result = verify_fingerprints(conn)
+        assert result["state"] is None
+        assert result["verified"] is False
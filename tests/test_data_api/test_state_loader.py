@@ -0,0 +1,120 @@
+import pytest
+
+from state_loader import (
+    LoadPlan,
+    build_dependency_graph,
+    make_unlogged,
+    read_statements,
+    split_sql,
+    topological_order,
+)
+
+
+class TestSplitSql:
+    def test_splits_on_semicolons_and_drops_comments(self):
+        """Test statements are split and comments removed"""
+        statements = split_sql("-- header\nSELECT 1;\n/* block */ SELECT 2;")
+        assert statements == ["SELECT 1", "SELECT 2"]
+
+    def test_keeps_quoted_semicolons(self):
+        """Test semicolons inside strings and identifiers do not split"""
+        statements = split_sql("INSERT INTO t VALUES ('a;b', 'it''s'); SELECT \"x;y\" FROM t;")
+        assert statements == ["INSERT INTO t VALUES ('a;b', 'it''s')", 'SELECT "x;y" FROM t']
+
+    def test_keeps_dollar_quoted_bodies(self):
+        """Test function bodies with inner semicolons stay in one statement"""
+        sql = "DO $$\nBEGIN\n    RAISE NOTICE 'a'; -- inner\nEND $$;\nSELECT 1;"
+        statements = split_sql(sql)
+        assert len(statements) == 2
+        assert statements[0].startswith("DO $$") and "-- inner" in statements[0]
+
+    def test_meta_commands_are_separate_statements(self):
+        """Test psql meta-commands are returned on their own"""
+        statements = split_sql("-- comment\n\\i /app/sql/states/schema-only.sql\nSELECT 1;")
+        assert statements == ["\\i /app/sql/states/schema-only.sql", "SELECT 1"]
+
+
+class TestStatePlans:
+    def test_includes_are_expanded(self, states_dir):
+        """Test \\i includes resolve next to the including file"""
+        statements = read_statements(str(states_dir / "full-test-data.sql"))
+        assert not any(s.startswith("\\") for s in statements)
+        assert any(s.startswith("DROP SCHEMA IF EXISTS public CASCADE") for s in statements)
+        assert any(s.startswith("CREATE MATERIALIZED VIEW system_stats") for s in statements)
+
+    def test_foreign_key_graph(self, states_dir):
+        """Test the dependency graph follows schema-only.sql foreign keys"""
+        graph = build_dependency_graph(read_statements(str(states_dir / "schema-only.sql")))
+        assert graph["users"] == set()
+        assert graph["projects"] == {"users"}
+        assert graph["deployments"] == {"projects", "environments", "users"}
+        assert graph["test_results"] == {"deployments"}
+        for table in ("settings", "notifications", "audit_logs"):
+            assert graph[table] == {"users"}
+
+    def test_independent_tables_share_a_batch(self, states_dir):
+        """Test framework inserts form one batch with independent leaf tables"""
+        plan = LoadPlan.from_file(str(states_dir / "framework-data.sql"))
+        batches = [payload for kind, payload in plan.steps if kind == "data"]
+        dependencies = plan.table_dependencies(batches[0])
+        assert dependencies["users"] == set()
+        for table in ("settings", "notifications", "audit_logs"):
+            assert dependencies[table] == {"users"}
+
+    def test_indexes_and_refresh_are_deferred(self, states_dir):
+        """Test index builds and matview refreshes run after the data load"""
+        plan = LoadPlan.from_file(str(states_dir / "full-test-data.sql"))
+        kinds = [kind for kind, _, _ in plan.deferred]
+        assert kinds.count("index") == 17
+        assert [target for kind, target, _ in plan.deferred if kind == "refresh"] == ["system_stats"]
+        for kind, payload in plan.steps:
+            if kind == "sql":
+                assert not any(s.upper().startswith(("CREATE INDEX", "REFRESH")) for s in payload)
+
+    def test_insert_select_depends_on_source_table(self):
+        """Test INSERT ... SELECT waits for the table it reads"""
+        plan = LoadPlan([
+            "CREATE TABLE a (id INT)",
+            "CREATE TABLE b (id INT)",
+            "INSERT INTO a VALUES (1)",
+            "INSERT INTO b SELECT id FROM a",
+        ])
+        (_, batch), = [step for step in plan.steps if step[0] == "data"]
+        assert plan.table_dependencies(batch) == {"a": set(), "b": {"a"}}
+
+    def test_recursive_include_is_rejected(self, tmp_path):
+        """Test a file including itself fails instead of recursing forever"""
+        sql_file = tmp_path / "loop.sql"
+        sql_file.write_text(f"\\i {sql_file}\n")
+        with pytest.raises(ValueError):
+            read_statements(str(sql_file))
+
+
+class TestFastMode:
+    def test_make_unlogged_rewrites_plain_tables_only(self):
+        """Test only plain CREATE TABLE statements become UNLOGGED"""
+        assert make_unlogged("CREATE TABLE users (id INT)") == "CREATE UNLOGGED TABLE users (id INT)"
+        assert make_unlogged("create table if not exists t (id INT)").startswith(
+            "CREATE UNLOGGED TABLE if not exists")
+        assert make_unlogged("CREATE TEMP TABLE t (id INT)") == "CREATE TEMP TABLE t (id INT)"
+        assert make_unlogged("CREATE MATERIALIZED VIEW v AS SELECT 1").startswith("CREATE MATERIALIZED")
+
+    def test_unlogged_plan(self, states_dir):
+        """Test a fast plan creates every table UNLOGGED"""
+        plan = LoadPlan.from_file(str(states_dir / "full-test-data.sql"), unlogged=True)
+        statements = [s for kind, payload in plan.steps if kind == "sql" for s in payload]
+        assert sum(s.startswith("CREATE UNLOGGED TABLE") for s in statements) == 11
+        assert not any(s.startswith("CREATE TABLE") for s in statements)
+
+    def test_topological_order_puts_parents_first(self, states_dir):
+        """Test tables are ordered after the tables they reference"""
+        graph = build_dependency_graph(read_statements(str(states_dir / "full-test-data.sql")))
+        order = topological_order(graph)
+        assert sorted(order) == sorted(graph)
+        for table, references in graph.items():
+            for parent in references:
+                assert order.index(parent) < order.index(table)
+
+    def test_topological_order_tolerates_cycles(self):
+        """Test reference cycles do not loop forever"""
+        assert topological_order({"a": {"b"}, "b": {"a"}, "c": set()}) == ["c", "a", "b"]
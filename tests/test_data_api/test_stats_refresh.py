@@ -0,0 +1,172 @@
+import time
+
+import psycopg2
+import pytest
+
+from stats_refresh import StatsRefresher, install_stats_tracking, refresh_stats_view
+
+
+def connect(db_config, autocommit=False):
+    conn = psycopg2.connect(**db_config)
+    conn.autocommit = autocommit
+    return conn
+
+
+def execute(db_config, sql):
+    conn = connect(db_config)
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(sql)
+            rows = cursor.fetchall() if cursor.description else None
+        conn.commit()
+        return rows
+    finally:
+        conn.close()
+
+
+def total_users(db_config):
+    return execute(db_config, "SELECT total_users FROM system_stats")[0][0]
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+class TestDebounce:
+    def test_changes_push_the_refresh_back(self):
+        """Test every change restarts the quiet period"""
+        refresher = StatsRefresher({}, debounce=2.0, max_delay=10.0)
+        assert refresher.status()["pending"] is False
+        refresher.mark_changed()
+        assert 1.9 < refresher.status()["due_in_seconds"] <= 2.0
+
+    def test_max_delay_bounds_the_wait(self):
+        """Test a steady stream of changes cannot postpone the refresh forever"""
+        refresher = StatsRefresher({}, debounce=2.0, max_delay=10.0)
+        refresher.mark_changed()
+        refresher._first_change -= 9.5
+        refresher.mark_changed()
+        assert refresher.status()["due_in_seconds"] <= 0.5
+
+
+class TestRefresh:
+    @pytest.mark.db_state("framework")
+    def test_framework_view_refreshes_concurrently(self, db_config):
+        """Test the unique index lets system_stats refresh without blocking readers"""
+        conn = connect(db_config, autocommit=True)
+        try:
+            result = refresh_stats_view(conn)
+        finally:
+            conn.close()
+        assert result["refreshed"] is True
+        assert result["concurrent"] is True
+
+    @pytest.mark.db_state("schema-only")
+    def test_nothing_to_track_without_the_view(self, db_config):
+        """Test schema-only databases are left alone"""
+        conn = connect(db_config)
+        try:
+            assert install_stats_tracking(conn)["installed"] is False
+        finally:
+            conn.close()
+
+    @pytest.mark.db_state("framework")
+    def test_incremental_counters_follow_changes(self, db_config):
+        """Test trigger-maintained counters track inserts, deletes and truncates"""
+        conn = connect(db_config)
+        try:
+            install_stats_tracking(conn, incremental=True)
+        finally:
+            conn.close()
+        assert total_users(db_config) == 6
+
+        execute(db_config, "INSERT INTO users (username, email, password_hash) "
+                           "SELECT 'u' || i, 'u' || i || '@x', 'x' FROM generate_series(1, 3) i")
+        execute(db_config, "DELETE FROM notifications; DELETE FROM users WHERE username = 'u1'")
+        execute(db_config, "TRUNCATE security_scans")
+        counts = dict(execute(db_config, "SELECT table_name, row_count FROM test_data_api.row_counts"))
+        assert counts["users"] == 8
+        assert counts["security_scans"] == 0
+
+        conn = connect(db_config, autocommit=True)
+        try:
+            assert refresh_stats_view(conn)["concurrent"] is True
+        finally:
+            conn.close()
+        assert total_users(db_config) == 8
+
+
+class TestStatsRefresher:
+    @pytest.mark.db_state("framework")
+    @pytest.mark.parametrize("incremental", [False, True])
+    def test_changes_are_refreshed_after_debounce(self, db_config, incremental):
+        """Test a data change reaches system_stats once the debounce has passed"""
+        conn = connect(db_config)
+        try:
+            install_stats_tracking(conn, incremental=incremental)
+        finally:
+            conn.close()
+
+        refresher = StatsRefresher(db_config, debounce=0.2, max_delay=1.0).start()
+        try:
+            assert wait_for(lambda: refresher.listening)
+            execute(db_config, "INSERT INTO users (username, email, password_hash) "
+                               "VALUES ('late', 'late@x', 'x')")
+            assert wait_for(lambda: total_users(db_config) == 7)
+            assert refresher.status()["refreshes"] == 1
+            assert refresher.status()["last_refresh"]["concurrent"] is True
+        finally:
+            refresher.stop()
+
+
+class TestStatsApi:
+    @pytest.mark.db_state("framework")
+    def test_refresh_on_demand(self, api, db_config):
+        """Test POST refreshes system_stats immediately"""
+        execute(db_config, "INSERT INTO users (username, email, password_hash) VALUES ('x', 'x@x', 'x')")
+        response = api.post("/api/test/stats-refresh")
+        assert response.status_code == 200, response.get_json()
+        assert response.get_json()["refreshed"] is True
+        assert total_users(db_config) == 7
+        assert api.get("/api/test/stats-refresh").get_json()["mode"] == "off"
+
+    def test_state_switch_installs_tracking(self, api, api_module, db_config, monkeypatch):
+        """Test loading a state installs the counters and starts the refresher"""
+        monkeypatch.setattr(api_module, "STATS_REFRESH_MODE", "incremental")
+        monkeypatch.setattr(api_module, "STATS_DEBOUNCE_SECONDS", 0.2)
+        monkeypatch.setattr(api_module, "stats_refresher", None)
+        try:
+            assert api.post("/api/test/db-state", json={"state": "framework"}).status_code == 200
+            status = api.get("/api/test/stats-refresh").get_json()
+            assert status["refresher"]["running"] is True
+
+            execute(db_config, "DELETE FROM notifications; DELETE FROM users WHERE id = 6")
+            assert wait_for(lambda: total_users(db_config) == 5)
+        finally:
+            api_module.stats_refresher.stop()
+
+    def test_fanout_targets_are_not_tracked(self, api, api_module, db_config, local_pg, monkeypatch):
+        """Test tracking is only installed where a refresher listens"""
+        name = "stats_second"
+        local_pg.create_database(name)
+        second = local_pg.db_config(name)
+        monkeypatch.setitem(api_module.DB_TARGETS, "second", second)
+        monkeypatch.setattr(api_module, "STATS_REFRESH_MODE", "incremental")
+        monkeypatch.setattr(api_module, "stats_refresher", None)
+        try:
+            response = api.post("/api/test/db-state",
+                                json={"state": "framework", "targets": ["default", "second"]})
+            assert response.status_code == 200, response.get_json()
+
+            triggers = "SELECT count(*) FROM pg_trigger WHERE tgname LIKE 'stats_%'"
+            assert execute(db_config, triggers)[0][0] > 0
+            assert execute(second, triggers)[0][0] == 0
+            assert execute(second, "SELECT to_regclass('test_data_api.row_counts')")[0][0] is None
+        finally:
+            api_module.stats_refresher.stop()
+            local_pg.drop_database(name)
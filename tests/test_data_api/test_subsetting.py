@@ -0,0 +1,122 @@
+from pathlib import Path
+
+import psycopg2
+import pytest
+
+from subsetting import SubsetError, SubsetExtractor, discover_subsets
+
+
+def query(db_config, sql):
+    conn = psycopg2.connect(**db_config)
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(sql)
+            return cursor.fetchall()
+    finally:
+        conn.close()
+
+
+def dangling_references(db_config):
+    """Foreign-key values in db_config that point at no row"""
+    checks = {
+        "environments": ("project_id", "projects"),
+        "deployments": ("environment_id", "environments"),
+        "test_results": ("deployment_id", "deployments"),
+        "security_scans": ("deployment_id", "deployments"),
+        "audit_logs": ("user_id", "users"),
+    }
+    dangling = {}
+    for table, (column, parent) in checks.items():
+        count = query(db_config, f"""
+            SELECT COUNT(*) FROM {table} c
+            WHERE c.{column} IS NOT NULL
+              AND NOT EXISTS (SELECT 1 FROM {parent} p WHERE p.id = c.{column})
+        """)[0][0]
+        if count:
+            dangling[table] = count
+    return dangling
+
+
+class TestDiscoverSubsets:
+    def test_finds_files_with_subset_header(self, tmp_path):
+        """Test only named .sql files starting with the subset header are states"""
+        (tmp_path / "two-projects.sql").write_text("-- Subset State: Two projects\n\\i x.sql\n")
+        (tmp_path / "notes.sql").write_text("-- Something else\n")
+        (tmp_path / "Bad Name.sql").write_text("-- Subset State: ignored\n")
+        subsets = discover_subsets(str(tmp_path))
+        assert list(subsets) == ["two-projects"]
+        assert subsets["two-projects"]["description"] == "Two projects"
+
+    def test_missing_directory_has_no_subsets(self, tmp_path):
+        """Test a subset directory that does not exist yet is empty"""
+        assert discover_subsets(str(tmp_path / "missing")) == {}
+
+
+class TestSubsetExtractor:
+    @pytest.mark.db_state("full")
+    def test_slice_is_closed_over_foreign_keys(self, db_config, states_dir, tmp_path):
+        """Test a project slice carries its descendants and every referenced row"""
+        extractor = SubsetExtractor(db_config, str(states_dir / "schema-only.sql"), batch_size=2)
+        report = extractor.extract("projects", str(tmp_path / "one.sql"), ids=[1],
+                                   include=["audit_logs"])
+
+        expected = query(db_config, """
+            SELECT (SELECT COUNT(*) FROM environments WHERE project_id = 1),
+                   (SELECT COUNT(*) FROM deployments WHERE project_id = 1),
+                   (SELECT COUNT(*) FROM test_results t JOIN deployments d
+                        ON d.id = t.deployment_id WHERE d.project_id = 1)
+        """)[0]
+        assert report["tables"]["projects"] == 1
+        assert report["tables"]["environments"] == expected[0]
+        assert report["tables"]["deployments"] == expected[1]
+        assert report["tables"]["test_results"] == expected[2]
+        assert report["tables"]["users"] > 0
+        assert report["tables"]["audit_logs"] > 0
+        assert "settings" not in report["tables"]
+
+    def test_unknown_root_is_rejected(self, db_config, states_dir, tmp_path):
+        """Test only tables created by schema-only.sql can be subset"""
+        extractor = SubsetExtractor(db_config, str(states_dir / "schema-only.sql"))
+        with pytest.raises(SubsetError):
+            extractor.extract("pg_class", str(tmp_path / "bad.sql"))
+        assert not (tmp_path / "bad.sql").exists()
+
+
+class TestSubsetApi:
+    @pytest.mark.db_state("full")
+    def test_subset_becomes_a_loadable_state(self, api, api_module, db_config, monkeypatch):
+        """Test an extracted subset loads consistently and is detected as its own state"""
+        response = api.post("/api/test/db-subset", json={
+            "name": "two-projects", "root": "projects", "limit": 2,
+            "include": ["audit_logs"], "batch_size": 3
+        })
+        assert response.status_code == 200, response.get_json()
+        report = response.get_json()
+        assert report["state"] == "two-projects"
+        assert report["tables"]["projects"] == 2
+
+        response = api.post("/api/test/db-state", json={"state": "two-projects"})
+        assert response.status_code == 200, response.get_json()
+        assert query(db_config, "SELECT COUNT(*) FROM projects")[0][0] == 2
+        assert dangling_references(db_config) == {}
+        assert api.get("/api/test/db-state").get_json()["current_state"] == "two-projects"
+
+        # Sequences continue after the copied ids
+        assert query(db_config, "INSERT INTO projects (name) VALUES ('new') RETURNING id")[0][0] > 2
+
+    @pytest.mark.db_state("full")
+    def test_subsets_from_other_workers_are_loadable(self, api, api_module, db_config, states_dir):
+        """Test a subset written to SUBSET_DIR by another process is a valid state right away"""
+        extractor = SubsetExtractor(db_config, str(states_dir / "schema-only.sql"))
+        extractor.extract("projects", str(Path(api_module.SUBSET_DIR) / "other-worker.sql"), limit=1)
+        assert "other-worker" in api.get("/api/test/db-state").get_json()["available_states"]
+
+        response = api.post("/api/test/db-state", json={"state": "other-worker"})
+        assert response.status_code == 200, response.get_json()
+        assert query(db_config, "SELECT COUNT(*) FROM projects")[0][0] == 1
+        assert api.post("/api/test/db-reset").status_code == 200
+
+    def test_builtin_states_cannot_be_overwritten(self, api):
+        """Test subset names may not shadow the built-in states"""
+        response = api.post("/api/test/db-subset", json={"name": "full", "root": "projects"})
+        assert response.status_code == 400
@@ -0,0 +1,109 @@
+import json
+
+import psycopg2
+import pytest
+
+from table_stream import TableInfo, make_etag
+
+
+def ndjson(response):
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+
+class TestProjection:
+    info = TableInfo("users", ["id", "username", "email"], "id")
+
+    def test_all_columns_by_default(self):
+        """Test no projection selects every column in table order"""
+        assert self.info.projection(None) == ["id", "username", "email"]
+
+    def test_key_column_is_always_included(self):
+        """Test the key is added so the next page can be requested"""
+        assert self.info.projection(["email", "username", "email"]) == ["id", "email", "username"]
+
+    def test_unknown_columns_are_rejected(self):
+        """Test projecting a column the table does not have fails"""
+        with pytest.raises(ValueError):
+            self.info.projection(["password"])
+
+
+class TestEtag:
+    fingerprint = {"rows": 10, "fingerprint": "42"}
+
+    def test_etag_varies_with_page_and_fingerprint(self):
+        """Test each page, projection and table content gets its own tag"""
+        base = make_etag(self.fingerprint, "users", ["id"], None, None)
+        assert base == make_etag(dict(self.fingerprint), "users", ["id"], None, None)
+        assert base != make_etag(self.fingerprint, "users", ["id"], "5", None)
+        assert base != make_etag(self.fingerprint, "users", ["id", "email"], None, None)
+        assert base != make_etag(dict(self.fingerprint, fingerprint="43"), "users", ["id"], None, None)
+        assert base != make_etag(dict(self.fingerprint, rows=11), "users", ["id"], None, None)
+
+
+@pytest.mark.db_state("full")
+class TestTableDataApi:
+    def test_streams_rows_as_ndjson(self, api):
+        """Test a table is returned as one JSON object per row in key order"""
+        response = api.get("/api/test/data/users?columns=username,email")
+        assert response.status_code == 200
+        assert response.mimetype == "application/x-ndjson"
+        rows = ndjson(response)
+        assert rows[0] == {"id": 1, "username": "admin", "email": "admin@secdevops.com"}
+        assert [row["id"] for row in rows] == sorted(row["id"] for row in rows)
+
+    def test_keyset_pages_cover_the_table(self, api, api_module, monkeypatch):
+        """Test following the last key page by page returns every row once"""
+        monkeypatch.setattr(api_module, "DATA_FETCH_SIZE", 2)
+        everything = ndjson(api.get("/api/test/data/environments?columns=id"))
+        seen, after = [], None
+        while True:
+            url = "/api/test/data/environments?columns=id&limit=3"
+            page = ndjson(api.get(url + (f"&after={after}" if after else "")))
+            if not page:
+                break
+            seen.extend(page)
+            after = page[-1]["id"]
+        assert seen == everything
+
+    def test_unchanged_state_revalidates_with_304(self, api):
+        """Test If-None-Match with the current tag returns 304 until the state changes"""
+        response = api.get("/api/test/data/projects")
+        etag = response.headers["ETag"]
+        assert etag and ndjson(response)
+
+        cached = api.get("/api/test/data/projects", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.get_data() == b""
+
+        assert api.post("/api/test/db-state", json={"state": "framework"}).status_code == 200
+        changed = api.get("/api/test/data/projects", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["ETag"] != etag
+        assert ndjson(changed)
+
+    def test_direct_write_invalidates_the_tag(self, api, db_config):
+        """Test a row written outside the API changes the tag and returns fresh data"""
+        response = api.get("/api/test/data/users")
+        etag = response.headers["ETag"]
+        rows = ndjson(response)
+
+        conn = psycopg2.connect(**db_config)
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("INSERT INTO users (username, email, password_hash) "
+                               "VALUES ('late', 'late@x', 'x')")
+            conn.commit()
+        finally:
+            conn.close()
+
+        fresh = api.get("/api/test/data/users", headers={"If-None-Match": etag})
+        assert fresh.status_code == 200
+        assert fresh.headers["ETag"] != etag
+        assert len(ndjson(fresh)) == len(rows) + 1
+
+    def test_invalid_requests_are_rejected(self, api):
+        """Test unknown tables, unknown columns and bad page keys"""
+        assert api.get("/api/test/data/nope").status_code == 404
+        assert api.get("/api/test/data/users?columns=password").status_code == 400
+        assert api.get("/api/test/data/users?after=abc").status_code == 400
+        assert api.get("/api/test/data/users?limit=0").status_code == 400
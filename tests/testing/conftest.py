@@ -0,0 +1,7 @@
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).parent.parent.parent
+TESTING_SCRIPTS_DIR = REPO_ROOT / "scripts" / "testing"
+
+sys.path.insert(0, str(TESTING_SCRIPTS_DIR))
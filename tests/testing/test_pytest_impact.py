@@ -0,0 +1,146 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from pytest_impact import select_tests, stale_reason
+
+TESTING_SCRIPTS_DIR = Path(__file__).parent.parent.parent / "scripts" / "testing"
+
+SAMPLE_CONFTEST = '''
+import pytest
+from pathlib import Path
+
+import helpers
+
+
+@pytest.fixture(scope="session")
+def settings():
+    return (Path(__file__).parent / "settings.ini").read_text()
+'''
+
+SAMPLE_SUITE = '''
+from pathlib import Path
+
+
+def test_uses_settings(settings):
+    assert settings
+
+
+def test_reads_data():
+    assert (Path(__file__).parent / "data.txt").read_text()
+
+
+def test_pure():
+    pass
+'''
+
+IMPACT = {
+    "version": 1,
+    "commit": "abc",
+    "rootdir": "suite",
+    "global": ["suite/tests/conftest.py", "suite/tests/helpers.py"],
+    "modules": {"suite/tests/test_a.py": ["suite/src/lib.py", "suite/tests/test_a.py"]},
+    "fixtures": {"model": ["suite/infra/main.tf", "suite/infra/acr/main.tf"]},
+    "test_modules": ["suite/tests/test_a.py", "suite/tests/test_b.py"],
+    "tests": {
+        "tests/test_a.py::test_one": {"module": "suite/tests/test_a.py", "fixtures": [], "files": []},
+        "tests/test_a.py::test_two": {"module": "suite/tests/test_a.py", "fixtures": [], "files": []},
+        "tests/test_b.py::test_model": {"module": "suite/tests/test_b.py", "fixtures": ["model"], "files": []},
+        "tests/test_b.py::test_data": {"module": "suite/tests/test_b.py", "fixtures": [],
+                                       "files": ["suite/data/x.json"]},
+    },
+}
+
+STATIC_RULES = [("infra/acr/*", ["tests/test_acr.py"])]
+CODE_SUFFIXES = (".py", ".tf", ".json")
+
+
+def select(*changed):
+    return select_tests(list(changed), IMPACT, "suite", STATIC_RULES, CODE_SUFFIXES)
+
+
+class TestSelectTests:
+    def test_recorded_accesses_select_dependent_tests(self):
+        """Test tests are selected through their own files, fixtures and module imports"""
+        assert select("suite/data/x.json").targets == ["tests/test_b.py::test_data"]
+        assert select("suite/infra/main.tf").targets == ["tests/test_b.py::test_model"]
+        # Every test of test_a.py depends on lib.py, so the module is selected as a whole
+        assert select("suite/src/lib.py").targets == ["tests/test_a.py"]
+
+    def test_static_mapping_takes_precedence(self):
+        """Test a statically mapped path selects only its tests, not every fixture user"""
+        assert select("suite/infra/acr/main.tf").targets == ["tests/test_acr.py"]
+
+    def test_changed_test_module_selects_itself(self):
+        """Test an edited or new test module is always selected"""
+        assert select("suite/tests/test_new.py").targets == ["tests/test_new.py"]
+
+    def test_conftest_selects_its_directory(self):
+        """Test a changed conftest selects the tests below it"""
+        assert select("suite/tests/unit/conftest.py").targets == ["tests/unit"]
+
+    def test_full_suite_fallbacks(self):
+        """Test global dependencies and unmapped code files select the full suite"""
+        assert select("suite/tests/helpers.py").full
+        assert select("suite/src/unknown.py").full
+
+    def test_unrelated_paths_select_nothing(self):
+        """Test docs and paths outside the suite select no tests"""
+        assert select("suite/README.md", "other/src/lib.py").targets == []
+
+
+class TestStaleness:
+    def test_missing_map_is_stale(self, tmp_path):
+        """Test a missing map falls back to the full suite"""
+        assert stale_reason(None, tmp_path, ["tests"], []) == "no impact map recorded"
+
+    def test_added_test_module_makes_map_stale(self, tmp_path):
+        """Test the map is stale when the set of test modules changed"""
+        tests_dir = tmp_path / "tests"
+        tests_dir.mkdir()
+        for name in ("test_a.py", "test_b.py"):
+            (tests_dir / name).write_text("")
+        assert stale_reason(IMPACT, tmp_path, ["tests"], []) is None
+
+        (tests_dir / "test_c.py").write_text("")
+        assert "added or removed" in stale_reason(IMPACT, tmp_path, ["tests"], [])
+
+    def test_global_change_since_recording_makes_map_stale(self, tmp_path):
+        """Test a conftest or session-wide dependency changed since recording invalidates the map"""
+        tests_dir = tmp_path / "tests"
+        tests_dir.mkdir()
+        for name in ("test_a.py", "test_b.py"):
+            (tests_dir / name).write_text("")
+        assert "changed since" in stale_reason(IMPACT, tmp_path, ["tests"], ["suite/tests/helpers.py"])
+        assert stale_reason(None, tmp_path, ["tests"], None) is not None
+
+
+class TestImpactRecorder:
+    def test_accesses_are_attributed_to_tests_fixtures_and_conftest(self, tmp_path):
+        """Test the audit hook attributes each file access to what was running"""
+        tests_dir = tmp_path / "tests"
+        tests_dir.mkdir()
+        (tests_dir / "conftest.py").write_text(SAMPLE_CONFTEST)
+        (tests_dir / "helpers.py").write_text("")
+        (tests_dir / "settings.ini").write_text("[x]\n")
+        (tests_dir / "data.txt").write_text("data\n")
+        (tests_dir / "test_sample.py").write_text(SAMPLE_SUITE)
+        impact_file = tmp_path / "impact.json"
+
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join([str(TESTING_SCRIPTS_DIR), str(tests_dir)]))
+        result = subprocess.run([sys.executable, "-m", "pytest", "-p", "pytest_impact", "--record-impact",
+                                 f"--impact-file={impact_file}", "-q", "tests"],
+                                cwd=tmp_path, env=env, capture_output=True, text=True)
+        assert result.returncode == 0, result.stdout
+
+        impact = json.loads(impact_file.read_text())
+        assert {"tests/conftest.py", "tests/helpers.py"} <= set(impact["global"])
+        assert impact["fixtures"]["settings"] == ["tests/settings.ini"]
+        assert impact["tests"]["tests/test_sample.py::test_reads_data"]["files"] == ["tests/data.txt"]
+        assert "settings" in impact["tests"]["tests/test_sample.py::test_uses_settings"]["fixtures"]
+        assert impact["test_modules"] == ["tests/test_sample.py"]
+
+        selection = select_tests(["tests/settings.ini"], impact, ".")
+        assert selection.targets == ["tests/test_sample.py::test_uses_settings"]
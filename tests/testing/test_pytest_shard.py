@@ -0,0 +1,86 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from pytest_shard import estimate, pack_shards
+
+TESTING_SCRIPTS_DIR = Path(__file__).parent.parent.parent / "scripts" / "testing"
+
+SAMPLE_SUITE = '''
+import time
+
+def test_slow():
+    time.sleep(0.3)
+
+def test_a():
+    pass
+
+def test_b():
+    pass
+
+def test_c():
+    pass
+'''
+
+
+def run_pytest(cwd, *args):
+    env = dict(os.environ, PYTHONPATH=str(TESTING_SCRIPTS_DIR))
+    return subprocess.run([sys.executable, "-m", "pytest", "-p", "pytest_shard", "-q", *args],
+                          cwd=cwd, env=env, capture_output=True, text=True)
+
+
+class TestPackShards:
+    def test_longest_first_balances_load(self):
+        """Test tests are packed longest-first onto the lightest shard"""
+        durations = {"a": 5.0, "b": 4.0, "c": 3.0, "d": 3.0, "e": 1.0}
+        shards = pack_shards(list(durations), durations, 2)
+        loads = [sum(durations[n] for n in shard) for shard in shards]
+        assert sorted(loads) == [8.0, 8.0]
+        assert sorted(n for shard in shards for n in shard) == sorted(durations)
+
+    def test_partition_is_deterministic(self):
+        """Test every agent computes the same partition regardless of collection order"""
+        nodeids = [f"tests/test_x.py::test_{i}" for i in range(20)]
+        durations = {n: (i % 7) / 10 for i, n in enumerate(nodeids)}
+        assert pack_shards(nodeids, durations, 3) == pack_shards(list(reversed(nodeids)), durations, 3)
+
+    def test_unknown_tests_use_module_mean(self):
+        """Test tests without a recorded duration are estimated from their module"""
+        durations = {"tests/test_a.py::test_1": 2.0, "tests/test_b.py::test_1": 0.5}
+        estimates = estimate(list(durations) + ["tests/test_a.py::test_new", "tests/test_c.py::test_new"],
+                             durations)
+        assert estimates["tests/test_a.py::test_new"] == 2.0
+        assert estimates["tests/test_c.py::test_new"] == 1.25
+
+
+class TestShardPlugin:
+    def test_shards_cover_suite_and_store_durations(self, tmp_path):
+        """Test shards run disjoint tests and record durations for the next split"""
+        (tmp_path / "test_sample.py").write_text(SAMPLE_SUITE)
+        durations_file = tmp_path / "durations.json"
+        result = run_pytest(tmp_path, "--store-durations", f"--durations-file={durations_file}")
+        assert result.returncode == 0, result.stdout
+        recorded = json.loads(durations_file.read_text())
+        assert recorded["test_sample.py::test_slow"] >= 0.3
+
+        outputs = []
+        for shard in range(2):
+            result = run_pytest(tmp_path, "--num-shards=2", f"--shard-id={shard}",
+                                f"--durations-file={durations_file}", "-vv")
+            assert result.returncode == 0, result.stdout
+            outputs.append({line.split()[0] for line in result.stdout.splitlines() if " PASSED" in line})
+        assert outputs[0].isdisjoint(outputs[1])
+        assert len(outputs[0] | outputs[1]) == 4
+        # The slow test fills one shard on its own
+        assert {"test_sample.py::test_slow"} in outputs
+
+    def test_recorded_slow_tests_leave_fast_tier(self, tmp_path):
+        """Test tests recorded above the slow threshold are marked slow"""
+        (tmp_path / "test_sample.py").write_text(SAMPLE_SUITE)
+        durations_file = tmp_path / "durations.json"
+        durations_file.write_text(json.dumps({"test_sample.py::test_slow": 5.0}))
+        result = run_pytest(tmp_path, f"--durations-file={durations_file}", "-m", "not slow")
+        assert result.returncode == 0, result.stdout
+        assert "3 passed, 1 deselected" in result.stdout
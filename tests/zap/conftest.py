@@ -0,0 +1,113 @@
+import importlib.util
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+REPO_ROOT = Path(__file__).parent.parent.parent
+SCRIPTS_DIR = REPO_ROOT / "scripts"
+BENCHMARKS_DIR = SCRIPTS_DIR / "benchmarks"
+
+sys.path.insert(0, str(SCRIPTS_DIR))
+sys.path.insert(0, str(BENCHMARKS_DIR))
+
+# parse-zap-results.py cannot be imported by name; register it as parse_zap_results
+if "parse_zap_results" not in sys.modules:
+    _spec = importlib.util.spec_from_file_location("parse_zap_results", SCRIPTS_DIR / "parse-zap-results.py")
+    _module = importlib.util.module_from_spec(_spec)
+    sys.modules["parse_zap_results"] = _module
+    _spec.loader.exec_module(_module)
+
+from zap_report_generator import generate_alerts  # noqa: E402
+
+MOCK_API_KEY = "test-api-key"
+
+
+class MockZAPHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_body(self, status, body, content_type="application/json"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        zap = self.server
+        url = urlsplit(self.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        with zap.lock:
+            zap.requests.append((url.path, params))
+            zap.connections.add(self.client_address)
+            if zap.drop_after and len(zap.requests) == zap.drop_after:
+                # Close without telling the client, like an idle keep-alive timeout
+                self.close_connection = True
+        if self.headers.get("X-ZAP-API-Key") != zap.api_key:
+            return self.send_body(400, json.dumps({"code": "bad_api_key", "message": "Bad API key"}).encode())
+        if url.path.startswith("/OTHER/core/other/"):
+            return self.send_body(200, zap.reports[url.path.split("/")[4]], "text/plain")
+
+        if url.path == "/JSON/core/view/version/":
+            data = {"version": "2.14.0"}
+        elif url.path in ("/JSON/spider/action/scan/", "/JSON/ascan/action/scan/"):
+            data = {"scan": "0"}
+        elif url.path in ("/JSON/spider/action/stop/", "/JSON/ascan/action/stop/"):
+            data = {"Result": "OK"}
+        elif url.path == "/JSON/spider/view/status/":
+            data = {"status": str(zap.spider_progress.pop(0) if len(zap.spider_progress) > 1 else zap.spider_progress[0])}
+        elif url.path == "/JSON/ascan/view/status/":
+            progress = zap.ascan_progress.pop(0) if len(zap.ascan_progress) > 1 else zap.ascan_progress[0]
+            zap.visible = len(zap.alerts) * progress // 100
+            data = {"status": str(progress)}
+        elif url.path == "/JSON/core/view/alerts/":
+            start, count = int(params.get("start", 0)), int(params.get("count", 0))
+            end = zap.visible if count == 0 else min(zap.visible, start + count)
+            data = {"alerts": zap.alerts[start:end]}
+        else:
+            return self.send_body(404, json.dumps({"code": "bad_view", "message": "No such view"}).encode())
+        self.send_body(200, json.dumps(data).encode())
+
+
+class MockZAPServer(ThreadingHTTPServer):
+    """Scripted ZAP API: scans progress through the given steps, alerts appear with active-scan progress"""
+
+    daemon_threads = True
+
+    def __init__(self, alerts, spider_progress=(0, 50, 100), ascan_progress=(0, 0, 30, 30, 60, 100)):
+        super().__init__(("127.0.0.1", 0), MockZAPHandler)
+        self.api_key = MOCK_API_KEY
+        self.alerts = alerts
+        self.visible = 0
+        self.spider_progress = list(spider_progress)
+        self.ascan_progress = list(ascan_progress)
+        self.reports = {"xmlreport": b"<OWASPZAPReport/>"}
+        self.requests = []
+        self.connections = set()
+        self.drop_after = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def alert_requests(self):
+        return [params for path, params in self.requests if path == "/JSON/core/view/alerts/"]
+
+
+@pytest.fixture
+def mock_zap():
+    """Local mock ZAP daemon holding 1234 synthetic alerts"""
+    server = MockZAPServer(list(generate_alerts(1234, seed=5)))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
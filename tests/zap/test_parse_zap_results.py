@@ -0,0 +1,277 @@
+import gzip
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from parse_zap_results import ALERT_FIELDS, RULE_FIELDS, RouteTrie, ZAPResultsParser
+from zap_report_generator import HOSTS, ROUTES, expected_summary, write_report
+
+PARSER = Path(__file__).parent.parent.parent / "scripts" / "parse-zap-results.py"
+
+
+@pytest.fixture(params=["json-native", "json-flat", "xml"])
+def report(request, tmp_path):
+    """Synthetic 500-alert report in each supported format"""
+    path = tmp_path / f"report.{'xml' if request.param == 'xml' else 'json'}"
+    write_report(str(path), 500, request.param, seed=7)
+    return path, "xml" if request.param == "xml" else "json"
+
+
+class TestZAPResultsParser:
+    def test_summary_matches_generated_alerts(self, report):
+        """Test every format is parsed into the same severity summary"""
+        path, fmt = report
+        parser = ZAPResultsParser(str(path), fmt)
+        assert parser.parse()
+        assert parser.summary == expected_summary(500, seed=7)
+        assert len(parser.alerts) == 500
+
+    def test_thresholds(self, report):
+        """Test thresholds fail on counts above the configured maximum"""
+        path, fmt = report
+        parser = ZAPResultsParser(str(path), fmt)
+        parser.parse()
+        passed, messages = parser.check_thresholds()
+        assert passed is False
+        assert any("High severity exceeds threshold" in m for m in messages)
+
+        parser.thresholds.update({"High": 10 ** 6, "Medium": 10 ** 6, "Low": 10 ** 6, "Informational": 10 ** 6})
+        passed, messages = parser.check_thresholds()
+        assert passed is True
+        assert messages[-1] == "✅ All security checks passed!"
+
+    def test_jenkins_report(self, report):
+        """Test the Jenkins report carries the summary and verdict"""
+        path, fmt = report
+        parser = ZAPResultsParser(str(path), fmt)
+        parser.parse()
+        result = parser.generate_jenkins_report()
+        assert result["total"] == 500
+        assert result["summary"] == parser.summary
+        assert result["passed"] is False
+
+    def test_sarif_contains_high_and_medium_only(self, report, tmp_path):
+        """Test SARIF export lists High as error and Medium as warning"""
+        path, fmt = report
+        parser = ZAPResultsParser(str(path), fmt)
+        parser.parse()
+        sarif_file = tmp_path / "out.sarif"
+        parser.export_sarif(str(sarif_file))
+        results = json.loads(sarif_file.read_text())["runs"][0]["results"]
+        assert len(results) == parser.summary["High"] + parser.summary["Medium"]
+        assert sum(r["level"] == "error" for r in results) == parser.summary["High"]
+
+    def test_detailed_report_lists_first_findings(self, report):
+        """Test the detailed report shows at most five findings per severity"""
+        path, fmt = report
+        parser = ZAPResultsParser(str(path), fmt)
+        parser.parse()
+        detailed = parser.generate_detailed_report()
+        assert "HIGH SEVERITY FINDINGS:" in detailed
+        assert detailed.count("⚠️") == 10
+
+    def test_gzip_report_matches_plain_report(self, report, tmp_path):
+        """Test a gzip-compressed report parses to the same results"""
+        path, fmt = report
+        compressed = tmp_path / (path.name + ".gz")
+        compressed.write_bytes(gzip.compress(path.read_bytes()))
+        plain, packed = ZAPResultsParser(str(path), fmt), ZAPResultsParser(str(compressed), fmt)
+        assert plain.parse() and packed.parse()
+        assert packed.summary == plain.summary
+        assert [a.to_dict() for a in packed.alerts] == [a.to_dict() for a in plain.alerts]
+
+    def test_unknown_json_structure_fails(self, tmp_path):
+        """Test JSON without an alerts list is rejected"""
+        path = tmp_path / "report.json"
+        path.write_text(json.dumps({"site": []}))
+        assert ZAPResultsParser(str(path)).parse() is False
+
+
+class TestCompactAlerts:
+    def test_alerts_keep_report_fields(self, tmp_path):
+        """Test compact records return the same field values as the report"""
+        path = tmp_path / "report.json"
+        write_report(str(path), 50, "json-flat", seed=9)
+        parser = ZAPResultsParser(str(path))
+        parser.parse()
+        for alert, original in zip(parser.alerts, json.loads(path.read_text())):
+            assert alert.to_dict() == {k: v for k, v in original.items() if k in ALERT_FIELDS}
+            assert alert.get("cwe", "N/A") == "N/A"
+            assert "param" not in alert
+
+    def test_rule_text_is_stored_once(self, report):
+        """Test alerts of the same rule share one description and solution"""
+        path, fmt = report
+        parser = ZAPResultsParser(str(path), fmt)
+        parser.parse()
+        assert len(parser.rules) <= 25
+        descriptions = {id(alert.rule[RULE_FIELDS.index("description")]) for alert in parser.alerts}
+        assert len(descriptions) == len({alert.get("description") for alert in parser.alerts})
+
+    def test_risk_and_confidence_are_integer_codes(self, tmp_path):
+        """Test codes follow ZAP numbering and unknown values survive"""
+        path = tmp_path / "report.json"
+        path.write_text(json.dumps([
+            {"risk": "High", "confidence": "Confirmed"},
+            {"risk": "Critical", "confidence": "Medium"},
+            {"alert": "No risk"},
+        ]))
+        parser = ZAPResultsParser(str(path))
+        assert parser.parse()
+        high, unknown, missing = parser.alerts
+        assert (high.risk, high.confidence) == (3, 4)
+        assert unknown.get("risk") == "Critical"
+        assert missing.get("risk") is None and missing.get("risk", "Informational") == "Informational"
+        assert parser.summary == {"High": 1, "Medium": 0, "Low": 0, "Informational": 1}
+
+
+class TestGateEvaluation:
+    def test_blocking_report_stops_at_first_high(self, report):
+        """Test the gate stops reading at the first High over threshold without keeping alerts"""
+        path, fmt = report
+        parser = ZAPResultsParser(str(path), fmt)
+        assert parser.evaluate_gate()
+        assert parser.summary["High"] == 1
+        assert sum(parser.summary.values()) < 500
+        assert parser.alerts == [] and parser.complete is False
+
+        result = parser.generate_jenkins_report()
+        assert result["passed"] is False and result["complete"] is False
+        assert "lower bounds" in result["messages"][-1]
+
+    def test_passing_report_is_read_to_the_end(self, report):
+        """Test a gate that cannot fail early yields the full summary and verdict"""
+        path, fmt = report
+        full = ZAPResultsParser(str(path), fmt)
+        full.thresholds["High"] = 10 ** 6
+        full.parse()
+
+        gate = ZAPResultsParser(str(path), fmt)
+        gate.thresholds["High"] = 10 ** 6
+        assert gate.evaluate_gate()
+        assert gate.complete is True
+        assert gate.summary == expected_summary(500, seed=7)
+        assert gate.check_thresholds() == full.check_thresholds()
+
+    def test_unknown_json_structure_fails(self, tmp_path):
+        """Test the gate rejects JSON without an alerts list"""
+        path = tmp_path / "report.json"
+        path.write_text(json.dumps({"site": []}))
+        assert ZAPResultsParser(str(path)).evaluate_gate() is False
+
+
+class TestRouteClustering:
+    def test_ids_uuids_and_hashes_become_placeholders(self):
+        """Test identifier segments are replaced while route segments are kept"""
+        routes = RouteTrie()
+        for url in ("https://a.test/api/users/12/settings?x=1", "https://a.test/api/users/345/settings",
+                    "https://a.test/api/test-results/0f8fad5b-d9cb-469f-a165-70867728950e",
+                    "https://a.test/static/js/app.3fa2b1c9d0.js", "https://a.test/"):
+            routes.add(url, "Low")
+        assert {r["template"]: r["total"] for r in routes.templates()} == {
+            "https://a.test/api/users/{id}/settings": 2,
+            "https://a.test/api/test-results/{uuid}": 1,
+            "https://a.test/static/js/app.{hash}.js": 1,
+            "https://a.test/": 1,
+        }
+
+    def test_high_cardinality_segments_collapse_into_a_parameter(self):
+        """Test many distinct literal siblings are merged into one {param} subtree"""
+        routes = RouteTrie(max_literals=3)
+        for name in ("alice", "bob", "carol", "dave", "erin"):
+            routes.add(f"https://a.test/profiles/{name}/avatar", "Medium")
+        routes.add("https://a.test/profiles/erin/avatar", "High")
+        routes.add("https://a.test/docs/intro", "Low")
+        assert routes.templates() == [
+            {"template": "https://a.test/profiles/{param}/avatar", "total": 6,
+             "High": 1, "Medium": 5, "Low": 0, "Informational": 0},
+            {"template": "https://a.test/docs/intro", "total": 1,
+             "High": 0, "Medium": 0, "Low": 1, "Informational": 0},
+        ]
+        assert routes.template("https://a.test/profiles/frank/avatar") == "https://a.test/profiles/{param}/avatar"
+
+    def test_report_routes_match_generated_templates(self, report):
+        """Test every format clusters the synthetic alerts into the generator's routes"""
+        path, fmt = report
+        parser = ZAPResultsParser(str(path), fmt)
+        parser.parse()
+        expected = {host + route.split("?")[0] for host in HOSTS for route in ROUTES}
+        routes = parser.routes.templates()
+        assert {r["template"] for r in routes} <= expected
+        assert sum(r["total"] for r in routes) == 500
+        assert sum(r["High"] for r in routes) == parser.summary["High"]
+
+    def test_outputs_carry_route_counts(self, report, tmp_path):
+        """Test the summary, detailed, Jenkins and SARIF outputs show route templates"""
+        path, fmt = report
+        parser = ZAPResultsParser(str(path), fmt)
+        parser.parse()
+        assert "Top Routes" in parser.generate_summary()
+        assert "{id}" in parser.generate_detailed_report()
+
+        result = parser.generate_jenkins_report()
+        assert result["routes"] == parser.routes.templates()[:25]
+        assert result["routeCount"] == len(parser.routes.templates())
+
+        sarif_file = tmp_path / "out.sarif"
+        parser.export_sarif(str(sarif_file))
+        run = json.loads(sarif_file.read_text())["runs"][0]
+        assert run["properties"]["routes"] == result["routes"]
+        assert all(r["properties"]["routeTemplate"].startswith("https://") for r in run["results"])
+
+
+class TestHTMLReport:
+    def test_findings_are_deduplicated_and_filtered(self, report):
+        """Test one finding per rule and risk, filtered by minimum severity"""
+        path, fmt = report
+        parser = ZAPResultsParser(str(path), fmt)
+        parser.parse()
+        findings = parser.group_findings()
+        assert sum(f["count"] for f in findings) == 500
+        assert len({(f["alert"].get("alert"), f["risk"]) for f in findings}) == len(findings)
+        assert [f["risk"] for f in findings] == sorted((f["risk"] for f in findings),
+                                                       key=["High", "Medium", "Low", "Informational"].index)
+        assert all(len(f["urls"]) <= 10 for f in findings)
+
+        severe = parser.group_findings("Medium")
+        assert {f["risk"] for f in severe} == {"High", "Medium"}
+        assert sum(f["count"] for f in severe) == parser.summary["High"] + parser.summary["Medium"]
+
+    def test_html_report_is_paginated_and_bounded(self, report, tmp_path):
+        """Test the HTML report pages findings and caps what it renders"""
+        path, fmt = report
+        parser = ZAPResultsParser(str(path), fmt)
+        parser.parse()
+        html_file = tmp_path / "findings.html"
+        parser.export_html(str(html_file), page_size=5, max_findings=12)
+        html = html_file.read_text()
+        assert html.count("<details") == 12
+        assert 'id="page-3"' in html and 'id="page-4"' not in html
+        assert f"Findings (12 of {len(parser.group_findings())}" in html
+
+    def test_styles_are_linked_not_inline(self, report, tmp_path):
+        """Test the styles are written to a sibling stylesheet that Jenkins' CSP allows"""
+        path, fmt = report
+        parser = ZAPResultsParser(str(path), fmt)
+        parser.parse()
+        html_file = tmp_path / "findings.html"
+        parser.export_html(str(html_file))
+        html = html_file.read_text()
+        assert "<style" not in html and " style=" not in html
+        assert '<link rel="stylesheet" href="findings.css">' in html
+        assert "details.high" in (tmp_path / "findings.css").read_text()
+
+    def test_command_line_html_export(self, tmp_path):
+        """Test --html with --html-min-risk writes only the selected severities"""
+        path = tmp_path / "report.json"
+        write_report(str(path), 300, "json-native", seed=3)
+        html_file = tmp_path / "findings.html"
+        result = subprocess.run([sys.executable, str(PARSER), str(path), "--html", str(html_file),
+                                 "--html-min-risk", "High"], capture_output=True, text=True)
+        assert result.returncode == 0, result.stdout + result.stderr
+        html = html_file.read_text()
+        assert '<details class="high">' in html
+        assert '<details class="medium">' not in html and '<details class="low">' not in html
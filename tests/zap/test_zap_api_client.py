@@ -0,0 +1,129 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from parse_zap_results import ZAPResultsParser
+from zap_api_client import AdaptivePoller, AlertCollector, ZAPClient, ZAPError, run_scan
+
+CLIENT = Path(__file__).parent.parent.parent / "scripts" / "zap_api_client.py"
+
+
+def expected_counts(alerts):
+    summary = {"High": 0, "Medium": 0, "Low": 0, "Informational": 0}
+    for alert in alerts:
+        summary[alert["risk"]] += 1
+    return summary
+
+
+class TestAdaptivePoller:
+    def test_backs_off_while_stalled_and_resets_on_progress(self):
+        """Test the interval doubles up to the maximum and resets when progress moves"""
+        slept = []
+        poller = AdaptivePoller(minimum=1, maximum=5, sleep=slept.append)
+        for progress in (0, 0, 0, 0, 0, 10, 10, 40):
+            poller.wait(progress)
+        assert slept == [1, 2, 4, 5, 5, 1, 2, 1]
+
+
+class TestZAPClient:
+    def test_scan_pages_alerts_into_parser(self, mock_zap, tmp_path):
+        """Test alerts are paged in during the scan over one connection"""
+        client = ZAPClient(mock_zap.url, api_key=mock_zap.api_key)
+        report = tmp_path / "full.json"
+        parser = ZAPResultsParser(str(report))
+        collector = AlertCollector(client, parser, page_size=100, output_file=str(report))
+        run_scan(client, "http://app", collector, poller_factory=lambda: AdaptivePoller(sleep=lambda s: None),
+                 log=lambda message: None)
+        collector.close()
+        client.close()
+
+        assert len(parser.alerts) == 1234
+        assert parser.summary == expected_counts(mock_zap.alerts)
+        assert len(mock_zap.connections) == 1
+
+        pages = mock_zap.alert_requests()
+        assert all(p["count"] == "100" for p in pages)
+        # Alerts raised before the end of the scan were fetched while it ran
+        assert pages[0]["start"] == "0" and int(pages[-1]["start"]) > 1000
+
+        reread = ZAPResultsParser(str(report))
+        assert reread.parse()
+        assert reread.summary == parser.summary
+
+    def test_fail_fast_stops_scan_at_first_blocking_page(self, mock_zap):
+        """Test a crossed threshold ends the scan early and stops it in ZAP"""
+        client = ZAPClient(mock_zap.url, api_key=mock_zap.api_key)
+        parser = ZAPResultsParser("unused.json")
+        collector = AlertCollector(client, parser, page_size=100)
+        completed = run_scan(client, "http://app", collector, poller_factory=lambda: AdaptivePoller(sleep=lambda s: None),
+                             fail_fast=True, stop_scan=True, log=lambda message: None)
+
+        assert completed is False
+        assert not parser.check_thresholds()[0]
+        assert ("/JSON/ascan/action/stop/", {"scanId": "0"}) in mock_zap.requests
+        # Only the alerts visible at 30% progress were fetched
+        assert len(parser.alerts) == 1234 * 30 // 100
+        assert mock_zap.ascan_progress == [30, 60, 100]
+
+    def test_fail_fast_keeps_scanning_past_non_blocking_findings(self, mock_zap):
+        """Test early Medium findings over their threshold do not stop the scan"""
+        mock_zap.alerts = [alert for alert in mock_zap.alerts if alert["risk"] == "Medium"]
+        client = ZAPClient(mock_zap.url, api_key=mock_zap.api_key)
+        parser = ZAPResultsParser("unused.json")
+        collector = AlertCollector(client, parser, page_size=100)
+        completed = run_scan(client, "http://app", collector, poller_factory=lambda: AdaptivePoller(sleep=lambda s: None),
+                             fail_fast=True, stop_scan=True, log=lambda message: None)
+
+        assert completed is True
+        assert parser.summary["Medium"] == len(mock_zap.alerts) > parser.thresholds["Medium"]
+        assert not any(path.endswith("/action/stop/") for path, params in mock_zap.requests)
+
+    def test_reconnects_when_idle_connection_is_dropped(self, mock_zap):
+        """Test a keep-alive connection closed by the server is reopened once"""
+        mock_zap.drop_after = 1
+        client = ZAPClient(mock_zap.url, api_key=mock_zap.api_key)
+        assert client.version() == "2.14.0"
+        assert client.version() == "2.14.0"
+        assert len(mock_zap.connections) == 2
+
+    def test_api_errors_raise(self, mock_zap):
+        """Test API errors and unreachable daemons raise ZAPError"""
+        with pytest.raises(ZAPError, match="Bad API key"):
+            ZAPClient(mock_zap.url, api_key="wrong").version()
+        with pytest.raises(ZAPError, match="No such view"):
+            ZAPClient(mock_zap.url, api_key=mock_zap.api_key).call("core", "view", "missing")
+        with pytest.raises(ZAPError):
+            ZAPClient("http://127.0.0.1:1", timeout=1).version()
+
+
+class TestCommandLine:
+    def test_full_scan_writes_reports_and_verdict(self, mock_zap, tmp_path):
+        """Test the CLI writes the three reports and fails on high findings"""
+        base = tmp_path / "reports" / "full"
+        result = subprocess.run(
+            [sys.executable, str(CLIENT), "http://app", "--zap-url", mock_zap.url, "--api-key", mock_zap.api_key,
+             "--report-base", str(base), "--page-size", "250", "--poll-min", "0", "--poll-max", "0"],
+            capture_output=True, text=True,
+        )
+        assert result.returncode == 1, result.stdout + result.stderr
+        assert "❌ High severity exceeds threshold" in result.stdout
+        assert len(json.loads(base.with_suffix(".json").read_text())["alerts"]) == 1234
+        assert "OWASP ZAP Findings" in base.with_suffix(".html").read_text()
+        assert not any(path.endswith("/htmlreport/") for path, params in mock_zap.requests)
+        assert base.with_suffix(".xml").read_bytes() == b"<OWASPZAPReport/>"
+
+    def test_fail_fast_exits_before_scan_ends(self, mock_zap, tmp_path):
+        """Test --fail-fast still writes the partial reports and fails"""
+        base = tmp_path / "full"
+        result = subprocess.run(
+            [sys.executable, str(CLIENT), "http://app", "--zap-url", mock_zap.url, "--api-key", mock_zap.api_key,
+             "--report-base", str(base), "--poll-min", "0", "--poll-max", "0", "--fail-fast"],
+            capture_output=True, text=True,
+        )
+        assert result.returncode == 1, result.stdout + result.stderr
+        assert "Scan abandoned early" in result.stdout
+        assert len(json.loads(base.with_suffix(".json").read_text())["alerts"]) < 1234
+        assert not any(path.endswith("/action/stop/") for path, params in mock_zap.requests)
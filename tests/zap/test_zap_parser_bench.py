@@ -0,0 +1,95 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from zap_parser_bench import ensure_report, find_regressions, machine_fingerprint
+from zap_report_generator import expected_summary, write_report
+
+BENCHMARKS_DIR = Path(__file__).parent.parent.parent / "scripts" / "benchmarks"
+FINGERPRINT = {"python": "3.11.7", "machine": "x86_64", "cpus": 4, "generator": 1}
+
+
+def history_run(parse_seconds, peak_rss_mb=100.0, fingerprint=FINGERPRINT):
+    return {
+        "meta": {"fingerprint": fingerprint},
+        "results": {"json-native/100k/jenkins": {
+            "parse_seconds": parse_seconds, "output_seconds": 0.001, "peak_rss_mb": peak_rss_mb
+        }},
+    }
+
+
+class TestReportGenerator:
+    def test_reports_are_deterministic(self, tmp_path):
+        """Test the same seed produces byte-identical reports"""
+        for fmt in ("json-native", "json-flat", "xml"):
+            first, second = tmp_path / f"a-{fmt}", tmp_path / f"b-{fmt}"
+            write_report(str(first), 200, fmt, seed=3)
+            write_report(str(second), 200, fmt, seed=3)
+            assert first.read_bytes() == second.read_bytes()
+
+        write_report(str(tmp_path / "other"), 200, "json-flat", seed=4)
+        assert (tmp_path / "other").read_bytes() != (tmp_path / "a-json-flat").read_bytes()
+
+    def test_write_report_returns_risk_counts(self, tmp_path):
+        """Test the returned summary matches the generated alerts"""
+        summary = write_report(str(tmp_path / "r.json"), 300, "json-native", seed=5)
+        assert summary == expected_summary(300, seed=5)
+        assert len(json.loads((tmp_path / "r.json").read_text())["alerts"]) == 300
+
+    def test_generated_reports_are_cached(self, tmp_path):
+        """Test a report is generated once per format, size and seed"""
+        report, summary = ensure_report(tmp_path, "json-flat", "1k", 42)
+        mtime = report.stat().st_mtime_ns
+        again, cached_summary = ensure_report(tmp_path, "json-flat", "1k", 42)
+        assert again == report and again.stat().st_mtime_ns == mtime
+        assert cached_summary == summary
+
+
+class TestFindRegressions:
+    def test_slower_than_history_median_is_flagged(self):
+        """Test a metric above median * (1 + tolerance) is a regression"""
+        history = [history_run(1.0), history_run(1.1), history_run(0.9)]
+        current = history_run(1.4)["results"]
+        regressions = find_regressions(current, history, FINGERPRINT, tolerance=0.25, window=5)
+        assert len(regressions) == 1
+        assert "parse_seconds" in regressions[0]
+        assert find_regressions(history_run(1.2)["results"], history, FINGERPRINT, 0.25, 5) == []
+
+    def test_noise_floor_and_other_machines_are_ignored(self):
+        """Test tiny absolute changes and runs from other machines never regress"""
+        history = [history_run(0.001, peak_rss_mb=20.0)]
+        current = history_run(0.01, peak_rss_mb=24.0)["results"]
+        assert find_regressions(current, history, FINGERPRINT, 0.25, 5) == []
+
+        other = dict(FINGERPRINT, cpus=64)
+        history = [history_run(0.5, fingerprint=other)]
+        assert find_regressions(history_run(5.0)["results"], history, FINGERPRINT, 0.25, 5) == []
+
+    def test_window_limits_history(self):
+        """Test only the most recent runs form the baseline"""
+        history = [history_run(10.0)] * 5 + [history_run(1.0)] * 3
+        assert find_regressions(history_run(2.0)["results"], history, FINGERPRINT, 0.25, window=3)
+        assert not find_regressions(history_run(2.0)["results"], history, FINGERPRINT, 0.25, window=8)
+
+
+class TestBenchmarkRun:
+    def test_run_stores_history_and_fails_on_regression(self, tmp_path):
+        """Test a run is appended to history and a doctored baseline makes it fail"""
+        history = tmp_path / "history.jsonl"
+        cmd = [sys.executable, str(BENCHMARKS_DIR / "zap_parser_bench.py"), "--sizes", "1k",
+               "--formats", "json-flat", "--modes", "jenkins", "sarif", "--repeat", "1",
+               "--work-dir", str(tmp_path), "--history", str(history)]
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        assert result.returncode == 0, result.stdout + result.stderr
+        run = json.loads(history.read_text())
+        assert set(run["results"]) == {"json-flat/1k/jenkins", "json-flat/1k/sarif"}
+        assert run["meta"]["fingerprint"] == machine_fingerprint()
+
+        # Pretend earlier runs used a fraction of the memory
+        for case in run["results"].values():
+            case["peak_rss_mb"] = 1.0
+        history.write_text(json.dumps(run) + "\n")
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        assert result.returncode == 1
+        assert "peak_rss_mb" in result.stdout